@@ -1,9 +1,16 @@
 import requests
-import json
 from typing import List, Dict, Optional
 from datetime import datetime
 import logging
 
+from flask import has_app_context
+
+from ai_models.catalog_ingestion import CatalogIngestor, CatalogSource, default_sources, imported_projects
+from models.catalog import CatalogRecord
+
+# Funding brackets used for the budget_range filter
+BUDGET_RANGES = [(0, 500000), (500000, 1000000), (1000000, 2000000), (2000000, 5000000)]
+
 class DiscoveryAgent:
     """
     Discovery Agent for fetching NGO/CSR project data from various APIs
@@ -18,13 +25,73 @@ class DiscoveryAgent:
         }
         self.logger = logging.getLogger(__name__)
         
+    def catalog_sources(self) -> List[CatalogSource]:
+        """
+        Catalog sources ingested by sync_catalog
+        """
+        return default_sources(self.api_endpoints)
+    
+    def sync_catalog(self, sources: List[CatalogSource] = None, **kwargs) -> Dict:
+        """
+        Incrementally import projects and NGOs from the external catalogs
+        """
+        return CatalogIngestor(sources or self.catalog_sources(), **kwargs).sync()
+    
     def fetch_ngo_projects(self, filters: Dict = None) -> List[Dict]:
         """
-        Fetch NGO projects from NGO Darpan API
+        Fetch NGO projects imported from the catalogs, or sample data before the first sync
         """
         try:
-            # Simulated API call to NGO Darpan
-            projects = [
+            projects = self._imported_projects()
+            if projects is None:
+                projects = self._sample_projects()
+            
+            if filters:
+                projects = self._apply_filters(projects, filters)
+                
+            return projects
+            
+        except Exception as e:
+            self.logger.error(f"Error fetching NGO projects: {str(e)}")
+            return []
+    
+    def _imported_projects(self, query: str = None) -> Optional[List[Dict]]:
+        """
+        Imported projects in the discovery format; None outside an app context or before any import
+        """
+        if not has_app_context():
+            return None
+        if CatalogRecord.query.filter_by(kind='project').first() is None:
+            return None
+        return [self._project_entry(external_id, project) for external_id, project in imported_projects(query=query)]
+    
+    def _project_entry(self, external_id: str, project) -> Dict:
+        focus_areas = project.get_csr_focus_areas()
+        geography = ', '.join(p for p in (project.location_city, project.location_region, project.location_country) if p)
+        return {
+            'id': external_id,
+            'name': project.title,
+            'ngo_name': project.ngo_name,
+            'sector': focus_areas[0] if focus_areas else '',
+            'geography': geography,
+            'budget_range': self._budget_range(float(project.funding_required or 0)),
+            'sdgs': [str(goal) for goal in project.get_sdg_goals()],
+            'description': project.short_description,
+            'status': 'Active' if project.status in ('published', 'funded') else (project.status or '').title(),
+            'created_date': project.created_at.date().isoformat() if project.created_at else None
+        }
+    
+    def _budget_range(self, amount: float) -> str:
+        for low, high in BUDGET_RANGES:
+            if amount < high:
+                return f"{low}-{high}"
+        return f"{BUDGET_RANGES[-1][1]}+"
+    
+    def _sample_projects(self) -> List[Dict]:
+        """
+        Sample NGO Darpan projects used until a catalog sync has run
+        """
+        return [
                 {
                     'id': 'ngo_001',
                     'name': 'Rural Education Initiative',
@@ -50,15 +117,6 @@ class DiscoveryAgent:
                     'created_date': '2024-02-20'
                 }
             ]
-            
-            if filters:
-                projects = self._apply_filters(projects, filters)
-                
-            return projects
-            
-        except Exception as e:
-            self.logger.error(f"Error fetching NGO projects: {str(e)}")
-            return []
     
     def fetch_sdg_datasets(self, sdg_goals: List[str] = None) -> List[Dict]:
         """
@@ -101,10 +159,12 @@ class DiscoveryAgent:
         Search projects with text query and filters
         """
         try:
-            all_projects = self.fetch_ngo_projects()
+            # Imported projects are text-searched in the database
+            imported = self._imported_projects(query or None)
+            all_projects = imported if imported is not None else self._sample_projects()
             
-            # Simple text search
-            if query:
+            # Simple text search over the sample data
+            if query and imported is None:
                 query_lower = query.lower()
                 all_projects = [
                     p for p in all_projects 
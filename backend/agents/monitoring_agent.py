@@ -1,59 +1,164 @@
-import json
-from typing import List, Dict
-from datetime import datetime
+from typing import List, Dict, Optional
+from datetime import date, datetime
 import logging
-import random
+
+# Progress may trail the elapsed share of the schedule by this much before it counts as a delay
+SCHEDULE_TOLERANCE = 0.1
+# Share of the budget that, once spent ahead of delivery, raises a burn-rate alert
+BUDGET_ALERT_THRESHOLD = 0.9
+
+
+def _as_date(value) -> Optional[date]:
+    if value is None or isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    try:
+        return datetime.fromisoformat(str(value)).date()
+    except ValueError:
+        return None
+
+
+def summarize_milestones(milestones: List[Dict], today: date) -> Dict:
+    """Counts and average progress of a project's milestones"""
+    total = completed = overdue = progress = 0
+    next_due = None
+    for milestone in milestones:
+        total += 1
+        done = milestone.get('status') == 'completed' or milestone.get('completion_date') is not None
+        target = _as_date(milestone.get('target_date'))
+        if done:
+            completed += 1
+            progress += 100
+            continue
+        progress += milestone.get('progress_percentage') or 0
+        if target and target < today:
+            overdue += 1
+        elif target and (next_due is None or target < next_due):
+            next_due = target
+    return {
+        'milestones_total': total,
+        'milestones_completed': completed,
+        'milestones_overdue': overdue,
+        'milestone_progress': progress / total if total else None,
+        'next_due': next_due,
+    }
+
 
 class MonitoringAgent:
     """
     Monitoring Agent for tracking project performance and detecting issues
     """
-    
+
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-    
+
+    def assess(self, snapshot: Dict, today: Optional[date] = None) -> Dict:
+        """Status and alerts for one project from its monitoring inputs.
+
+        `snapshot` carries the project's schedule (start_date, end_date), tracked
+        progress_pct, milestone summary (see summarize_milestones) and budget
+        (budget allocated, spent so far).
+        """
+        today = today or date.today()
+
+        # Tracked progress wins; otherwise fall back to milestone completion
+        if snapshot.get('progress_pct') is not None:
+            progress = snapshot['progress_pct'] / 100
+        elif snapshot.get('milestone_progress') is not None:
+            progress = snapshot['milestone_progress'] / 100
+        else:
+            progress = 0.0
+        progress = max(0.0, min(1.0, progress))
+
+        start, end = _as_date(snapshot.get('start_date')), _as_date(snapshot.get('end_date'))
+        expected = None
+        if start and end and end > start:
+            expected = max(0.0, min(1.0, (today - start).days / (end - start).days))
+
+        budget = snapshot.get('budget') or 0
+        spent = snapshot.get('spent')
+        utilization = spent / budget if budget and spent is not None else None
+
+        if snapshot.get('status') == 'completed' or (
+            progress >= 1 and snapshot.get('milestones_completed', 0) == snapshot.get('milestones_total', 0)
+        ):
+            status = 'Completed'
+            alerts = []
+        else:
+            alerts = self._alerts(snapshot, progress, expected, utilization)
+            if any(alert['severity'] == 'high' for alert in alerts):
+                status = 'At Risk'
+            elif alerts:
+                status = 'Minor Issues'
+            else:
+                status = 'On Track'
+
+        next_due = snapshot.get('next_due')
+        return {
+            'project_id': snapshot.get('id'),
+            'project_name': snapshot.get('name', 'Unknown'),
+            'status': status,
+            'progress': round(progress, 4),
+            'expected_progress': round(expected, 4) if expected is not None else None,
+            'budget_spent': round(utilization, 4) if utilization is not None else None,
+            'milestones': {
+                'total': snapshot.get('milestones_total', 0),
+                'completed': snapshot.get('milestones_completed', 0),
+                'overdue': snapshot.get('milestones_overdue', 0),
+                'next_due': next_due.isoformat() if next_due else None,
+            },
+            'alerts': alerts,
+            'monitoring_date': datetime.now().isoformat()
+        }
+
+    @staticmethod
+    def _alerts(snapshot: Dict, progress: float, expected: Optional[float], utilization: Optional[float]) -> List[Dict]:
+        alerts = []
+        overdue = snapshot.get('milestones_overdue', 0)
+        if overdue:
+            alerts.append({
+                'type': 'overdue_milestones',
+                'severity': 'high' if overdue > 1 else 'medium',
+                'message': f"{overdue} milestone{'s' if overdue > 1 else ''} past due"
+            })
+
+        if expected is not None and progress < expected - SCHEDULE_TOLERANCE:
+            alerts.append({
+                'type': 'schedule_delay',
+                'severity': 'high' if progress < expected - 3 * SCHEDULE_TOLERANCE else 'medium',
+                'message': f"Behind schedule: {progress*100:.1f}% complete vs {expected*100:.1f}% expected"
+            })
+
+        if utilization is not None and utilization > 1:
+            alerts.append({
+                'type': 'budget_overrun',
+                'severity': 'high',
+                'message': f"Budget overrun: {utilization*100:.1f}% spent"
+            })
+        elif utilization is not None and utilization >= BUDGET_ALERT_THRESHOLD and progress < utilization - SCHEDULE_TOLERANCE:
+            alerts.append({
+                'type': 'budget_burn',
+                'severity': 'medium',
+                'message': f"Spending ahead of delivery: {utilization*100:.1f}% spent, {progress*100:.1f}% complete"
+            })
+        return alerts
+
     def monitor_project(self, project_id: str, project_data: Dict) -> Dict:
-        """Monitor a single project"""
+        """Monitor a single project from its data.
+
+        `project_data` may carry a `milestones` list instead of the summarized
+        milestone fields.
+        """
         try:
-            # Simulate monitoring data
-            progress = random.uniform(0.6, 0.9)
-            budget_spent = random.uniform(0.7, 0.95)
-            
-            # Determine status
-            if progress >= 0.8 and budget_spent <= 0.9:
-                status = "On Track"
-            elif progress >= 0.6 and budget_spent <= 0.95:
-                status = "Minor Issues"
-            else:
-                status = "At Risk"
-            
-            # Generate alerts
-            alerts = []
-            if budget_spent > 0.9:
-                alerts.append({
-                    'type': 'budget_overrun',
-                    'message': f"Budget overrun: {budget_spent*100:.1f}% spent"
-                })
-            
-            if progress < 0.7:
-                alerts.append({
-                    'type': 'schedule_delay',
-                    'message': f"Behind schedule: {progress*100:.1f}% complete"
-                })
-            
-            return {
-                'project_id': project_id,
-                'project_name': project_data.get('name', 'Unknown'),
-                'status': status,
-                'progress': progress,
-                'budget_spent': budget_spent,
-                'alerts': alerts,
-                'monitoring_date': datetime.now().isoformat()
-            }
+            snapshot = dict(project_data, id=project_id)
+            if 'milestones' in project_data:
+                snapshot.update(summarize_milestones(project_data['milestones'] or [], date.today()))
+            return self.assess(snapshot)
         except Exception as e:
             self.logger.error(f"Error monitoring project: {str(e)}")
             return {}
-    
+
     def batch_monitor_projects(self, projects: List[Dict]) -> Dict:
         """Monitor multiple projects"""
         try:
@@ -62,16 +167,23 @@ class MonitoringAgent:
                 result = self.monitor_project(project.get('id'), project)
                 if result:
                     results.append(result)
-            
+
             return {
                 'monitoring_results': results,
-                'summary': {
-                    'total_projects': len(results),
-                    'on_track': len([r for r in results if r.get('status') == 'On Track']),
-                    'at_risk': len([r for r in results if r.get('status') == 'At Risk'])
-                },
+                'summary': summarize_results(results),
                 'generated_at': datetime.now().isoformat()
             }
         except Exception as e:
             self.logger.error(f"Error in batch monitoring: {str(e)}")
             return {}
+
+
+def summarize_results(results: List[Dict]) -> Dict:
+    """Status counts for a set of monitoring results"""
+    return {
+        'total_projects': len(results),
+        'on_track': sum(1 for r in results if r.get('status') == 'On Track'),
+        'minor_issues': sum(1 for r in results if r.get('status') == 'Minor Issues'),
+        'at_risk': sum(1 for r in results if r.get('status') == 'At Risk'),
+        'completed': sum(1 for r in results if r.get('status') == 'Completed')
+    }
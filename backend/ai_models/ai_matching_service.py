@@ -1,9 +1,10 @@
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from ai_models.ai_model import ai_model
 from models.company_details import Company
 from models.projects import Project
 from models.rationale import DecisionRationale
 from models.base import db
+from models.types import as_text
 import logging
 
 logger = logging.getLogger(__name__)
@@ -51,7 +52,7 @@ class AIMatchingService:
                 if filters.get('sdg_goals'):
                     # Filter by SDG goals (projects that have any of the specified SDGs)
                     sdg_goals = filters['sdg_goals']
-                    query = query.filter(Project.sdg_goals.contains(sdg_goals))
+                    query = query.filter(as_text(Project.sdg_goals).contains(sdg_goals))
                 
                 if filters.get('max_budget'):
                     query = query.filter(Project.funding_required <= filters['max_budget'])
@@ -89,7 +90,8 @@ class AIMatchingService:
                     'past_projects_completed': project.past_projects_completed,
                     'status': project.status,
                     'expected_outcomes': project.get_expected_outcomes() if hasattr(project, 'get_expected_outcomes') else {},
-                    'kpis': project.get_kpis() if hasattr(project, 'get_kpis') else {}
+                    'kpis': project.get_kpis() if hasattr(project, 'get_kpis') else {},
+                    'updated_at': project.updated_at.isoformat() if project.updated_at else None
                 }
                 projects_data.append(project_dict)
             
@@ -138,6 +140,37 @@ class AIMatchingService:
             logger.error(f"Error generating project matching rationale: {str(e)}")
             return None
     
+    @staticmethod
+    def stream_project_matching_rationale(company_id: int, project_filters: Dict = None) -> Optional[Iterator[Tuple[str, Any]]]:
+        """Stream rationale items as (event, data) pairs, saving the final rationale when complete
+        
+        Company and project data are loaded before returning so lookup failures
+        can still be reported as a normal error response; None means there is
+        nothing to stream.
+        """
+        company_data = AIMatchingService.get_company_data(company_id)
+        if not company_data:
+            return None
+        
+        projects_data = AIMatchingService.get_available_projects(project_filters)
+        if not projects_data:
+            logger.warning("No projects available for matching")
+            return None
+        
+        def events():
+            for event, data in ai_model.stream_project_matching_rationale(company_data, projects_data):
+                if event == 'complete':
+                    rationale_id = AIMatchingService.save_rationale_to_db(
+                        company_id=company_id,
+                        rationale_data=data
+                    )
+                    if rationale_id:
+                        data['rationale_id'] = rationale_id
+                        logger.info(f"Successfully streamed and saved rationale {rationale_id} for company {company_id}")
+                yield event, data
+        
+        return events()
+    
     @staticmethod
     def save_rationale_to_db(company_id: int, rationale_data: Dict) -> Optional[int]:
         """Save rationale data to database"""
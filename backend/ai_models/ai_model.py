@@ -1,11 +1,15 @@
 import requests
 import json
 import os
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterator, Tuple
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 import logging
 from dotenv import load_dotenv
 
+from .stream_parser import IncrementalRationaleParser
+from perf.metrics import track_external
+
 # Load environment variables
 load_dotenv()
 
@@ -13,6 +17,64 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+RATIONALE_SYSTEM_PROMPT = """You are an expert ESG consultant and CSR advisor. Your task is to analyze corporate companies and match them with the most suitable sustainability projects based on their profile, budget, focus areas, and strategic objectives.
+
+You must respond ONLY with valid JSON in the following format:
+{
+  "selectedProjectId": "integer",
+  "confidenceScore": "float between 0-1",
+  "title": "string",
+  "context": {
+    "companyProfile": "string",
+    "matchingCriteria": "string",
+    "strategicAlignment": "string"
+  },
+  "criteria": {
+    "impact": "float between 0-1",
+    "cost": "float between 0-1", 
+    "risk": "float between 0-1",
+    "alignment": "float between 0-1",
+    "feasibility": "float between 0-1"
+  },
+  "options": [
+    {
+      "key": "project_id",
+      "label": "Project Title",
+      "data": {
+        "projectId": "integer",
+        "score": "float",
+        "strengths": ["array of strings"],
+        "concerns": ["array of strings"]
+      }
+    }
+  ],
+  "selectedOption": "project_id",
+  "pros": [
+    "string describing benefits"
+  ],
+  "cons": [
+    "string describing concerns"
+  ],
+  "reasoningSteps": [
+    "string describing analysis step"
+  ],
+  "scoreBreakdown": {
+    "project_id": {
+      "impact": "float",
+      "cost": "float",
+      "risk": "float",
+      "alignment": "float",
+      "feasibility": "float",
+      "total": "float"
+      }
+    }
+  }
+
+Ensure all scores are between 0 and 1, and provide detailed reasoning for your recommendations."""
+
+# Streaming consumers render these arrays first, so ask the model to lead with them
+STREAMING_ORDER_HINT = "Write the \"reasoningSteps\", \"pros\" and \"options\" arrays first in the JSON object, before the other fields."
+
 class AIModel:
     def __init__(self):
         # Try to load environment variables, but don't fail if .env file doesn't exist
@@ -27,7 +89,7 @@ class AIModel:
             logger.error("OPENROUTER_API_KEY environment variable is not set. Please set it in your .env file.")
             raise ValueError("OPENROUTER_API_KEY environment variable is required but not set.")
         
-        self.base_url = "https://openrouter.ai/api/v1/chat/completions"
+        self.base_url = os.getenv('OPENROUTER_BASE_URL', "https://openrouter.ai/api/v1/chat/completions")
         self.model = "deepseek/deepseek-chat-v3.1:free"  # Use the working model from test_model.py
         
         # Debug: Check environment variable
@@ -55,12 +117,13 @@ class AIModel:
             logger.info(f"API Key present: {'Authorization' in self.headers}")
             logger.info(f"API Key value: {self.headers.get('Authorization', 'NOT_SET')[:20]}...")
             
-            response = requests.post(
-                url=self.base_url,
-                headers=self.headers,
-                data=json.dumps(payload),
-                timeout=30
-            )
+            with track_external('openrouter'):
+                response = requests.post(
+                    url=self.base_url,
+                    headers=self.headers,
+                    data=json.dumps(payload),
+                    timeout=30
+                )
             
             # Always return the response object, regardless of status code
             # This allows the caller to check status_code and access error details
@@ -87,69 +150,7 @@ class AIModel:
             # Prepare the prompt for project matching
             prompt = self._create_project_matching_prompt(company_data, projects_data)
             
-            messages = [
-                {
-                    "role": "system",
-                    "content": """You are an expert ESG consultant and CSR advisor. Your task is to analyze corporate companies and match them with the most suitable sustainability projects based on their profile, budget, focus areas, and strategic objectives.
-
-You must respond ONLY with valid JSON in the following format:
-{
-  "selectedProjectId": "integer",
-  "confidenceScore": "float between 0-1",
-  "title": "string",
-  "context": {
-    "companyProfile": "string",
-    "matchingCriteria": "string",
-    "strategicAlignment": "string"
-  },
-  "criteria": {
-    "impact": "float between 0-1",
-    "cost": "float between 0-1", 
-    "risk": "float between 0-1",
-    "alignment": "float between 0-1",
-    "feasibility": "float between 0-1"
-  },
-  "options": [
-    {
-      "key": "project_id",
-      "label": "Project Title",
-      "data": {
-        "projectId": "integer",
-        "score": "float",
-        "strengths": ["array of strings"],
-        "concerns": ["array of strings"]
-      }
-    }
-  ],
-  "selectedOption": "project_id",
-  "pros": [
-    "string describing benefits"
-  ],
-  "cons": [
-    "string describing concerns"
-  ],
-  "reasoningSteps": [
-    "string describing analysis step"
-  ],
-  "scoreBreakdown": {
-    "project_id": {
-      "impact": "float",
-      "cost": "float",
-      "risk": "float",
-      "alignment": "float",
-      "feasibility": "float",
-      "total": "float"
-      }
-    }
-  }
-
-Ensure all scores are between 0 and 1, and provide detailed reasoning for your recommendations."""
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
+            messages = self._build_rationale_messages(prompt)
             
             # Make API request with higher temperature for more variety
             response = self._make_request(messages, temperature=0.7)
@@ -218,33 +219,12 @@ Ensure all scores are between 0 and 1, and provide detailed reasoning for your r
                 logger.warning(f"OpenRouter API request failed with status {response.status_code}")
                 logger.error(f"API response content: {response.text}")
                 
-                # Determine specific error reason based on status code
-                error_reason = "Unknown API Error"
-                error_details = "The AI service is currently unavailable"
-                
-                if response.status_code == 401:
-                    error_reason = "Authentication Failed"
-                    error_details = "API key is invalid, expired, or account has restrictions. Please check your OpenRouter account and API key."
-                elif response.status_code == 403:
-                    error_reason = "Access Denied"
-                    error_details = "Your account doesn't have permission to access this service or model."
-                elif response.status_code == 404:
-                    error_reason = "Service Not Found"
-                    error_details = "The requested AI model or service is not available with your current account plan."
-                elif response.status_code == 429:
-                    error_reason = "Rate Limit Exceeded"
-                    error_details = "Too many requests. Please wait before trying again."
-                elif response.status_code == 500:
-                    error_reason = "AI Service Error"
-                    error_details = "The AI service is experiencing technical difficulties."
-                elif response.status_code == 503:
-                    error_reason = "Service Unavailable"
-                    error_details = "The AI service is temporarily unavailable."
-                else:
-                    error_reason = f"API Error {response.status_code}"
-                    error_details = f"Unexpected error from AI service: {response.text}"
-                
-                return self._generate_mock_rationale_with_error(company_data, projects_data, error_reason, error_details)
+                error_reason, error_details = self._describe_http_error(response)
+                return self._generate_mock_rationale_with_error(
+                    company_data, projects_data, error_reason, error_details,
+                    status_code=response.status_code,
+                    retry_after=self._parse_retry_after(response)
+                )
             
         except Exception as e:
             logger.error(f"Error in AI rationale generation: {str(e)}")
@@ -252,17 +232,166 @@ Ensure all scores are between 0 and 1, and provide detailed reasoning for your r
             logger.info("Falling back to mock AI response due to exception")
             return self._generate_mock_rationale_with_error(company_data, projects_data, "AI Service Exception", f"Unexpected error occurred: {str(e)}")
     
+    def _build_rationale_messages(self, prompt: str, streaming: bool = False) -> List[Dict]:
+        """Build the chat messages for a project matching rationale request"""
+        system_prompt = RATIONALE_SYSTEM_PROMPT
+        if streaming:
+            system_prompt = f"{system_prompt}\n\n{STREAMING_ORDER_HINT}"
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _describe_http_error(self, response: requests.Response) -> Tuple[str, str]:
+        """Map a non-200 OpenRouter response to an (error_reason, error_details) pair"""
+        status = response.status_code
+        if status == 401:
+            return "Authentication Failed", "API key is invalid, expired, or account has restrictions. Please check your OpenRouter account and API key."
+        if status == 403:
+            return "Access Denied", "Your account doesn't have permission to access this service or model."
+        if status == 404:
+            return "Service Not Found", "The requested AI model or service is not available with your current account plan."
+        if status == 429:
+            return "Rate Limit Exceeded", "Too many requests. Please wait before trying again."
+        if status == 500:
+            return "AI Service Error", "The AI service is experiencing technical difficulties."
+        if status == 503:
+            return "Service Unavailable", "The AI service is temporarily unavailable."
+        return f"API Error {status}", f"Unexpected error from AI service: {response.text}"
+
+    def _parse_retry_after(self, response: requests.Response) -> Optional[float]:
+        """Return the Retry-After delay in seconds, if the provider sent one"""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            # HTTP-date form
+            try:
+                retry_at = parsedate_to_datetime(value)
+                return max(0.0, (retry_at - datetime.now(retry_at.tzinfo)).total_seconds())
+            except (TypeError, ValueError):
+                return None
+
+    def _make_streaming_request(self, messages: List[Dict], temperature: float = 0.7) -> Optional[requests.Response]:
+        """Open a streamed (server-sent events) completion request to OpenRouter"""
+        try:
+            payload = {
+                "model": self.model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": 4000,
+                "stream": True
+            }
+            # Short connect timeout, generous gap allowed between streamed chunks.
+            # Only time-to-headers is measured here; the body is consumed by the caller.
+            with track_external('openrouter'):
+                return requests.post(
+                    url=self.base_url,
+                    headers=self.headers,
+                    data=json.dumps(payload),
+                    stream=True,
+                    timeout=(10, 60)
+                )
+        except Exception as e:
+            logger.error(f"Error making streaming API request: {str(e)}")
+            return None
+
+    def _iter_stream_content(self, response: requests.Response) -> Iterator[str]:
+        """Yield content deltas from an OpenRouter SSE response"""
+        for line in response.iter_lines(decode_unicode=True):
+            # Blank lines separate events, lines starting with ':' are keep-alive comments
+            if not line or line.startswith(':'):
+                continue
+            if not line.startswith('data:'):
+                continue
+            data = line[5:].strip()
+            if data == '[DONE]':
+                break
+            try:
+                chunk = json.loads(data)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping malformed stream chunk: {data[:80]}")
+                continue
+            if 'error' in chunk:
+                raise RuntimeError(chunk['error'].get('message', 'Stream error'))
+            choices = chunk.get('choices') or []
+            if choices:
+                content = (choices[0].get('delta') or {}).get('content')
+                if content:
+                    yield content
+
+    def stream_project_matching_rationale(self, company_data: Dict, projects_data: List[Dict]) -> Iterator[Tuple[str, Any]]:
+        """
+        Stream a project matching rationale as (event, data) pairs
+        
+        Items of reasoningSteps, pros and options are yielded as soon as each one
+        is complete in the streamed completion. The last pair is always
+        ('complete', rationale) with the validated rationale, or a mock rationale
+        carrying error details if the stream could not be used.
+        """
+        prompt = self._create_project_matching_prompt(company_data, projects_data)
+        messages = self._build_rationale_messages(prompt, streaming=True)
+        parser = IncrementalRationaleParser()
+
+        response = self._make_streaming_request(messages, temperature=0.7)
+        if response is None:
+            yield from self._stream_fallback(company_data, projects_data, "Network Error", "Unable to connect to AI service. Please check your internet connection and try again.")
+            return
+
+        try:
+            if response.status_code != 200:
+                logger.warning(f"OpenRouter streaming request failed with status {response.status_code}")
+                error_reason, error_details = self._describe_http_error(response)
+                yield from self._stream_fallback(company_data, projects_data, error_reason, error_details)
+                return
+
+            emitted = 0
+            for content in self._iter_stream_content(response):
+                for key, item in parser.feed(content):
+                    emitted += 1
+                    yield key, item
+                if parser.complete:
+                    break
+
+            document = parser.document()
+            if not document:
+                yield from self._stream_fallback(company_data, projects_data, "Invalid AI Response", "The AI service returned an unexpected response format.", skip_items=emitted > 0)
+                return
+            rationale_data = self._validate_rationale_response(json.loads(document))
+            logger.info(f"Successfully streamed rationale for company {company_data.get('company_name', 'Unknown')}")
+            yield 'complete', rationale_data
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse streamed JSON response: {str(e)}")
+            yield from self._stream_fallback(company_data, projects_data, "AI Response Parsing Failed", "The AI generated a response but it couldn't be parsed properly. This may indicate an issue with the AI model's output format.", skip_items=True)
+        except Exception as e:
+            logger.error(f"Error in streamed rationale generation: {str(e)}")
+            yield from self._stream_fallback(company_data, projects_data, "AI Service Exception", f"Unexpected error occurred: {str(e)}", skip_items=True)
+        finally:
+            response.close()
+
+    def _stream_fallback(self, company_data: Dict, projects_data: List[Dict], error_reason: str, error_details: str, skip_items: bool = False) -> Iterator[Tuple[str, Any]]:
+        """Yield the mock rationale in the same event shape as a real stream"""
+        rationale_data = self._generate_mock_rationale_with_error(company_data, projects_data, error_reason, error_details)
+        yield 'error', rationale_data['error']
+        if not skip_items:
+            for key in ('reasoningSteps', 'pros', 'options'):
+                for item in rationale_data[key]:
+                    yield key, item
+        yield 'complete', rationale_data
+
     def _create_project_matching_prompt(self, company_data: Dict, projects_data: List[Dict]) -> str:
         """Create a detailed prompt for project matching analysis"""
         
         # Extract key company information
         company_name = company_data.get('company_name', 'Unknown Company')
         industry = company_data.get('industry', 'Unknown')
-        budget_amount = company_data.get('budget', {}).get('amount', 0)
-        budget_currency = company_data.get('budget', {}).get('currency', 'INR')
-        priority_sdgs = company_data.get('focus_area', {}).get('priority_sdgs', [])
-        esg_goals = company_data.get('focus_area', {}).get('esg_goals', '')
-        risk_appetite = company_data.get('ai_config', {}).get('risk_appetite', 'Medium')
+        budget_amount = (company_data.get('budget') or {}).get('amount', 0)
+        budget_currency = (company_data.get('budget') or {}).get('currency', 'INR')
+        priority_sdgs = (company_data.get('focus_area') or {}).get('priority_sdgs', [])
+        esg_goals = (company_data.get('focus_area') or {}).get('esg_goals', '')
+        risk_appetite = (company_data.get('ai_config') or {}).get('risk_appetite', 'Medium')
         
         # Format projects data
         projects_info = []
@@ -451,13 +580,23 @@ Please provide your analysis in the specified JSON format with detailed reasonin
             }
         }
 
-    def _generate_mock_rationale_with_error(self, company_data: Dict, projects_data: List[Dict], error_reason: str, error_details: str) -> Dict:
+    def _generate_mock_rationale_with_error(self, company_data: Dict, projects_data: List[Dict], error_reason: str, error_details: str,
+                                            status_code: Optional[int] = None, retry_after: Optional[float] = None) -> Dict:
         """Generate a mock rationale with specific error information"""
         logger.info(f"Generating mock AI rationale with error: {error_reason}")
         
         # Select the first project as default
         selected_project = projects_data[0] if projects_data else {}
         
+        error = {
+            "reason": error_reason,
+            "details": error_details
+        }
+        if status_code is not None:
+            error["status_code"] = status_code
+        if retry_after is not None:
+            error["retry_after"] = retry_after
+        
         return {
             "selectedProjectId": selected_project.get('id', 1),
             "confidenceScore": 0.85,
@@ -516,10 +655,7 @@ Please provide your analysis in the specified JSON format with detailed reasonin
                     "total": 0.8 + (i * 0.03)
                 } for i, project in enumerate(projects_data[:3], 1)
             },
-            "error": {
-                "reason": error_reason,
-                "details": error_details
-            }
+            "error": error
         }
 
 # Global instance
@@ -0,0 +1,351 @@
+"""
+Batch rationale generation across all companies.
+
+The nightly refresh used to call AIMatchingService.generate_project_matching_rationale
+once per company, serially. BatchMatchingRunner loads the inputs up front, fans the
+LLM calls out over a bounded thread pool behind a shared token bucket, and writes the
+results back in bulk. Progress is checkpointed to a JSON file after every flush so an
+interrupted run picks up where it stopped.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, insert
+
+from ai_models.ai_matching_service import AIMatchingService
+from ai_models.ai_model import ai_model
+from models.ai_matching import AIMatch
+from models.base import db
+from models.company_details import Company
+from models.rationale import DecisionRationale
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying; anything else falls through as a failed company
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503}
+
+DEFAULT_CHECKPOINT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance', 'batch_matching_checkpoint.json'
+)
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by all workers of a batch run"""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[int] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or max(1, int(rate_per_minute // 6) or 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for `seconds`, e.g. after a 429 with Retry-After"""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+
+class BatchCheckpoint:
+    """JSON checkpoint of completed and failed companies for one run"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.state = None
+
+    def read(self) -> Optional[Dict]:
+        """The saved checkpoint as-is, finished or not; None if there is none"""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path) as fh:
+                return json.load(fh)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return None
+
+    def load(self, resume: bool = True) -> Dict:
+        """State for a run: the unfinished saved run when resuming, otherwise a fresh one"""
+        state = self.read() if resume else None
+        if not state or state.get('finished_at'):
+            state = {
+                'run_id': uuid.uuid4().hex,
+                'started_at': datetime.utcnow().isoformat(),
+                'finished_at': None,
+                'completed': [],
+                'failed': {},
+            }
+        self.state = state
+        return state
+
+    @property
+    def completed(self) -> set:
+        return set(self.state['completed'])
+
+    def record(self, succeeded: Iterable[int], failed: Dict[int, str]):
+        completed = self.completed
+        completed.update(succeeded)
+        self.state['completed'] = sorted(completed)
+        for company_id in succeeded:
+            self.state['failed'].pop(str(company_id), None)
+        for company_id, reason in failed.items():
+            self.state['failed'][str(company_id)] = reason
+
+    def finish(self):
+        self.state['finished_at'] = datetime.utcnow().isoformat()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as fh:
+            json.dump(self.state, fh, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class BatchMatchingRunner:
+    """Generate and persist rationales for many companies concurrently"""
+
+    def __init__(self, max_workers: int = 4, requests_per_minute: float = 20,
+                 checkpoint_path: str = DEFAULT_CHECKPOINT_PATH, project_filters: Dict = None,
+                 max_retries: int = 3, flush_every: int = 10, created_by: int = 1):
+        self.max_workers = max_workers
+        self.bucket = TokenBucket(requests_per_minute)
+        self.checkpoint = BatchCheckpoint(checkpoint_path)
+        self.project_filters = project_filters or {}
+        self.max_retries = max_retries
+        self.flush_every = flush_every
+        self.created_by = created_by
+
+    def run(self, company_ids: Optional[List[int]] = None, resume: bool = True) -> Dict:
+        """Run the batch; must be called inside an application context"""
+        started = time.monotonic()
+        state = self.checkpoint.load(resume=resume)
+        done = self.checkpoint.completed
+
+        if company_ids is None:
+            company_ids = [row[0] for row in db.session.query(Company.id).order_by(Company.id).all()]
+        pending = [cid for cid in company_ids if cid not in done]
+
+        summary = {
+            'run_id': state['run_id'],
+            'total': len(company_ids),
+            'skipped': len(company_ids) - len(pending),
+            'succeeded': 0,
+            'failed': 0,
+            'rationales_written': 0,
+            'matches_written': 0,
+        }
+
+        projects_data = AIMatchingService.get_available_projects(self.project_filters)
+        if not projects_data:
+            logger.warning("No projects available for batch matching")
+            summary['duration_seconds'] = round(time.monotonic() - started, 2)
+            return summary
+        projects_by_id = {p['id']: p for p in projects_data}
+
+        # Gather company inputs on this thread; workers never touch the session
+        inputs = {}
+        for company_id in pending:
+            company_data = AIMatchingService.get_company_data(company_id)
+            if company_data:
+                inputs[company_id] = company_data
+            else:
+                self.checkpoint.record([], {company_id: 'Company not found'})
+                summary['failed'] += 1
+
+        logger.info(f"Batch run {state['run_id']}: {len(inputs)} companies pending, {summary['skipped']} already done")
+
+        buffer = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._generate, company_data, projects_data): company_id
+                for company_id, company_data in inputs.items()
+            }
+            for future in as_completed(futures):
+                company_id = futures[future]
+                try:
+                    rationale_data, error = future.result()
+                except Exception as e:
+                    rationale_data, error = None, str(e)
+                if error:
+                    logger.warning(f"Batch matching failed for company {company_id}: {error}")
+                    self.checkpoint.record([], {company_id: error})
+                    summary['failed'] += 1
+                else:
+                    buffer.append((company_id, rationale_data))
+                if len(buffer) >= self.flush_every:
+                    self._flush(buffer, projects_by_id, summary)
+                    buffer = []
+        self._flush(buffer, projects_by_id, summary)
+
+        if not state['failed']:
+            self.checkpoint.finish()
+        self.checkpoint.save()
+        summary['duration_seconds'] = round(time.monotonic() - started, 2)
+        logger.info(f"Batch run {state['run_id']} finished: {summary}")
+        return summary
+
+    def _generate(self, company_data: Dict, projects_data: List[Dict]):
+        """Worker: call the model with rate limiting and retries; returns (rationale, error)"""
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            rationale_data = ai_model.generate_project_matching_rationale(company_data, projects_data)
+            error = (rationale_data or {}).get('error')
+            if rationale_data and not error:
+                return rationale_data, None
+            if not error:
+                return None, 'No rationale returned'
+            if error.get('status_code') not in RETRYABLE_STATUS_CODES or attempt == self.max_retries:
+                return None, error.get('reason', 'Unknown error')
+            wait = error.get('retry_after')
+            if wait is None:
+                wait = 2 ** attempt
+            logger.info(f"Retrying {company_data.get('company_name')} in {wait}s after {error.get('reason')}")
+            self.bucket.pause(wait)
+        return None, 'Retries exhausted'
+
+    def _flush(self, results: List, projects_by_id: Dict, summary: Dict):
+        """Bulk insert rationales and matches for a group of companies, then checkpoint"""
+        if not results:
+            return
+        now = datetime.utcnow()
+        rationale_rows = []
+        match_rows = []
+        for company_id, rationale_data in results:
+            rationale_rows.append({
+                'company_id': company_id,
+                'project_id': _as_int(rationale_data.get('selectedProjectId')),
+                'title': (rationale_data.get('title') or 'AI-Generated Project Matching Analysis')[:200],
+                'context': rationale_data.get('context', {}),
+                'criteria': rationale_data.get('criteria', {}),
+                'options': rationale_data.get('options', []),
+                'selected_option': rationale_data.get('selectedOption'),
+                'pros': rationale_data.get('pros', []),
+                'cons': rationale_data.get('cons', []),
+                'reasoning_steps': rationale_data.get('reasoningSteps', []),
+                'score_breakdown': rationale_data.get('scoreBreakdown', {}),
+                'created_by': self.created_by,
+                'created_at': now,
+                'updated_at': now,
+            })
+            match_rows.extend(_match_rows(company_id, rationale_data, projects_by_id, now))
+
+        try:
+            db.session.execute(insert(DecisionRationale), rationale_rows)
+            for company_id in {row['company_id'] for row in match_rows}:
+                project_ids = [row['project_id'] for row in match_rows if row['company_id'] == company_id]
+                db.session.execute(
+                    delete(AIMatch).where(AIMatch.company_id == company_id, AIMatch.project_id.in_(project_ids))
+                )
+            if match_rows:
+                db.session.execute(insert(AIMatch), match_rows)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error writing batch results: {str(e)}")
+            self.checkpoint.record([], {company_id: f"Write failed: {e}" for company_id, _ in results})
+            summary['failed'] += len(results)
+            self.checkpoint.save()
+            return
+
+        self.checkpoint.record([company_id for company_id, _ in results], {})
+        self.checkpoint.save()
+        summary['succeeded'] += len(results)
+        summary['rationales_written'] += len(rationale_rows)
+        summary['matches_written'] += len(match_rows)
+
+
+def _as_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _match_rows(company_id: int, rationale_data: Dict, projects_by_id: Dict, now: datetime) -> List[Dict]:
+    """Turn the scored options of a rationale into AIMatch rows"""
+    rows = {}
+    for option in rationale_data.get('options') or []:
+        data = option.get('data') or {}
+        project_id = _as_int(data.get('projectId', option.get('key')))
+        project = projects_by_id.get(project_id)
+        if not project:
+            continue
+        try:
+            score = float(data.get('score') or 0)
+        except (TypeError, ValueError):
+            score = 0.0
+        location = ', '.join(p for p in [project.get('location_city'), project.get('location_region'), project.get('location_country')] if p)
+        rows[project_id] = {
+            'company_id': company_id,
+            'project_id': project_id,
+            'alignment_score': int(round(max(0.0, min(1.0, score)) * 100)),
+            'investment_min': None,
+            'investment_max': project.get('funding_required'),
+            'investment_currency': project.get('currency'),
+            'timeline_months': project.get('duration_months'),
+            'location_text': location or None,
+            'tags': None,
+            'rationale': '; '.join(data.get('strengths') or []) or None,
+            'source': 'llm',
+            'created_at': now,
+        }
+    return list(rows.values())
+
+
+_background_lock = threading.Lock()
+_background_thread = None
+
+
+def start_background_run(app, company_ids: Optional[List[int]] = None, resume: bool = True, **runner_options) -> bool:
+    """Start a batch run on a daemon thread; returns False if one is already running"""
+    global _background_thread
+    with _background_lock:
+        if _background_thread and _background_thread.is_alive():
+            return False
+
+        def target():
+            with app.app_context():
+                try:
+                    BatchMatchingRunner(**runner_options).run(company_ids=company_ids, resume=resume)
+                except Exception as e:
+                    logger.error(f"Background batch run failed: {str(e)}")
+                finally:
+                    db.session.remove()
+
+        _background_thread = threading.Thread(target=target, name='batch-matching', daemon=True)
+        _background_thread.start()
+        return True
+
+
+def background_run_status(checkpoint_path: str = DEFAULT_CHECKPOINT_PATH) -> Dict:
+    """Report whether a run is active along with the last checkpoint contents"""
+    return {
+        'running': bool(_background_thread and _background_thread.is_alive()),
+        'checkpoint': BatchCheckpoint(checkpoint_path).read(),
+    }
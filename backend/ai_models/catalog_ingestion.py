@@ -0,0 +1,443 @@
+"""
+Incremental ingestion of external NGO/project catalogs.
+
+CatalogIngestor fetches every configured source concurrently on one asyncio
+event loop, with a semaphore bounding the requests in flight across all sources.
+Pages within a source are walked in order by following the cursor each page
+returns. Every page request carries the ETag/Last-Modified validators stored
+from the previous sync; a 304 skips the page and follows the cursor remembered
+for it, so an unchanged catalog costs one round trip per page and no writes.
+
+Records from changed pages are mapped to Project or NGOProfile columns and
+hashed. CatalogRecord links each external id to its local row together with the
+hash, so only new records are inserted and only records whose hash changed are
+updated - one bulk insert and one bulk update per page. Bulk statements skip
+the flush hooks, so written NGOs get their summary rows refreshed in the same
+transaction and written projects are queued for a rule-based match refresh.
+A page's writes and its new validators are committed together, so an
+interrupted sync resumes from the pages that did not commit. A failing source
+is rolled back and reported without affecting the others.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+from flask import current_app, has_app_context
+from sqlalchemy import and_, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from ai_models.match_materializer import queue_project_refresh
+from models.base import db
+from models.catalog import CatalogRecord, CatalogSyncState
+from models.ngo_marketplace import NGOProfile
+from models.ngo_summary import refresh_bulk_written
+from models.projects import Project
+from models.user import User
+
+logger = logging.getLogger(__name__)
+
+PROJECT = 'project'
+NGO = 'ngo'
+
+# Keeps IN (...) lists under SQLite's bound-parameter limit
+CHUNK_SIZE = 900
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+@dataclass
+class CatalogSource:
+    """One paged JSON endpoint listing projects or NGOs"""
+    name: str
+    url: str
+    kind: str = PROJECT
+    items_key: str = 'items'
+    cursor_key: str = 'next_cursor'
+    cursor_param: str = 'cursor'
+    default_country: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CatalogSource':
+        source = cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+        if source.kind not in (PROJECT, NGO):
+            raise ValueError(f"Unknown catalog kind '{source.kind}' for source {source.name}")
+        return source
+
+
+def default_sources(endpoints: Dict[str, str]) -> List[CatalogSource]:
+    """Sources for the DiscoveryAgent endpoints that publish projects and NGOs"""
+    sources = []
+    if endpoints.get('ngo_darpan'):
+        base = endpoints['ngo_darpan'].rstrip('/')
+        sources.append(CatalogSource('ngo_darpan.ngos', f"{base}/ngos", kind=NGO, default_country='India'))
+        sources.append(CatalogSource('ngo_darpan.projects', f"{base}/projects", default_country='India'))
+    if endpoints.get('sustainability_platforms'):
+        base = endpoints['sustainability_platforms'].rstrip('/')
+        sources.append(CatalogSource('sustainability_platforms.projects', f"{base}/projects"))
+    return sources
+
+
+# Record mapping -------------------------------------------------------------------
+
+def _text(value, limit: Optional[int] = None) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    if not text:
+        return None
+    return text[:limit] if limit else text
+
+
+def _number(value) -> Optional[float]:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(str(value).replace(',', ''))
+    except (TypeError, ValueError):
+        return None
+
+
+def _int(value) -> Optional[int]:
+    number = _number(value)
+    return int(number) if number is not None else None
+
+
+def _date(value) -> Optional[date]:
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except (TypeError, ValueError):
+        return None
+
+
+def _list(value) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    return [str(v).strip() for v in value if str(v).strip()]
+
+
+def _sdgs(value) -> List[int]:
+    goals = []
+    for item in _list(value):
+        goal = _int(item.upper().replace('SDG', ''))
+        if goal and 1 <= goal <= 17 and goal not in goals:
+            goals.append(goal)
+    return goals
+
+
+def map_project(record: Dict, source: CatalogSource) -> Optional[Dict]:
+    """Project columns for a catalog record, or None if required fields are missing"""
+    title = _text(record.get('title') or record.get('name'), 255)
+    description = _text(record.get('description') or record.get('short_description'))
+    ngo_name = _text(record.get('ngo_name'), 255)
+    country = _text(record.get('country') or source.default_country, 100)
+    total_cost = _number(record.get('total_cost', record.get('budget')))
+    start_date, end_date = _date(record.get('start_date')), _date(record.get('end_date'))
+    if not (title and description and ngo_name and country and total_cost is not None and start_date and end_date):
+        return None
+    funding_required = _number(record.get('funding_required'))
+    return {
+        'title': title,
+        'short_description': description,
+        'ngo_name': ngo_name,
+        'location_city': _text(record.get('city'), 100),
+        'location_region': _text(record.get('region') or record.get('state'), 100),
+        'location_country': country,
+        'sdg_goals': json.dumps(_sdgs(record.get('sdgs'))),
+        'csr_focus_areas': json.dumps(_list(record.get('focus_areas') or record.get('sector'))),
+        'total_project_cost': total_cost,
+        'funding_required': funding_required if funding_required is not None else total_cost,
+        'currency': _text(record.get('currency'), 10) or 'INR',
+        'start_date': start_date,
+        'end_date': end_date,
+        'duration_months': (end_date - start_date).days // 30 + 1,
+        'ngo_registration_number': _text(record.get('ngo_registration_number'), 100),
+        'status': 'published',
+        'visibility': 'public',
+    }
+
+
+def map_ngo(record: Dict, source: CatalogSource) -> Optional[Dict]:
+    """NGOProfile columns for a catalog record, or None if required fields are missing"""
+    name = _text(record.get('name'), 255)
+    country = _text(record.get('country') or source.default_country, 100)
+    if not (name and country):
+        return None
+    rating = _int(record.get('rating'))
+    return {
+        'name': name,
+        'registration_number': _text(record.get('registration_number'), 100),
+        'legal_status': _text(record.get('legal_status'), 100),
+        'year_established': _int(record.get('year_established')),
+        'city': _text(record.get('city'), 100),
+        'state': _text(record.get('state'), 100),
+        'country': country,
+        'email': _text(record.get('email'), 255),
+        'phone': _text(record.get('phone'), 50),
+        'website': _text(record.get('website'), 255),
+        'primary_sectors': json.dumps(_list(record.get('sectors'))),
+        'sdg_focus': json.dumps(_sdgs(record.get('sdgs'))),
+        'geographic_focus': json.dumps(_list(record.get('regions'))),
+        'rating': rating if rating and 1 <= rating <= 5 else None,
+        'verification_badge': _text(record.get('verification_badge'), 50),
+        'annual_budget': _number(record.get('annual_budget')),
+        'about': _text(record.get('about')),
+    }
+
+
+MAPPERS: Dict[str, Tuple[type, Callable]] = {
+    PROJECT: (Project, map_project),
+    NGO: (NGOProfile, map_ngo),
+}
+
+
+def content_hash(fields: Dict) -> str:
+    return hashlib.sha256(json.dumps(fields, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def _chunks(values: List, size: int = CHUNK_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+# Ingestion ------------------------------------------------------------------------
+
+class CatalogIngestor:
+    """Fetches catalog sources concurrently and upserts what changed"""
+
+    def __init__(self, sources: Iterable[CatalogSource], max_concurrency: int = 4, timeout: float = 30.0,
+                 max_retries: int = 2, import_user_id: Optional[int] = None, client_factory: Callable = None):
+        self.sources = [s if isinstance(s, CatalogSource) else CatalogSource.from_dict(s) for s in sources]
+        names = [s.name for s in self.sources]
+        if len(names) != len(set(names)):
+            raise ValueError('Catalog source names must be unique')
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.max_retries = max(0, max_retries)
+        self.import_user_id = import_user_id
+        self.client_factory = client_factory or (lambda: httpx.AsyncClient(timeout=self.timeout, follow_redirects=True))
+
+    def sync(self, session: Session = None) -> Dict:
+        """Run one sync of every source and return a per-source summary"""
+        started = time.perf_counter()
+        results = asyncio.run(self._sync_all(session or db.session))
+        summary = {
+            'sources': results,
+            'inserted': sum(r['inserted'] for r in results.values()),
+            'updated': sum(r['updated'] for r in results.values()),
+            'unchanged': sum(r['unchanged'] for r in results.values()),
+            'failed': sum(1 for r in results.values() if r['error']),
+            'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+        }
+        logger.info(f"Catalog sync: {summary}")
+        return summary
+
+    async def _sync_all(self, session: Session) -> Dict[str, Dict]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self.client_factory() as client:
+            results = await asyncio.gather(*(self._sync_source(client, semaphore, session, s) for s in self.sources))
+        return {source.name: result for source, result in zip(self.sources, results)}
+
+    async def _sync_source(self, client, semaphore: asyncio.Semaphore, session: Session, source: CatalogSource) -> Dict:
+        result = {'pages': 0, 'not_modified': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0, 'invalid': 0, 'error': None}
+        try:
+            state = session.get(CatalogSyncState, source.name)
+            pages = dict(state.pages or {}) if state else {}
+            seen = set()
+            cursor = ''
+            while cursor is not None and cursor not in seen:
+                seen.add(cursor)
+                validators = pages.get(cursor) or {}
+                response = await self._fetch(client, semaphore, source, cursor, validators)
+                result['pages'] += 1
+                if response.status_code == 304:
+                    result['not_modified'] += 1
+                    cursor = validators.get('nextCursor')
+                    continue
+                payload = response.json()
+                next_cursor = payload.get(source.cursor_key) or None
+                pages[cursor] = {
+                    'etag': response.headers.get('ETag'),
+                    'lastModified': response.headers.get('Last-Modified'),
+                    'nextCursor': next_cursor,
+                }
+                counts = self.apply_records(session, source, payload.get(source.items_key) or [])
+                for key, value in counts.items():
+                    result[key] += value
+                self._save_state(session, source.name, pages)
+                session.commit()
+                cursor = next_cursor
+            if cursor is not None:
+                logger.warning(f"Catalog source {source.name} returned a cursor loop at '{cursor}'")
+        except Exception as e:
+            session.rollback()
+            result['error'] = str(e)
+            logger.error(f"Catalog sync failed for {source.name}: {str(e)}")
+        return result
+
+    async def _fetch(self, client, semaphore: asyncio.Semaphore, source: CatalogSource, cursor: str, validators: Dict):
+        headers = {'Accept': 'application/json'}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('lastModified'):
+            headers['If-Modified-Since'] = validators['lastModified']
+        params = {source.cursor_param: cursor} if cursor else None
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with semaphore:
+                    response = await client.get(source.url, params=params, headers=headers)
+                if response.status_code not in RETRY_STATUSES:
+                    if response.status_code != 304:
+                        response.raise_for_status()
+                    return response
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    raise
+            else:
+                if attempt == self.max_retries:
+                    response.raise_for_status()
+            await asyncio.sleep(0.5 * 2 ** attempt)
+
+    def _save_state(self, session: Session, name: str, pages: Dict):
+        state = session.get(CatalogSyncState, name)
+        if state is None:
+            state = CatalogSyncState(source=name)
+            session.add(state)
+        state.pages = pages
+        state.last_synced_at = datetime.utcnow()
+
+    # Upserts --------------------------------------------------------------------------
+
+    def apply_records(self, session: Session, source: CatalogSource, records: List[Dict]) -> Dict[str, int]:
+        """Insert new records and update changed ones; unchanged records cost no writes"""
+        model, mapper = MAPPERS[source.kind]
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'invalid': 0}
+        mapped: Dict[str, Tuple[Dict, str]] = {}
+        for record in records:
+            external_id = _text(record.get('id') if isinstance(record, dict) else None, 128)
+            fields = mapper(record, source) if external_id else None
+            if fields is None:
+                counts['invalid'] += 1
+                continue
+            mapped[external_id] = (fields, content_hash(fields))
+        if not mapped:
+            return counts
+
+        links = {}
+        for chunk in _chunks(list(mapped)):
+            for link_id, external_id, local_id, digest in session.execute(
+                select(CatalogRecord.id, CatalogRecord.external_id, CatalogRecord.local_id, CatalogRecord.content_hash)
+                .where(CatalogRecord.source == source.name, CatalogRecord.kind == source.kind,
+                       CatalogRecord.external_id.in_(chunk))
+            ):
+                links[external_id] = (link_id, local_id, digest)
+
+        now = datetime.utcnow()
+        new = [eid for eid in mapped if eid not in links]
+        adopted = self._match_existing_ngos(session, {eid: mapped[eid][0] for eid in new}) if source.kind == NGO else {}
+        to_insert = [eid for eid in new if eid not in adopted]
+        changed = [eid for eid, (_, digest) in mapped.items() if eid in links and links[eid][2] != digest]
+        counts['unchanged'] = len(mapped) - len(new) - len(changed)
+
+        if to_insert:
+            extra = {'created_by': self._import_user_id(session), 'created_at': now} if model is Project else {'created_at': now}
+            rows = [{**mapped[eid][0], **extra, 'updated_at': now} for eid in to_insert]
+            local_ids = session.execute(
+                insert(model).returning(model.id, sort_by_parameter_order=True), rows
+            ).scalars().all()
+            session.execute(insert(CatalogRecord), [
+                {'source': source.name, 'kind': source.kind, 'external_id': eid, 'local_id': local_id,
+                 'content_hash': mapped[eid][1], 'synced_at': now, 'created_at': now}
+                for eid, local_id in zip(to_insert, local_ids)
+            ])
+        if adopted:
+            session.execute(insert(CatalogRecord), [
+                {'source': source.name, 'kind': source.kind, 'external_id': eid, 'local_id': local_id,
+                 'content_hash': mapped[eid][1], 'synced_at': now, 'created_at': now}
+                for eid, local_id in adopted.items()
+            ])
+        updates = [(eid, links[eid][1]) for eid in changed] + list(adopted.items())
+        if updates:
+            session.execute(update(model), [{**mapped[eid][0], 'id': local_id, 'updated_at': now} for eid, local_id in updates])
+        if changed:
+            session.execute(update(CatalogRecord), [
+                {'id': links[eid][0], 'content_hash': mapped[eid][1], 'synced_at': now} for eid in changed
+            ])
+        counts['inserted'] = len(to_insert)
+        counts['updated'] = len(updates)
+        # Bulk statements skip the flush hooks that keep derived rows current
+        written = [local_id for _, local_id in updates] + (local_ids if to_insert else [])
+        if written and model is Project:
+            queue_project_refresh(session, written)
+        elif written:
+            refresh_bulk_written(session, written)
+        return counts
+
+    def _match_existing_ngos(self, session: Session, new: Dict[str, Dict]) -> Dict[str, int]:
+        """Link unseen NGO records to profiles that already exist under the same registration number or name"""
+        adopted = {}
+        if not new:
+            return adopted
+        by_registration = {f['registration_number']: eid for eid, f in new.items() if f.get('registration_number')}
+        by_name = {f['name']: eid for eid, f in new.items()}
+        for chunk in _chunks(list(new)):
+            registrations = [new[eid]['registration_number'] for eid in chunk if new[eid].get('registration_number')]
+            names = [new[eid]['name'] for eid in chunk]
+            conditions = [NGOProfile.name.in_(names)]
+            if registrations:
+                conditions.append(NGOProfile.registration_number.in_(registrations))
+            for profile_id, name, registration in session.execute(
+                select(NGOProfile.id, NGOProfile.name, NGOProfile.registration_number).where(or_(*conditions))
+            ):
+                eid = by_registration.get(registration) or by_name.get(name)
+                if eid and eid not in adopted:
+                    adopted[eid] = profile_id
+        # Two records for the same NGO in one page would violate the unique name
+        seen_names = set()
+        for eid, fields in new.items():
+            if eid in adopted:
+                continue
+            if fields['name'] in seen_names:
+                raise ValueError(f"Duplicate NGO name '{fields['name']}' in catalog page")
+            seen_names.add(fields['name'])
+        return adopted
+
+    def _import_user_id(self, session: Session) -> int:
+        """Owner of imported projects: the configured user, else the first admin or user"""
+        if self.import_user_id is None and has_app_context():
+            self.import_user_id = current_app.config.get('CATALOG_IMPORT_USER_ID')
+        if self.import_user_id is None:
+            self.import_user_id = session.execute(
+                select(User.id).order_by((User.role == 'admin').desc(), User.id).limit(1)
+            ).scalar()
+        if self.import_user_id is None:
+            raise ValueError('No user to own imported projects; set CATALOG_IMPORT_USER_ID')
+        return self.import_user_id
+
+
+def imported_projects(session: Session = None, query: Optional[str] = None, limit: Optional[int] = None) -> List[Tuple]:
+    """(external id, Project) pairs for imported projects, optionally text-searched in SQL"""
+    session = session or db.session
+    statement = (
+        select(CatalogRecord.external_id, Project)
+        .join(Project, and_(CatalogRecord.kind == PROJECT, CatalogRecord.local_id == Project.id))
+        .order_by(Project.id)
+    )
+    if query:
+        pattern = f"%{query}%"
+        statement = statement.where(or_(
+            Project.title.ilike(pattern), Project.short_description.ilike(pattern), Project.ngo_name.ilike(pattern)
+        ))
+    if limit:
+        statement = statement.limit(limit)
+    return [tuple(row) for row in session.execute(statement)]
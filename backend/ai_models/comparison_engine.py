@@ -0,0 +1,260 @@
+"""
+Multi-criteria comparison of projects.
+
+load_criteria() bulk-loads the compared projects (one query, plus one for the
+company's alignment scores) into a CriteriaMatrix: one row per project, one
+column per criterion. All scoring then happens on the NumPy matrix in one pass -
+min-max normalization, weighted scores, rankings, Pareto dominance and the gap to
+the best value of each criterion. Re-ranking with different weights reuses the
+normalized matrix, and the analysis returns it so clients can do the same locally.
+
+Criteria and their direction:
+
+    cost             funding_required                                    lower is better
+    impact           SDGs + beneficiary groups + expected outcome metrics higher is better
+    risk             NGO compliance gaps and share of the cost unfunded  lower is better
+    alignment        AIMatch.alignment_score for the company (optional)  higher is better
+    ngo_credibility  NGO rating, verification and track record           higher is better
+    duration         duration_months                                     lower is better
+"""
+
+import json
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import select
+
+from models.ai_matching import AIMatch
+from models.base import db
+from models.projects import Project
+
+# (name, +1 when higher is better / -1 when lower is better)
+CRITERIA = (
+    ('cost', -1),
+    ('impact', 1),
+    ('risk', -1),
+    ('alignment', 1),
+    ('ngo_credibility', 1),
+    ('duration', -1),
+)
+CRITERIA_NAMES = tuple(name for name, _ in CRITERIA)
+DIRECTIONS = np.array([direction for _, direction in CRITERIA], dtype=float)
+
+DEFAULT_WEIGHTS = {
+    'cost': 1.0,
+    'impact': 1.5,
+    'risk': 1.0,
+    'alignment': 1.5,
+    'ngo_credibility': 1.0,
+    'duration': 0.5,
+}
+
+_PROJECT_COLUMNS = (
+    Project.id, Project.title, Project.funding_required, Project.total_project_cost,
+    Project.duration_months, Project.sdg_goals, Project.target_beneficiaries, Project.expected_outcomes,
+    Project.ngo_rating, Project.ngo_verification_badge, Project.ngo_80g_status, Project.ngo_fcra_status,
+    Project.past_projects_completed,
+)
+
+
+def _json_len(value) -> int:
+    if not value:
+        return 0
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return 0
+    return len(value) if isinstance(value, (list, dict)) else 0
+
+
+def _number(value) -> float:
+    return float(value) if value is not None else np.nan
+
+
+def project_criteria(row, alignment: Optional[float] = None) -> List[float]:
+    """Raw criterion values for one project row (NaN where unknown)"""
+    funding = _number(row.funding_required)
+    total = _number(row.total_project_cost)
+
+    risk = 0.0
+    if (row.ngo_verification_badge or '').lower() != 'verified':
+        risk += 0.3
+    if (row.ngo_80g_status or '').lower() != 'valid':
+        risk += 0.15
+    if (row.ngo_fcra_status or '').lower() not in ('valid', 'not required'):
+        risk += 0.15
+    if total and total > 0 and not np.isnan(funding):
+        # Projects still needing most of their budget are more likely to stall
+        risk += 0.4 * min(max(funding / total, 0.0), 1.0)
+
+    credibility = np.nan
+    if row.ngo_rating is not None or row.ngo_verification_badge or row.past_projects_completed:
+        credibility = (
+            (row.ngo_rating or 0) / 5 * 0.6
+            + (0.25 if (row.ngo_verification_badge or '').lower() == 'verified' else 0.0)
+            + min(row.past_projects_completed or 0, 20) / 20 * 0.15
+        )
+
+    return [
+        funding,
+        float(_json_len(row.sdg_goals) + _json_len(row.target_beneficiaries) + _json_len(row.expected_outcomes)),
+        risk,
+        _number(alignment),
+        credibility,
+        _number(row.duration_months),
+    ]
+
+
+class CriteriaMatrix:
+    """Criterion values of a set of projects and the scoring done on them"""
+
+    def __init__(self, project_ids: List[int], titles: List[str], values: np.ndarray):
+        self.project_ids = list(project_ids)
+        self.titles = list(titles)
+        self.values = np.asarray(values, dtype=float).reshape(len(self.project_ids), len(CRITERIA))
+        # Criteria with no data for any project take no part in the scoring
+        self.available = ~np.isnan(self.values).all(axis=0)
+        self.normalized = self._normalize()
+
+    def __len__(self):
+        return len(self.project_ids)
+
+    def _normalize(self) -> np.ndarray:
+        """Scale each criterion to 0..1 where 1 is best; unknown values score 0.5"""
+        values = self.values
+        if not len(self):
+            return np.empty_like(values)
+        with np.errstate(all='ignore'):
+            low = np.nanmin(np.where(self.available, values, 0.0), axis=0)
+            high = np.nanmax(np.where(self.available, values, 0.0), axis=0)
+            span = high - low
+            scaled = np.where(span > 0, (values - low) / np.where(span > 0, span, 1.0), 1.0)
+        scaled = np.where(DIRECTIONS > 0, scaled, 1.0 - np.where(span > 0, scaled, 0.0))
+        return np.where(np.isnan(values), 0.5, scaled)
+
+    def weight_vector(self, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Weights in criterion order, zeroed for unavailable criteria and summing to 1"""
+        merged = dict(DEFAULT_WEIGHTS)
+        for name, weight in (weights or {}).items():
+            if name not in merged:
+                raise ValueError(f"Unknown criterion: {name}")
+            weight = float(weight)
+            if weight < 0 or np.isnan(weight):
+                raise ValueError(f"Weight for {name} must be a non-negative number")
+            merged[name] = weight
+        vector = np.array([merged[name] for name in CRITERIA_NAMES]) * self.available
+        total = vector.sum()
+        return vector / total if total > 0 else vector
+
+    def scores(self, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Weighted score per project on a 0-100 scale"""
+        return self.normalized @ self.weight_vector(weights) * 100
+
+    def rank(self, weights: Optional[Dict[str, float]] = None) -> List[Dict]:
+        """Projects ordered by weighted score; reuses the normalized matrix"""
+        scores = self.scores(weights)
+        # Stable sort keeps the input order for ties
+        order = np.argsort(-scores, kind='stable')
+        return [
+            {'rank': position + 1, 'projectId': self.project_ids[i], 'score': round(float(scores[i]), 2)}
+            for position, i in enumerate(order)
+        ]
+
+    def dominance(self) -> np.ndarray:
+        """dominance[i, j] is True when project i Pareto-dominates project j"""
+        oriented = self.normalized[:, self.available]
+        better_or_equal = (oriented[:, None, :] >= oriented[None, :, :]).all(axis=2)
+        strictly_better = (oriented[:, None, :] > oriented[None, :, :]).any(axis=2)
+        return better_or_equal & strictly_better
+
+    def deltas(self) -> np.ndarray:
+        """Raw gap to the best value of each criterion (always >= 0, NaN when unknown)"""
+        with np.errstate(all='ignore'):
+            if not len(self):
+                return np.empty_like(self.values)
+            best_high = np.nanmax(np.where(self.available, self.values, 0.0), axis=0)
+            best_low = np.nanmin(np.where(self.available, self.values, 0.0), axis=0)
+        return np.where(DIRECTIONS > 0, best_high - self.values, self.values - best_low)
+
+    def analyze(self, weights: Optional[Dict[str, float]] = None) -> Dict:
+        """Scores, ranking, Pareto front and per-criterion deltas in one pass"""
+        weight_vector = self.weight_vector(weights)
+        scores = self.normalized @ weight_vector * 100
+        order = np.argsort(-scores, kind='stable')
+        ranks = np.empty(len(self), dtype=int)
+        ranks[order] = np.arange(1, len(self) + 1)
+        dominance = self.dominance()
+        dominated_by = dominance.sum(axis=0)
+        deltas = self.deltas()
+
+        projects = []
+        for i in order:
+            projects.append({
+                'projectId': self.project_ids[i],
+                'title': self.titles[i],
+                'rank': int(ranks[i]),
+                'score': round(float(scores[i]), 2),
+                'paretoOptimal': bool(dominated_by[i] == 0),
+                'dominatedBy': [self.project_ids[j] for j in np.flatnonzero(dominance[:, i])],
+                'dominates': int(dominance[i].sum()),
+                'criteria': {
+                    name: {
+                        'value': _clean(self.values[i, c]),
+                        'normalized': round(float(self.normalized[i, c]), 4),
+                        'deltaToBest': _clean(deltas[i, c]),
+                    }
+                    for c, name in enumerate(CRITERIA_NAMES) if self.available[c]
+                },
+            })
+
+        return {
+            'criteria': [
+                {'name': name, 'direction': 'higher' if direction > 0 else 'lower', 'weight': round(float(w), 4)}
+                for (name, direction), w, available in zip(CRITERIA, weight_vector, self.available) if available
+            ],
+            'projects': projects,
+            'paretoFront': [self.project_ids[i] for i in order if dominated_by[i] == 0],
+            # Row per project in input order, column per criterion above, for client-side re-ranking
+            'projectOrder': self.project_ids,
+            'normalized': np.round(self.normalized[:, self.available], 4).tolist(),
+        }
+
+
+def _clean(value) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 4)
+
+
+def load_criteria(project_ids: Iterable[int], company_id: Optional[int] = None) -> CriteriaMatrix:
+    """Bulk-load the projects (in the order given) into a criteria matrix.
+
+    Unknown ids are skipped. Alignment comes from the company's stored AI match
+    scores and is left out when no company is given.
+    """
+    project_ids = list(dict.fromkeys(int(i) for i in project_ids))
+    rows = {}
+    if project_ids:
+        result = db.session.execute(select(*_PROJECT_COLUMNS).where(Project.id.in_(project_ids)))
+        rows = {row.id: row for row in result}
+
+    alignment = {}
+    if company_id is not None and rows:
+        result = db.session.execute(
+            select(AIMatch.project_id, AIMatch.alignment_score)
+            .where(AIMatch.company_id == company_id, AIMatch.project_id.in_(list(rows)))
+        )
+        for project_id, score in result:
+            alignment[project_id] = max(score, alignment.get(project_id, score))
+
+    return build_matrix([rows[i] for i in project_ids if i in rows], alignment)
+
+
+def build_matrix(rows, alignment: Optional[Dict[int, float]] = None) -> CriteriaMatrix:
+    """Criteria matrix from already loaded rows or Project instances"""
+    alignment = alignment or {}
+    values = [project_criteria(row, alignment.get(row.id)) for row in rows]
+    return CriteriaMatrix(
+        [row.id for row in rows],
+        [row.title for row in rows],
+        np.array(values, dtype=float).reshape(len(rows), len(CRITERIA)),
+    )
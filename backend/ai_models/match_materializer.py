@@ -0,0 +1,396 @@
+"""
+Rule-based match materializer.
+
+Keeps a top-K list of AIMatch rows (source='rules') per company, scored with the
+AlignmentAgent, so GET /api/projects/ai-matches can serve fresh matches without
+an LLM call. Commits that touch a Project or a company's profile (FocusArea,
+Budget, AIConfig, NGO preferences, branches) only recompute the affected rows.
+The recompute runs on a background worker, never on the committing request:
+ids committed within AI_MATCH_REFRESH_DELAY_SECONDS of each other are coalesced
+into one refresh.
+"""
+
+import heapq
+import json
+import logging
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import delete, event, insert, inspect, select, text
+from sqlalchemy.orm import Session, selectinload
+
+from agents.alignment_agent import AlignmentAgent
+from models.ai_matching import AIMatch
+from models.base import db
+from models.company_details import AIConfig, Budget, Company, CompanyBranch, FocusArea, NGOPreference
+from models.projects import Project
+
+logger = logging.getLogger(__name__)
+
+MATCH_SOURCE = 'rules'
+ELIGIBLE_STATUSES = ('published', 'draft')
+
+# Keyword -> SDG number; company profiles store SDG names in several spellings
+SDG_KEYWORDS = [
+    ('poverty', 1), ('hunger', 2), ('health', 3), ('education', 4), ('gender', 5),
+    ('below water', 14), ('ocean', 14), ('water', 6), ('energy', 7), ('decent work', 8),
+    ('economic growth', 8), ('industry', 9), ('innovation', 9), ('inequalit', 10),
+    ('cities', 11), ('consumption', 12), ('climate', 13), ('on land', 15),
+    ('peace', 16), ('justice', 16), ('partnership', 17),
+]
+
+# Risk appetite shifts weight between NGO credibility and SDG fit
+RISK_APPETITE_WEIGHTS = {
+    'low': {'sdg_alignment': 0.25, 'geographic_fit': 0.2, 'budget_alignment': 0.2, 'sector_relevance': 0.1, 'ngo_credibility': 0.25},
+    'medium': None,
+    'high': {'sdg_alignment': 0.35, 'geographic_fit': 0.2, 'budget_alignment': 0.2, 'sector_relevance': 0.15, 'ngo_credibility': 0.1},
+}
+
+COMPANY_PROFILE_MODELS = (Budget, FocusArea, AIConfig, NGOPreference, CompanyBranch)
+
+
+def sdg_number(value) -> Optional[int]:
+    """Normalize an SDG given as a number or a name to its number"""
+    if isinstance(value, int):
+        return value
+    text_value = str(value).strip().lower()
+    if text_value.isdigit():
+        return int(text_value)
+    match = re.match(r'sdg\s*(\d+)', text_value)
+    if match:
+        return int(match.group(1))
+    for keyword, number in SDG_KEYWORDS:
+        if keyword in text_value:
+            return number
+    return None
+
+
+def _json_list(value) -> list:
+    if not value:
+        return []
+    try:
+        parsed = json.loads(value) if isinstance(value, str) else value
+    except (TypeError, ValueError):
+        return []
+    return parsed if isinstance(parsed, list) else []
+
+
+def project_features(project: Project) -> Dict:
+    """Flatten a Project into the shape AlignmentAgent expects, plus display fields"""
+    sdgs = [n for n in (sdg_number(v) for v in _json_list(project.sdg_goals)) if n]
+    location = ', '.join(p for p in [project.location_city, project.location_region, project.location_country] if p)
+    funding = float(project.funding_required) if project.funding_required is not None else None
+    return {
+        'id': project.id,
+        'name': project.title,
+        'sdgs': sdgs,
+        'geography': location,
+        'budget_range': str(funding) if funding is not None else '',
+        'sector': ', '.join(_json_list(project.csr_focus_areas)),
+        'ngo_rating': project.ngo_rating or 0,
+        'funding_required': funding,
+        'currency': project.currency,
+        'duration_months': project.duration_months,
+    }
+
+
+def company_profile(company: Company) -> Dict:
+    """Build the corporate profile AlignmentAgent expects from a Company and its children"""
+    focus = company.focus_area
+    budget = company.budget
+    preferences = company.ngo_preferences
+    geographies = [g for g in [company.hq_country, company.hq_state, company.hq_city] if g]
+    for branch in company.branches:
+        geographies.extend(g for g in [branch.country, branch.state, branch.city] if g)
+    if preferences:
+        geographies.extend(_json_list(preferences.regions))
+    themes = (focus.themes or '') if focus else ''
+    return {
+        'priority_sdgs': [n for n in (sdg_number(v) for v in _json_list(focus.priority_sdgs if focus else None)) if n],
+        'target_geographies': list(dict.fromkeys(geographies)),
+        'csr_budget': {'min': 0, 'max': float(budget.amount)} if budget and budget.amount else {},
+        'focus_sectors': [t.strip() for t in themes.split(',') if t.strip()],
+        'risk_appetite': ((company.ai_config.risk_appetite if company.ai_config else None) or 'Medium').lower(),
+    }
+
+
+class MatchMaterializer:
+    """Maintains rule-based top-K AIMatch rows per company"""
+
+    def __init__(self, top_k: int = 20):
+        self.top_k = top_k
+        self._agents = {}
+        self._pending_projects = set()
+        self._pending_companies = set()
+        self._worker = None
+        self._worker_done = threading.Condition()
+
+    def _agent(self, risk_appetite: str) -> AlignmentAgent:
+        if risk_appetite not in self._agents:
+            agent = AlignmentAgent()
+            weights = RISK_APPETITE_WEIGHTS.get(risk_appetite)
+            if weights:
+                agent.alignment_weights = dict(weights)
+            self._agents[risk_appetite] = agent
+        return self._agents[risk_appetite]
+
+    def score(self, project: Dict, profile: Dict) -> Tuple[int, str]:
+        """Return (alignment_score 0-100, recommendation) for one pair"""
+        agent = self._agent(profile['risk_appetite'])
+        result = agent.calculate_alignment_score(project, profile)
+        total = result.get('total_alignment_score', 0) if result else 0
+        return int(round(total)), agent._generate_recommendation(total)
+
+    def init_app(self, app):
+        """Register on the app and hook session events for incremental refresh"""
+        app.config.setdefault('AI_MATCH_AUTO_REFRESH', True)
+        app.config.setdefault('AI_MATCH_REFRESH_DELAY_SECONDS', 0.5)
+        app.config.setdefault('AI_MATCH_TOP_K', self.top_k)
+        self.top_k = app.config['AI_MATCH_TOP_K']
+        app.extensions['match_materializer'] = self
+        _register_session_events()
+        with app.app_context():
+            _ensure_schema()
+
+    # Full and incremental refresh -------------------------------------------------
+
+    def refresh_all(self, session: Session = None) -> Dict:
+        """Recompute top-K matches for every company"""
+        session = session or db.session
+        company_ids = session.execute(select(Company.id)).scalars().all()
+        return self.refresh_companies(company_ids, session=session)
+
+    def refresh_companies(self, company_ids: Iterable[int], session: Session = None) -> Dict:
+        """Recompute the full top-K for the given companies"""
+        session = session or db.session
+        company_ids = set(company_ids)
+        if not company_ids:
+            return {'companies': 0, 'rows_written': 0}
+        projects = self._load_projects(session)
+        profiles = self._load_profiles(session, company_ids)
+        rows_written = 0
+        for company_id in company_ids:
+            profile = profiles.get(company_id)
+            session.execute(delete(AIMatch).where(AIMatch.company_id == company_id, AIMatch.source == MATCH_SOURCE))
+            if not profile:
+                continue
+            top = self._top_k(projects.values(), profile)
+            rows = [self._row(company_id, projects[pid], score, note) for pid, (score, note) in top.items()]
+            if rows:
+                session.execute(insert(AIMatch), rows)
+                rows_written += len(rows)
+        session.commit()
+        return {'companies': len(company_ids), 'rows_written': rows_written}
+
+    def refresh_projects(self, project_ids: Iterable[int], session: Session = None) -> Dict:
+        """Merge changed projects into every company's top-K, recomputing only where needed"""
+        session = session or db.session
+        project_ids = set(project_ids)
+        if not project_ids:
+            return {'companies': 0, 'rows_written': 0}
+
+        changed = {
+            p.id: project_features(p)
+            for p in session.execute(
+                select(Project).where(Project.id.in_(project_ids), Project.status.in_(ELIGIBLE_STATUSES))
+            ).scalars()
+        }
+        existing = {}
+        for company_id, project_id, score in session.execute(
+            select(AIMatch.company_id, AIMatch.project_id, AIMatch.alignment_score).where(AIMatch.source == MATCH_SOURCE)
+        ):
+            existing.setdefault(company_id, {})[project_id] = score
+
+        company_ids = session.execute(select(Company.id)).scalars().all()
+        profiles = self._load_profiles(session, company_ids)
+        needs_full = set()
+        rows_written = 0
+        for company_id, profile in profiles.items():
+            current = existing.get(company_id, {})
+            new_scores = {pid: self.score(features, profile) for pid, features in changed.items()}
+
+            # A top-K member that dropped (or vanished) from a full list may need its
+            # replacement pulled from outside the list, so fall back to a full recompute
+            full = len(current) >= self.top_k
+            if full and any(
+                pid in current and (pid not in new_scores or new_scores[pid][0] < current[pid])
+                for pid in project_ids
+            ):
+                needs_full.add(company_id)
+                continue
+
+            candidates = {pid: score for pid, score in current.items() if pid not in project_ids}
+            candidates.update({pid: score for pid, (score, _) in new_scores.items()})
+            top = set(pid for pid, _ in heapq.nsmallest(self.top_k, candidates.items(), key=lambda kv: (-kv[1], kv[0])))
+
+            stale = [pid for pid in current if pid not in top or pid in project_ids]
+            fresh = [pid for pid in top if pid in new_scores]
+            if stale:
+                session.execute(delete(AIMatch).where(
+                    AIMatch.company_id == company_id, AIMatch.source == MATCH_SOURCE, AIMatch.project_id.in_(stale)
+                ))
+            if fresh:
+                session.execute(insert(AIMatch), [
+                    self._row(company_id, changed[pid], *new_scores[pid]) for pid in fresh
+                ])
+                rows_written += len(fresh)
+        session.commit()
+
+        result = {'companies': len(profiles), 'rows_written': rows_written, 'full_recomputes': len(needs_full)}
+        if needs_full:
+            result['rows_written'] += self.refresh_companies(needs_full, session=session)['rows_written']
+        return result
+
+    # Background refresh -------------------------------------------------------------
+
+    def schedule(self, app, project_ids: Iterable[int] = (), company_ids: Iterable[int] = ()):
+        """Queue an incremental refresh for the worker thread, starting it if it isn't running"""
+        with self._worker_done:
+            self._pending_projects.update(project_ids)
+            self._pending_companies.update(cid for cid in company_ids if cid is not None)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run_worker, args=(app,), name='ai-match-refresh', daemon=True)
+                self._worker.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued refresh has been applied; False on timeout"""
+        with self._worker_done:
+            return self._worker_done.wait_for(lambda: self._worker is None, timeout)
+
+    def _run_worker(self, app):
+        delay = app.config.get('AI_MATCH_REFRESH_DELAY_SECONDS') or 0
+        while True:
+            # Let commits that arrive close together pile up into one refresh
+            if delay:
+                time.sleep(delay)
+            with self._worker_done:
+                projects, companies = self._pending_projects, self._pending_companies
+                self._pending_projects, self._pending_companies = set(), set()
+                if not projects and not companies:
+                    self._worker = None
+                    self._worker_done.notify_all()
+                    return
+            try:
+                with app.app_context():
+                    try:
+                        if companies:
+                            self.refresh_companies(companies)
+                        if projects:
+                            self.refresh_projects(projects)
+                    finally:
+                        db.session.remove()
+            except Exception as e:
+                logger.error(f"Error refreshing rule-based matches: {str(e)}")
+
+    def _load_projects(self, session: Session) -> Dict[int, Dict]:
+        projects = session.execute(select(Project).where(Project.status.in_(ELIGIBLE_STATUSES))).scalars()
+        return {p.id: project_features(p) for p in projects}
+
+    def _load_profiles(self, session: Session, company_ids: Iterable[int]) -> Dict[int, Dict]:
+        companies = session.execute(
+            select(Company)
+            .where(Company.id.in_(list(company_ids)))
+            .options(
+                selectinload(Company.focus_area),
+                selectinload(Company.budget),
+                selectinload(Company.ai_config),
+                selectinload(Company.ngo_preferences),
+                selectinload(Company.branches),
+            )
+        ).scalars()
+        return {c.id: company_profile(c) for c in companies}
+
+    def _top_k(self, projects: Iterable[Dict], profile: Dict) -> Dict[int, Tuple[int, str]]:
+        scored = ((project['id'], self.score(project, profile)) for project in projects)
+        best = heapq.nsmallest(self.top_k, scored, key=lambda item: (-item[1][0], item[0]))
+        return dict(best)
+
+    def _row(self, company_id: int, project: Dict, score: int, note: str) -> Dict:
+        return {
+            'company_id': company_id,
+            'project_id': project['id'],
+            'alignment_score': score,
+            'investment_min': None,
+            'investment_max': project['funding_required'],
+            'investment_currency': project['currency'],
+            'timeline_months': project['duration_months'],
+            'location_text': project['geography'] or None,
+            'tags': None,
+            'rationale': note,
+            'source': MATCH_SOURCE,
+            'created_at': datetime.utcnow(),
+        }
+
+
+match_materializer = MatchMaterializer()
+
+
+# Session hooks ---------------------------------------------------------------------
+
+_events_registered = False
+
+
+def _register_session_events():
+    global _events_registered
+    if _events_registered:
+        return
+    event.listen(db.session, 'after_flush', _collect_changes)
+    event.listen(db.session, 'after_commit', _apply_changes)
+    event.listen(db.session, 'after_rollback', _discard_changes)
+    _events_registered = True
+
+
+def _collect_changes(session, flush_context):
+    """Remember which projects/companies a flush touched until the transaction commits"""
+    pending = session.info.setdefault('match_refresh', {'projects': set(), 'companies': set()})
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        if isinstance(obj, Project):
+            pending['projects'].add(obj.id)
+        elif isinstance(obj, Company):
+            pending['companies'].add(obj.id)
+        elif isinstance(obj, COMPANY_PROFILE_MODELS):
+            pending['companies'].add(obj.company_id)
+
+
+def queue_project_refresh(session, project_ids: Iterable[int]):
+    """Refresh matches for projects written with bulk statements once the session commits"""
+    pending = session.info.setdefault('match_refresh', {'projects': set(), 'companies': set()})
+    pending['projects'].update(project_ids)
+
+
+def _apply_changes(session):
+    pending = session.info.pop('match_refresh', None)
+    if not pending or not (pending['projects'] or pending['companies']):
+        return
+    if not has_app_context():
+        return
+    materializer = current_app.extensions.get('match_materializer')
+    if not materializer or not current_app.config.get('AI_MATCH_AUTO_REFRESH'):
+        return
+    materializer.schedule(current_app._get_current_object(), pending['projects'], pending['companies'])
+
+
+def _discard_changes(session):
+    session.info.pop('match_refresh', None)
+
+
+def _ensure_schema():
+    """Add the source column and score index to databases created before they existed"""
+    try:
+        inspector = inspect(db.engine)
+        if 'ai_matches' not in inspector.get_table_names():
+            return
+        columns = {c['name'] for c in inspector.get_columns('ai_matches')}
+        if 'source' not in columns:
+            with db.engine.begin() as conn:
+                conn.execute(text("ALTER TABLE ai_matches ADD COLUMN source VARCHAR(16)"))
+        for index in AIMatch.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
+    except Exception as e:
+        logger.warning(f"Could not ensure ai_matches schema: {e}")
@@ -0,0 +1,425 @@
+"""
+Incremental project monitoring.
+
+MonitoringEngine scores projects with MonitoringAgent from their real inputs:
+milestone due dates and completion, ProjectTrackingInfo.progress_pct, approved
+funding applications and the spend reported in impact reports (falling back to
+the tracker's allocated/spent details). Each run only loads projects whose inputs
+changed since the previous run - a watermark on the `updated_at` of the project
+and its milestones, tracking row, applications and reports - plus projects with
+a milestone that fell due since the last run, since those change status without
+any row being touched. New alerts are written to ProjectTimelineEntry in one
+bulk insert per run; alerts that are still active are not repeated.
+
+MonitoringScheduler runs the engine on a daemon thread at a fixed interval.
+Deleting a milestone or application does not bump any `updated_at`, so such
+changes are picked up on the next edit or on a run with full=True.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import and_, case, func, insert, inspect, or_, select
+from sqlalchemy.orm import Session
+
+from agents.monitoring_agent import MonitoringAgent, summarize_results
+from models.base import db
+from models.projects import Project, ProjectApplication, ProjectImpactReport, ProjectMilestone
+from models.tracker import ProjectTimelineEntry, ProjectTrackingInfo
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance', 'monitoring_state.json'
+)
+
+# Drafts have no delivery to monitor yet
+UNMONITORED_STATUSES = ('draft',)
+
+# Tables whose rows feed a project's monitoring inputs
+WATCHED_TABLES = (
+    (Project.id, Project.updated_at),
+    (ProjectMilestone.project_id, ProjectMilestone.updated_at),
+    (ProjectTrackingInfo.project_id, ProjectTrackingInfo.updated_at),
+    (ProjectApplication.project_id, ProjectApplication.updated_at),
+    (ProjectImpactReport.project_id, ProjectImpactReport.updated_at),
+)
+
+# Impact report metrics that record cumulative spend
+SPEND_METRICS = ('amount_spent', 'funds_utilized', 'budget_spent', 'spent')
+
+ALERT_COLORS = {'high': 'red', 'medium': 'orange'}
+
+# Keeps IN (...) lists under SQLite's bound-parameter limit
+CHUNK_SIZE = 900
+
+
+def _chunks(values: List[int], size: int = CHUNK_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _number(value) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).replace(',', ''))
+    except (TypeError, ValueError):
+        return None
+
+
+def _quarter(day: date) -> str:
+    return f"Q{(day.month - 1) // 3 + 1} {day.year}"
+
+
+class MonitoringState:
+    """JSON file holding the watermark and the alerts each project currently has"""
+
+    def __init__(self, path: str = DEFAULT_STATE_PATH):
+        self.path = path
+        self.watermark = None
+        self.last_run_date = None
+        self.active_alerts = {}
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable monitoring state {self.path}: {e}")
+            return
+        self.watermark = datetime.fromisoformat(state['watermark']) if state.get('watermark') else None
+        self.last_run_date = date.fromisoformat(state['last_run_date']) if state.get('last_run_date') else None
+        self.active_alerts = {int(pid): set(types) for pid, types in (state.get('active_alerts') or {}).items()}
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'watermark': self.watermark.isoformat() if self.watermark else None,
+                'last_run_date': self.last_run_date.isoformat() if self.last_run_date else None,
+                'active_alerts': {str(pid): sorted(types) for pid, types in self.active_alerts.items()},
+            }, f)
+        os.replace(tmp_path, self.path)
+
+
+class MonitoringEngine:
+    """Computes project status from tracked data and records new alerts"""
+
+    def __init__(self, state_path: Optional[str] = DEFAULT_STATE_PATH):
+        self.agent = MonitoringAgent()
+        self.state = MonitoringState(state_path)
+        self.scheduler = None
+        self._run_lock = threading.Lock()
+
+    def init_app(self, app):
+        """Register on the app and start the scheduler when enabled"""
+        app.config.setdefault('MONITORING_SCHEDULER_ENABLED', False)
+        app.config.setdefault('MONITORING_INTERVAL_SECONDS', 900)
+        app.config.setdefault('MONITORING_STATE_PATH', self.state.path)
+        if app.config['MONITORING_STATE_PATH'] != self.state.path:
+            self.state = MonitoringState(app.config['MONITORING_STATE_PATH'])
+        app.extensions['monitoring_engine'] = self
+        with app.app_context():
+            _ensure_schema()
+        if app.config['MONITORING_SCHEDULER_ENABLED']:
+            self.scheduler = MonitoringScheduler(app, self, app.config['MONITORING_INTERVAL_SECONDS'])
+            self.scheduler.start()
+
+    # Runs ---------------------------------------------------------------------------
+
+    def run(self, session: Session = None, full: bool = False, today: Optional[date] = None) -> Dict:
+        """Monitor every project whose inputs changed since the last run"""
+        if not self._run_lock.acquire(blocking=False):
+            return {'skipped': True, 'reason': 'A monitoring run is already in progress'}
+        try:
+            return self._run(session or db.session, full, today or date.today())
+        finally:
+            self._run_lock.release()
+
+    def _run(self, session: Session, full: bool, today: date) -> Dict:
+        started = time.perf_counter()
+        # A full run rescans every project but still skips alerts that are already active
+        since = None if full else self.state.watermark
+        changed, watermark = self.changed_projects(session, since)
+        changed |= self.newly_overdue_projects(session, self.state.last_run_date, today)
+
+        active_alerts = dict(self.state.active_alerts)
+        try:
+            results = self.evaluate(changed, session=session, today=today)
+            alerts_written = self._record_alerts(session, results, today)
+            session.commit()
+        except Exception:
+            session.rollback()
+            self.state.active_alerts = active_alerts
+            raise
+
+        # Only advance once the alerts are committed, so a failed run is retried
+        self.state.watermark = max(filter(None, [since, watermark]), default=None)
+        self.state.last_run_date = today
+        self.state.save()
+
+        summary = {
+            'projects_checked': len(results),
+            'alerts_written': alerts_written,
+            'watermark': self.state.watermark.isoformat() if self.state.watermark else None,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+            **summarize_results(results),
+        }
+        logger.info(f"Monitoring run: {summary}")
+        return summary
+
+    def changed_projects(self, session: Session, since: Optional[datetime]):
+        """Ids of projects with an input row updated after `since`, and the newest stamp seen"""
+        changed = set()
+        newest = None
+        for project_column, updated_column in WATCHED_TABLES:
+            query = select(project_column, func.max(updated_column)).group_by(project_column)
+            if since is not None:
+                query = query.where(updated_column > since)
+            for project_id, updated_at in session.execute(query):
+                changed.add(project_id)
+                if updated_at and (newest is None or updated_at > newest):
+                    newest = updated_at
+        return changed, newest
+
+    def newly_overdue_projects(self, session: Session, last_run_date: Optional[date], today: date) -> Set[int]:
+        """Projects with an open milestone that fell due since the last run"""
+        if last_run_date is None or last_run_date >= today:
+            return set()
+        return set(session.execute(
+            select(ProjectMilestone.project_id).distinct().where(
+                ProjectMilestone.target_date >= last_run_date,
+                ProjectMilestone.target_date < today,
+                ProjectMilestone.completion_date.is_(None),
+                or_(ProjectMilestone.status.is_(None), ProjectMilestone.status != 'completed'),
+            )
+        ).scalars())
+
+    def evaluate(self, project_ids: Iterable[int], session: Session = None, today: Optional[date] = None) -> List[Dict]:
+        """Monitoring results for the given projects"""
+        session = session or db.session
+        today = today or date.today()
+        snapshots = self.load_snapshots(session, sorted(project_ids), today)
+        results = []
+        for snapshot in snapshots.values():
+            result = self.agent.assess(snapshot, today)
+            result['company_ids'] = snapshot['company_ids']
+            results.append(result)
+        return results
+
+    # Loading ------------------------------------------------------------------------
+
+    def load_snapshots(self, session: Session, project_ids: List[int], today: date) -> Dict[int, Dict]:
+        """Monitoring inputs for each project, in a fixed number of grouped queries per chunk"""
+        snapshots = {}
+        for chunk in _chunks(project_ids):
+            for row in session.execute(
+                select(Project.id, Project.title, Project.status, Project.start_date, Project.end_date,
+                       Project.funding_required)
+                .where(Project.id.in_(chunk), Project.status.notin_(UNMONITORED_STATUSES))
+            ):
+                snapshots[row.id] = {
+                    'id': row.id,
+                    'name': row.title,
+                    'status': row.status,
+                    'start_date': row.start_date,
+                    'end_date': row.end_date,
+                    'budget': float(row.funding_required) if row.funding_required is not None else None,
+                    'progress_pct': None,
+                    'spent': None,
+                    'company_ids': [],
+                    'milestones_total': 0,
+                    'milestones_completed': 0,
+                    'milestones_overdue': 0,
+                    'milestone_progress': None,
+                    'next_due': None,
+                }
+            chunk = [pid for pid in chunk if pid in snapshots]
+            if chunk:
+                self._load_milestones(session, chunk, snapshots, today)
+                self._load_tracking(session, chunk, snapshots)
+                self._load_funding(session, chunk, snapshots)
+                self._load_reported_spend(session, chunk, snapshots)
+        return snapshots
+
+    @staticmethod
+    def _load_milestones(session: Session, chunk: List[int], snapshots: Dict[int, Dict], today: date):
+        done = or_(ProjectMilestone.status == 'completed', ProjectMilestone.completion_date.isnot(None))
+        open_milestone = ~done
+        query = (
+            select(
+                ProjectMilestone.project_id,
+                func.count(),
+                func.sum(case((done, 1), else_=0)),
+                func.sum(case((and_(open_milestone, ProjectMilestone.target_date < today), 1), else_=0)),
+                func.avg(case((done, 100), else_=func.coalesce(ProjectMilestone.progress_percentage, 0))),
+                func.min(case((and_(open_milestone, ProjectMilestone.target_date >= today),
+                                  ProjectMilestone.target_date), else_=None)),
+            )
+            .where(ProjectMilestone.project_id.in_(chunk))
+            .group_by(ProjectMilestone.project_id)
+        )
+        for project_id, total, completed, overdue, progress, next_due in session.execute(query):
+            snapshots[project_id].update({
+                'milestones_total': total,
+                'milestones_completed': completed or 0,
+                'milestones_overdue': overdue or 0,
+                'milestone_progress': float(progress) if progress is not None else None,
+                'next_due': next_due if isinstance(next_due, date) or next_due is None else date.fromisoformat(next_due),
+            })
+
+    @staticmethod
+    def _load_tracking(session: Session, chunk: List[int], snapshots: Dict[int, Dict]):
+        for project_id, progress_pct, details in session.execute(
+            select(ProjectTrackingInfo.project_id, ProjectTrackingInfo.progress_pct, ProjectTrackingInfo.details)
+            .where(ProjectTrackingInfo.project_id.in_(chunk))
+        ):
+            snapshot = snapshots[project_id]
+            snapshot['progress_pct'] = progress_pct
+            details = details or {}
+            allocated, spent = _number(details.get('allocated')), _number(details.get('spent'))
+            if allocated:
+                snapshot['budget'] = allocated
+            if spent is not None:
+                snapshot['spent'] = spent
+
+    @staticmethod
+    def _load_funding(session: Session, chunk: List[int], snapshots: Dict[int, Dict]):
+        """Approved applications: the sponsoring companies and the funding they committed"""
+        committed = {}
+        for project_id, company_id, amount in session.execute(
+            select(ProjectApplication.project_id, ProjectApplication.company_id,
+                   func.sum(ProjectApplication.amount_offered))
+            .where(ProjectApplication.project_id.in_(chunk), ProjectApplication.status == 'approved')
+            .group_by(ProjectApplication.project_id, ProjectApplication.company_id)
+        ):
+            snapshots[project_id]['company_ids'].append(company_id)
+            if amount:
+                committed[project_id] = committed.get(project_id, 0.0) + float(amount)
+        for project_id, amount in committed.items():
+            snapshots[project_id]['budget'] = amount
+
+    @staticmethod
+    def _load_reported_spend(session: Session, chunk: List[int], snapshots: Dict[int, Dict]):
+        """Cumulative spend from the most recent impact report that states one"""
+        latest = {}
+        for project_id, report_date, metrics in session.execute(
+            select(ProjectImpactReport.project_id, ProjectImpactReport.report_date, ProjectImpactReport.impact_metrics)
+            .where(ProjectImpactReport.project_id.in_(chunk), ProjectImpactReport.impact_metrics.isnot(None))
+        ):
+            try:
+                metrics = json.loads(metrics)
+            except (TypeError, ValueError):
+                continue
+            if not isinstance(metrics, dict):
+                continue
+            spent = next((_number(metrics[key]) for key in SPEND_METRICS if key in metrics), None)
+            if spent is None:
+                continue
+            if project_id not in latest or report_date >= latest[project_id][0]:
+                latest[project_id] = (report_date, spent)
+        for project_id, (_, spent) in latest.items():
+            snapshots[project_id]['spent'] = spent
+
+    # Alerts -------------------------------------------------------------------------
+
+    def _record_alerts(self, session: Session, results: List[Dict], today: date) -> int:
+        """Bulk insert timeline entries for alerts that were not already active"""
+        rows = []
+        now = datetime.utcnow()
+        quarter = _quarter(today)
+        for result in results:
+            project_id = result['project_id']
+            active = self.state.active_alerts.get(project_id, set())
+            current = {alert['type'] for alert in result['alerts']}
+            for alert in result['alerts']:
+                if alert['type'] in active:
+                    continue
+                text = f"{result['project_name'] or f'Project {project_id}'}: {alert['message']}"[:200]
+                for company_id in result['company_ids'] or [None]:
+                    rows.append({
+                        'color': ALERT_COLORS.get(alert['severity'], 'orange'),
+                        'text': text,
+                        'quarter': quarter,
+                        'company_id': company_id,
+                        'created_at': now,
+                    })
+            if current:
+                self.state.active_alerts[project_id] = current
+            else:
+                self.state.active_alerts.pop(project_id, None)
+        if rows:
+            session.execute(insert(ProjectTimelineEntry), rows)
+        return len(rows)
+
+
+class MonitoringScheduler:
+    """Runs the monitoring engine every `interval` seconds on a daemon thread"""
+
+    def __init__(self, app, engine: MonitoringEngine, interval: float):
+        self.app = app
+        self.engine = engine
+        self.interval = interval
+        self.last_result = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def start(self) -> bool:
+        if self.running:
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name='project-monitoring', daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            with self.app.app_context():
+                try:
+                    self.last_result = self.engine.run()
+                except Exception as e:
+                    logger.error(f"Scheduled monitoring run failed: {str(e)}")
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+            self._stop.wait(self.interval)
+
+
+monitoring_engine = MonitoringEngine()
+
+
+def _ensure_schema():
+    """Create the updated_at and project_id indexes the incremental scan relies on"""
+    try:
+        inspector = inspect(db.engine)
+        tables = set(inspector.get_table_names())
+        for model in (Project, ProjectMilestone, ProjectTrackingInfo, ProjectApplication, ProjectImpactReport):
+            if model.__tablename__ not in tables:
+                continue
+            for index in model.__table__.indexes:
+                index.create(db.engine, checkfirst=True)
+    except Exception as e:
+        logger.warning(f"Could not ensure monitoring indexes: {e}")
@@ -0,0 +1,388 @@
+"""
+Bulk project import from CSV or JSONL.
+
+ProjectImporter stream-parses an upload row by row, so memory stays flat however
+large the file is. Rows are validated in chunks of `batch_size` and each chunk's
+valid rows are written with one bulk insert and committed together with the
+job's progress counters. Rejected rows are collected in a per-row error report
+(capped at `max_errors`) while the rest of the file keeps importing.
+
+CSV uploads need a header row with the Project column names. List columns
+(sdg_goals, csr_focus_areas, target_beneficiaries, project_images) hold
+semicolon-separated values or a JSON array; object columns (expected_outcomes,
+kpis, past_impact) hold JSON. JSONL uploads carry one project object per line
+with the same keys as POST /api/projects/projects.
+
+Large uploads are saved under instance/imports and run by start_import_job on a
+single background worker, so jobs queue instead of competing for the database.
+"""
+
+import csv
+import io
+import json
+import logging
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from ai_models.match_materializer import queue_project_refresh
+from models.base import db
+from models.project_import import ProjectImportJob
+from models.projects import Project
+from utils import validate_sdg_goals
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IMPORT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance', 'imports')
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+
+REQUIRED_FIELDS = (
+    'title', 'short_description', 'ngo_name', 'location_country',
+    'total_project_cost', 'funding_required', 'start_date', 'end_date',
+)
+TEXT_FIELDS = (
+    'title', 'short_description', 'ngo_name', 'location_city', 'location_region', 'location_country',
+    'currency', 'preferred_contribution_type', 'ngo_registration_number', 'ngo_80g_status',
+    'ngo_fcra_status', 'ngo_verification_badge', 'proposal_document_url', 'video_link',
+)
+LIST_FIELDS = ('sdg_goals', 'csr_focus_areas', 'target_beneficiaries', 'project_images')
+OBJECT_FIELDS = ('expected_outcomes', 'kpis', 'past_impact')
+CHOICES = {
+    'status': ('draft', 'published'),
+    'visibility': ('public', 'private', 'restricted'),
+}
+TRUE_VALUES = ('1', 'true', 'yes', 'y')
+FALSE_VALUES = ('0', 'false', 'no', 'n')
+
+
+class ImportFormatError(ValueError):
+    """The upload as a whole cannot be read (unknown format, missing columns, bad encoding)"""
+
+
+def detect_format(filename: Optional[str] = None, content_type: Optional[str] = None,
+                  requested: Optional[str] = None) -> Optional[str]:
+    """csv/jsonl from an explicit format, the file extension or the content type"""
+    if requested:
+        requested = requested.lower()
+        return 'jsonl' if requested == 'ndjson' else requested if requested in IMPORT_FORMATS else None
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    if content_type in ('text/csv', 'application/csv'):
+        return 'csv'
+    if content_type in ('application/x-ndjson', 'application/jsonl', 'application/x-jsonlines'):
+        return 'jsonl'
+    return None
+
+
+def iter_records(stream, file_format: str) -> Iterator[Tuple[int, Optional[Dict], Optional[str]]]:
+    """Yield (line number, record, error) for each row of a binary or text stream"""
+    text = stream if isinstance(stream, io.TextIOBase) else io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if file_format == 'csv':
+        reader = csv.DictReader(text)
+        missing = [f for f in REQUIRED_FIELDS if f not in (reader.fieldnames or [])]
+        if missing:
+            raise ImportFormatError(f"CSV header is missing columns: {', '.join(missing)}")
+        for record in reader:
+            if None in record:
+                yield reader.line_num, None, 'Row has more values than the header has columns'
+            elif not any((value or '').strip() for value in record.values()):
+                continue
+            else:
+                yield reader.line_num, record, None
+    elif file_format == 'jsonl':
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_number, None, f'Invalid JSON: {e}'
+                continue
+            if isinstance(record, dict):
+                yield line_number, record, None
+            else:
+                yield line_number, None, 'Each line must be a JSON object'
+    else:
+        raise ImportFormatError(f"Unsupported import format '{file_format}'")
+
+
+# Validation -----------------------------------------------------------------------
+
+def _blank(value) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _parse_list(value):
+    if isinstance(value, list):
+        return value
+    value = str(value).strip()
+    if value.startswith('['):
+        parsed = json.loads(value)
+        if not isinstance(parsed, list):
+            raise ValueError('must be an array')
+        return parsed
+    return [part.strip() for part in value.split(';') if part.strip()]
+
+
+def _parse_sdg(value):
+    if isinstance(value, int):
+        return value
+    text = str(value).strip().upper().replace('SDG', '').strip()
+    return int(text) if text.isdigit() else value
+
+
+def _parse_date(value):
+    return datetime.strptime(str(value).strip()[:10], '%Y-%m-%d').date()
+
+
+def _parse_number(value) -> float:
+    if isinstance(value, bool):
+        raise ValueError('must be a number')
+    number = float(str(value).replace(',', '').strip())
+    if not math.isfinite(number):
+        raise ValueError('must be a finite number')
+    return number
+
+
+def validate_record(record: Dict) -> Tuple[Optional[Dict], List[str]]:
+    """Project column values for an upload row, or None and the reasons it was rejected"""
+    errors = []
+    fields = {}
+
+    for name in REQUIRED_FIELDS:
+        if _blank(record.get(name)):
+            errors.append(f'{name} is required')
+
+    columns = Project.__table__.columns
+    for name in TEXT_FIELDS:
+        value = record.get(name)
+        if _blank(value):
+            continue
+        value = str(value).strip()
+        limit = columns[name].type.length
+        if limit and len(value) > limit:
+            errors.append(f'{name} is longer than {limit} characters')
+        fields[name] = value
+
+    for name in ('total_project_cost', 'funding_required'):
+        if _blank(record.get(name)):
+            continue
+        try:
+            amount = _parse_number(record[name])
+        except ValueError:
+            errors.append(f'{name} must be a number')
+            continue
+        if amount < 0:
+            errors.append(f'{name} cannot be negative')
+        fields[name] = amount
+    if fields.get('funding_required', 0) > fields.get('total_project_cost', float('inf')):
+        errors.append('funding_required cannot exceed total_project_cost')
+
+    for name in ('start_date', 'end_date'):
+        if _blank(record.get(name)):
+            continue
+        try:
+            fields[name] = _parse_date(record[name])
+        except ValueError:
+            errors.append(f'{name} must be a YYYY-MM-DD date')
+    if 'start_date' in fields and 'end_date' in fields:
+        if fields['end_date'] < fields['start_date']:
+            errors.append('end_date is before start_date')
+        else:
+            delta = fields['end_date'] - fields['start_date']
+            fields['duration_months'] = (delta.days // 30) + 1
+
+    for name in LIST_FIELDS:
+        if _blank(record.get(name)):
+            continue
+        try:
+            values = _parse_list(record[name])
+        except ValueError:
+            errors.append(f'{name} must be a JSON array or semicolon-separated list')
+            continue
+        if name == 'sdg_goals':
+            values = [_parse_sdg(v) for v in values]
+            is_valid, error = validate_sdg_goals(values)
+            if not is_valid:
+                errors.append(error)
+                continue
+        fields[name] = json.dumps(values)
+
+    for name in OBJECT_FIELDS:
+        value = record.get(name)
+        if _blank(value):
+            continue
+        try:
+            value = json.loads(value) if isinstance(value, str) else value
+        except ValueError:
+            errors.append(f'{name} must be JSON')
+            continue
+        fields[name] = json.dumps(value)
+
+    for name, choices in CHOICES.items():
+        value = record.get(name)
+        if _blank(value):
+            continue
+        value = str(value).strip().lower()
+        if value not in choices:
+            errors.append(f"{name} must be one of: {', '.join(choices)}")
+        fields[name] = value
+
+    for name in ('ngo_rating', 'past_projects_completed'):
+        if _blank(record.get(name)):
+            continue
+        try:
+            number = int(_parse_number(record[name]))
+        except ValueError:
+            errors.append(f'{name} must be a whole number')
+            continue
+        if name == 'ngo_rating' and not 1 <= number <= 5:
+            errors.append('ngo_rating must be between 1 and 5')
+        fields[name] = number
+
+    if not _blank(record.get('csr_eligibility')):
+        value = record['csr_eligibility']
+        flag = str(value).strip().lower()
+        if isinstance(value, bool):
+            fields['csr_eligibility'] = value
+        elif flag in TRUE_VALUES or flag in FALSE_VALUES:
+            fields['csr_eligibility'] = flag in TRUE_VALUES
+        else:
+            errors.append('csr_eligibility must be true or false')
+
+    if errors:
+        return None, errors
+    return fields, []
+
+
+# Import ---------------------------------------------------------------------------
+
+class ProjectImporter:
+    """Validates upload rows in chunks and bulk inserts the valid ones"""
+
+    def __init__(self, created_by: int, batch_size: int = 500, max_errors: int = 1000, session: Session = None):
+        self.created_by = created_by
+        self.batch_size = max(1, batch_size)
+        self.max_errors = max_errors
+        self.session = session or db.session
+
+    def run(self, stream, file_format: str, job: Optional[ProjectImportJob] = None) -> Dict:
+        """Import every row of the stream; returns counts and the per-row error report"""
+        summary = {'total_rows': 0, 'imported_rows': 0, 'failed_rows': 0, 'errors': []}
+        batch = []
+        for row_number, record, error in iter_records(stream, file_format):
+            summary['total_rows'] += 1
+            if error is None:
+                fields, problems = validate_record(record)
+                if fields is not None:
+                    batch.append((row_number, fields))
+                else:
+                    self._reject(summary, row_number, problems)
+            else:
+                self._reject(summary, row_number, [error])
+            if summary['total_rows'] % self.batch_size == 0:
+                self._insert(batch, summary, job)
+                batch = []
+        self._insert(batch, summary, job)
+        return summary
+
+    def _reject(self, summary: Dict, row_number: int, problems: List[str]):
+        summary['failed_rows'] += 1
+        if len(summary['errors']) < self.max_errors:
+            summary['errors'].append({'row': row_number, 'errors': problems})
+
+    def _insert(self, batch: List[Tuple[int, Dict]], summary: Dict, job: Optional[ProjectImportJob]):
+        """Write one chunk's valid rows and the job's progress in a single transaction"""
+        now = datetime.utcnow()
+        rows = [{**fields, 'created_by': self.created_by, 'created_at': now, 'updated_at': now} for _, fields in batch]
+        try:
+            if rows:
+                project_ids = self.session.execute(insert(Project).returning(Project.id), rows).scalars().all()
+                # Bulk inserts skip the flush hook that refreshes rule-based matches
+                queue_project_refresh(self.session, project_ids)
+            if job is not None:
+                _record_progress(job, {**summary, 'imported_rows': summary['imported_rows'] + len(rows)})
+            self.session.commit()
+            summary['imported_rows'] += len(rows)
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Project import batch failed: {str(e)}")
+            for row_number, _ in batch:
+                self._reject(summary, row_number, [f'Could not be saved: {e.__class__.__name__}'])
+            if job is not None:
+                _record_progress(job, summary)
+                self.session.commit()
+
+
+def _record_progress(job: ProjectImportJob, summary: Dict):
+    job.total_rows = summary['total_rows']
+    job.imported_rows = summary['imported_rows']
+    job.failed_rows = summary['failed_rows']
+    job.errors = list(summary['errors'])
+
+
+def run_import_job(job: ProjectImportJob, stream, batch_size: int = 500, session: Session = None) -> ProjectImportJob:
+    """Run an import for a job row, recording its outcome on the job"""
+    session = session or db.session
+    job.status = 'running'
+    job.started_at = datetime.utcnow()
+    session.commit()
+    try:
+        ProjectImporter(job.created_by, batch_size=batch_size, session=session).run(stream, job.file_format, job)
+        job.status = 'completed'
+    except (ImportFormatError, UnicodeDecodeError, csv.Error) as e:
+        session.rollback()
+        job.status = 'failed'
+        job.error = str(e)
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Project import job {job.id} failed: {str(e)}")
+        job.status = 'failed'
+        job.error = f'Import failed: {str(e)}'
+    job.finished_at = datetime.utcnow()
+    session.commit()
+    return job
+
+
+# Background jobs ------------------------------------------------------------------
+
+_executor_lock = threading.Lock()
+_executor = None
+
+
+def start_import_job(app, job_id: int, path: str, batch_size: int = 500):
+    """Queue a saved upload for import on the background worker; the file is removed afterwards"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='project-import')
+
+    def target():
+        with app.app_context():
+            try:
+                job = db.session.get(ProjectImportJob, job_id)
+                if job is None:
+                    return
+                with open(path, 'rb') as stream:
+                    run_import_job(job, stream, batch_size=batch_size)
+            except Exception as e:
+                logger.error(f"Background project import {job_id} failed: {str(e)}")
+            finally:
+                db.session.remove()
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    return _executor.submit(target)
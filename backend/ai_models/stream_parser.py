@@ -0,0 +1,136 @@
+"""
+Incremental JSON parsing for streamed LLM completions.
+
+The rationale prompt asks the model for a single JSON object. When the
+completion is streamed token by token we do not want to wait for the closing
+brace before showing anything, so this parser walks the text as it arrives and
+emits every element of selected top-level arrays (e.g. ``reasoningSteps``) as
+soon as that element is syntactically complete.
+"""
+
+import json
+import logging
+from typing import Any, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = ' \t\r\n'
+
+
+class IncrementalRationaleParser:
+    """Streaming parser that yields completed items of watched top-level arrays"""
+
+    def __init__(self, watched_keys: Iterable[str] = ('reasoningSteps', 'pros', 'options')):
+        self.watched_keys = set(watched_keys)
+        self.buffer = ''
+        self._pos = 0
+        self._started = False
+        self._end = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._last_string = None
+        self._current_key = None
+        self._array_key = None
+        self._element_start = None
+        self._element_is_scalar = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Consume a chunk of completion text and return newly completed (key, item) pairs"""
+        if not chunk:
+            return []
+        self.buffer += chunk
+        if self.complete:
+            # Trailing text after the root object (e.g. a closing ``` fence)
+            return []
+        events = []
+        buf = self.buffer
+        i = self._pos
+        while i < len(buf):
+            ch = buf[i]
+            if not self._started:
+                # Skip any preamble such as a ```json fence until the root object opens
+                if ch == '{':
+                    self._started = True
+                    self._depth = 1
+                i += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_string = buf[self._string_start + 1:i]
+                    elif self._depth == 2 and self._array_key and self._element_start == self._string_start:
+                        self._emit(events, i + 1)
+                i += 1
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+                if self._in_watched_array() and self._element_start is None:
+                    self._element_start = i
+            elif ch in '{[':
+                if self._in_watched_array() and self._element_start is None:
+                    self._element_start = i
+                if ch == '[' and self._depth == 1 and self._current_key in self.watched_keys:
+                    self._array_key = self._current_key
+                    self._element_start = None
+                self._depth += 1
+            elif ch in '}]':
+                if self._in_watched_array() and self._element_is_scalar:
+                    self._emit(events, i)
+                self._depth -= 1
+                if self._depth == 2 and self._array_key and self._element_start is not None:
+                    self._emit(events, i + 1)
+                elif self._depth == 1 and self._array_key:
+                    self._array_key = None
+                    self._element_start = None
+                elif self._depth == 0:
+                    self._end = i + 1
+                    self._pos = i + 1
+                    return events
+            elif ch == ':' and self._depth == 1:
+                self._current_key = self._last_string
+            elif ch == ',':
+                if self._in_watched_array() and self._element_is_scalar:
+                    self._emit(events, i)
+            elif ch not in _WHITESPACE and self._in_watched_array() and self._element_start is None:
+                # Bare scalar element (number, true, false, null)
+                self._element_start = i
+                self._element_is_scalar = True
+            i += 1
+        self._pos = i
+        return events
+
+    def _in_watched_array(self) -> bool:
+        return self._array_key is not None and self._depth == 2
+
+    def _emit(self, events: list, end: int):
+        raw = self.buffer[self._element_start:end]
+        self._element_start = None
+        self._element_is_scalar = False
+        try:
+            events.append((self._array_key, json.loads(raw)))
+        except json.JSONDecodeError:
+            logger.warning(f"Skipping unparsable streamed element for {self._array_key}: {raw[:80]}")
+
+    @property
+    def complete(self) -> bool:
+        """True once the root object has been closed"""
+        return self._end is not None
+
+    def document(self) -> Optional[str]:
+        """Return the raw JSON text of the root object received so far"""
+        start = self.buffer.find('{')
+        if start == -1:
+            return None
+        if self.complete:
+            return self.buffer[start:self._end]
+        return self.buffer[start:]
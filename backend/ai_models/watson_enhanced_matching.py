@@ -12,6 +12,7 @@ from ibm_watson.watson_service import watson_service
 # Note: No direct model classes are required here; DB writes use existing models
 from models.rationale import DecisionRationale
 from models.base import db
+from perf.metrics import track_external
 
 logger = logging.getLogger(__name__)
 
@@ -156,9 +157,10 @@ class WatsonEnhancedMatchingService:
             watson_company_data = self._prepare_company_data_for_watson(company_data)
             
             # Get comprehensive analysis
-            analysis = self.watson_service.get_comprehensive_analysis(
-                watson_project_data, watson_company_data
-            )
+            with track_external('watson'):
+                analysis = self.watson_service.get_comprehensive_analysis(
+                    watson_project_data, watson_company_data
+                )
             
             return analysis
             
@@ -184,7 +186,8 @@ class WatsonEnhancedMatchingService:
                     'complexity_level': 'medium',  # Default
                     'risk_level': 'medium',  # Default
                     'expected_return': option.get('expected_return', 0),
-                    'sustainability_score': 0.5  # Default
+                    'sustainability_score': 0.5,  # Default
+                    'updated_at': option.get('updated_at')
                 }
                 project_list.append(project_data)
             
@@ -192,9 +195,10 @@ class WatsonEnhancedMatchingService:
             available_budget = company_data.get('budget', 1000000)  # Default 1M
             
             # Get optimization
-            optimization = self.watson_service.optimize_budget_allocation(
-                available_budget, project_list
-            )
+            with track_external('watson'):
+                optimization = self.watson_service.optimize_budget_allocation(
+                    available_budget, project_list
+                )
             
             return optimization
             
@@ -226,7 +230,9 @@ class WatsonEnhancedMatchingService:
             'expected_return': 0,
             'team_size': 5,
             'technology_requirements': [],
-            'resource_requirements': {}
+            'resource_requirements': {},
+            # Versions the Watson result cache entry for this project
+            'updated_at': project_data.get('updated_at')
         }
     
     def _prepare_company_data_for_watson(self, company_data: Dict) -> Dict:
@@ -239,7 +245,8 @@ class WatsonEnhancedMatchingService:
             'available_budget': company_data.get('budget', 1000000),
             'csr_focus_areas': company_data.get('focus_area', []),
             'capabilities': [],
-            'available_resources': {}
+            'available_resources': {},
+            'updated_at': company_data.get('updated_at')
         }
     
     def _generate_enhanced_recommendations(self, base_rationale: Dict, 
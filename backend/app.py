@@ -12,6 +12,15 @@ from routes.approvals import approvals_bp
 from routes.ai_matching import ai_matching_bp
 from routes.watson_agents import watson_bp
 from routes.enhanced_ai_matching import enhanced_ai_bp
+from routes.events import events_bp
+from routes.exports import exports_bp
+from ai_models.match_materializer import match_materializer
+from ai_models.monitoring_engine import monitoring_engine
+from models.ngo_summary import ngo_summary_projection
+from perf import request_metrics, query_tracker, table_stats
+from ibm_watson.watson_service import watson_service
+import realtime
+import caching
 
 
 def create_app() -> Flask:
@@ -26,13 +35,39 @@ def create_app() -> Flask:
 		sqlite_path = os.path.join(base_dir, "sustainalign.db")
 		app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{sqlite_path}"
 	app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-	CORS(app, resources={r"/api/*": {"origins": os.environ.get("CORS_ORIGIN", "*")}})
+	CORS(app, resources={r"/api/*": {"origins": os.environ.get("CORS_ORIGIN", "*")}}, expose_headers=["X-Next-Cursor"])
 
 	# Init DB
 	db.init_app(app)
 	with app.app_context():
 		db.create_all()
 
+	# Keep rule-based AI matches in sync with project/company changes
+	match_materializer.init_app(app)
+	# Keep the NGO marketplace summary projection in sync with NGO changes
+	ngo_summary_projection.init_app(app)
+	# Incremental project monitoring; MONITORING_SCHEDULER=true runs it in the background
+	app.config["MONITORING_SCHEDULER_ENABLED"] = os.environ.get("MONITORING_SCHEDULER", "false").lower() == "true"
+	app.config["MONITORING_INTERVAL_SECONDS"] = int(os.environ.get("MONITORING_INTERVAL_SECONDS", "900"))
+	monitoring_engine.init_app(app)
+	# Push committed tracker/approval changes to /api/events/stream; Redis fans out across workers
+	app.config["EVENTS_REDIS_URL"] = os.environ.get("EVENTS_REDIS_URL")
+	realtime.init_app(app)
+	# Cache dashboard GET responses until the rows behind them change; Redis shares entries across workers
+	app.config["RESPONSE_CACHE_REDIS_URL"] = os.environ.get("RESPONSE_CACHE_REDIS_URL")
+	app.config["RESPONSE_CACHE_TTL"] = int(os.environ.get("RESPONSE_CACHE_TTL", "300"))
+	caching.init_app(app)
+
+	# Per-request latency/SQL/outbound timings, Server-Timing header and /metrics
+	request_metrics.init_app(app)
+	# Flags repeated statement shapes (N+1 loads) per request in debug/testing
+	query_tracker.init_app(app)
+	# Row counts for the /database inspector, from planner statistics refreshed in the background
+	table_stats.init_app(app)
+
+	# Run the Watson tools in-process (or on a local pool) instead of the Orchestrate service
+	watson_service.init_app(app)
+
 	# Blueprints (API)
 	app.register_blueprint(auth_bp, url_prefix="/api/auth")
 	app.register_blueprint(profile_bp, url_prefix="/api/profile")
@@ -41,6 +76,8 @@ def create_app() -> Flask:
 	app.register_blueprint(comparisons_bp, url_prefix="/api/comparisons")
 	app.register_blueprint(approvals_bp, url_prefix="/api/approvals")
 	app.register_blueprint(ai_matching_bp)
+	app.register_blueprint(events_bp)
+	app.register_blueprint(exports_bp)
 	app.register_blueprint(watson_bp)
 	app.register_blueprint(enhanced_ai_bp)
 
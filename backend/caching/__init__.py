@@ -0,0 +1,12 @@
+# Response Cache Package
+# Tag-invalidated caching of read-heavy GET endpoints with in-process or Redis storage
+
+from .backends import MemoryBackend, RedisBackend
+from .response_cache import response_cache, ResponseCache, register_session_events
+
+__all__ = ['response_cache', 'ResponseCache', 'MemoryBackend', 'RedisBackend', 'register_session_events', 'init_app']
+
+
+def init_app(app):
+    """Pick the storage backend and start invalidating on commits"""
+    response_cache.init_app(app)
@@ -0,0 +1,130 @@
+"""
+Storage backends for the response cache.
+
+Entries are invalidated through tag versions rather than by deleting keys:
+every tag has a counter, an entry records the counters of its tags when it is
+stored, and bumping a tag makes every entry stored under an older counter a
+miss. Invalidation is therefore one increment per tag however many entries
+carry it, and a lookup reads the entry and its tag versions together.
+
+MemoryBackend keeps an LRU of entries in the process, which is enough for a
+single worker. RedisBackend shares entries and tag versions between workers;
+entries expire with the Redis key TTL and tag counters are kept indefinitely.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+REDIS_PREFIX = 'sustainalign:cache:'
+
+
+class MemoryBackend:
+    """In-process LRU of entries with per-entry expiry"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, key: str, tags: List[str]) -> Tuple[Optional[Dict], List[int]]:
+        """The entry stored under `key` (or None) and the current versions of `tags`"""
+        with self._lock:
+            versions = [self._versions.get(tag, 0) for tag in tags]
+            item = self._entries.get(key)
+            if item is None:
+                return None, versions
+            expires, entry = item
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None, versions
+            self._entries.move_to_end(key)
+            return entry, versions
+
+    def store(self, key: str, entry: Dict, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def bump(self, tags: Iterable[str]):
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisBackend:
+    """Entries and tag versions in Redis, shared by every worker"""
+
+    name = 'redis'
+
+    def __init__(self, client, prefix: str = REDIS_PREFIX):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def connect(cls, url: str) -> Optional['RedisBackend']:
+        """A backend for `url`, or None (so the caller stays in-process) if Redis is unavailable"""
+        try:
+            import redis
+        except ImportError:
+            logger.warning("RESPONSE_CACHE_REDIS_URL is set but the redis package is not installed; using the in-process cache")
+            return None
+        try:
+            client = redis.Redis.from_url(url)
+            client.ping()
+        except Exception as e:
+            logger.warning(f"Could not reach Redis at {url}; using the in-process cache: {e}")
+            return None
+        return cls(client)
+
+    def _entry_key(self, key: str) -> str:
+        return f"{self.prefix}entry:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def lookup(self, key: str, tags: List[str]) -> Tuple[Optional[Dict], List[int]]:
+        values = self.client.mget([self._entry_key(key)] + [self._tag_key(tag) for tag in tags])
+        versions = [int(v) if v is not None else 0 for v in values[1:]]
+        if values[0] is None:
+            return None, versions
+        try:
+            return json.loads(values[0]), versions
+        except ValueError:
+            return None, versions
+
+    def store(self, key: str, entry: Dict, ttl: float):
+        self.client.set(self._entry_key(key), json.dumps(entry), ex=max(1, int(ttl)))
+
+    def bump(self, tags: Iterable[str]):
+        pipeline = self.client.pipeline(transaction=False)
+        for tag in tags:
+            pipeline.incr(self._tag_key(tag))
+        pipeline.execute()
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=f"{self.prefix}entry:*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def size(self) -> int:
+        return sum(1 for _ in self.client.scan_iter(match=f"{self.prefix}entry:*"))
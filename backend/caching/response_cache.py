@@ -0,0 +1,289 @@
+"""
+Tag-invalidated cache for read-heavy GET endpoints.
+
+Dashboard endpoints return the same JSON to every viewer until the rows behind
+them change, so ``@response_cache.cached(Model, ...)`` stores the response body
+keyed on the endpoint, its path arguments, the normalized query string and the
+tenant (the ``company_id`` the dashboard is scoped to).
+
+Each entry is tagged with the tables it reads. When the request narrows a table
+by one of its scope columns (``?company_id=5`` on a table with ``company_id``)
+the tag is narrowed to match, so a change to company 6's rows leaves company 5's
+dashboards cached. Session hooks collect the tags of every row a transaction
+inserts, updates or deletes - old and new scope values alike - and bump them
+once it commits. Bulk ``session.execute(insert/update/delete(Model))``
+statements invalidate the whole table. Writes that bypass the ORM session (raw
+SQL, other processes without these hooks) are only picked up when entries
+expire, after RESPONSE_CACHE_TTL seconds.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from functools import wraps
+from typing import Iterable, List, Optional, Set
+
+from flask import Response, current_app, make_response, request
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from .backends import MemoryBackend, RedisBackend
+
+logger = logging.getLogger(__name__)
+
+# Columns whose values narrow a table's tag
+SCOPE_COLUMNS = ('company_id', 'project_id', 'ngo_id')
+
+# The query argument that selects the tenant a dashboard is scoped to
+TENANT_ARG = 'company_id'
+
+
+def scope_tag(table: str, column: str, value) -> str:
+    return f"{table}:{column}={value}"
+
+
+def any_scope_tag(table: str) -> str:
+    """Bumped when rows of a table change without known scope values"""
+    return f"{table}:*"
+
+
+def cache_key(endpoint: str, view_args, args) -> str:
+    """Hash of the endpoint, path arguments, tenant and the remaining query args in a stable order"""
+    tenant = args.get(TENANT_ARG, type=int)
+    normalized = []
+    for name in sorted(args):
+        if name == TENANT_ARG:
+            continue
+        values = sorted(value for value in args.getlist(name) if value != '')
+        if values:
+            normalized.append([name, values])
+    payload = json.dumps([endpoint, view_args or {}, tenant, normalized], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """Flask extension caching decorated GET responses with tag-based invalidation"""
+
+    def __init__(self):
+        self.backend = None
+        self.default_ttl = 300
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.config.setdefault('RESPONSE_CACHE_ENABLED', True)
+        app.config.setdefault('RESPONSE_CACHE_REDIS_URL', None)
+        app.config.setdefault('RESPONSE_CACHE_TTL', 300)
+        app.config.setdefault('RESPONSE_CACHE_MAX_ENTRIES', 2048)
+        self.default_ttl = app.config['RESPONSE_CACHE_TTL']
+        backend = None
+        if app.config['RESPONSE_CACHE_REDIS_URL']:
+            backend = RedisBackend.connect(app.config['RESPONSE_CACHE_REDIS_URL'])
+        self.backend = backend or MemoryBackend(app.config['RESPONSE_CACHE_MAX_ENTRIES'])
+        app.extensions['response_cache'] = self
+        register_session_events()
+
+    # Reads --------------------------------------------------------------------------
+
+    def cached(self, *models, scope: Iterable[str] = (TENANT_ARG,), ttl: Optional[float] = None):
+        """Cache a GET view's 200 responses until a row of one of `models` changes.
+
+        `scope` names query arguments that narrow the cached result to rows with
+        the same column value; a table that has none of those columns is tagged
+        as a whole.
+        """
+        tables = [model.__table__ for model in models]
+        scope = tuple(scope)
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not self._active():
+                    return view(*args, **kwargs)
+                key = cache_key(request.endpoint, kwargs, request.args)
+                tags = self._tags(tables, scope)
+                try:
+                    entry, versions = self.backend.lookup(key, tags)
+                except Exception as e:
+                    logger.error(f"Response cache lookup failed: {str(e)}")
+                    return view(*args, **kwargs)
+
+                bypass = 'no-cache' in (request.headers.get('Cache-Control') or '')
+                if entry is not None and entry['versions'] == versions and not bypass:
+                    self._count(True)
+                    response = Response(entry['body'], status=entry['status'], mimetype=entry['mimetype'])
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+
+                self._count(False)
+                response = make_response(view(*args, **kwargs))
+                # Versions were read before the view ran, so a commit racing with it leaves the entry stale
+                self._store(key, response, versions, ttl)
+                response.headers['X-Cache'] = 'MISS'
+                return response
+
+            return wrapper
+
+        return decorator
+
+    def _active(self) -> bool:
+        return (
+            request.method == 'GET'
+            and self.backend is not None
+            and current_app.extensions.get('response_cache') is self
+            and current_app.config.get('RESPONSE_CACHE_ENABLED', True)
+        )
+
+    @staticmethod
+    def _tags(tables, scope) -> List[str]:
+        tags = []
+        for table in tables:
+            scoped = None
+            for column in scope:
+                value = request.args.get(column, type=int)
+                if value is not None and column in table.c:
+                    scoped = scope_tag(table.name, column, value)
+                    break
+            if scoped:
+                tags.extend((scoped, any_scope_tag(table.name)))
+            else:
+                tags.append(table.name)
+        return tags
+
+    def _store(self, key: str, response: Response, versions: List[int], ttl: Optional[float]):
+        if response.status_code != 200 or response.is_streamed:
+            return
+        try:
+            body = response.get_data().decode('utf-8')
+        except UnicodeDecodeError:
+            return
+        entry = {'status': 200, 'mimetype': response.mimetype, 'body': body, 'versions': versions}
+        try:
+            self.backend.store(key, entry, ttl or self.default_ttl)
+        except Exception as e:
+            logger.error(f"Response cache store failed: {str(e)}")
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        metrics = current_app.extensions.get('request_metrics')
+        if metrics is not None:
+            metrics.registry.observe_cache(request.endpoint, 'hit' if hit else 'miss')
+
+    # Invalidation -------------------------------------------------------------------
+
+    def invalidate(self, tags: Iterable[str]):
+        tags = sorted(set(tags))
+        if not tags or self.backend is None:
+            return
+        try:
+            self.backend.bump(tags)
+        except Exception as e:
+            logger.error(f"Response cache invalidation failed: {str(e)}")
+            return
+        with self._lock:
+            self.invalidations += len(tags)
+
+    def invalidate_tables(self, *models):
+        """Drop every cached response reading these tables"""
+        self.invalidate(tag for model in models for tag in _table_tags(model.__table__.name))
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': self.backend.name if self.backend is not None else None,
+                'entries': self.backend.size() if self.backend is not None else 0,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'invalidations': self.invalidations,
+            }
+
+
+response_cache = ResponseCache()
+
+
+# Session hooks ----------------------------------------------------------------------
+
+def _table_tags(table: str):
+    return table, any_scope_tag(table)
+
+
+def _row_tags(obj) -> Set[str]:
+    """Tags a changed row invalidates: its table plus each old and new scope value"""
+    state = inspect(obj)
+    table = state.mapper.local_table
+    tags = {table.name}
+    for column in SCOPE_COLUMNS:
+        if column not in table.c or column not in state.attrs:
+            continue
+        history = state.attrs[column].history
+        values = {v for v in (*history.added, *history.deleted, *history.unchanged) if v is not None}
+        if not values and column not in state.unloaded:
+            continue
+        if not values:
+            # Not loaded, so the row could belong to any scope
+            tags.add(any_scope_tag(table.name))
+        tags.update(scope_tag(table.name, column, value) for value in values)
+    return tags
+
+
+def _pending(session) -> Set[str]:
+    return session.info.setdefault('response_cache_tags', set())
+
+
+def _collect_changes(session, flush_context):
+    changed = list(session.new) + list(session.dirty) + list(session.deleted)
+    if not changed:
+        return
+    pending = _pending(session)
+    for obj in changed:
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        pending.update(_row_tags(obj))
+
+
+def _collect_bulk_writes(orm_execute_state):
+    """session.execute(insert/update/delete(Model)) skips the flush, so drop the whole table"""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None:
+        return
+    _pending(orm_execute_state.session).update(_table_tags(mapper.local_table.name))
+
+
+def _invalidate_committed(session):
+    tags = session.info.pop('response_cache_tags', None)
+    if tags:
+        response_cache.invalidate(tags)
+
+
+def _discard_changes(session):
+    session.info.pop('response_cache_tags', None)
+
+
+_events_registered = False
+
+
+def register_session_events():
+    """Hook every session (db.session and ad-hoc Sessions) once per process"""
+    global _events_registered
+    if _events_registered:
+        return
+    event.listen(Session, 'after_flush', _collect_changes)
+    event.listen(Session, 'do_orm_execute', _collect_bulk_writes)
+    event.listen(Session, 'after_commit', _invalidate_committed)
+    event.listen(Session, 'after_rollback', _discard_changes)
+    _events_registered = True
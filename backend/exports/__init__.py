@@ -0,0 +1,7 @@
+# Bulk Export Package
+# Streams full tables as CSV, JSONL or Parquet with constant memory
+
+from .datasets import DATASETS, ExportError, export_rows
+from .writers import FORMATS, write_export
+
+__all__ = ['DATASETS', 'ExportError', 'export_rows', 'FORMATS', 'write_export']
@@ -0,0 +1,128 @@
+"""
+Exportable datasets.
+
+Each dataset is a table exported in primary key order through a server-side
+cursor (`yield_per`), so rows are fetched in fixed-size partitions however many
+there are. Exports resume with `after_id`: a client that lost the connection
+passes the last id it received and gets the remaining rows.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models.audit import AuditEvent
+from models.base import db
+from models.impact import ImpactTimeSeries
+from models.projects import Project
+
+# Rows fetched per round trip and per written chunk
+PARTITION_SIZE = 1000
+
+
+class ExportError(ValueError):
+    """Invalid export request (unknown dataset or filter value)"""
+
+
+def _int(value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        raise ExportError(f"'{value}' is not a whole number")
+
+
+def _datetime(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ExportError(f"'{value}' is not an ISO date or datetime")
+
+
+def _date(value: str) -> date:
+    return _datetime(value).date()
+
+
+def _equals(column, parse: Callable = str):
+    return lambda value: column == parse(value)
+
+
+def _at_least(column, parse: Callable):
+    return lambda value: column >= parse(value)
+
+
+def _before(column, parse: Callable):
+    return lambda value: column < parse(value)
+
+
+@dataclass
+class ExportDataset:
+    """A table, its primary key and the query-string filters it accepts"""
+    name: str
+    model: type
+    filters: Dict[str, Callable] = field(default_factory=dict)
+
+    @property
+    def columns(self) -> List:
+        return list(self.model.__table__.columns)
+
+    @property
+    def column_names(self) -> List[str]:
+        return [column.name for column in self.columns]
+
+    def statement(self, params: Dict[str, str], after_id: Optional[int] = None, limit: Optional[int] = None):
+        unknown = [name for name in params if name not in self.filters]
+        if unknown:
+            raise ExportError(f"Unknown filters for {self.name}: {', '.join(sorted(unknown))}")
+        key = self.model.__table__.c.id
+        statement = select(*self.columns).order_by(key)
+        for name, value in params.items():
+            statement = statement.where(self.filters[name](value))
+        if after_id is not None:
+            statement = statement.where(key > after_id)
+        if limit:
+            statement = statement.limit(limit)
+        return statement
+
+
+DATASETS: Dict[str, ExportDataset] = {
+    'projects': ExportDataset('projects', Project, {
+        'status': _equals(Project.status),
+        'visibility': _equals(Project.visibility),
+        'created_by': _equals(Project.created_by, _int),
+        'location_country': _equals(Project.location_country),
+        'updated_since': _at_least(Project.updated_at, _datetime),
+        'created_since': _at_least(Project.created_at, _datetime),
+    }),
+    'audit_events': ExportDataset('audit_events', AuditEvent, {
+        'entity_type': _equals(AuditEvent.entity_type),
+        'entity_id': _equals(AuditEvent.entity_id, _int),
+        'action': _equals(AuditEvent.action),
+        'actor_role': _equals(AuditEvent.actor_role),
+        'source': _equals(AuditEvent.source),
+        'since': _at_least(AuditEvent.created_at, _datetime),
+        'until': _before(AuditEvent.created_at, _datetime),
+    }),
+    'impact_time_series': ExportDataset('impact_time_series', ImpactTimeSeries, {
+        'metric': _equals(ImpactTimeSeries.metric_name),
+        'company_id': _equals(ImpactTimeSeries.company_id, _int),
+        'project_id': _equals(ImpactTimeSeries.project_id, _int),
+        'since': _at_least(ImpactTimeSeries.ts_date, _date),
+        'until': _before(ImpactTimeSeries.ts_date, _date),
+    }),
+}
+
+
+def export_rows(dataset: ExportDataset, params: Dict[str, str] = None, after_id: Optional[int] = None,
+                limit: Optional[int] = None, session: Session = None,
+                partition_size: int = PARTITION_SIZE) -> Iterator[List[Tuple]]:
+    """Yield the dataset's rows in partitions of at most `partition_size`"""
+    statement = dataset.statement(params or {}, after_id, limit)
+    result = (session or db.session).execute(statement.execution_options(yield_per=partition_size))
+    try:
+        for partition in result.partitions():
+            yield partition
+    finally:
+        result.close()
@@ -0,0 +1,142 @@
+"""
+Streaming writers for exported rows.
+
+Each writer turns an iterator of row partitions into an iterator of encoded
+chunks, one chunk per partition, so a response or file receives data as soon as
+it is read and never holds more than one partition in memory. Parquet writes
+one row group per partition and needs the optional pyarrow package.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterable, Iterator, List, Tuple
+
+from sqlalchemy import JSON, Boolean, Date, DateTime, Float, Integer, Numeric
+
+from models.types import JSONText
+
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+
+def _json_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return _json_value(value)
+
+
+def write_csv(columns: List, partitions: Iterable[List[Tuple]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.name for column in columns])
+    for partition in partitions:
+        writer.writerows([_csv_value(value) for value in row] for row in partition)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def write_jsonl(columns: List, partitions: Iterable[List[Tuple]]) -> Iterator[bytes]:
+    names = [column.name for column in columns]
+    for partition in partitions:
+        lines = [json.dumps({name: _json_value(value) for name, value in zip(names, row)}, default=str)
+                 for row in partition]
+        yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last drain"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_type(pa, column):
+    if isinstance(column.type, Boolean):
+        return pa.bool_()
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, (Float, Numeric)):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp('us')
+    if isinstance(column.type, Date):
+        return pa.date32()
+    return pa.string()
+
+
+def write_parquet(columns: List, partitions: Iterable[List[Tuple]]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([pa.field(column.name, _arrow_type(pa, column)) for column in columns])
+    is_json = [isinstance(column.type, (JSON, JSONText)) for column in columns]
+    is_float = [isinstance(column.type, Numeric) and not isinstance(column.type, Float) for column in columns]
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for partition in partitions:
+            arrays = []
+            for index, column in enumerate(columns):
+                values = [row[index] for row in partition]
+                if is_json[index]:
+                    values = [json.dumps(v) if v is not None else None for v in values]
+                elif is_float[index]:
+                    values = [float(v) if v is not None else None for v in values]
+                arrays.append(pa.array(values, type=schema.field(column.name).type))
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+WRITERS = {'csv': write_csv, 'jsonl': write_jsonl, 'parquet': write_parquet}
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def write_export(file_format: str, columns: List, partitions: Iterable[List[Tuple]]) -> Iterator[bytes]:
+    """Encoded chunks of the rows in the requested format"""
+    return WRITERS[file_format](columns, partitions)
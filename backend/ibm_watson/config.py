@@ -0,0 +1,82 @@
+"""
+Configuration for the IBM WatsonX Orchestrate integration.
+
+Values come from the environment (see config/env_example.txt). Agent definitions
+are read from the YAML files under ibm_watson/agents/.
+"""
+
+import logging
+import os
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+AGENTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'agents')
+
+# Values left over from env_example.txt rather than real credentials
+_PLACEHOLDER_MARKERS = ('your-', 'add-your-')
+
+
+def _is_placeholder(value: str) -> bool:
+    return not value or any(value.startswith(marker) for marker in _PLACEHOLDER_MARKERS)
+
+
+def _load_agent_configs(directory: str = AGENTS_DIR) -> Dict[str, Dict[str, Any]]:
+    """Agent name -> YAML definition for every agent spec in `directory`"""
+    try:
+        import yaml
+    except ImportError:
+        logger.warning("PyYAML not installed; Watson agent definitions unavailable")
+        return {}
+
+    configs = {}
+    if not os.path.isdir(directory):
+        return configs
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(('.yaml', '.yml')):
+            continue
+        try:
+            with open(os.path.join(directory, filename), encoding='utf-8') as f:
+                spec = yaml.safe_load(f) or {}
+        except Exception as e:
+            logger.warning(f"Could not read agent spec {filename}: {e}")
+            continue
+        if spec.get('name'):
+            configs[spec['name']] = spec
+    return configs
+
+
+class WatsonConfig:
+    """Watson connection settings and local tool runtime options"""
+
+    def __init__(self):
+        self.reload()
+
+    def reload(self):
+        """Re-read the environment, e.g. after load_dotenv()"""
+        self.environment_name = os.environ.get('WO_DEVELOPER_EDITION_SOURCE', 'local')
+        self.service_url = os.environ.get('WATSON_SERVICE_URL', '')
+        self.api_key = os.environ.get('WATSON_API_KEY') or os.environ.get('WO_API_KEY', '')
+        self.project_id = os.environ.get('WO_INSTANCE', '')
+        self.default_llm = os.environ.get('WATSON_DEFAULT_LLM', 'watsonx/ibm/granite-3-2-8b-instruct')
+
+        # Local tool runtime: "inline" runs tools in the calling thread, "process" on a pool
+        self.tool_execution = os.environ.get('WATSON_TOOL_EXECUTION', 'inline').lower()
+        self.tool_workers = int(os.environ.get('WATSON_TOOL_WORKERS', '2'))
+        self.tool_timeout = float(os.environ.get('WATSON_TOOL_TIMEOUT', '300'))
+
+        # Result cache for agent operations; a path persists it to SQLite
+        self.cache_enabled = os.environ.get('WATSON_CACHE_ENABLED', 'true').lower() == 'true'
+        self.cache_size = int(os.environ.get('WATSON_CACHE_SIZE', '1024'))
+        self.cache_ttl = float(os.environ.get('WATSON_CACHE_TTL', '3600'))
+        self.cache_path = os.environ.get('WATSON_CACHE_PATH') or None
+
+        self.agent_configs = _load_agent_configs()
+
+    def is_configured(self) -> bool:
+        """Whether credentials for a remote Orchestrate instance are present"""
+        return not _is_placeholder(self.api_key) and not _is_placeholder(self.service_url)
+
+
+# Global config instance
+watson_config = WatsonConfig()
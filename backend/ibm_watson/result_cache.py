@@ -0,0 +1,196 @@
+"""
+Result cache for Watson agent operations.
+
+Agent operations are pure functions of their project and company inputs, so
+results are memoized on a fingerprint of the canonicalized inputs. Entries also
+record a version - the `updated_at` stamps of the project and company the inputs
+came from - and an entry whose version no longer matches is treated as a miss
+and replaced, so editing a project or company invalidates its cached analyses
+without waiting for the TTL. The in-memory store is an LRU capped at
+`max_entries`; with a `path` set, entries are written through to SQLite so they
+survive restarts.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Fields that identify where the inputs came from rather than what they are
+VERSION_FIELDS = ('updated_at',)
+
+
+def _canonical(value):
+    """Normalize a value so equal inputs serialize identically"""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items() if k not in VERSION_FIELDS}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonical(v) for v in value), key=repr)
+    if isinstance(value, float) and value.is_integer():
+        # 50000 and 50000.0 score the same
+        return int(value)
+    if isinstance(value, Decimal):
+        return _canonical(float(value))
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def fingerprint(*parts) -> str:
+    """Stable hash of the canonicalized parts"""
+    payload = json.dumps(_canonical(list(parts)), sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def input_version(*records: Optional[Dict[str, Any]]) -> str:
+    """Version of a set of input records: their ids and `updated_at` stamps"""
+    return '|'.join(f"{(record or {}).get('id')}@{(record or {}).get('updated_at')}" for record in records)
+
+
+class ResultCache:
+    """TTL + LRU cache with optional SQLite persistence and hit/miss counters"""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._db = None
+        if path:
+            self._open(path)
+
+    def _open(self, path: str):
+        try:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS watson_results '
+                '(key TEXT PRIMARY KEY, version TEXT, expires_at REAL, value TEXT)'
+            )
+            self._db.execute('DELETE FROM watson_results WHERE expires_at <= ?', (time.time(),))
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Watson result cache persistence disabled ({path}): {e}")
+            self._db = None
+
+    def configure(self, max_entries: int, ttl: float, path: Optional[str] = None):
+        """Apply new limits, e.g. after the Watson config is reloaded"""
+        with self._lock:
+            self.max_entries = max_entries
+            self.ttl = ttl
+            if path != self.path:
+                self.close()
+                self.path = path
+                if path:
+                    self._open(path)
+            self._evict()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    # Lookup ---------------------------------------------------------------------------
+
+    def get(self, key: str, version: Optional[str] = None):
+        """Cached value for `key`, or None when missing, expired or stale"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._load(key)
+            if entry is not None:
+                entry_version, expires_at, value = entry
+                if expires_at > now and entry_version == version:
+                    self._entries[key] = entry
+                    self._entries.move_to_end(key)
+                    self._evict()
+                    self.hits += 1
+                    return value
+                self._discard(key)
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value, version: Optional[str] = None):
+        entry = (version, time.time() + self.ttl, value)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._evict()
+            if self._db is not None:
+                try:
+                    self._db.execute('INSERT OR REPLACE INTO watson_results VALUES (?, ?, ?, ?)',
+                                     (key, version, entry[1], json.dumps(value, default=str)))
+                    self._db.commit()
+                except (sqlite3.Error, TypeError, ValueError) as e:
+                    logger.warning(f"Could not persist Watson result {key[:12]}: {e}")
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], version: Optional[str] = None,
+                       cacheable: Callable[[Any], bool] = lambda value: True):
+        """Return the cached value or compute, store and return a fresh one.
+
+        The second element of the returned tuple says whether it was a hit.
+        """
+        value = self.get(key, version)
+        if value is not None:
+            return value, True
+        value = compute()
+        if value is not None and cacheable(value):
+            self.set(key, value, version)
+        return value, False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM watson_results')
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl,
+            'persistent': self._db is not None,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+        }
+
+    # Internals ------------------------------------------------------------------------
+
+    def _load(self, key: str):
+        if self._db is None:
+            return None
+        row = self._db.execute('SELECT version, expires_at, value FROM watson_results WHERE key = ?',
+                               (key,)).fetchone()
+        if row is None:
+            return None
+        return row[0], row[1], json.loads(row[2])
+
+    def _discard(self, key: str):
+        self._entries.pop(key, None)
+        if self._db is not None:
+            self._db.execute('DELETE FROM watson_results WHERE key = ?', (key,))
+            self._db.commit()
+
+    def _evict(self):
+        # Only the in-memory LRU is capped; expired rows on disk are dropped when read
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
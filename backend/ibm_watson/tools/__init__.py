@@ -3,13 +3,15 @@ IBM WatsonX Orchestrate Tools for SustainAlign
 """
 
 from .project_analyzer import project_analyzer_function
-from .impact_calculator import impact_calculator_function
-from .risk_assessor import risk_assessor_function
+from .impact_calculator import impact_calculator_function, impact_calculator_batch_function
+from .risk_assessor import risk_assessor_function, risk_assessor_batch_function
 from .budget_optimizer import budget_optimizer_function
 
 __all__ = [
     'project_analyzer_function',
-    'impact_calculator_function', 
+    'impact_calculator_function',
+    'impact_calculator_batch_function',
     'risk_assessor_function',
+    'risk_assessor_batch_function',
     'budget_optimizer_function'
 ]
@@ -4,12 +4,26 @@ Calculates social and environmental impact metrics
 """
 
 import logging
-from typing import Dict, Any, List
+from bisect import bisect_left
+from typing import Dict, Any, List, Sequence, Tuple
 import math
+import numpy as np
 from ibm_watsonx_orchestrate.agent_builder.tools import tool
 
 logger = logging.getLogger(__name__)
 
+# Upper bounds of the scoring tiers for each quantity; a value <= 0 scores 0,
+# <= bounds[1] scores 0.3, <= bounds[2] 0.6, <= bounds[3] 0.8 and anything above 1.0
+TIER_SCORES = (0.0, 0.3, 0.6, 0.8, 1.0)
+TIER_BOUNDS = {
+    'beneficiaries': (0, 100, 1000, 10000),
+    'carbon_reduction_tons': (0, 10, 100, 1000),
+    'water_conservation_liters': (0, 10000, 100000, 1000000),  # 10k / 100k / 1M liters
+    'waste_reduction_kg': (0, 100, 1000, 10000),  # 100kg / 1 ton / 10 tons
+    'jobs_created': (0, 5, 20, 100),
+    'local_spending_usd': (0, 10000, 100000, 1000000),  # $10k / $100k / $1M
+}
+
 @tool
 def impact_calculator_function(project_metrics: Dict[str, Any], 
                              baseline_data: Dict[str, Any] = None,
@@ -200,83 +214,33 @@ def _calculate_overall_impact(social_impact: Dict[str, Any],
     
     return overall_score
 
+def _tier_score(value: float, bounds) -> float:
+    """Map a quantity onto the 0 / 0.3 / 0.6 / 0.8 / 1.0 tiers delimited by `bounds`"""
+    return TIER_SCORES[bisect_left(bounds, value)]
+
 def _normalize_beneficiary_impact(beneficiaries: int) -> float:
     """Normalize beneficiary count to 0-1 score"""
-    if beneficiaries <= 0:
-        return 0.0
-    elif beneficiaries <= 100:
-        return 0.3
-    elif beneficiaries <= 1000:
-        return 0.6
-    elif beneficiaries <= 10000:
-        return 0.8
-    else:
-        return 1.0
+    return _tier_score(beneficiaries, TIER_BOUNDS['beneficiaries'])
 
 def _normalize_carbon_impact(carbon_reduction: float) -> float:
     """Normalize carbon reduction to 0-1 score"""
-    if carbon_reduction <= 0:
-        return 0.0
-    elif carbon_reduction <= 10:
-        return 0.3
-    elif carbon_reduction <= 100:
-        return 0.6
-    elif carbon_reduction <= 1000:
-        return 0.8
-    else:
-        return 1.0
+    return _tier_score(carbon_reduction, TIER_BOUNDS['carbon_reduction_tons'])
 
 def _normalize_water_impact(water_conservation: float) -> float:
     """Normalize water conservation to 0-1 score"""
-    if water_conservation <= 0:
-        return 0.0
-    elif water_conservation <= 10000:  # 10k liters
-        return 0.3
-    elif water_conservation <= 100000:  # 100k liters
-        return 0.6
-    elif water_conservation <= 1000000:  # 1M liters
-        return 0.8
-    else:
-        return 1.0
+    return _tier_score(water_conservation, TIER_BOUNDS['water_conservation_liters'])
 
 def _normalize_waste_impact(waste_reduction: float) -> float:
     """Normalize waste reduction to 0-1 score"""
-    if waste_reduction <= 0:
-        return 0.0
-    elif waste_reduction <= 100:  # 100kg
-        return 0.3
-    elif waste_reduction <= 1000:  # 1 ton
-        return 0.6
-    elif waste_reduction <= 10000:  # 10 tons
-        return 0.8
-    else:
-        return 1.0
+    return _tier_score(waste_reduction, TIER_BOUNDS['waste_reduction_kg'])
 
 def _normalize_jobs_impact(jobs_created: int) -> float:
     """Normalize jobs created to 0-1 score"""
-    if jobs_created <= 0:
-        return 0.0
-    elif jobs_created <= 5:
-        return 0.3
-    elif jobs_created <= 20:
-        return 0.6
-    elif jobs_created <= 100:
-        return 0.8
-    else:
-        return 1.0
+    return _tier_score(jobs_created, TIER_BOUNDS['jobs_created'])
 
 def _normalize_spending_impact(local_spending: float) -> float:
     """Normalize local spending to 0-1 score"""
-    if local_spending <= 0:
-        return 0.0
-    elif local_spending <= 10000:  # $10k
-        return 0.3
-    elif local_spending <= 100000:  # $100k
-        return 0.6
-    elif local_spending <= 1000000:  # $1M
-        return 0.8
-    else:
-        return 1.0
+    return _tier_score(local_spending, TIER_BOUNDS['local_spending_usd'])
 
 def _calculate_education_impact(education_metrics: Dict[str, Any]) -> float:
     """Calculate education impact score"""
@@ -447,3 +411,226 @@ def _generate_impact_recommendations(overall_impact: float,
         recommendations.append("Excellent impact potential - proceed with implementation")
     
     return recommendations
+
+
+# Batch evaluation ------------------------------------------------------------------
+
+_QUANTITY_FIELDS = ('beneficiaries', 'carbon_reduction_tons', 'water_conservation_liters',
+                    'waste_reduction_kg', 'jobs_created', 'local_spending_usd')
+_NESTED_SCORERS = {
+    'education_metrics': _calculate_education_impact,
+    'health_metrics': _calculate_health_impact,
+    'community_metrics': _calculate_community_impact,
+    'biodiversity_metrics': _calculate_biodiversity_impact,
+    'skill_development_metrics': _calculate_skills_impact,
+    'market_development_metrics': _calculate_market_impact,
+}
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def _tier_scores(values: np.ndarray, bounds) -> np.ndarray:
+    """Vectorized _tier_score: searchsorted(side='left') matches bisect_left"""
+    return np.asarray(TIER_SCORES)[np.searchsorted(bounds, values, side='left')]
+
+
+def _round2(values: np.ndarray) -> np.ndarray:
+    # Python's round() is correctly rounded where np.round is not; keep parity with the scalar path
+    return np.array([round(v, 2) for v in values.tolist()], dtype=float)
+
+
+# Marks a field a project in a list of dicts doesn't have
+_ABSENT = object()
+
+
+def _is_null(value) -> bool:
+    """None, a missing list entry or NaN (how a DataFrame reports missing values)"""
+    return value is None or value is _ABSENT or (isinstance(value, float) and math.isnan(value))
+
+
+def _as_columns(projects, fields) -> Tuple[int, Dict[str, Sequence]]:
+    """Project count and field -> values for a list of metric dicts, a column -> values mapping or a DataFrame.
+
+    Columnar and DataFrame input are used as-is; fields the input doesn't have are left out.
+    """
+    if hasattr(projects, 'to_dict') and hasattr(projects, 'columns'):
+        return len(projects), {field: projects[field].to_numpy() for field in fields if field in projects.columns}
+    if isinstance(projects, dict):
+        columns = {k: v if hasattr(v, '__len__') else list(v) for k, v in projects.items()}
+        lengths = {len(v) for v in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        return (lengths.pop() if lengths else 0), {field: columns[field] for field in fields if field in columns}
+    rows = list(projects)
+    return len(rows), {field: [row.get(field, _ABSENT) for row in rows]
+                       for field in fields if any(field in row for row in rows)}
+
+
+def _quantity_array(values, n: int) -> np.ndarray:
+    """Float array of a quantity column; missing and null values count as 0"""
+    if values is None:
+        return np.zeros(n)
+    if isinstance(values, list):
+        values = [0 if _is_null(v) else v for v in values]
+    values = np.asarray(values, dtype=float).reshape(n)
+    return np.where(np.isnan(values), 0.0, values)
+
+
+def _reported(values, i: int, default):
+    """Value echoed back in the details: the default when absent, None when null, plain Python types"""
+    if values is None or values[i] is _ABSENT:
+        return default
+    value = values[i]
+    if _is_null(value):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _summary(values: np.ndarray, percentiles) -> Dict[str, Any]:
+    if not len(values):
+        return {"mean": None, "median": None, "min": None, "max": None, "std": None, "percentiles": {}}
+    return {
+        "mean": round(float(values.mean()), 4),
+        "median": round(float(np.median(values)), 4),
+        "min": round(float(values.min()), 4),
+        "max": round(float(values.max()), 4),
+        "std": round(float(values.std()), 4),
+        "percentiles": {
+            f"p{p:g}": round(float(v), 4) for p, v in zip(percentiles, np.percentile(values, percentiles))
+        },
+    }
+
+
+def calculate_impact_batch(projects, baseline_data: Dict[str, Any] = None, timeframe: str = "12_months",
+                           include_details: bool = True, percentiles=DEFAULT_PERCENTILES) -> Dict[str, Any]:
+    """Score a whole portfolio at once.
+
+    Each per-project result matches impact_calculator_function's output for the
+    same metrics (plus an ``id`` when the input has one and the project's
+    percentile within the portfolio). With ``include_details=False`` only the
+    scores are returned, which is what dashboards need for large portfolios.
+    Missing or null quantities count as 0.
+    """
+    n, columns = _as_columns(projects, ('id',) + _QUANTITY_FIELDS + tuple(_NESTED_SCORERS))
+    percentiles = tuple(percentiles)
+
+    quantities = {field: _quantity_array(columns.get(field), n) for field in _QUANTITY_FIELDS}
+    tiers = {field: _tier_scores(values, TIER_BOUNDS[field]) for field, values in quantities.items()}
+    nested_values = {
+        field: [{} if _is_null(v) else v for v in columns[field]] if field in columns else [{}] * n
+        for field in _NESTED_SCORERS
+    }
+    nested = {
+        field: np.array([scorer(v) for v in nested_values[field]], dtype=float).reshape(n)
+        for field, scorer in _NESTED_SCORERS.items()
+    }
+
+    # Same operand order as the scalar helpers so the floats come out identical
+    social = _round2(tiers['beneficiaries'] * 0.3 + nested['education_metrics'] * 0.25
+                     + nested['health_metrics'] * 0.25 + nested['community_metrics'] * 0.2)
+    environmental = _round2(tiers['carbon_reduction_tons'] * 0.4 + tiers['water_conservation_liters'] * 0.3
+                            + tiers['waste_reduction_kg'] * 0.2 + nested['biodiversity_metrics'] * 0.1)
+    economic = _round2(tiers['jobs_created'] * 0.3 + tiers['local_spending_usd'] * 0.3
+                       + nested['skill_development_metrics'] * 0.2 + nested['market_development_metrics'] * 0.2)
+    unrounded_overall = social * 0.4 + environmental * 0.35 + economic * 0.25
+    overall = _round2(unrounded_overall)
+
+    # Share of the portfolio scoring at or below each project
+    percentile_rank = (np.searchsorted(np.sort(overall), overall, side='right') / n * 100 if n else overall).tolist()
+
+    # Plain floats from here on so results serialize like the scalar path's
+    aggregates = {'social': social, 'environmental': environmental, 'economic': economic, 'overall': overall}
+    tiers = {field: values.tolist() for field, values in tiers.items()}
+    nested = {field: values.tolist() for field, values in nested.items()}
+    social, environmental, economic, overall = (values.tolist() for values in aggregates.values())
+    unrounded_overall = unrounded_overall.tolist()
+
+    results = []
+    ids = columns.get('id')
+    for i in range(n):
+        if include_details:
+            social_impact = {
+                "score": social[i],
+                "beneficiary_impact": {"count": _reported(columns.get('beneficiaries'), i, 0), "score": round(tiers['beneficiaries'][i], 2)},
+                "education_impact": {"metrics": _reported(columns.get('education_metrics'), i, {}), "score": round(nested['education_metrics'][i], 2)},
+                "health_impact": {"metrics": _reported(columns.get('health_metrics'), i, {}), "score": round(nested['health_metrics'][i], 2)},
+                "community_impact": {"metrics": _reported(columns.get('community_metrics'), i, {}), "score": round(nested['community_metrics'][i], 2)},
+            }
+            environmental_impact = {
+                "score": environmental[i],
+                "carbon_impact": {"reduction_tons": _reported(columns.get('carbon_reduction_tons'), i, 0), "score": round(tiers['carbon_reduction_tons'][i], 2)},
+                "water_impact": {"conservation_liters": _reported(columns.get('water_conservation_liters'), i, 0), "score": round(tiers['water_conservation_liters'][i], 2)},
+                "waste_impact": {"reduction_kg": _reported(columns.get('waste_reduction_kg'), i, 0), "score": round(tiers['waste_reduction_kg'][i], 2)},
+                "biodiversity_impact": {"metrics": _reported(columns.get('biodiversity_metrics'), i, {}), "score": round(nested['biodiversity_metrics'][i], 2)},
+            }
+            economic_impact = {
+                "score": economic[i],
+                "employment_impact": {"jobs_created": _reported(columns.get('jobs_created'), i, 0), "score": round(tiers['jobs_created'][i], 2)},
+                "spending_impact": {"local_spending_usd": _reported(columns.get('local_spending_usd'), i, 0), "score": round(tiers['local_spending_usd'][i], 2)},
+                "skills_impact": {"metrics": _reported(columns.get('skill_development_metrics'), i, {}), "score": round(nested['skill_development_metrics'][i], 2)},
+                "market_impact": {"metrics": _reported(columns.get('market_development_metrics'), i, {}), "score": round(nested['market_development_metrics'][i], 2)},
+            }
+            result = {
+                "timeframe": timeframe,
+                "overall_impact_score": overall[i],
+                "social_impact": social_impact,
+                "environmental_impact": environmental_impact,
+                "economic_impact": economic_impact,
+                "insights": _generate_impact_insights(social_impact, environmental_impact, economic_impact),
+                "recommendations": _generate_impact_recommendations(unrounded_overall[i], social_impact, environmental_impact, economic_impact),
+                "success": True,
+            }
+        else:
+            result = {
+                "overall_impact_score": overall[i],
+                "social_score": social[i],
+                "environmental_score": environmental[i],
+                "economic_score": economic[i],
+            }
+        if ids is not None and ids[i] is not _ABSENT:
+            result = {"id": _reported(ids, i, None), **result}
+        result["portfolio_percentile"] = round(percentile_rank[i], 2)
+        results.append(result)
+
+    return {
+        "timeframe": timeframe,
+        "project_count": n,
+        "projects": results,
+        "portfolio": {
+            "overall_impact": _summary(aggregates['overall'], percentiles),
+            "social_impact": _summary(aggregates['social'], percentiles),
+            "environmental_impact": _summary(aggregates['environmental'], percentiles),
+            "economic_impact": _summary(aggregates['economic'], percentiles),
+            "totals": {field: float(values.sum()) for field, values in quantities.items()},
+            "high_impact_projects": int((aggregates['overall'] > 0.8).sum()),
+            "low_impact_projects": int((aggregates['overall'] < 0.5).sum()),
+        },
+        "success": True,
+    }
+
+
+@tool
+def impact_calculator_batch_function(projects: List[Dict[str, Any]],
+                                     baseline_data: Dict[str, Any] = None,
+                                     timeframe: str = "12_months",
+                                     include_details: bool = True) -> Dict[str, Any]:
+    """
+    Calculate impact metrics for a portfolio of projects in one call
+    
+    Args:
+        projects: List of project impact metrics (same fields as impact_calculator_function)
+        baseline_data: Baseline impact data for comparison
+        timeframe: Assessment timeframe (6_months, 12_months, 24_months)
+        include_details: Return the full per-project breakdown instead of just scores
+    
+    Returns:
+        Per-project impact scores plus portfolio aggregates and percentiles
+    """
+    try:
+        logger.info(f"Calculating impact metrics for {len(projects)} projects")
+        return calculate_impact_batch(projects, baseline_data, timeframe, include_details)
+    except Exception as e:
+        logger.error(f"Error in batch impact calculation: {str(e)}")
+        return {
+            "error": f"Batch impact calculation failed: {str(e)}",
+            "success": False
+        }
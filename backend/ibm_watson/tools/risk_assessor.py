@@ -4,12 +4,71 @@ Assesses project risks and mitigation strategies
 """
 
 import logging
+import re
 from typing import Dict, Any, List
 import json
 from ibm_watsonx_orchestrate.agent_builder.tools import tool
 
 logger = logging.getLogger(__name__)
 
+# Location keywords, matched as substrings of the lower-cased location
+HIGH_RISK_LOCATION_KEYWORDS = ('conflict', 'war', 'disaster', 'remote', 'rural')
+MEDIUM_RISK_LOCATION_KEYWORDS = ('developing', 'emerging', 'transition')
+
+
+def _keyword_matcher(keywords):
+    """One compiled alternation instead of a substring scan per keyword"""
+    return re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+
+
+_HIGH_RISK_LOCATION_RE = _keyword_matcher(HIGH_RISK_LOCATION_KEYWORDS)
+_MEDIUM_RISK_LOCATION_RE = _keyword_matcher(MEDIUM_RISK_LOCATION_KEYWORDS)
+
+# Risk scores of categorical fields
+FUNDING_SOURCE_RISK = {
+    'government': 0.2,
+    'foundation': 0.3,
+    'corporate': 0.4,
+    'individual': 0.6,
+    'crowdfunding': 0.7,
+    'unknown': 0.8
+}
+COMPLEXITY_RISK = {
+    'low': 0.2,
+    'medium': 0.5,
+    'high': 0.8,
+    'very_high': 1.0
+}
+CLIMATE_RISK = {
+    'low': 0.2,
+    'medium': 0.5,
+    'high': 0.8,
+    'very_high': 1.0
+}
+ENGAGEMENT_RISK = {
+    'low': 0.7,
+    'medium': 0.4,
+    'high': 0.2
+}
+CULTURAL_RISK = {
+    'low': 0.8,
+    'medium': 0.5,
+    'high': 0.2
+}
+COMPLIANCE_RISK = {
+    'compliant': 0.1,
+    'partially_compliant': 0.4,
+    'non_compliant': 0.8,
+    'unknown': 0.7
+}
+LEGAL_RISK = {
+    'stable': 0.2,
+    'evolving': 0.5,
+    'unstable': 0.8,
+    'unknown': 0.6
+}
+
+
 @tool
 def risk_assessor_function(project_data: Dict[str, Any], 
                           risk_factors: List[Dict[str, Any]] = None,
@@ -35,31 +94,8 @@ def risk_assessor_function(project_data: Dict[str, Any],
         social_risks = _assess_social_risks(project_data)
         regulatory_risks = _assess_regulatory_risks(project_data)
         
-        # Calculate overall risk score
-        overall_risk = _calculate_overall_risk(
-            financial_risks, operational_risks, environmental_risks, 
-            social_risks, regulatory_risks
-        )
-        
-        # Generate risk mitigation recommendations
-        mitigation_recommendations = _generate_mitigation_recommendations(
-            financial_risks, operational_risks, environmental_risks,
-            social_risks, regulatory_risks
-        )
-        
-        return {
-            "overall_risk_score": round(overall_risk, 2),
-            "risk_categories": {
-                "financial_risks": financial_risks,
-                "operational_risks": operational_risks,
-                "environmental_risks": environmental_risks,
-                "social_risks": social_risks,
-                "regulatory_risks": regulatory_risks
-            },
-            "mitigation_recommendations": mitigation_recommendations,
-            "risk_level": _determine_risk_level(overall_risk),
-            "success": True
-        }
+        return _risk_result(financial_risks, operational_risks, environmental_risks,
+                            social_risks, regulatory_risks)
         
     except Exception as e:
         logger.error(f"Error in risk assessment: {str(e)}")
@@ -68,6 +104,39 @@ def risk_assessor_function(project_data: Dict[str, Any],
             "success": False
         }
 
+def _risk_result(financial_risks: Dict[str, Any],
+                 operational_risks: Dict[str, Any],
+                 environmental_risks: Dict[str, Any],
+                 social_risks: Dict[str, Any],
+                 regulatory_risks: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine the five category assessments into the tool's response"""
+    
+    # Calculate overall risk score
+    overall_risk = _calculate_overall_risk(
+        financial_risks, operational_risks, environmental_risks, 
+        social_risks, regulatory_risks
+    )
+    
+    # Generate risk mitigation recommendations
+    mitigation_recommendations = _generate_mitigation_recommendations(
+        financial_risks, operational_risks, environmental_risks,
+        social_risks, regulatory_risks
+    )
+    
+    return {
+        "overall_risk_score": round(overall_risk, 2),
+        "risk_categories": {
+            "financial_risks": financial_risks,
+            "operational_risks": operational_risks,
+            "environmental_risks": environmental_risks,
+            "social_risks": social_risks,
+            "regulatory_risks": regulatory_risks
+        },
+        "mitigation_recommendations": mitigation_recommendations,
+        "risk_level": _determine_risk_level(overall_risk),
+        "success": True
+    }
+
 def _assess_financial_risks(project_data: Dict[str, Any]) -> Dict[str, Any]:
     """Assess financial risks"""
     
@@ -325,15 +394,7 @@ def _calculate_budget_risk(budget: float, timeline: int) -> float:
 
 def _calculate_funding_risk(funding_source: str) -> float:
     """Calculate funding source risk score"""
-    risk_levels = {
-        'government': 0.2,
-        'foundation': 0.3,
-        'corporate': 0.4,
-        'individual': 0.6,
-        'crowdfunding': 0.7,
-        'unknown': 0.8
-    }
-    return risk_levels.get(funding_source.lower(), 0.5)
+    return FUNDING_SOURCE_RISK.get(funding_source.lower(), 0.5)
 
 def _calculate_currency_risk(volatility: float) -> float:
     """Calculate currency volatility risk score"""
@@ -341,13 +402,7 @@ def _calculate_currency_risk(volatility: float) -> float:
 
 def _calculate_complexity_risk(complexity: str) -> float:
     """Calculate project complexity risk score"""
-    risk_levels = {
-        'low': 0.2,
-        'medium': 0.5,
-        'high': 0.8,
-        'very_high': 1.0
-    }
-    return risk_levels.get(complexity.lower(), 0.5)
+    return COMPLEXITY_RISK.get(complexity.lower(), 0.5)
 
 def _calculate_team_risk(team_size: int) -> float:
     """Calculate team size risk score"""
@@ -375,18 +430,13 @@ def _calculate_location_risk(location: str) -> float:
         return 0.5  # Medium risk if no location info
     
     # Simple risk assessment based on location keywords
-    high_risk_keywords = ['conflict', 'war', 'disaster', 'remote', 'rural']
-    medium_risk_keywords = ['developing', 'emerging', 'transition']
-    
     location_lower = location.lower()
     
-    for keyword in high_risk_keywords:
-        if keyword in location_lower:
-            return 0.8
+    if _HIGH_RISK_LOCATION_RE.search(location_lower):
+        return 0.8
     
-    for keyword in medium_risk_keywords:
-        if keyword in location_lower:
-            return 0.5
+    if _MEDIUM_RISK_LOCATION_RE.search(location_lower):
+        return 0.5
     
     return 0.3  # Low risk for stable locations
 
@@ -401,13 +451,7 @@ def _calculate_environmental_impact_risk(environmental_impact: Dict[str, Any]) -
 
 def _calculate_climate_risk(climate_vulnerability: str) -> float:
     """Calculate climate vulnerability risk score"""
-    risk_levels = {
-        'low': 0.2,
-        'medium': 0.5,
-        'high': 0.8,
-        'very_high': 1.0
-    }
-    return risk_levels.get(climate_vulnerability.lower(), 0.5)
+    return CLIMATE_RISK.get(climate_vulnerability.lower(), 0.5)
 
 def _calculate_resource_risk(resource_dependency: List[str]) -> float:
     """Calculate resource dependency risk score"""
@@ -433,12 +477,7 @@ def _calculate_engagement_risk(community_engagement: Dict[str, Any]) -> float:
         return 0.7  # High risk if no community engagement plan
     
     engagement_level = community_engagement.get('level', 'low')
-    risk_levels = {
-        'low': 0.7,
-        'medium': 0.4,
-        'high': 0.2
-    }
-    return risk_levels.get(engagement_level.lower(), 0.5)
+    return ENGAGEMENT_RISK.get(engagement_level.lower(), 0.5)
 
 def _calculate_conflict_risk(stakeholder_conflicts: List[str]) -> float:
     """Calculate stakeholder conflict risk score"""
@@ -451,12 +490,7 @@ def _calculate_conflict_risk(stakeholder_conflicts: List[str]) -> float:
 
 def _calculate_cultural_risk(cultural_sensitivity: str) -> float:
     """Calculate cultural sensitivity risk score"""
-    risk_levels = {
-        'low': 0.8,
-        'medium': 0.5,
-        'high': 0.2
-    }
-    return risk_levels.get(cultural_sensitivity.lower(), 0.5)
+    return CULTURAL_RISK.get(cultural_sensitivity.lower(), 0.5)
 
 def _calculate_social_impact_risk(social_impact: Dict[str, Any]) -> float:
     """Calculate social impact risk score"""
@@ -469,23 +503,11 @@ def _calculate_social_impact_risk(social_impact: Dict[str, Any]) -> float:
 
 def _calculate_compliance_risk(compliance_status: str) -> float:
     """Calculate compliance risk score"""
-    risk_levels = {
-        'compliant': 0.1,
-        'partially_compliant': 0.4,
-        'non_compliant': 0.8,
-        'unknown': 0.7
-    }
-    return risk_levels.get(compliance_status.lower(), 0.5)
+    return COMPLIANCE_RISK.get(compliance_status.lower(), 0.5)
 
 def _calculate_legal_risk(legal_framework: str) -> float:
     """Calculate legal framework risk score"""
-    risk_levels = {
-        'stable': 0.2,
-        'evolving': 0.5,
-        'unstable': 0.8,
-        'unknown': 0.6
-    }
-    return risk_levels.get(legal_framework.lower(), 0.5)
+    return LEGAL_RISK.get(legal_framework.lower(), 0.5)
 
 def _calculate_permit_risk(permits_required: List[str]) -> float:
     """Calculate permit risk score"""
@@ -565,3 +587,174 @@ def _generate_mitigation_recommendations(financial_risks: Dict[str, Any],
     ])
     
     return list(set(recommendations))  # Remove duplicates
+
+
+# Batch evaluation ------------------------------------------------------------------
+
+# Each category assessment and the project fields it reads; results are memoized on
+# those fields so portfolios with repeated profiles only compute each profile once
+RISK_CATEGORIES = (
+    ('financial_risks', _assess_financial_risks,
+     ('budget', 'timeline_months', 'funding_source', 'currency_volatility')),
+    ('operational_risks', _assess_operational_risks,
+     ('complexity_level', 'team_size', 'technology_requirements', 'location')),
+    ('environmental_risks', _assess_environmental_risks,
+     ('environmental_impact', 'climate_vulnerability', 'resource_dependency', 'sustainability_requirements')),
+    ('social_risks', _assess_social_risks,
+     ('community_engagement', 'stakeholder_conflicts', 'cultural_sensitivity', 'social_impact')),
+    ('regulatory_risks', _assess_regulatory_risks,
+     ('regulatory_requirements', 'compliance_status', 'legal_framework', 'permits_required')),
+)
+
+# Below this many projects a process pool costs more than it saves
+MIN_PROJECTS_PER_WORKER = 500
+
+
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def _freeze(value):
+    """Hashable form of a field value; raises TypeError for unhashable leaves"""
+    if isinstance(value, _SCALAR_TYPES):
+        return value
+    if isinstance(value, dict):
+        return frozenset((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(_freeze(v) for v in value)
+    hash(value)
+    return value
+
+
+class RiskEngine:
+    """Scores projects with compiled keyword matchers and memoized category results.
+
+    Category results are shared between projects with the same inputs, so treat
+    the returned assessments as read-only. Call clear_cache() after changing any
+    scoring rule so cached categories are recomputed.
+    """
+
+    def __init__(self, cache_size: int = 10000):
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._caches = {name: {} for name, _, _ in RISK_CATEGORIES}
+
+    def clear_cache(self):
+        for cache in self._caches.values():
+            cache.clear()
+        self.hits = self.misses = 0
+
+    def _category(self, name: str, assess, fields, project_data: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            # Absent fields are left out so the helpers' .get() defaults still apply
+            key = tuple((field, _freeze(project_data[field])) for field in fields if field in project_data)
+        except TypeError:
+            self.misses += 1
+            return assess(project_data)
+
+        cache = self._caches[name]
+        cached = cache.get(key)
+        if cached is None:
+            self.misses += 1
+            cached = assess(project_data)
+            if len(cache) >= self.cache_size:
+                # Evict the oldest entry; dicts keep insertion order
+                del cache[next(iter(cache))]
+            cache[key] = cached
+        else:
+            self.hits += 1
+        return cached
+
+    def assess(self, project_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Same result as risk_assessor_function(project_data)"""
+        try:
+            categories = [self._category(name, assess, fields, project_data)
+                          for name, assess, fields in RISK_CATEGORIES]
+            return _risk_result(*categories)
+        except Exception as e:
+            return {
+                "error": f"Risk assessment failed: {str(e)}",
+                "success": False
+            }
+
+    def assess_many(self, projects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [self.assess(project) for project in projects]
+
+
+# Engine used by process pool workers; each worker builds its own cache
+_worker_engine = None
+
+
+def _assess_chunk(projects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    global _worker_engine
+    if _worker_engine is None:
+        _worker_engine = RiskEngine()
+    return _worker_engine.assess_many(projects)
+
+
+def assess_risks_batch(projects: List[Dict[str, Any]], engine: RiskEngine = None,
+                       workers: int = None) -> Dict[str, Any]:
+    """Score a list of projects in one pass.
+
+    Each per-project result matches risk_assessor_function's output (prefixed with
+    the project's ``id`` when it has one). With ``workers`` > 1 and enough
+    projects, chunks are scored in a process pool.
+    """
+    projects = list(projects)
+    engine = engine or RiskEngine()
+    workers = min(workers or 1, max(len(projects) // MIN_PROJECTS_PER_WORKER, 1))
+
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        size = -(-len(projects) // workers)
+        chunks = [projects[i:i + size] for i in range(0, len(projects), size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = [result for chunk in executor.map(_assess_chunk, chunks) for result in chunk]
+    else:
+        results = engine.assess_many(projects)
+
+    levels = {}
+    scores = []
+    for project, result in zip(projects, results):
+        if result.get("success"):
+            levels[result["risk_level"]] = levels.get(result["risk_level"], 0) + 1
+            scores.append(result["overall_risk_score"])
+    results = [{"id": project["id"], **result} if "id" in project else result
+               for project, result in zip(projects, results)]
+
+    return {
+        "project_count": len(projects),
+        "projects": results,
+        "summary": {
+            "risk_levels": levels,
+            "average_risk_score": round(sum(scores) / len(scores), 2) if scores else None,
+            "failed": len(projects) - len(scores),
+        },
+        "success": True
+    }
+
+
+@tool
+def risk_assessor_batch_function(projects: List[Dict[str, Any]], workers: int = 1) -> Dict[str, Any]:
+    """
+    Assess risks for a list of projects in one call
+    
+    Args:
+        projects: List of project data (same fields as risk_assessor_function)
+        workers: Number of worker processes for large portfolios
+    
+    Returns:
+        Per-project risk assessments plus a portfolio summary
+    """
+    try:
+        logger.info(f"Assessing risks for {len(projects)} projects")
+        return assess_risks_batch(projects, workers=workers)
+    except Exception as e:
+        logger.error(f"Error in batch risk assessment: {str(e)}")
+        return {
+            "error": f"Batch risk assessment failed: {str(e)}",
+            "success": False
+        }
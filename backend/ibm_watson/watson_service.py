@@ -0,0 +1,321 @@
+"""
+Local Watson tool runtime.
+
+The four WatsonX Orchestrate tools under ibm_watson/tools/ are plain Python, so
+WatsonService runs them in-process instead of going through the Orchestrate
+container. ToolRegistry discovers every ``@tool`` in the tools package and
+LocalToolRuntime executes them inline (default) or on a process pool with a
+per-call timeout (WATSON_TOOL_EXECUTION=process). The agent-level operations the
+routes use - alignment, feasibility, impact, budget optimization and the
+comprehensive analysis - are compositions of those tool calls, so scoring is
+deterministic and works offline.
+"""
+
+import importlib
+import logging
+import pkgutil
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import WatsonConfig, watson_config
+from .result_cache import ResultCache, fingerprint, input_version
+
+logger = logging.getLogger(__name__)
+
+TOOLS_PACKAGE = 'ibm_watson.tools'
+
+
+def tool_name(function_name: str) -> str:
+    """Registry name of a tool function, matching the tool YAML specs"""
+    if function_name.endswith('_function'):
+        function_name = function_name[:-len('_function')]
+    return f"{function_name}_tool"
+
+
+class ToolRegistry(Mapping):
+    """Tool name -> callable for every @tool in the tools package"""
+
+    def __init__(self, package: str = TOOLS_PACKAGE):
+        self.package = package
+        self._tools = {}
+
+    def discover(self) -> int:
+        """Import the tools package and register its tools; returns how many were found"""
+        try:
+            from ibm_watsonx_orchestrate.agent_builder.tools.python_tool import PythonTool
+            package = importlib.import_module(self.package)
+        except ImportError as e:
+            logger.warning(f"Watson tools unavailable: {e}")
+            return 0
+
+        tools = {}
+        for module_info in pkgutil.iter_modules(package.__path__):
+            try:
+                module = importlib.import_module(f"{self.package}.{module_info.name}")
+            except Exception as e:
+                logger.error(f"Could not import Watson tool module {module_info.name}: {str(e)}")
+                continue
+            for attribute in vars(module).values():
+                if isinstance(attribute, PythonTool):
+                    tools[tool_name(attribute.fn.__name__)] = attribute
+        self._tools = tools
+        return len(tools)
+
+    def __getitem__(self, name):
+        return self._tools[name]
+
+    def __iter__(self):
+        return iter(self._tools)
+
+    def __len__(self):
+        return len(self._tools)
+
+
+# Registry used inside pool workers, discovered once per worker process
+_worker_registry = None
+
+
+def _execute_in_worker(name: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    global _worker_registry
+    if _worker_registry is None:
+        _worker_registry = ToolRegistry()
+        _worker_registry.discover()
+    return _worker_registry[name](**kwargs)
+
+
+class LocalToolRuntime:
+    """Runs registered tools inline or on a process pool with a timeout"""
+
+    def __init__(self, registry: ToolRegistry, config: WatsonConfig):
+        self.registry = registry
+        self.config = config
+        self._executor = None
+
+    @property
+    def uses_pool(self) -> bool:
+        return self.config.tool_execution == 'process'
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=max(self.config.tool_workers, 1))
+        return self._executor
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def run(self, name: str, **kwargs) -> Dict[str, Any]:
+        """Run one tool; failures come back as {"error": ..., "success": False}"""
+        return self.run_many({name: (name, kwargs)})[name]
+
+    def run_many(self, calls: Dict[str, Tuple[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+        """Run several tool calls, concurrently when a pool is configured.
+
+        `calls` maps a result key to (tool name, keyword arguments).
+        """
+        results = {}
+        for key, (name, _) in calls.items():
+            if name not in self.registry:
+                results[key] = {"error": f"Unknown tool: {name}", "success": False}
+
+        pending = {key: call for key, call in calls.items() if key not in results}
+        if not self.uses_pool:
+            for key, (name, kwargs) in pending.items():
+                results[key] = self._guarded(name, lambda: self.registry[name](**kwargs))
+            return results
+
+        futures = {key: self._pool().submit(_execute_in_worker, name, kwargs)
+                   for key, (name, kwargs) in pending.items()}
+        for key, future in futures.items():
+            # The timeout bounds how long the caller waits; the pool still finishes the call
+            results[key] = self._guarded(calls[key][0], lambda: future.result(timeout=self.config.tool_timeout))
+        return results
+
+    def _guarded(self, name: str, call) -> Dict[str, Any]:
+        try:
+            return call()
+        except FutureTimeoutError:
+            logger.error(f"Watson tool {name} timed out after {self.config.tool_timeout}s")
+            return {"error": f"Tool {name} timed out after {self.config.tool_timeout}s", "success": False}
+        except Exception as e:
+            logger.error(f"Error running Watson tool {name}: {str(e)}")
+            return {"error": f"Tool {name} failed: {str(e)}", "success": False}
+
+
+class LocalAgentManager:
+    """Lists the agents defined in ibm_watson/agents/ and the tools they use"""
+
+    def __init__(self, config: WatsonConfig, registry: ToolRegistry):
+        self.config = config
+        self.registry = registry
+
+    def list_agents(self) -> List[Dict[str, Any]]:
+        agents = []
+        for name, spec in self.config.agent_configs.items():
+            tools = spec.get('tools') or []
+            agents.append({
+                'name': name,
+                'description': spec.get('description', ''),
+                'llm': spec.get('llm'),
+                'tools': tools,
+                'status': 'local' if all(tool_name(t) in self.registry for t in tools) else 'unavailable',
+            })
+        return agents
+
+
+class WatsonService:
+    """Agent operations backed by the local tool runtime"""
+
+    def __init__(self, config: WatsonConfig = watson_config):
+        self.config = config
+        self.tools = ToolRegistry()
+        self.runtime = LocalToolRuntime(self.tools, config)
+        self.agent_manager = LocalAgentManager(config, self.tools)
+        self.cache = ResultCache(config.cache_size, config.cache_ttl, config.cache_path)
+        self.initialized = False
+
+    def init_app(self, app):
+        """Read the runtime settings once the app has loaded its environment"""
+        app.extensions['watson_service'] = self
+        self.initialize()
+
+    def initialize(self) -> bool:
+        self.config.reload()
+        self.runtime.shutdown()
+        self.cache.configure(self.config.cache_size, self.config.cache_ttl, self.config.cache_path)
+        self.initialized = self.tools.discover() > 0
+        if self.initialized:
+            logger.info(f"Watson local runtime ready with {len(self.tools)} tools ({self.config.tool_execution})")
+        return self.initialized
+
+    def _ensure_initialized(self):
+        if not self.initialized:
+            self.initialize()
+
+    def _cached(self, operation: str, compute, inputs: Tuple, records: Tuple = ()) -> Dict[str, Any]:
+        """Memoize an agent operation on its inputs.
+
+        `records` are the project/company dicts whose `updated_at` stamps version
+        the entry. Failed results are not cached.
+        """
+        if not self.config.cache_enabled:
+            return compute()
+        result, hit = self.cache.get_or_compute(
+            fingerprint(operation, *inputs), compute, version=input_version(*records),
+            cacheable=lambda value: bool(value.get('success')),
+        )
+        return {**result, 'cached': True} if hit else result
+
+    # Agent operations ----------------------------------------------------------------
+
+    def analyze_project_alignment(self, project_data: Dict, company_profile: Dict) -> Dict[str, Any]:
+        self._ensure_initialized()
+        return self._cached(
+            'alignment',
+            lambda: self.runtime.run('project_analyzer_tool', project_data=project_data,
+                                     company_profile=company_profile, analysis_type='alignment'),
+            (project_data, company_profile), (project_data, company_profile),
+        )
+
+    def evaluate_project_feasibility(self, project_data: Dict, company_profile: Dict) -> Dict[str, Any]:
+        self._ensure_initialized()
+        return self._cached('feasibility', lambda: self._evaluate_feasibility(project_data, company_profile),
+                            (project_data, company_profile), (project_data, company_profile))
+
+    def _evaluate_feasibility(self, project_data: Dict, company_profile: Dict) -> Dict[str, Any]:
+        results = self.runtime.run_many({
+            'feasibility': ('project_analyzer_tool', {'project_data': project_data, 'company_profile': company_profile,
+                                                      'analysis_type': 'feasibility'}),
+            'risk_assessment': ('risk_assessor_tool', {'project_data': project_data}),
+        })
+        return self._combine('feasibility_evaluation', results)
+
+    def assess_project_impact(self, project_data: Dict) -> Dict[str, Any]:
+        self._ensure_initialized()
+        return self._cached('impact', lambda: self._assess_impact(project_data), (project_data,), (project_data,))
+
+    def _assess_impact(self, project_data: Dict) -> Dict[str, Any]:
+        results = self.runtime.run_many({
+            'impact_potential': ('project_analyzer_tool', {'project_data': project_data, 'company_profile': {},
+                                                           'analysis_type': 'impact'}),
+            'impact_metrics': ('impact_calculator_tool', self._impact_arguments(project_data)),
+        })
+        return self._combine('impact_assessment', results)
+
+    def optimize_budget_allocation(self, available_budget: float, project_list: List[Dict],
+                                   constraints: Optional[Dict] = None) -> Dict[str, Any]:
+        self._ensure_initialized()
+        return self._cached(
+            'budget_optimization',
+            lambda: self.runtime.run('budget_optimizer_tool', available_budget=available_budget,
+                                     project_list=project_list, constraints=constraints),
+            (available_budget, project_list, constraints), tuple(project_list),
+        )
+
+    def get_comprehensive_analysis(self, project_data: Dict, company_profile: Dict) -> Dict[str, Any]:
+        """Alignment, feasibility, impact and risk in one round of tool calls"""
+        self._ensure_initialized()
+        return self._cached('comprehensive', lambda: self._comprehensive_analysis(project_data, company_profile),
+                            (project_data, company_profile), (project_data, company_profile))
+
+    def _comprehensive_analysis(self, project_data: Dict, company_profile: Dict) -> Dict[str, Any]:
+        results = self.runtime.run_many({
+            'alignment': ('project_analyzer_tool', {'project_data': project_data, 'company_profile': company_profile,
+                                                    'analysis_type': 'alignment'}),
+            'feasibility': ('project_analyzer_tool', {'project_data': project_data, 'company_profile': company_profile,
+                                                      'analysis_type': 'feasibility'}),
+            'impact': ('impact_calculator_tool', self._impact_arguments(project_data)),
+            'risk': ('risk_assessor_tool', {'project_data': project_data}),
+        })
+        analysis = self._combine('comprehensive_analysis', results)
+
+        scores = []
+        if results['alignment'].get('success'):
+            scores.append(results['alignment']['overall_score'])
+        if results['feasibility'].get('success'):
+            scores.append(results['feasibility']['overall_score'])
+        if results['impact'].get('success'):
+            scores.append(results['impact']['overall_impact_score'])
+        if results['risk'].get('success'):
+            scores.append(1 - results['risk']['overall_risk_score'])
+        analysis['overall_score'] = round(sum(scores) / len(scores), 2) if scores else None
+
+        recommendations = []
+        for key in ('alignment', 'feasibility'):
+            recommendations.extend(results[key].get('recommendations', []))
+        recommendations.extend(results['impact'].get('recommendations', []))
+        recommendations.extend(results['risk'].get('mitigation_recommendations', []))
+        # Keep first occurrence order so the response is stable
+        analysis['comprehensive_recommendations'] = list(dict.fromkeys(recommendations))
+        return analysis
+
+    @staticmethod
+    def _impact_arguments(project_data: Dict) -> Dict[str, Any]:
+        metrics = dict(project_data.get('impact_metrics') or {})
+        metrics.setdefault('beneficiaries', project_data.get('expected_beneficiaries') or 0)
+        return {
+            'project_metrics': metrics,
+            'baseline_data': project_data.get('baseline_data') or {},
+            'timeframe': project_data.get('timeframe', '12_months'),
+        }
+
+    @staticmethod
+    def _combine(analysis_type: str, results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        errors = {key: result.get('error', 'failed') for key, result in results.items() if not result.get('success')}
+        combined = {
+            'analysis_type': analysis_type,
+            'timestamp': datetime.now().isoformat(),
+            'runtime': 'local',
+            **results,
+            'success': not errors,
+        }
+        if errors:
+            combined['errors'] = errors
+        return combined
+
+
+# Global service instance
+watson_service = WatsonService()
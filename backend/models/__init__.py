@@ -28,6 +28,9 @@ from .rationale import DecisionRationale, RationaleNote
 from .audit import AuditEvent
 from .ngo_marketplace import NGOImpactEvent, NGODocument, NGOTransparencyReport, NGOCertificate, NGOTestimonial
 from .comparison import Comparison, ComparisonItem
+from .ngo_summary import NGOSummary
+from .catalog import CatalogRecord, CatalogSyncState
+from .project_import import ProjectImportJob
 
 __all__ = [
     'db',
@@ -69,3 +72,7 @@ __all__.append('NGODocument')
 __all__.append('NGOTransparencyReport')
 __all__.append('NGOCertificate')
 __all__.append('NGOTestimonial')
+__all__.append('NGOSummary')
+__all__.append('CatalogRecord')
+__all__.append('CatalogSyncState')
+__all__.append('ProjectImportJob')
@@ -4,6 +4,10 @@ from .base import db
 
 class AIMatch(db.Model):
     __tablename__ = 'ai_matches'
+    __table_args__ = (
+        # Serves "top matches for a company" straight from the index
+        db.Index('ix_ai_matches_company_score', 'company_id', db.text('alignment_score DESC')),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -23,6 +27,7 @@ class AIMatch(db.Model):
     # Optional metadata
     tags = db.Column(db.JSON, nullable=True)  # e.g., [{ icon: '🎓', bg: 'bg-blue-100', fg: 'text-blue-600' }]
     rationale = db.Column(db.Text, nullable=True)
+    source = db.Column(db.String(16), nullable=True, default='manual')  # manual, llm, rules
 
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 
@@ -56,6 +61,7 @@ class AIMatch(db.Model):
             'tags': self.tags or [],
             'projectId': self.project_id,
             'companyId': self.company_id,
+            'source': self.source or 'manual',
         }
 
     def _derive_location(self) -> str:
@@ -0,0 +1,41 @@
+from datetime import datetime
+from .base import db
+
+
+class CatalogRecord(db.Model):
+    """Link between a record in an external catalog and the Project/NGOProfile it was imported as"""
+    __tablename__ = 'catalog_records'
+    __table_args__ = (
+        db.UniqueConstraint('source', 'kind', 'external_id', name='uq_catalog_records_source_kind_external'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    source = db.Column(db.String(64), nullable=False)  # e.g., ngo_darpan
+    kind = db.Column(db.String(16), nullable=False)  # project | ngo
+    external_id = db.Column(db.String(128), nullable=False)
+    local_id = db.Column(db.Integer, nullable=False, index=True)  # projects.id or ngo_profiles.id
+    # Hash of the mapped fields; an unchanged hash means the record is skipped
+    content_hash = db.Column(db.String(64), nullable=False)
+    synced_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'source': self.source,
+            'kind': self.kind,
+            'externalId': self.external_id,
+            'localId': self.local_id,
+            'syncedAt': self.synced_at.isoformat() if self.synced_at else None,
+        }
+
+
+class CatalogSyncState(db.Model):
+    """Per-source conditional request validators and page cursors from the last sync"""
+    __tablename__ = 'catalog_sync_state'
+
+    source = db.Column(db.String(64), primary_key=True)
+    # Page cursor (or '' for the first page) -> { etag, lastModified, nextCursor }
+    pages = db.Column(db.JSON, nullable=True)
+    last_synced_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
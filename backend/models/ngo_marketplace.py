@@ -1,6 +1,27 @@
 from datetime import datetime, date
 from .base import db
-import json
+from .types import JSONText
+
+
+def summary_fields(ngo) -> dict:
+    """Marketplace card fields; accepts an NGOProfile or an ngo_profiles row"""
+    sectors = ngo.primary_sectors if isinstance(ngo.primary_sectors, list) else []
+    return {
+        'id': ngo.id,
+        'name': ngo.name,
+        'location': {
+            'city': ngo.city,
+            'state': ngo.state,
+            'country': ngo.country,
+        },
+        'rating': ngo.rating,
+        'verificationBadge': ngo.verification_badge,
+        'sectors': sectors,
+        'logoUrl': ngo.logo_url,
+        'profileImageUrl': ngo.profile_image_url,
+        'projectsCompleted': ngo.total_projects_completed,
+        'beneficiariesReached': ngo.total_beneficiaries_reached,
+    }
 
 
 class NGOProfile(db.Model):
@@ -36,19 +57,19 @@ class NGOProfile(db.Model):
     total_beneficiaries_reached = db.Column(db.Integer, default=0)
 
     # Focus Areas
-    primary_sectors = db.Column(db.Text)  # JSON array of sectors
-    sdg_focus = db.Column(db.Text)  # JSON array of SDG numbers
-    geographic_focus = db.Column(db.Text)  # JSON array of regions/states
+    primary_sectors = db.Column(JSONText)  # JSON array of sectors
+    sdg_focus = db.Column(JSONText)  # JSON array of SDG numbers
+    geographic_focus = db.Column(JSONText)  # JSON array of regions/states
 
     # Financial Information
     annual_budget = db.Column(db.Numeric(15, 2))
     currency = db.Column(db.String(10), default='INR')
-    funding_sources = db.Column(db.Text)  # JSON array of funding sources
+    funding_sources = db.Column(JSONText)  # JSON array of funding sources
 
     # Media & Documents
     logo_url = db.Column(db.String(500))
     profile_image_url = db.Column(db.String(500))
-    documents = db.Column(db.Text)  # JSON array of document URLs
+    documents = db.Column(JSONText)  # JSON array of document URLs
 
     # Profile Summary
     about = db.Column(db.Text)
@@ -67,81 +88,41 @@ class NGOProfile(db.Model):
 
     def set_primary_sectors(self, sectors_list):
         if isinstance(sectors_list, list):
-            self.primary_sectors = json.dumps(sectors_list)
+            self.primary_sectors = list(sectors_list)
 
     def get_primary_sectors(self):
-        if not self.primary_sectors:
-            return []
-        try:
-            return json.loads(self.primary_sectors)
-        except Exception:
-            return []
+        return list(self.primary_sectors) if isinstance(self.primary_sectors, list) else []
 
     def set_sdg_focus(self, sdg_list):
         if isinstance(sdg_list, list):
-            self.sdg_focus = json.dumps(sdg_list)
+            self.sdg_focus = list(sdg_list)
 
     def get_sdg_focus(self):
-        if not self.sdg_focus:
-            return []
-        try:
-            return json.loads(self.sdg_focus)
-        except Exception:
-            return []
+        return list(self.sdg_focus) if isinstance(self.sdg_focus, list) else []
 
     def set_geographic_focus(self, regions_list):
         if isinstance(regions_list, list):
-            self.geographic_focus = json.dumps(regions_list)
+            self.geographic_focus = list(regions_list)
 
     def get_geographic_focus(self):
-        if not self.geographic_focus:
-            return []
-        try:
-            return json.loads(self.geographic_focus)
-        except Exception:
-            return []
+        return list(self.geographic_focus) if isinstance(self.geographic_focus, list) else []
 
     def set_funding_sources(self, sources_list):
         if isinstance(sources_list, list):
-            self.funding_sources = json.dumps(sources_list)
+            self.funding_sources = list(sources_list)
 
     def get_funding_sources(self):
-        if not self.funding_sources:
-            return []
-        try:
-            return json.loads(self.funding_sources)
-        except Exception:
-            return []
+        return list(self.funding_sources) if isinstance(self.funding_sources, list) else []
 
     def set_documents(self, doc_urls):
         if isinstance(doc_urls, list):
-            self.documents = json.dumps(doc_urls)
+            self.documents = list(doc_urls)
 
     def get_documents(self):
-        if not self.documents:
-            return []
-        try:
-            return json.loads(self.documents)
-        except Exception:
-            return []
+        return list(self.documents) if isinstance(self.documents, list) else []
 
     def to_summary(self) -> dict:
-        return {
-            'id': self.id,
-            'name': self.name,
-            'location': {
-                'city': self.city,
-                'state': self.state,
-                'country': self.country,
-            },
-            'rating': self.rating,
-            'verificationBadge': self.verification_badge,
-            'sectors': self.get_primary_sectors(),
-            'logoUrl': self.logo_url,
-            'profileImageUrl': self.profile_image_url,
-            'projectsCompleted': self.total_projects_completed,
-            'beneficiariesReached': self.total_beneficiaries_reached,
-        }
+        return summary_fields(self)
 
     def to_detail(self) -> dict:
         return {
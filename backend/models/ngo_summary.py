@@ -0,0 +1,216 @@
+"""
+Denormalized NGO summary projection for the marketplace listing.
+
+Each row holds the pre-rendered JSON of NGOProfile.to_summary() together with the
+columns the listing filters on, so the listing is one indexed query that splices
+the stored JSON into the response without decoding it. Rows are refreshed in the
+same transaction as any flush that touches an NGO, its risk assessments or its
+certificates. Bulk Core writes that bypass the ORM (e.g. the synthetic data
+generator) should call ``ngo_summary_projection.rebuild()`` afterwards.
+"""
+
+import json
+import logging
+import re
+from datetime import datetime
+from typing import Iterable, Optional
+
+from flask import current_app, has_app_context
+from sqlalchemy import delete, event, func, insert, inspect, select
+
+from .base import db
+from .ngo_marketplace import NGOCertificate, NGOProfile, summary_fields
+from .risk import NGORiskAssessment
+
+logger = logging.getLogger(__name__)
+
+# Keep IN lists well under SQLite's bound parameter limit
+REFRESH_CHUNK_SIZE = 500
+
+
+class NGOSummary(db.Model):
+    __tablename__ = 'ngo_summaries'
+    __table_args__ = (
+        db.Index('ix_ngo_summaries_verification', 'verification_badge', 'ngo_id'),
+        db.Index('ix_ngo_summaries_state', 'state_key', 'ngo_id'),
+        db.Index('ix_ngo_summaries_rating', 'rating', 'ngo_id'),
+    )
+
+    ngo_id = db.Column(db.Integer, db.ForeignKey('ngo_profiles.id', ondelete='CASCADE'), primary_key=True)
+
+    # Filter columns
+    state_key = db.Column(db.String(100), nullable=True)  # lower-cased state
+    rating = db.Column(db.Integer, nullable=True)
+    verification_badge = db.Column(db.String(50), nullable=True)
+    risk_level = db.Column(db.String(16), nullable=True)  # latest assessment
+    sectors_key = db.Column(db.Text, nullable=True)  # "|education|health|" for delimiter-safe LIKE
+    sdgs_key = db.Column(db.Text, nullable=True)  # "|4|13|"
+
+    # Pre-rendered summary JSON served as-is by the listing
+    payload = db.Column(db.Text, nullable=False)
+    refreshed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+def _list_key(values) -> Optional[str]:
+    values = [str(v).strip().lower() for v in values or [] if str(v).strip()]
+    return f"|{'|'.join(values)}|" if values else None
+
+
+def _sdg_key(values) -> Optional[str]:
+    """Accepts 4, "4" or "SDG 4" style entries"""
+    numbers = []
+    for value in values or []:
+        match = re.search(r'\d+', str(value))
+        if match:
+            numbers.append(int(match.group()))
+    return _list_key(sorted(set(numbers)))
+
+
+def _parse_list(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return []
+    return value if isinstance(value, list) else []
+
+
+class NGOSummaryProjection:
+    """Maintains ngo_summaries from NGO, risk and certificate changes"""
+
+    def init_app(self, app):
+        """Register on the app, hook session events and backfill a stale projection"""
+        app.config.setdefault('NGO_SUMMARY_AUTO_REFRESH', True)
+        app.extensions['ngo_summary_projection'] = self
+        _register_session_events()
+        with app.app_context():
+            self.ensure_fresh()
+
+    def ensure_fresh(self):
+        """Rebuild when the projection is missing rows (new table, bulk loads)"""
+        try:
+            if 'ngo_summaries' not in inspect(db.engine).get_table_names():
+                NGOSummary.__table__.create(db.engine, checkfirst=True)
+            with db.engine.connect() as conn:
+                ngos = conn.execute(select(func.count()).select_from(NGOProfile.__table__)).scalar()
+                summaries = conn.execute(select(func.count()).select_from(NGOSummary.__table__)).scalar()
+            if ngos != summaries:
+                self.rebuild()
+        except Exception as e:
+            logger.warning(f"Could not ensure NGO summary projection: {e}")
+
+    def rebuild(self, connection=None) -> int:
+        """Recompute every summary row"""
+        if connection is None:
+            with db.engine.begin() as conn:
+                return self.rebuild(conn)
+        connection.execute(delete(NGOSummary.__table__))
+        ids = connection.execute(select(NGOProfile.id).order_by(NGOProfile.id)).scalars().all()
+        written = 0
+        for start in range(0, len(ids), REFRESH_CHUNK_SIZE):
+            written += self._write(connection, ids[start:start + REFRESH_CHUNK_SIZE], replace=False)
+        logger.info(f"Rebuilt {written} NGO summaries")
+        return written
+
+    def refresh(self, connection, ngo_ids: Iterable[int]) -> int:
+        """Recompute the summaries of the given NGOs on an open connection"""
+        ngo_ids = sorted({i for i in ngo_ids if i is not None})
+        written = 0
+        for start in range(0, len(ngo_ids), REFRESH_CHUNK_SIZE):
+            written += self._write(connection, ngo_ids[start:start + REFRESH_CHUNK_SIZE], replace=True)
+        return written
+
+    def _write(self, connection, ngo_ids, replace: bool) -> int:
+        if not ngo_ids:
+            return 0
+        if replace:
+            connection.execute(delete(NGOSummary.__table__).where(NGOSummary.ngo_id.in_(ngo_ids)))
+
+        risk_by_ngo = {}
+        risk_rows = connection.execute(
+            select(NGORiskAssessment.ngo_id, NGORiskAssessment.risk_level)
+            .where(NGORiskAssessment.ngo_id.in_(ngo_ids))
+            .order_by(NGORiskAssessment.ngo_id, NGORiskAssessment.updated_at.desc(), NGORiskAssessment.id.desc())
+        )
+        for ngo_id, risk_level in risk_rows:
+            risk_by_ngo.setdefault(ngo_id, risk_level)
+
+        certificates = dict(connection.execute(
+            select(NGOCertificate.ngo_id, func.count())
+            .where(NGOCertificate.ngo_id.in_(ngo_ids))
+            .group_by(NGOCertificate.ngo_id)
+        ).all())
+
+        now = datetime.utcnow()
+        rows = []
+        for ngo in connection.execute(select(NGOProfile.__table__).where(NGOProfile.id.in_(ngo_ids))):
+            summary = summary_fields(ngo)
+            summary['riskLevel'] = risk_by_ngo.get(ngo.id)
+            summary['certificateCount'] = certificates.get(ngo.id, 0)
+            rows.append({
+                'ngo_id': ngo.id,
+                'state_key': (ngo.state or '').strip().lower() or None,
+                'rating': ngo.rating,
+                'verification_badge': ngo.verification_badge,
+                'risk_level': summary['riskLevel'],
+                'sectors_key': _list_key(summary['sectors']),
+                'sdgs_key': _sdg_key(_parse_list(ngo.sdg_focus)),
+                'payload': json.dumps(summary, separators=(',', ':')),
+                'refreshed_at': now,
+            })
+        if rows:
+            connection.execute(insert(NGOSummary.__table__), rows)
+        return len(rows)
+
+
+# Session hooks ---------------------------------------------------------------------
+
+_events_registered = False
+
+
+def _register_session_events():
+    global _events_registered
+    if _events_registered:
+        return
+    event.listen(db.session, 'after_flush', _refresh_flushed)
+    _events_registered = True
+
+
+def _refresh_flushed(session, flush_context):
+    """Refresh summaries touched by this flush inside the same transaction"""
+    if not has_app_context() or not current_app.config.get('NGO_SUMMARY_AUTO_REFRESH'):
+        return
+    projection = current_app.extensions.get('ngo_summary_projection')
+    if not projection:
+        return
+    ngo_ids = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        if isinstance(obj, NGOProfile):
+            ngo_ids.add(obj.id)
+        elif isinstance(obj, (NGORiskAssessment, NGOCertificate)):
+            ngo_ids.add(obj.ngo_id)
+            # A row moved to another NGO changes the old NGO's summary too
+            history = inspect(obj).attrs.ngo_id.history
+            ngo_ids.update(history.deleted or ())
+    if ngo_ids:
+        try:
+            projection.refresh(session.connection(), ngo_ids)
+        except Exception as e:
+            logger.error(f"Error refreshing NGO summaries: {str(e)}")
+
+
+def refresh_bulk_written(session, ngo_ids: Iterable[int]):
+    """Refresh summaries of NGOs written with bulk statements, which skip the flush hook"""
+    if not has_app_context() or not current_app.config.get('NGO_SUMMARY_AUTO_REFRESH'):
+        return
+    projection = current_app.extensions.get('ngo_summary_projection')
+    if projection:
+        projection.refresh(session.connection(), ngo_ids)
+
+
+# Global projection instance
+ngo_summary_projection = NGOSummaryProjection()
@@ -0,0 +1,41 @@
+from datetime import datetime
+from .base import db
+
+
+class ProjectImportJob(db.Model):
+    """Bulk project import from an uploaded CSV/JSONL file"""
+    __tablename__ = 'project_import_jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    filename = db.Column(db.String(255), nullable=True)
+    file_format = db.Column(db.String(16), nullable=False)  # csv | jsonl
+    status = db.Column(db.String(24), nullable=False, default='queued')  # queued | running | completed | failed
+
+    total_rows = db.Column(db.Integer, nullable=False, default=0)
+    imported_rows = db.Column(db.Integer, nullable=False, default=0)
+    failed_rows = db.Column(db.Integer, nullable=False, default=0)
+    # [{ row, errors: [...] }] for rejected rows, capped at the importer's max_errors
+    errors = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.Text, nullable=True)  # why the job itself failed
+
+    created_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'filename': self.filename,
+            'format': self.file_format,
+            'status': self.status,
+            'totalRows': self.total_rows,
+            'importedRows': self.imported_rows,
+            'failedRows': self.failed_rows,
+            'errors': self.errors or [],
+            'error': self.error,
+            'createdAt': self.created_at.isoformat() if self.created_at else None,
+            'startedAt': self.started_at.isoformat() if self.started_at else None,
+            'finishedAt': self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -1,5 +1,6 @@
 from datetime import datetime
 from .base import db
+from .types import JSONText
 import json
 
 
@@ -16,9 +17,9 @@ class Project(db.Model):
     location_country = db.Column(db.String(100), nullable=False)
     
     # Thematic Info
-    sdg_goals = db.Column(db.Text)  # JSON array of SDG numbers 1-17
-    csr_focus_areas = db.Column(db.Text)  # JSON array of focus areas
-    target_beneficiaries = db.Column(db.Text)  # JSON array of beneficiary types
+    sdg_goals = db.Column(JSONText)  # JSON array of SDG numbers 1-17
+    csr_focus_areas = db.Column(JSONText)  # JSON array of focus areas
+    target_beneficiaries = db.Column(JSONText)  # JSON array of beneficiary types
     
     # Financials
     total_project_cost = db.Column(db.Numeric(15, 2), nullable=False)
@@ -33,9 +34,9 @@ class Project(db.Model):
     duration_months = db.Column(db.Integer)  # Calculated field
     
     # Impact Metrics
-    expected_outcomes = db.Column(db.Text)  # JSON object with metrics
-    kpis = db.Column(db.Text)  # JSON object with KPIs
-    past_impact = db.Column(db.Text)  # JSON object for recurring projects
+    expected_outcomes = db.Column(JSONText)  # JSON object with metrics
+    kpis = db.Column(JSONText)  # JSON object with KPIs
+    past_impact = db.Column(JSONText)  # JSON object for recurring projects
     
     # NGO Credibility
     ngo_registration_number = db.Column(db.String(100))
@@ -46,7 +47,7 @@ class Project(db.Model):
     past_projects_completed = db.Column(db.Integer, default=0)
     
     # Media & Supporting Files
-    project_images = db.Column(db.Text)  # JSON array of image URLs
+    project_images = db.Column(JSONText)  # JSON array of image URLs
     proposal_document_url = db.Column(db.String(500))
     video_link = db.Column(db.String(500))
     
@@ -55,7 +56,7 @@ class Project(db.Model):
     visibility = db.Column(db.String(50), default='public')  # public, private, restricted
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Relationships
     creator = db.relationship('User', backref='created_projects')
@@ -77,79 +78,65 @@ class Project(db.Model):
     def set_sdg_goals(self, sdg_list):
         """Set SDG goals as JSON array"""
         if isinstance(sdg_list, list):
-            self.sdg_goals = json.dumps(sdg_list)
+            self.sdg_goals = list(sdg_list)
     
     def get_sdg_goals(self):
         """Get SDG goals as list"""
-        if self.sdg_goals:
-            return json.loads(self.sdg_goals)
-        return []
+        return list(self.sdg_goals) if isinstance(self.sdg_goals, list) else []
     
     def set_csr_focus_areas(self, focus_areas):
         """Set CSR focus areas as JSON array"""
         if isinstance(focus_areas, list):
-            self.csr_focus_areas = json.dumps(focus_areas)
+            self.csr_focus_areas = list(focus_areas)
     
     def get_csr_focus_areas(self):
         """Get CSR focus areas as list"""
-        if self.csr_focus_areas:
-            return json.loads(self.csr_focus_areas)
-        return []
+        return list(self.csr_focus_areas) if isinstance(self.csr_focus_areas, list) else []
     
     def set_target_beneficiaries(self, beneficiaries):
         """Set target beneficiaries as JSON array"""
         if isinstance(beneficiaries, list):
-            self.target_beneficiaries = json.dumps(beneficiaries)
+            self.target_beneficiaries = list(beneficiaries)
     
     def get_target_beneficiaries(self):
         """Get target beneficiaries as list"""
-        if self.target_beneficiaries:
-            return json.loads(self.target_beneficiaries)
-        return []
+        return list(self.target_beneficiaries) if isinstance(self.target_beneficiaries, list) else []
     
     def set_expected_outcomes(self, outcomes):
         """Set expected outcomes as JSON object"""
         if isinstance(outcomes, dict):
-            self.expected_outcomes = json.dumps(outcomes)
+            self.expected_outcomes = dict(outcomes)
     
     def get_expected_outcomes(self):
         """Get expected outcomes as dict"""
-        if self.expected_outcomes:
-            return json.loads(self.expected_outcomes)
-        return {}
+        return dict(self.expected_outcomes) if isinstance(self.expected_outcomes, dict) else {}
     
     def set_kpis(self, kpis_dict):
         """Set KPIs as JSON object"""
         if isinstance(kpis_dict, dict):
-            self.kpis = json.dumps(kpis_dict)
+            self.kpis = dict(kpis_dict)
     
     def get_kpis(self):
         """Get KPIs as dict"""
-        if self.kpis:
-            return json.loads(self.kpis)
-        return {}
+        return dict(self.kpis) if isinstance(self.kpis, dict) else {}
     
     def set_past_impact(self, impact_dict):
         """Set past impact as JSON object"""
         if isinstance(impact_dict, dict):
-            self.past_impact = json.dumps(impact_dict)
+            self.past_impact = dict(impact_dict)
     
     def get_past_impact(self):
         """Get past impact as dict"""
-        if self.past_impact:
-            return json.loads(self.past_impact)
-        return {}
+        return dict(self.past_impact) if isinstance(self.past_impact, dict) else {}
     
     def set_project_images(self, image_urls):
         """Set project images as JSON array"""
         if isinstance(image_urls, list):
-            self.project_images = json.dumps(image_urls)
+            self.project_images = list(image_urls)
     
     def get_project_images(self):
         """Get project images as list"""
-        if self.project_images:
-            return json.loads(self.project_images)
-        return []
+        return list(self.project_images) if isinstance(self.project_images, list) else []
     
     def to_dict(self):
         """Convert project to dictionary"""
@@ -210,15 +197,15 @@ class Project(db.Model):
 class ProjectMilestone(db.Model):
     __tablename__ = 'project_milestones'
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False, index=True)
     title = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text)
-    target_date = db.Column(db.Date, nullable=False)
+    target_date = db.Column(db.Date, nullable=False, index=True)
     completion_date = db.Column(db.Date)
     status = db.Column(db.String(50), default='pending')  # pending, in_progress, completed, delayed
     progress_percentage = db.Column(db.Integer, default=0)  # 0-100
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     def to_dict(self):
         return {
@@ -238,7 +225,7 @@ class ProjectMilestone(db.Model):
 class ProjectApplication(db.Model):
     __tablename__ = 'project_applications'
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False, index=True)
     company_id = db.Column(db.Integer, db.ForeignKey('companies.id'), nullable=False)
     application_type = db.Column(db.String(50), nullable=False)  # funding, partnership, volunteer
     amount_offered = db.Column(db.Numeric(15, 2))  # For funding applications
@@ -246,7 +233,7 @@ class ProjectApplication(db.Model):
     status = db.Column(db.String(50), default='pending')  # pending, approved, rejected, withdrawn
     notes = db.Column(db.Text)  # Internal notes or feedback
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Relationships
     company = db.relationship('Company', backref='project_applications')
@@ -270,7 +257,7 @@ class ProjectApplication(db.Model):
 class ProjectImpactReport(db.Model):
     __tablename__ = 'project_impact_reports'
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False, index=True)
     report_period = db.Column(db.String(50), nullable=False)  # monthly, quarterly, annual
     report_date = db.Column(db.Date, nullable=False)
     impact_metrics = db.Column(db.Text)  # JSON object with actual vs expected metrics
@@ -280,7 +267,7 @@ class ProjectImpactReport(db.Model):
     attachments = db.Column(db.Text)  # JSON array of file URLs
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Relationships
     creator = db.relationship('User', backref='created_impact_reports')
@@ -0,0 +1,214 @@
+"""
+Lightweight read records for list endpoints.
+
+Loading a list through the ORM builds a full entity per row: identity map entry,
+instrumented attributes, load state and relationship proxies, all to call one
+serializer and throw the object away. A record type is a plain ``__slots__``
+class holding only the columns that serializer reads. It is filled from a Core
+``select()`` of exactly those columns and borrows the model's own serializer
+functions, so the JSON is identical to serializing the entity.
+
+Related records are loaded the way ``selectinload`` would load them: one
+``IN`` query per relationship for the whole page. A many-to-one relationship can
+instead be ``joined`` so its columns come back in the main statement.
+
+Records are read-only snapshots. Nothing is tracked by the session, so they
+must not be used for writes.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import RelationshipDirection
+
+from .approval import ApprovalRequest, ApprovalStep
+from .audit import AuditEvent
+from .base import db
+from .company_details import Company
+from .ngo_marketplace import NGOProfile
+from .projects import Project, ProjectApplication, ProjectImpactReport, ProjectMilestone
+from .rationale import DecisionRationale, RationaleNote
+from .risk import NGORiskAssessment
+
+# Keep IN lists well under SQLite's bound parameter limit
+LOAD_CHUNK_SIZE = 500
+
+
+class Related:
+    """A relationship of the model, filled with records of ``record_type``"""
+
+    def __init__(self, record_type, joined: bool = False):
+        self.record_type = record_type
+        self.joined = joined
+
+
+class Record:
+    """Base for record types; see ``record_type()``"""
+
+    __slots__ = ()
+    __model__ = None
+    __columns__: Sequence[str] = ()
+    __related__: Dict[str, Related] = {}
+
+    def __init__(self, *values):
+        for name, value in zip(self.__columns__, values):
+            setattr(self, name, value)
+
+    def __repr__(self):
+        key = inspect(self.__model__).primary_key[0].key
+        return f"<{type(self).__name__} {key}={getattr(self, key, None)!r}>"
+
+
+def record_type(model, columns: Optional[Iterable[str]] = None, methods: Iterable[str] = ('to_dict',),
+                related: Optional[Dict[str, Related]] = None):
+    """
+    Build a ``__slots__`` record class for `model`.
+
+    `columns` are mapped attribute names (default: every column) and always
+    include the primary key and the foreign keys `related` needs. `methods` are
+    copied from the model so its serializers run unchanged against the record.
+    """
+    mapper = inspect(model)
+    related = dict(related or {})
+    names = list(columns) if columns is not None else [prop.key for prop in mapper.column_attrs]
+    needed = [prop.key for prop in mapper.column_attrs if prop.columns[0].primary_key]
+    for name, spec in related.items():
+        relationship = mapper.relationships[name]
+        if relationship.direction is RelationshipDirection.MANYTOONE:
+            needed.extend(mapper.get_property_by_column(c).key for c in relationship.local_columns)
+    for name in needed:
+        if name not in names:
+            names.append(name)
+
+    namespace = {
+        '__slots__': tuple(names) + tuple(related),
+        '__model__': model,
+        '__columns__': tuple(names),
+        '__related__': related,
+    }
+    for name in methods:
+        namespace[name] = getattr(model, name)
+    return type(f"{model.__name__}Record", (Record,), namespace)
+
+
+def _columns(cls) -> List:
+    return [getattr(cls.__model__, name) for name in cls.__columns__]
+
+
+def select_records(cls):
+    """``select()`` of the columns `cls` is built from; add filters, order and limit, then pass to fetch_records()"""
+    statement = select(*_columns(cls))
+    for name, spec in cls.__related__.items():
+        if spec.joined:
+            statement = statement.add_columns(*_columns(spec.record_type)).outerjoin(getattr(cls.__model__, name))
+    return statement
+
+
+def _chunks(values: List, size: int = LOAD_CHUNK_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _load_one_to_many(cls, name: str, spec: Related, records: List):
+    relationship = inspect(cls.__model__).relationships[name]
+    (local, remote), = relationship.local_remote_pairs
+    local_key = inspect(cls.__model__).get_property_by_column(local).key
+    child = spec.record_type
+    # Like selectinload, rows are only sorted when the relationship has an order_by
+    order_by = list(relationship.order_by or ())
+
+    children: Dict = {}
+    keys = list({getattr(r, local_key) for r in records})
+    for chunk in _chunks(keys):
+        rows = db.session.execute(
+            select(remote, *_columns(child)).where(remote.in_(chunk)).order_by(*order_by)
+        ).all()
+        for row in rows:
+            children.setdefault(row[0], []).append(child(*row[1:]))
+    _load_related(child, [c for group in children.values() for c in group])
+    for record in records:
+        setattr(record, name, children.get(getattr(record, local_key), []))
+
+
+def _load_many_to_one(cls, name: str, spec: Related, records: List):
+    relationship = inspect(cls.__model__).relationships[name]
+    (local, remote), = relationship.local_remote_pairs
+    local_key = inspect(cls.__model__).get_property_by_column(local).key
+    target = spec.record_type
+
+    parents: Dict = {}
+    keys = list({getattr(r, local_key) for r in records} - {None})
+    for chunk in _chunks(keys):
+        for row in db.session.execute(select(remote, *_columns(target)).where(remote.in_(chunk))):
+            parents[row[0]] = target(*row[1:])
+    _load_related(target, list(parents.values()))
+    for record in records:
+        setattr(record, name, parents.get(getattr(record, local_key)))
+
+
+def _load_related(cls, records: List):
+    if not records:
+        return
+    for name, spec in cls.__related__.items():
+        if spec.joined:
+            continue
+        direction = inspect(cls.__model__).relationships[name].direction
+        if direction is RelationshipDirection.MANYTOONE:
+            _load_many_to_one(cls, name, spec, records)
+        else:
+            _load_one_to_many(cls, name, spec, records)
+
+
+def fetch_records(cls, statement) -> List:
+    """Run a select_records() statement and return records with their related records loaded"""
+    joined = [(name, spec.record_type) for name, spec in cls.__related__.items() if spec.joined]
+    width = len(cls.__columns__)
+    records = []
+    for row in db.session.execute(statement):
+        record = cls(*row[:width])
+        offset = width
+        for name, target in joined:
+            values = row[offset:offset + len(target.__columns__)]
+            offset += len(target.__columns__)
+            # An outer join that matched nothing leaves every column NULL
+            setattr(record, name, target(*values) if any(v is not None for v in values) else None)
+        records.append(record)
+    _load_related(cls, records)
+    return records
+
+
+# Record types served by the list endpoints
+
+MilestoneRecord = record_type(ProjectMilestone)
+ProjectRecord = record_type(
+    Project,
+    methods=('to_dict', 'get_sdg_goals', 'get_csr_focus_areas', 'get_target_beneficiaries',
+             'get_expected_outcomes', 'get_kpis', 'get_past_impact', 'get_project_images'),
+    related={
+        'milestones': Related(MilestoneRecord),
+        # to_dict only counts these
+        'applications': Related(record_type(ProjectApplication, columns=('id',), methods=())),
+        'impact_reports': Related(record_type(ProjectImpactReport, columns=('id',), methods=())),
+    },
+)
+
+RationaleRecord = record_type(DecisionRationale, related={'notes': Related(record_type(RationaleNote))})
+
+AuditEventRecord = record_type(AuditEvent)
+
+ApprovalRecord = record_type(
+    ApprovalRequest,
+    related={
+        'project': Related(record_type(Project, columns=('id', 'title'), methods=())),
+        'company': Related(record_type(Company, columns=('id', 'company_name'), methods=())),
+        'steps': Related(record_type(ApprovalStep)),
+    },
+)
+
+RiskSummaryRecord = record_type(
+    NGORiskAssessment,
+    columns=('id', 'ngo_id', 'risk_level', 'highlight_metric_label', 'highlight_metric_value_pct',
+             'compliance_score_pct', 'updated_at'),
+    methods=('to_summary',),
+    related={'ngo': Related(record_type(NGOProfile, columns=('id', 'name', 'primary_sectors'), methods=()), joined=True)},
+)
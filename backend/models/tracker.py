@@ -4,6 +4,13 @@ from .base import db
 
 class ProjectTrackingInfo(db.Model):
     __tablename__ = 'project_tracking_info'
+    # Tracker board: filter by status, newest first (SQLite appends the rowid, which
+    # serves as the id tie-breaker for keyset pagination)
+    __table_args__ = (
+        db.Index('ix_project_tracking_status_updated', 'status', 'updated_at'),
+        # Monitoring watermark scan
+        db.Index('ix_project_tracking_updated', 'updated_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False, index=True)
@@ -111,6 +118,9 @@ class ProjectTrackingInfo(db.Model):
 
 class ProjectTimelineEntry(db.Model):
     __tablename__ = 'project_timeline_entries'
+    __table_args__ = (
+        db.Index('ix_project_timeline_company_created', 'company_id', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     color = db.Column(db.String(16), nullable=True)
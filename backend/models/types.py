@@ -0,0 +1,157 @@
+"""
+Column types shared by the models.
+
+JSONText stores a JSON value in a TEXT column (or a native JSON column on
+PostgreSQL and MySQL). The value is decoded once when a row is loaded, so the
+mapped attribute holds the parsed list/dict and repeated reads (serializers
+calling get_sdg_goals() for every card) cost nothing. Assigning a new value
+replaces it and is encoded on flush. A str is taken to be JSON that is already
+encoded, so code that writes json.dumps(...) output keeps working: it is decoded
+when assigned to a mapped attribute and stored as-is by bulk statements. Stored
+text that is not valid JSON is returned unchanged.
+
+migrate_json_columns() brings existing data in line: it rewrites values that are
+not valid JSON and, on databases with a native JSON type, converts the columns.
+"""
+
+import json
+import logging
+from typing import Dict, Iterable
+
+from sqlalchemy import Text, bindparam, cast, event, inspect, select, text, update
+from sqlalchemy.orm import Mapper
+from sqlalchemy.types import JSON, TypeDecorator
+
+logger = logging.getLogger(__name__)
+
+NATIVE_JSON_DIALECTS = ('postgresql', 'mysql', 'mariadb')
+
+# Rows read and rewritten per round trip by the migration
+MIGRATION_CHUNK_SIZE = 1000
+
+
+def _decode(value):
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+class JSONText(TypeDecorator):
+    """JSON value decoded once per loaded row; TEXT storage unless the database has native JSON"""
+
+    impl = Text
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import JSONB
+            return dialect.type_descriptor(JSONB())
+        if dialect.name in NATIVE_JSON_DIALECTS:
+            return dialect.type_descriptor(JSON())
+        return dialect.type_descriptor(Text())
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        native = dialect.name in NATIVE_JSON_DIALECTS
+        if isinstance(value, str):
+            if not native:
+                return value
+            try:
+                return json.loads(value)
+            except ValueError:
+                return value
+        return value if native else json.dumps(value)
+
+    def process_result_value(self, value, dialect):
+        if dialect.name in NATIVE_JSON_DIALECTS:
+            return value
+        return _decode(value)
+
+
+@event.listens_for(Mapper, 'mapper_configured')
+def _decode_assigned_json(mapper, class_):
+    """Attributes of JSONText columns always hold decoded values, even when assigned encoded JSON"""
+    for prop in mapper.column_attrs:
+        if any(isinstance(column.type, JSONText) for column in prop.columns):
+            event.listen(getattr(class_, prop.key), 'set',
+                         lambda target, value, oldvalue, initiator: _decode(value), retval=True)
+
+
+def as_text(column):
+    """The column's stored JSON as text, for LIKE filters that work on every backend"""
+    return cast(column, Text)
+
+
+def json_columns(models: Iterable) -> Iterable:
+    for model in models:
+        for column in model.__table__.columns:
+            if isinstance(column.type, JSONText):
+                yield model.__table__, column
+
+
+def migrate_json_columns(engine, models: Iterable) -> Dict[str, int]:
+    """Rewrite stored values that are not valid JSON, then switch to native JSON columns where supported"""
+    fixed = {}
+    native = engine.dialect.name in NATIVE_JSON_DIALECTS
+    for table, column in json_columns(models):
+        key = f"{table.name}.{column.name}"
+        existing = {c['name']: c['type'] for c in inspect(engine).get_columns(table.name)}
+        if column.name not in existing:
+            continue
+        already_native = native and isinstance(existing[column.name], JSON)
+        if already_native:
+            fixed[key] = 0
+            continue
+
+        # Read the raw text so values are not decoded on the way out
+        primary_key = table.primary_key.columns.values()[0]
+        rewrite = (
+            update(table)
+            .where(primary_key == bindparam('_id'))
+            .values({column.name: bindparam('_value', type_=Text)})
+        )
+        count = 0
+        last_id = None
+        with engine.begin() as conn:
+            while True:
+                query = (
+                    select(primary_key, cast(column, Text))
+                    .where(column.isnot(None))
+                    .order_by(primary_key)
+                    .limit(MIGRATION_CHUNK_SIZE)
+                )
+                if last_id is not None:
+                    query = query.where(primary_key > last_id)
+                rows = conn.execute(query).all()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                changes = []
+                for row_id, raw in rows:
+                    if not raw.strip():
+                        changes.append({'_id': row_id, '_value': None})
+                        continue
+                    try:
+                        json.loads(raw)
+                    except ValueError:
+                        # Keep legacy free text as a JSON string rather than dropping it
+                        changes.append({'_id': row_id, '_value': json.dumps(raw)})
+                if changes:
+                    conn.execute(rewrite, changes)
+                    count += len(changes)
+
+            if native:
+                if engine.dialect.name == 'postgresql':
+                    conn.execute(text(
+                        f'ALTER TABLE {table.name} ALTER COLUMN {column.name} TYPE jsonb USING {column.name}::jsonb'
+                    ))
+                else:
+                    conn.execute(text(f'ALTER TABLE {table.name} MODIFY {column.name} JSON'))
+        fixed[key] = count
+        if count:
+            logger.info(f"Rewrote {count} non-JSON values in {key}")
+    return fixed
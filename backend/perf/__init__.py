@@ -0,0 +1,8 @@
+# Performance Instrumentation Package
+# Request metrics, SQL/outbound timing, the Prometheus /metrics surface, N+1 detection and cached table counts
+
+from .metrics import request_metrics, track_external
+from .query_tracker import query_tracker, query_budget
+from .table_stats import table_stats
+
+__all__ = ['request_metrics', 'track_external', 'query_tracker', 'query_budget', 'table_stats']
@@ -0,0 +1,366 @@
+"""
+Query plan analysis and index advice.
+
+StatementCapture records the distinct SELECT/UPDATE/DELETE statements an engine
+runs while it is active (for instance while the benchmark suite or
+scripts/index_advisor.py exercises the API), together with their parameters and
+the endpoints that issued them.
+
+IndexAdvisor explains each captured statement - ``EXPLAIN QUERY PLAN`` on
+SQLite, ``EXPLAIN (FORMAT JSON)`` on PostgreSQL - and flags full table scans
+and sorts the planner has to do itself (SQLite's temp B-trees). For each flagged
+table it proposes a composite index from the statement's own predicates:
+equality columns first, then the ORDER BY columns (or one range column). An
+index that an existing one already covers is not proposed. On databases with
+transactional DDL the proposal is created inside a transaction that is rolled
+back and the statement explained again, so a proposal is marked verified only
+if the planner would actually use it.
+
+Predicates are read from the SQL SQLAlchemy emits (``table.column = ?``), so
+expressions such as ``lower(name) LIKE ?`` or leading-wildcard LIKE filters are
+not turned into proposals.
+"""
+
+import json
+import logging
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+
+from flask import has_request_context, request
+from sqlalchemy import event, inspect, text
+
+from models.base import db
+
+from .metrics import BACKGROUND_ENDPOINT
+from .query_tracker import statement_shape
+
+logger = logging.getLogger(__name__)
+
+FULL_SCAN = 'full_scan'
+SORT = 'sort'
+
+EXPLAINED_STATEMENTS = ('SELECT', 'WITH', 'UPDATE', 'DELETE')
+
+# Index names are capped at PostgreSQL's identifier limit
+MAX_INDEX_NAME = 63
+
+_TABLE_RE = re.compile(r'\b(?:FROM|JOIN|UPDATE)\s+"?(\w+)"?(?:\s+(?:AS\s+)?"?(\w+)"?)?', re.IGNORECASE)
+_PREDICATE_RE = re.compile(
+    r'"?(\w+)"?\."?(\w+)"?\s*(=|<=|>=|<>|!=|<|>|\bIN\b|\bBETWEEN\b|\bLIKE\b)', re.IGNORECASE
+)
+_JOINED_COLUMN_RE = re.compile(r'=\s*"?(\w+)"?\."?(\w+)"?')
+_ORDER_BY_RE = re.compile(r'\bORDER BY\s+(.+?)(?:\bLIMIT\b|\bOFFSET\b|\)|$)', re.IGNORECASE | re.DOTALL)
+_COLUMN_RE = re.compile(r'"?(\w+)"?\."?(\w+)"?')
+_SQLITE_SCAN_RE = re.compile(r'^SCAN (\w+)(?: AS (\w+))?$')
+_SQLITE_SORT_RE = re.compile(r'^USE TEMP B-TREE FOR (?:(?:LAST )?TERM OF )?(ORDER BY|GROUP BY|DISTINCT)')
+_KEYWORDS = {
+    'WHERE', 'ON', 'USING', 'LEFT', 'RIGHT', 'INNER', 'OUTER', 'FULL', 'CROSS', 'JOIN', 'ORDER', 'GROUP',
+    'HAVING', 'LIMIT', 'OFFSET', 'UNION', 'SET',
+}
+
+EQUALITY_OPERATORS = ('=', 'IN')
+RANGE_OPERATORS = ('<', '>', '<=', '>=', 'BETWEEN')
+
+
+class CapturedStatement:
+    """One statement shape: the first concrete statement seen and where it came from"""
+
+    __slots__ = ('shape', 'statement', 'parameters', 'count', 'endpoints')
+
+    def __init__(self, shape: str, statement: str, parameters):
+        self.shape = shape
+        self.statement = statement
+        self.parameters = parameters
+        self.count = 0
+        self.endpoints = Counter()
+
+
+class StatementCapture:
+    """Records the distinct statements an engine executes while active"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements: Dict[str, CapturedStatement] = {}
+
+    def start(self):
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def stop(self):
+        if event.contains(self.engine, 'before_cursor_execute', self._on_execute):
+            event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if executemany or not statement.lstrip().upper().startswith(EXPLAINED_STATEMENTS):
+            return
+        shape = statement_shape(statement)
+        captured = self.statements.get(shape)
+        if captured is None:
+            captured = self.statements[shape] = CapturedStatement(shape, statement, parameters)
+        captured.count += 1
+        captured.endpoints[(request.endpoint or '<unmatched>') if has_request_context() else BACKGROUND_ENDPOINT] += 1
+
+
+# Plans ------------------------------------------------------------------------------
+
+def _explain_sqlite(conn, statement, parameters) -> List[Dict]:
+    issues = []
+    for row in conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters):
+        detail = row[-1]
+        scan = _SQLITE_SCAN_RE.match(detail)
+        if scan:
+            issues.append({'kind': FULL_SCAN, 'name': scan.group(2) or scan.group(1), 'detail': detail})
+        elif _SQLITE_SORT_RE.match(detail):
+            issues.append({'kind': SORT, 'name': None, 'detail': detail})
+    return issues
+
+
+def _explain_postgresql(conn, statement, parameters) -> List[Dict]:
+    plan = conn.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {statement}', parameters).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    issues = []
+    nodes = [plan[0]['Plan']]
+    while nodes:
+        node = nodes.pop()
+        if node.get('Node Type') == 'Seq Scan':
+            issues.append({'kind': FULL_SCAN, 'name': node.get('Alias') or node.get('Relation Name'),
+                           'detail': f"Seq Scan on {node.get('Relation Name')}"})
+        elif node.get('Node Type') in ('Sort', 'Incremental Sort'):
+            issues.append({'kind': SORT, 'name': None, 'detail': f"Sort on {', '.join(node.get('Sort Key') or [])}"})
+        nodes.extend(node.get('Plans') or [])
+    return issues
+
+
+PLAN_READERS = {'sqlite': _explain_sqlite, 'postgresql': _explain_postgresql}
+
+
+# Predicates -------------------------------------------------------------------------
+
+def _aliases(statement: str) -> Dict[str, str]:
+    """Alias (or bare table name) -> table for every table the statement reads"""
+    aliases = {}
+    for table, alias in _TABLE_RE.findall(statement):
+        aliases[table] = table
+        if alias and alias.upper() not in _KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def _append(columns: List[str], column: str):
+    if column not in columns:
+        columns.append(column)
+
+
+def predicate_columns(statement: str, alias: str) -> Dict[str, List[str]]:
+    """Columns of `alias` compared for equality, compared by range and used for ordering, in statement order"""
+    found = {'equality': [], 'range': [], 'order': []}
+    order_clause = _ORDER_BY_RE.search(statement)
+    body = statement[:order_clause.start()] if order_clause else statement
+    for name, column, operator in _PREDICATE_RE.findall(body):
+        if name != alias:
+            continue
+        operator = operator.upper()
+        if operator in EQUALITY_OPERATORS:
+            _append(found['equality'], column)
+        elif operator in RANGE_OPERATORS:
+            _append(found['range'], column)
+    for name, column in _JOINED_COLUMN_RE.findall(body):
+        if name == alias:
+            _append(found['equality'], column)
+    if order_clause:
+        ordered = _COLUMN_RE.findall(order_clause.group(1))
+        # An index can only supply the order if every sort column is on this table
+        if ordered and all(name == alias for name, _ in ordered):
+            found['order'] = [column for _, column in ordered]
+    return found
+
+
+def propose_columns(statement: str, alias: str) -> List[str]:
+    columns = predicate_columns(statement, alias)
+    proposal = list(columns['equality'])
+    tail = columns['order'] or columns['range'][:1]
+    for column in tail:
+        _append(proposal, column)
+    return proposal
+
+
+def index_name(table: str, columns: List[str]) -> str:
+    return f"ix_{table}_{'_'.join(columns)}"[:MAX_INDEX_NAME]
+
+
+class IndexAdvisor:
+    """Explains captured statements and proposes indexes for the scans and sorts it finds"""
+
+    def __init__(self, engine, verify: bool = True):
+        self.engine = engine
+        self.verify = verify
+        # Table -> model class name, for migration snippets
+        self.models = {mapper.local_table.name: mapper.class_.__name__ for mapper in db.Model.registry.mappers}
+        self._existing = {}
+
+    def _explain(self, conn, statement, parameters) -> Optional[List[Dict]]:
+        reader = PLAN_READERS.get(self.engine.dialect.name)
+        if reader is None:
+            return None
+        try:
+            return reader(conn, statement, parameters)
+        except Exception as e:
+            logger.warning(f"Could not explain statement: {e}")
+            return None
+
+    def _covered(self, table: str, columns: List[str]) -> bool:
+        """True if an existing index (or the primary key) starts with `columns`"""
+        if table not in self._existing:
+            inspector = inspect(self.engine)
+            existing = [index['column_names'] for index in inspector.get_indexes(table)]
+            existing.append(inspector.get_pk_constraint(table).get('constrained_columns') or [])
+            existing.extend(constraint['column_names'] for constraint in inspector.get_unique_constraints(table))
+            self._existing[table] = existing
+        return any(index[:len(columns)] == columns for index in self._existing[table])
+
+    def _verify(self, captured: CapturedStatement, table: str, columns: List[str], issue: Dict) -> Optional[bool]:
+        """Create the index in a rolled back transaction and check the issue leaves the plan"""
+        dialect = self.engine.dialect.name
+        if not self.verify or dialect not in PLAN_READERS:
+            return None
+        column_list = ', '.join(columns)
+        with self.engine.connect() as conn:
+            # pysqlite only opens transactions for DML, so DDL needs an explicit savepoint
+            if dialect == 'sqlite':
+                conn.exec_driver_sql('SAVEPOINT index_advisor')
+            else:
+                conn.begin()
+            try:
+                conn.exec_driver_sql(f'CREATE INDEX {index_name(table, columns)} ON {table} ({column_list})')
+                issues = self._explain(conn, captured.statement, captured.parameters)
+            finally:
+                if dialect == 'sqlite':
+                    conn.exec_driver_sql('ROLLBACK TO index_advisor')
+                    conn.exec_driver_sql('RELEASE index_advisor')
+                conn.rollback()
+        if issues is None:
+            return None
+        return not any(i['kind'] == issue['kind'] and i['name'] == issue['name'] for i in issues)
+
+    def analyze(self, statements, min_rows: int = 0) -> Dict:
+        """Findings and proposals for captured statements (a StatementCapture or its values)"""
+        if isinstance(statements, StatementCapture):
+            statements = statements.statements.values()
+        findings = []
+        proposals = {}
+        row_counts = {}
+        explained = 0
+        with self.engine.connect() as conn:
+            for captured in statements:
+                issues = self._explain(conn, captured.statement, captured.parameters)
+                if issues is None:
+                    continue
+                explained += 1
+                aliases = _aliases(captured.statement)
+                for issue in issues:
+                    alias = issue['name']
+                    if issue['kind'] == SORT:
+                        # Attribute the sort to the table its ORDER BY columns belong to
+                        order = _ORDER_BY_RE.search(captured.statement)
+                        ordered = _COLUMN_RE.findall(order.group(1)) if order else []
+                        alias = ordered[0][0] if ordered else None
+                    table = aliases.get(alias)
+                    if table is None:
+                        continue
+                    if table not in row_counts:
+                        row_counts[table] = conn.execute(text(f'SELECT count(*) FROM {table}')).scalar()
+                    if row_counts[table] < min_rows:
+                        continue
+                    findings.append({
+                        'table': table,
+                        'kind': issue['kind'],
+                        'detail': issue['detail'],
+                        'statement': captured.shape,
+                        'executions': captured.count,
+                        'endpoints': dict(captured.endpoints),
+                    })
+                    columns = propose_columns(captured.statement, alias)
+                    if not columns or self._covered(table, columns):
+                        continue
+                    key = (table, tuple(columns))
+                    proposal = proposals.get(key)
+                    if proposal is None:
+                        proposal = proposals[key] = {
+                            'table': table, 'columns': columns, 'rows': row_counts[table],
+                            'statements': set(), 'endpoints': Counter(), 'verified': None,
+                        }
+                    if captured.shape not in proposal['statements']:
+                        proposal['statements'].add(captured.shape)
+                        proposal['endpoints'].update(captured.endpoints)
+                    if proposal['verified'] is not True:
+                        proposal['verified'] = self._verify(captured, table, columns, issue)
+
+        return {
+            'dialect': self.engine.dialect.name,
+            'statements': explained,
+            'findings': sorted(findings, key=lambda f: -f['executions']),
+            'proposals': [self._finish(p) for p in _merge_prefixes(list(proposals.values()))],
+        }
+
+    def _finish(self, proposal: Dict) -> Dict:
+        table, columns = proposal['table'], proposal['columns']
+        name = index_name(table, columns)
+        model = self.models.get(table)
+        if model:
+            migration = f"ensure_index_exists(db.Index('{name}', {', '.join(f'{model}.{c}' for c in columns)}))"
+        else:
+            migration = f"ensure_index_exists(db.Index('{name}', {', '.join(f'db.metadata.tables[{table!r}].c.{c}' for c in columns)}))"
+        return {
+            **proposal,
+            'name': name,
+            'statements': len(proposal['statements']),
+            'executions': sum(proposal['endpoints'].values()),
+            'endpoints': [{'endpoint': e, 'executions': n} for e, n in proposal['endpoints'].most_common()],
+            'model_index': f"db.Index('{name}', {', '.join(repr(c) for c in columns)})",
+            'migration': migration,
+        }
+
+
+def _merge_prefixes(proposals: List[Dict]) -> List[Dict]:
+    """Fold a proposal into a longer one on the same table that starts with its columns"""
+    proposals.sort(key=lambda p: (p['table'], -len(p['columns'])))
+    kept = []
+    for proposal in proposals:
+        wider = next((k for k in kept if k['table'] == proposal['table']
+                      and k['columns'][:len(proposal['columns'])] == proposal['columns']), None)
+        if wider is None:
+            kept.append(proposal)
+            continue
+        new = proposal['statements'] - wider['statements']
+        wider['statements'] |= new
+        if new:
+            wider['endpoints'].update(proposal['endpoints'])
+    return sorted(kept, key=lambda p: -sum(p['endpoints'].values()))
+
+
+def format_report(report: Dict) -> str:
+    lines = [f"Explained {report['statements']} statements on {report['dialect']}: "
+             f"{len(report['findings'])} scans/sorts, {len(report['proposals'])} proposed indexes"]
+    for proposal in report['proposals']:
+        verified = {True: 'verified', False: 'not used by the planner', None: 'unverified'}[proposal['verified']]
+        endpoints = ', '.join(e['endpoint'] for e in proposal['endpoints'][:5])
+        lines.append(f"\n  {proposal['table']} ({', '.join(proposal['columns'])}) - {proposal['rows']} rows, "
+                     f"{proposal['executions']} executions, {verified}")
+        lines.append(f"    endpoints: {endpoints}")
+        lines.append(f"    model:     {proposal['model_index']}")
+        lines.append(f"    migrate:   {proposal['migration']}")
+    unresolved = [f for f in report['findings']
+                  if not any(p['table'] == f['table'] for p in report['proposals'])]
+    if unresolved:
+        lines.append("\n  Scans/sorts without a proposal:")
+        for finding in unresolved[:20]:
+            lines.append(f"    {finding['detail']} ({finding['executions']}x): {finding['statement'][:160]}")
+    return '\n'.join(lines)
@@ -0,0 +1,323 @@
+"""
+Per-request performance metrics.
+
+RequestMetrics hooks into the Flask request cycle and the SQLAlchemy engine to
+record, for every endpoint, a latency histogram plus the number of SQL statements,
+time spent in the database, time spent encoding JSON and time spent waiting on
+outbound services (OpenRouter, Watson). Each response carries a ``Server-Timing``
+header with the breakdown for that request and the aggregates are exposed in the
+Prometheus text format at ``/metrics``.
+
+Streamed responses are measured up to the point the response object is returned;
+time spent producing the body afterwards is not included.
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+from flask import Response, current_app, g, request
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+
+from models.base import db
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Endpoint label used for statements issued outside a request (background threads, CLI)
+BACKGROUND_ENDPOINT = 'background'
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_current_stats = contextvars.ContextVar('request_stats', default=None)
+
+
+class RequestStats:
+    """Timings collected while one request is being handled"""
+
+    __slots__ = ('started', 'db_statements', 'db_seconds', 'serialize_seconds', 'external')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_statements = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.external = {}
+
+    def add_external(self, service: str, seconds: float):
+        self.external[service] = self.external.get(service, 0.0) + seconds
+
+    def server_timing(self, total_seconds: float) -> str:
+        """Render the stats as a Server-Timing header value (durations in ms)"""
+        parts = [
+            f"app;dur={total_seconds * 1000:.1f}",
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.db_statements} queries"',
+        ]
+        for service, seconds in sorted(self.external.items()):
+            parts.append(f"{service};dur={seconds * 1000:.1f}")
+        if self.serialize_seconds:
+            parts.append(f"serialize;dur={self.serialize_seconds * 1000:.1f}")
+        return ', '.join(parts)
+
+
+def current_stats() -> Optional[RequestStats]:
+    """Stats of the request being handled on this thread, if any"""
+    return _current_stats.get()
+
+
+class Histogram:
+    """Fixed-bucket histogram; callers serialize access through the registry lock"""
+
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        index = bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+
+    def cumulative(self):
+        """Yield (le, cumulative count) pairs including +Inf"""
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            yield _format_number(bound), running
+        yield '+Inf', self.count
+
+
+class MetricsRegistry:
+    """Process-wide aggregates rendered by the /metrics endpoint"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.requests: Dict[Tuple[str, str, str], int] = {}
+            self.latency: Dict[Tuple[str, str], Histogram] = {}
+            self.db_statements: Dict[str, int] = {}
+            self.db_seconds: Dict[str, float] = {}
+            self.serialize_seconds: Dict[str, float] = {}
+            self.external: Dict[str, Histogram] = {}
+            self.external_errors: Dict[str, int] = {}
+            self.cache_lookups: Dict[Tuple[str, str], int] = {}
+
+    def observe_request(self, method: str, endpoint: str, status: int, seconds: float, stats: RequestStats):
+        with self.lock:
+            key = (method, endpoint, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            histogram = self.latency.get((method, endpoint))
+            if histogram is None:
+                histogram = self.latency[(method, endpoint)] = Histogram(self.buckets)
+            histogram.observe(seconds)
+            self._add_db(endpoint, stats.db_statements, stats.db_seconds)
+            if stats.serialize_seconds:
+                self.serialize_seconds[endpoint] = self.serialize_seconds.get(endpoint, 0.0) + stats.serialize_seconds
+
+    def observe_statement(self, endpoint: str, seconds: float):
+        with self.lock:
+            self._add_db(endpoint, 1, seconds)
+
+    def observe_external(self, service: str, seconds: float, failed: bool = False):
+        with self.lock:
+            histogram = self.external.get(service)
+            if histogram is None:
+                histogram = self.external[service] = Histogram(self.buckets)
+            histogram.observe(seconds)
+            if failed:
+                self.external_errors[service] = self.external_errors.get(service, 0) + 1
+
+    def observe_cache(self, endpoint: str, result: str):
+        """Count a response cache lookup (`hit` or `miss`) for an endpoint"""
+        with self.lock:
+            key = (endpoint, result)
+            self.cache_lookups[key] = self.cache_lookups.get(key, 0) + 1
+
+    def _add_db(self, endpoint: str, statements: int, seconds: float):
+        if not statements:
+            return
+        self.db_statements[endpoint] = self.db_statements.get(endpoint, 0) + statements
+        self.db_seconds[endpoint] = self.db_seconds.get(endpoint, 0.0) + seconds
+
+    def render(self) -> str:
+        """Prometheus text exposition of everything recorded so far"""
+        lines = []
+        with self.lock:
+            _counter(lines, 'sustainalign_http_requests_total', 'HTTP requests handled',
+                     {_labels(method=m, endpoint=e, status=s): v for (m, e, s), v in self.requests.items()})
+            _histogram(lines, 'sustainalign_http_request_duration_seconds', 'Time to build the response',
+                       {_labels(method=m, endpoint=e): h for (m, e), h in self.latency.items()})
+            _counter(lines, 'sustainalign_db_statements_total', 'SQL statements executed',
+                     {_labels(endpoint=e): v for e, v in self.db_statements.items()})
+            _counter(lines, 'sustainalign_db_duration_seconds_total', 'Time spent executing SQL',
+                     {_labels(endpoint=e): v for e, v in self.db_seconds.items()})
+            _counter(lines, 'sustainalign_serialization_duration_seconds_total', 'Time spent encoding JSON responses',
+                     {_labels(endpoint=e): v for e, v in self.serialize_seconds.items()})
+            _histogram(lines, 'sustainalign_external_request_duration_seconds', 'Outbound calls to external services',
+                       {_labels(service=s): h for s, h in self.external.items()})
+            _counter(lines, 'sustainalign_external_request_errors_total', 'Outbound calls that raised',
+                     {_labels(service=s): v for s, v in self.external_errors.items()})
+            _counter(lines, 'sustainalign_response_cache_lookups_total', 'Response cache lookups by result',
+                     {_labels(endpoint=e, result=r): v for (e, r), v in self.cache_lookups.items()})
+        return '\n'.join(lines) + '\n'
+
+
+def _format_number(value) -> str:
+    if isinstance(value, float):
+        return repr(value) if value != int(value) else f"{value:.1f}"
+    return str(value)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels) -> str:
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _counter(lines, name, help_text, samples):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} counter")
+    for labels, value in sorted(samples.items()):
+        lines.append(f"{name}{{{labels}}} {_format_number(value)}")
+
+
+def _histogram(lines, name, help_text, samples):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, histogram in sorted(samples.items()):
+        for le, count in histogram.cumulative():
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {count}')
+        lines.append(f"{name}_sum{{{labels}}} {_format_number(histogram.sum)}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """JSON provider that charges encoding time to the current request"""
+
+    def dumps(self, obj, **kwargs):
+        stats = _current_stats.get()
+        if stats is None:
+            return super().dumps(obj, **kwargs)
+        started = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            stats.serialize_seconds += time.perf_counter() - started
+
+
+@contextmanager
+def track_external(service: str):
+    """Time an outbound call, e.g. ``with track_external('openrouter'): requests.post(...)``"""
+    started = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except Exception:
+        failed = True
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.add_external(service, elapsed)
+        request_metrics.registry.observe_external(service, elapsed, failed)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('perf_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('perf_started')
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.db_statements += 1
+        stats.db_seconds += elapsed
+    else:
+        request_metrics.registry.observe_statement(BACKGROUND_ENDPOINT, elapsed)
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    connection = exception_context.connection
+    if connection is not None and connection.info.get('perf_started'):
+        connection.info['perf_started'].pop()
+
+
+def _register_engine_events(engine):
+    if event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        return
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(engine, 'handle_error', _handle_error)
+
+
+class RequestMetrics:
+    """Flask extension wiring the request hooks, engine events and /metrics route"""
+
+    def __init__(self, registry: MetricsRegistry = None):
+        self.registry = registry or MetricsRegistry()
+
+    def init_app(self, app):
+        app.config.setdefault('METRICS_ENABLED', True)
+        app.config.setdefault('METRICS_SERVER_TIMING', True)
+        app.config.setdefault('METRICS_PATH', '/metrics')
+        app.extensions['request_metrics'] = self
+        if not app.config['METRICS_ENABLED']:
+            return
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        if type(app.json) is DefaultJSONProvider:
+            app.json = TimedJSONProvider(app)
+        with app.app_context():
+            _register_engine_events(db.engine)
+        app.add_url_rule(app.config['METRICS_PATH'], 'metrics', self.metrics_view)
+
+    def metrics_view(self):
+        return Response(self.registry.render(), mimetype=PROMETHEUS_CONTENT_TYPE)
+
+    def _before_request(self):
+        stats = RequestStats()
+        g.request_stats = stats
+        _current_stats.set(stats)
+
+    def _after_request(self, response):
+        stats = _current_stats.get()
+        if stats is None:
+            return response
+        elapsed = time.perf_counter() - stats.started
+        endpoint = request.endpoint or '<unmatched>'
+        self.registry.observe_request(request.method, endpoint, response.status_code, elapsed, stats)
+        if current_app.config.get('METRICS_SERVER_TIMING', True):
+            response.headers['Server-Timing'] = stats.server_timing(elapsed)
+        return response
+
+    def _teardown_request(self, exc=None):
+        _current_stats.set(None)
+
+
+# Global metrics instance
+request_metrics = RequestMetrics()
@@ -0,0 +1,215 @@
+"""
+N+1 query detection.
+
+QueryTracker records every SQL statement issued while a request is handled,
+groups them by statement shape and flags shapes that repeat at least
+QUERY_TRACKER_REPEAT_THRESHOLD times - the signature of a serializer lazy-loading
+a relationship inside a loop. Each flagged shape is reported with the application
+frame that issued it (e.g. ``models/tracker.py:41 ProjectTrackingInfo.to_card``).
+
+It is enabled by default in debug and testing mode. Tests can also use
+``query_budget()`` to assert a maximum number of statements for a block of code:
+
+    with query_budget(5):
+        client.get('/api/projects/tracker/projects')
+"""
+
+import contextvars
+import logging
+import os
+import re
+import sys
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from flask import current_app, g, request
+from sqlalchemy import event
+
+from models.base import db
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_PERF_DIR = os.path.join(BACKEND_DIR, 'perf')
+_MODELS_DIR = os.path.join(BACKEND_DIR, 'models')
+
+# Collectors receiving statements on this thread; nested tracking (a test budget
+# around a request that is itself tracked) appends to each of them
+_active_collectors = contextvars.ContextVar('query_collectors', default=())
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_IN_LIST_RE = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a SQL statement so queries differing only in parameters compare equal"""
+    shape = _WHITESPACE_RE.sub(' ', statement).strip()
+    shape = _STRING_RE.sub('?', shape)
+    shape = _NUMBER_RE.sub('?', shape)
+    return _IN_LIST_RE.sub('(?)', shape)
+
+
+def _caller() -> Optional[str]:
+    """Describe the application frame that issued the statement.
+
+    Serializers in models/ are preferred over the route that called them, since
+    that is where the lazy load needs fixing.
+    """
+    frame = sys._getframe(2)
+    first_app_frame = None
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename.startswith(BACKEND_DIR) and not filename.startswith(_PERF_DIR):
+            code = frame.f_code
+            location = f"{os.path.relpath(filename, BACKEND_DIR)}:{frame.f_lineno} {getattr(code, 'co_qualname', code.co_name)}"
+            if filename.startswith(_MODELS_DIR):
+                return location
+            if first_app_frame is None:
+                first_app_frame = location
+        frame = frame.f_back
+    return first_app_frame
+
+
+class QueryReport:
+    """Statements captured for one request or block, grouped by shape"""
+
+    def __init__(self, statements: List[tuple]):
+        self.statements = statements
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, threshold: int) -> List[Dict]:
+        """Shapes issued at least `threshold` times, most frequent first"""
+        shapes = Counter(shape for shape, _ in self.statements)
+        findings = []
+        for shape, count in shapes.most_common():
+            if count < threshold:
+                break
+            callers = Counter(caller for s, caller in self.statements if s == shape and caller)
+            findings.append({
+                'statement': shape,
+                'count': count,
+                'callers': [caller for caller, _ in callers.most_common(3)],
+            })
+        return findings
+
+    def format(self, threshold: int = 2) -> str:
+        lines = [f"{self.count} statements"]
+        for finding in self.repeated(threshold):
+            lines.append(f"  {finding['count']}x {finding['statement'][:200]}")
+            for caller in finding['callers']:
+                lines.append(f"      from {caller}")
+        return '\n'.join(lines)
+
+
+class QueryCollector:
+    """Accumulates statements while active on the current thread"""
+
+    def __init__(self, capture_callers: bool = True):
+        self.capture_callers = capture_callers
+        self.statements = []
+        self._token = None
+
+    def start(self):
+        self._token = _active_collectors.set(_active_collectors.get() + (self,))
+        return self
+
+    def stop(self) -> QueryReport:
+        if self._token is not None:
+            _active_collectors.reset(self._token)
+            self._token = None
+        return self.report()
+
+    def report(self) -> QueryReport:
+        return QueryReport(list(self.statements))
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    collectors = _active_collectors.get()
+    if not collectors:
+        return
+    shape = statement_shape(statement)
+    caller = _caller() if any(c.capture_callers for c in collectors) else None
+    for collector in collectors:
+        collector.statements.append((shape, caller))
+
+
+def _register_engine_events(engine):
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+
+
+@contextmanager
+def query_budget(max_queries: int, max_repeats: Optional[int] = None, engine=None):
+    """Fail if the block issues more than `max_queries` statements.
+
+    With `max_repeats`, also fail if any single statement shape is issued more
+    than that many times. Must be used inside an application context unless an
+    engine is passed.
+    """
+    _register_engine_events(engine or db.engine)
+    collector = QueryCollector()
+    with collector:
+        yield collector
+    report = collector.report()
+    if report.count > max_queries:
+        raise AssertionError(f"Query budget exceeded: {report.count} > {max_queries}\n{report.format()}")
+    if max_repeats is not None and report.repeated(max_repeats + 1):
+        raise AssertionError(f"Repeated statement over {max_repeats}x (possible N+1)\n{report.format(max_repeats + 1)}")
+
+
+class QueryTracker:
+    """Flask extension flagging repeated statement shapes per request"""
+
+    def init_app(self, app):
+        app.config.setdefault('QUERY_TRACKER_ENABLED', app.debug or app.testing)
+        app.config.setdefault('QUERY_TRACKER_REPEAT_THRESHOLD', 5)
+        app.extensions['query_tracker'] = self
+        if not app.config['QUERY_TRACKER_ENABLED']:
+            return
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        with app.app_context():
+            _register_engine_events(db.engine)
+
+    def _before_request(self):
+        g.query_collector = QueryCollector().start()
+
+    def _after_request(self, response):
+        collector = g.pop('query_collector', None)
+        if collector is None:
+            return response
+        report = collector.stop()
+        findings = report.repeated(current_app.config['QUERY_TRACKER_REPEAT_THRESHOLD'])
+        g.query_report = report
+        response.headers['X-Query-Count'] = str(report.count)
+        if findings:
+            response.headers['X-Query-Repeats'] = str(len(findings))
+            for finding in findings:
+                logger.warning(
+                    f"Possible N+1 in {request.method} {request.path}: {finding['count']}x "
+                    f"{finding['statement'][:200]} from {', '.join(finding['callers']) or 'unknown'}"
+                )
+        return response
+
+    def _teardown_request(self, exc=None):
+        collector = g.pop('query_collector', None)
+        if collector is not None:
+            collector.stop()
+
+
+# Global tracker instance
+query_tracker = QueryTracker()
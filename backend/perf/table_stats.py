@@ -0,0 +1,150 @@
+"""
+Cached table row counts for the database inspector.
+
+Counting every table with ``COUNT(*)`` on each page view is a full scan per
+table. TableStats keeps the last known count of every table in memory and
+refreshes it on a background thread once it is older than
+TABLE_STATS_MAX_AGE_SECONDS; readers always get the cached numbers immediately
+(None until the first refresh finishes) and never wait for a refresh.
+
+Counts come from sources the database answers without a scan: ``max(rowid)``
+on SQLite (an index lookup; gaps left by deletes make it an upper bound),
+``pg_class.reltuples`` on PostgreSQL and ``information_schema.tables.table_rows``
+on MySQL. These are estimates and are marked as approximate. The planner
+statistics the app's own queries rely on are only read, never rewritten. Other
+databases, and tables these sources don't cover (e.g. SQLite ``WITHOUT ROWID``
+tables), fall back to an exact count on the background thread.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from flask import current_app
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import DBAPIError
+
+from models.base import db
+
+logger = logging.getLogger(__name__)
+
+def _sqlite_estimates(conn) -> Dict[str, int]:
+    estimates = {}
+    tables = conn.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+    ).scalars().all()
+    for table in tables:
+        quoted = table.replace('"', '""')
+        try:
+            # Rowids are assigned in increasing order, so the largest one bounds the count
+            estimates[table] = conn.exec_driver_sql(f'SELECT max(rowid) FROM "{quoted}"').scalar() or 0
+        except DBAPIError:
+            # WITHOUT ROWID tables are counted exactly instead
+            continue
+    return estimates
+
+
+def _postgresql_estimates(conn) -> Dict[str, int]:
+    rows = conn.execute(text(
+        "SELECT c.relname, c.reltuples FROM pg_class c "
+        "JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "WHERE c.relkind = 'r' AND n.nspname = current_schema()"
+    ))
+    # reltuples is -1 for tables never vacuumed or analyzed
+    return {name: int(tuples) for name, tuples in rows if tuples >= 0}
+
+
+def _mysql_estimates(conn) -> Dict[str, int]:
+    rows = conn.execute(text(
+        "SELECT table_name, table_rows FROM information_schema.tables WHERE table_schema = DATABASE()"
+    ))
+    return {name: int(count) for name, count in rows if count is not None}
+
+
+ESTIMATORS = {'sqlite': _sqlite_estimates, 'postgresql': _postgresql_estimates,
+              'mysql': _mysql_estimates, 'mariadb': _mysql_estimates}
+
+
+class TableStats:
+    """Row counts per table, served from memory and refreshed in the background"""
+
+    def __init__(self, max_age: float = 600):
+        self.max_age = max_age
+        self._counts: Dict[str, Dict] = {}
+        self._refreshed = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.config.setdefault('TABLE_STATS_MAX_AGE_SECONDS', self.max_age)
+        self.max_age = app.config['TABLE_STATS_MAX_AGE_SECONDS']
+        app.extensions['table_stats'] = self
+
+    def counts(self) -> Dict[str, Dict]:
+        """Cached {'rows', 'approximate', 'refreshed_at'} per table; starts a refresh when stale"""
+        stale = self._refreshed is None or time.monotonic() - self._refreshed > self.max_age
+        if stale:
+            self.refresh_async(current_app._get_current_object())
+        with self._lock:
+            return dict(self._counts)
+
+    def refresh_async(self, app) -> Optional[threading.Thread]:
+        with self._lock:
+            if self._refreshing:
+                return None
+            self._refreshing = True
+        thread = threading.Thread(target=self._refresh_in_app, args=(app,), name='table-stats-refresh', daemon=True)
+        thread.start()
+        return thread
+
+    def _refresh_in_app(self, app):
+        try:
+            with app.app_context():
+                try:
+                    self.refresh()
+                finally:
+                    db.session.remove()
+        except Exception as e:
+            logger.error(f"Error refreshing table statistics: {str(e)}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def refresh(self) -> Dict[str, Dict]:
+        """Re-read the counts now (in an app context)"""
+        estimator = ESTIMATORS.get(db.engine.dialect.name)
+        estimates = {}
+        if estimator is not None:
+            try:
+                with db.engine.begin() as conn:
+                    estimates = estimator(conn)
+            except Exception as e:
+                logger.warning(f"Planner statistics unavailable, counting rows instead: {e}")
+
+        refreshed_at = datetime.utcnow().isoformat()
+        counts = {}
+        with db.engine.connect() as conn:
+            for table in db.metadata.sorted_tables:
+                if table.name in estimates:
+                    counts[table.name] = {'rows': estimates[table.name], 'approximate': True, 'refreshed_at': refreshed_at}
+                    continue
+                try:
+                    rows = conn.execute(select(func.count()).select_from(table)).scalar()
+                except Exception:
+                    rows = None
+                counts[table.name] = {'rows': rows, 'approximate': False, 'refreshed_at': refreshed_at}
+
+        with self._lock:
+            self._counts = counts
+            self._refreshed = time.monotonic()
+        return counts
+
+    def invalidate(self):
+        with self._lock:
+            self._refreshed = None
+
+
+# Global statistics cache
+table_stats = TableStats()
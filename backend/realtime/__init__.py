@@ -0,0 +1,13 @@
+# Realtime Event Package
+# In-process (optionally Redis-backed) event broker and the change capture feeding the SSE stream
+
+from .broker import event_broker, EventBroker
+from .capture import EVENT_TYPES, register_session_events
+
+__all__ = ['event_broker', 'EventBroker', 'EVENT_TYPES', 'register_session_events', 'init_app']
+
+
+def init_app(app):
+    """Set up the broker and start publishing committed changes"""
+    event_broker.init_app(app)
+    register_session_events()
@@ -0,0 +1,213 @@
+"""
+Event broker for server-sent event push.
+
+EventBroker fans published events out to in-process subscribers, each with a
+bounded queue and an optional company filter. With a Redis URL configured the
+broker publishes to a Redis channel instead and a listener thread delivers what
+comes back from Redis to the local subscribers, so every worker process sees
+every event. Without Redis (or if it cannot be reached) delivery stays
+in-process, which is enough for a single worker.
+
+Event ids are what SSE clients send back as Last-Event-ID, so they are assigned
+once, at publish time. With Redis they come from a shared counter and travel in
+the message, so every worker numbers an event the same way. Counters start
+from the current time in microseconds rather than 1, so ids keep increasing
+across restarts and a stale Last-Event-ID never hides newer events.
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+REDIS_CHANNEL = 'sustainalign:events'
+REDIS_EVENT_ID_KEY = 'sustainalign:events:last_id'
+
+
+def _clock_id() -> int:
+    return time.time_ns() // 1000
+
+
+class Event:
+    """One published event: a type, a JSON-able payload and the companies it concerns"""
+
+    __slots__ = ('id', 'type', 'data', 'company_ids')
+
+    def __init__(self, event_type: str, data: Dict, company_ids: Iterable[Optional[int]] = (), event_id: int = 0):
+        self.id = event_id
+        self.type = event_type
+        self.data = data
+        self.company_ids = frozenset(cid for cid in company_ids if cid is not None)
+
+    def visible_to(self, company_id: Optional[int], types: Optional[frozenset]) -> bool:
+        if types and self.type not in types:
+            return False
+        return company_id is None or company_id in self.company_ids
+
+    def to_message(self) -> str:
+        return json.dumps({'id': self.id, 'type': self.type, 'data': self.data,
+                           'company_ids': sorted(self.company_ids)}, default=str)
+
+    @classmethod
+    def from_message(cls, message) -> 'Event':
+        payload = json.loads(message)
+        return cls(payload['type'], payload['data'], payload.get('company_ids') or (), int(payload.get('id') or 0))
+
+
+class Subscription:
+    """A subscriber's queue; events that overflow it are dropped and flagged"""
+
+    def __init__(self, broker: 'EventBroker', company_id: Optional[int], types: Optional[Iterable[str]], max_queue: int):
+        self.broker = broker
+        self.company_id = company_id
+        self.types = frozenset(types) if types else None
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def offer(self, event: Event):
+        if not event.visible_to(self.company_id, self.types):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            # The client has fallen behind; it is told to resync on its next read
+            self.dropped += 1
+
+    def get(self, timeout: float) -> Optional[Event]:
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class EventBroker:
+    """In-process pub/sub with optional Redis fan-out across workers"""
+
+    def __init__(self, history_size: int = 1000, max_queue: int = 500):
+        self.history_size = history_size
+        self.max_queue = max_queue
+        self.published = 0
+        self._subscribers = set()
+        self._history = deque(maxlen=history_size)
+        self._last_id = _clock_id()
+        self._lock = threading.Lock()
+        self._redis = None
+        self._listener = None
+
+    def init_app(self, app):
+        app.config.setdefault('EVENTS_REDIS_URL', None)
+        app.config.setdefault('EVENTS_HEARTBEAT_SECONDS', 15)
+        app.config.setdefault('EVENTS_STREAM_MAX_SECONDS', 300)
+        app.extensions['event_broker'] = self
+        if app.config['EVENTS_REDIS_URL'] and self._redis is None:
+            self.connect_redis(app.config['EVENTS_REDIS_URL'])
+
+    # Redis fan-out ------------------------------------------------------------------
+
+    def connect_redis(self, url: str) -> bool:
+        """Route publishes through Redis; returns False (staying in-process) if unavailable"""
+        try:
+            import redis
+        except ImportError:
+            logger.warning("EVENTS_REDIS_URL is set but the redis package is not installed; using in-process events")
+            return False
+        try:
+            client = redis.Redis.from_url(url)
+            client.ping()
+        except Exception as e:
+            logger.warning(f"Could not reach Redis at {url}; using in-process events: {e}")
+            return False
+        # The first worker to connect seeds the shared counter; later ones keep counting from it
+        client.set(REDIS_EVENT_ID_KEY, _clock_id(), nx=True)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(REDIS_CHANNEL)
+        self._redis = client
+        self._listener = threading.Thread(target=self._listen, args=(pubsub,), name='event-broker-redis', daemon=True)
+        self._listener.start()
+        return True
+
+    @property
+    def backend(self) -> str:
+        return 'redis' if self._redis is not None else 'memory'
+
+    def _listen(self, pubsub):
+        while self._redis is not None:
+            try:
+                message = pubsub.get_message(timeout=1.0)
+            except Exception as e:
+                logger.error(f"Redis event listener error: {str(e)}")
+                time.sleep(1.0)
+                continue
+            if message and message.get('type') == 'message':
+                try:
+                    self._deliver(Event.from_message(message['data']))
+                except (TypeError, ValueError, KeyError) as e:
+                    logger.warning(f"Ignoring malformed event from Redis: {e}")
+
+    # Publish / subscribe ------------------------------------------------------------
+
+    def publish(self, event_type: str, data: Dict, company_ids: Iterable[Optional[int]] = ()):
+        event = Event(event_type, data, company_ids)
+        if self._redis is not None:
+            try:
+                event.id = self._redis.incr(REDIS_EVENT_ID_KEY)
+                self._redis.publish(REDIS_CHANNEL, event.to_message())
+                return
+            except Exception as e:
+                logger.error(f"Redis publish failed, delivering locally: {str(e)}")
+        self._deliver(event)
+
+    def _deliver(self, event: Event):
+        with self._lock:
+            # Events from Redis arrive numbered; local ones continue after the last id seen
+            if not event.id:
+                event.id = self._last_id + 1
+            self._last_id = max(self._last_id, event.id)
+            self._history.append(event)
+            self.published += 1
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.offer(event)
+
+    def subscribe(self, company_id: Optional[int] = None, types: Optional[Iterable[str]] = None,
+                  last_event_id: Optional[int] = None) -> Subscription:
+        """Register a subscriber; with `last_event_id`, missed events still in history are queued first"""
+        subscription = Subscription(self, company_id, types, self.max_queue)
+        with self._lock:
+            if last_event_id is not None:
+                for event in self._history:
+                    if event.id > last_event_id:
+                        subscription.offer(event)
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'backend': self.backend,
+                'subscribers': len(self._subscribers),
+                'published': self.published,
+                'last_event_id': self._last_id,
+                'dropped': sum(s.dropped for s in self._subscribers),
+            }
+
+
+event_broker = EventBroker()
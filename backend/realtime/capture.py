@@ -0,0 +1,192 @@
+"""
+Change capture for the event stream.
+
+Session hooks collect tracker timeline inserts (ORM adds and bulk
+``session.execute(insert(ProjectTimelineEntry), rows)`` alike), tracker status
+and progress changes, and approval request/step status transitions while a
+transaction is flushed, then publish them once it commits. Tracker and approval
+step changes are tagged with the companies they concern - companies with an
+approved application or an approval request for the project - in one lookup per
+commit.
+"""
+
+import logging
+from typing import Dict, List, Optional, Set
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from models.approval import ApprovalRequest, ApprovalStep
+from models.base import db
+from models.projects import ProjectApplication
+from models.tracker import ProjectTimelineEntry, ProjectTrackingInfo
+
+logger = logging.getLogger(__name__)
+
+TIMELINE = 'timeline'
+TRACKER = 'tracker'
+APPROVAL = 'approval'
+APPROVAL_STEP = 'approval_step'
+
+EVENT_TYPES = (TIMELINE, TRACKER, APPROVAL, APPROVAL_STEP)
+
+TRACKER_FIELDS = ('status', 'progress_pct')
+
+
+def _changed(obj, *fields) -> Optional[Dict]:
+    """Old -> new values of the fields a flush is changing, or None if none changed"""
+    state = inspect(obj)
+    changes = {}
+    for field in fields:
+        history = state.attrs[field].history
+        if history.has_changes():
+            changes[field] = (history.deleted[0] if history.deleted else None, history.added[0] if history.added else None)
+    return changes or None
+
+
+def _timeline_payload(row: Dict) -> Dict:
+    created_at = row.get('created_at')
+    return {
+        'color': row.get('color'),
+        'text': row.get('text'),
+        'quarter': row.get('quarter'),
+        'companyId': row.get('company_id'),
+        'createdAt': created_at.isoformat() if created_at else None,
+    }
+
+
+def _pending(session) -> List:
+    return session.info.setdefault('event_stream', [])
+
+
+def _collect_changes(session, flush_context):
+    """Queue events for what this flush changed until the transaction commits"""
+    pending = None
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, ProjectTimelineEntry) and obj in session.new:
+            pending = pending if pending is not None else _pending(session)
+            row = {c: getattr(obj, c) for c in ('color', 'text', 'quarter', 'company_id', 'created_at')}
+            pending.append((TIMELINE, _timeline_payload(row), {'companies': [obj.company_id]}))
+        elif isinstance(obj, ProjectTrackingInfo):
+            changes = _changed(obj, *TRACKER_FIELDS) if obj not in session.new else {'status': (None, obj.status)}
+            if not changes:
+                continue
+            pending = pending if pending is not None else _pending(session)
+            pending.append((TRACKER, {
+                'id': f"p{obj.project_id}",
+                'projectId': obj.project_id,
+                'status': obj.status,
+                'progressPct': obj.progress_pct,
+                'previousStatus': changes.get('status', (obj.status,))[0],
+            }, {'project': obj.project_id}))
+        elif isinstance(obj, ApprovalStep) and obj not in session.new:
+            changes = _changed(obj, 'status')
+            if not changes:
+                continue
+            pending = pending if pending is not None else _pending(session)
+            pending.append((APPROVAL_STEP, {
+                'approvalId': obj.request_id,
+                'stepId': obj.id,
+                'name': obj.name,
+                'status': obj.status,
+                'previousStatus': changes['status'][0],
+                'decidedAt': obj.decided_at.isoformat() if obj.decided_at else None,
+            }, {'request': obj.request_id}))
+        elif isinstance(obj, ApprovalRequest) and obj not in session.new:
+            changes = _changed(obj, 'status')
+            if not changes:
+                continue
+            pending = pending if pending is not None else _pending(session)
+            pending.append((APPROVAL, {
+                'id': obj.id,
+                'projectId': obj.project_id,
+                'status': obj.status,
+                'previousStatus': changes['status'][0],
+            }, {'companies': [obj.company_id]}))
+
+
+def _collect_bulk_inserts(orm_execute_state):
+    """Timeline rows written with session.execute(insert(ProjectTimelineEntry), rows)"""
+    if not orm_execute_state.is_insert:
+        return
+    if (orm_execute_state.statement.entity_description or {}).get('entity') is not ProjectTimelineEntry:
+        return
+    rows = orm_execute_state.parameters
+    if isinstance(rows, dict):
+        rows = [rows]
+    if not rows:
+        return
+    pending = _pending(orm_execute_state.session)
+    for row in rows:
+        pending.append((TIMELINE, _timeline_payload(row), {'companies': [row.get('company_id')]}))
+
+
+def _resolve_companies(events: List) -> List:
+    """Replace project/request references with the company ids they concern"""
+    project_ids = {ref['project'] for _, _, ref in events if 'project' in ref}
+    request_ids = {ref['request'] for _, _, ref in events if 'request' in ref}
+    by_project: Dict[int, Set[int]] = {}
+    by_request: Dict[int, Set[int]] = {}
+    if project_ids or request_ids:
+        # The committing session can't emit SQL from after_commit, so use a fresh one
+        with Session(bind=db.engine) as lookup:
+            if project_ids:
+                for project_id, company_id in lookup.execute(
+                    select(ProjectApplication.project_id, ProjectApplication.company_id)
+                    .where(ProjectApplication.project_id.in_(project_ids), ProjectApplication.status == 'approved')
+                    .union(
+                        select(ApprovalRequest.project_id, ApprovalRequest.company_id)
+                        .where(ApprovalRequest.project_id.in_(project_ids))
+                    )
+                ):
+                    by_project.setdefault(project_id, set()).add(company_id)
+            if request_ids:
+                for request_id, company_id in lookup.execute(
+                    select(ApprovalRequest.id, ApprovalRequest.company_id).where(ApprovalRequest.id.in_(request_ids))
+                ):
+                    by_request.setdefault(request_id, set()).add(company_id)
+
+    resolved = []
+    for event_type, payload, ref in events:
+        if 'project' in ref:
+            companies = by_project.get(ref['project'], set())
+        elif 'request' in ref:
+            companies = by_request.get(ref['request'], set())
+        else:
+            companies = ref['companies']
+        resolved.append((event_type, payload, companies))
+    return resolved
+
+
+def _publish_changes(session):
+    events = session.info.pop('event_stream', None)
+    if not events or not has_app_context():
+        return
+    broker = current_app.extensions.get('event_broker')
+    if broker is None:
+        return
+    try:
+        for event_type, payload, company_ids in _resolve_companies(events):
+            broker.publish(event_type, payload, company_ids)
+    except Exception as e:
+        logger.error(f"Error publishing change events: {str(e)}")
+
+
+def _discard_changes(session):
+    session.info.pop('event_stream', None)
+
+
+_events_registered = False
+
+
+def register_session_events():
+    """Hook every session (db.session and ad-hoc Sessions) once per process"""
+    global _events_registered
+    if _events_registered:
+        return
+    event.listen(Session, 'after_flush', _collect_changes)
+    event.listen(Session, 'do_orm_execute', _collect_bulk_inserts)
+    event.listen(Session, 'after_commit', _publish_changes)
+    event.listen(Session, 'after_rollback', _discard_changes)
+    _events_registered = True
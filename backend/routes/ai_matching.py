@@ -1,6 +1,8 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context, current_app
 from ai_models.ai_matching_service import AIMatchingService
 from models.base import db
+from routes.projects import get_current_user
+from utils import sse_event
 from functools import wraps
 import logging
 
@@ -58,6 +60,148 @@ def generate_rationale():
             'error': 'Internal server error'
         }), 500
 
+@ai_matching_bp.route('/generate-rationale/stream', methods=['POST'])
+@require_ai_auth
+def generate_rationale_stream():
+    """Stream rationale insights over server-sent events as the model produces them
+    
+    Emits `reasoningSteps`, `pros` and `options` events (one per item), an
+    optional `error` event when falling back to mock data, and a final
+    `complete` event with the full rationale.
+    """
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+        
+        company_id = data.get('company_id')
+        project_filters = data.get('filters', {})
+        
+        if not company_id:
+            return jsonify({'error': 'Company ID is required'}), 400
+        
+        events = AIMatchingService.stream_project_matching_rationale(
+            company_id=company_id,
+            project_filters=project_filters
+        )
+        
+        if events is None:
+            return jsonify({
+                'success': False,
+                'error': 'Failed to generate rationale'
+            }), 500
+        
+        def generate():
+            yield sse_event('start', {'company_id': company_id})
+            try:
+                for event, payload in events:
+                    yield sse_event(event, payload)
+            except Exception as e:
+                logger.error(f"Error streaming rationale: {str(e)}")
+                yield sse_event('error', {'reason': 'Stream Interrupted', 'details': str(e)})
+        
+        return Response(
+            stream_with_context(generate()),
+            mimetype='text/event-stream',
+            headers={
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no'
+            }
+        )
+        
+    except Exception as e:
+        logger.error(f"Error starting rationale stream: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Internal server error'
+        }), 500
+
+# Runner option -> (type, smallest accepted value)
+BATCH_RUNNER_OPTIONS = {
+    'max_workers': (int, 1),
+    'requests_per_minute': (float, 1),
+    'max_retries': (int, 0),
+    'flush_every': (int, 1),
+}
+
+def _batch_runner_options(data):
+    """Coerce and range-check the runner options of a batch run request; raises ValueError"""
+    options = {}
+    for key, (cast, minimum) in BATCH_RUNNER_OPTIONS.items():
+        if data.get(key) is None:
+            continue
+        try:
+            value = cast(data[key])
+        except (TypeError, ValueError):
+            raise ValueError(f'{key} must be a number')
+        if not value >= minimum:
+            raise ValueError(f'{key} must be at least {minimum}')
+        options[key] = value
+    return options
+
+@ai_matching_bp.route('/batch-runs', methods=['POST'])
+def start_batch_run():
+    """Start a background rationale run across all (or the given) companies"""
+    user = get_current_user()
+    if not user or user.role != 'admin':
+        return jsonify({'error': 'Admin access required'}), 403
+    
+    try:
+        from ai_models.batch_matching import start_background_run
+        
+        data = request.get_json(silent=True) or {}
+        try:
+            runner_options = _batch_runner_options(data)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        if data.get('filters'):
+            runner_options['project_filters'] = data['filters']
+        
+        started = start_background_run(
+            current_app._get_current_object(),
+            company_ids=data.get('company_ids'),
+            resume=data.get('resume', True),
+            **runner_options
+        )
+        
+        if not started:
+            return jsonify({
+                'success': False,
+                'error': 'A batch run is already in progress'
+            }), 409
+        
+        return jsonify({
+            'success': True,
+            'message': 'Batch run started'
+        }), 202
+        
+    except Exception as e:
+        logger.error(f"Error starting batch run: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Internal server error'
+        }), 500
+
+@ai_matching_bp.route('/batch-runs/status', methods=['GET'])
+@require_ai_auth
+def batch_run_status():
+    """Get progress of the current or last batch run"""
+    try:
+        from ai_models.batch_matching import background_run_status
+        
+        return jsonify({
+            'success': True,
+            'data': background_run_status()
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting batch run status: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Internal server error'
+        }), 500
+
 @ai_matching_bp.route('/rationales/<int:company_id>', methods=['GET'])
 @require_ai_auth
 def get_company_rationales(company_id):
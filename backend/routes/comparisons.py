@@ -1,5 +1,8 @@
 from flask import Blueprint, request, jsonify
-from models import db, Comparison, ComparisonItem, Project, User
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from models import db, Comparison, ComparisonItem, Project, User, Company
+from ai_models.comparison_engine import load_criteria
 from utils import api_response
 from functools import wraps
 
@@ -33,7 +36,13 @@ def get_comparisons():
     """Get all comparisons for the authenticated user"""
     try:
         user_id = request.user_id
-        comparisons = Comparison.query.filter_by(user_id=user_id).all()
+        comparisons = Comparison.query.options(
+            selectinload(Comparison.items).joinedload(ComparisonItem.project).options(
+                selectinload(Project.milestones),
+                selectinload(Project.applications),
+                selectinload(Project.impact_reports),
+            )
+        ).filter_by(user_id=user_id).all()
         
         return api_response(
             data=[comp.to_dict() for comp in comparisons],
@@ -55,6 +64,11 @@ def create_comparison():
         if not data.get('name'):
             return api_response(error="Comparison name is required", status_code=400)
         
+        try:
+            requested = list(dict.fromkeys(int(i) for i in data.get('project_ids') or []))
+        except (TypeError, ValueError):
+            return api_response(error="Project IDs must be integers", status_code=400)
+        
         # Create comparison
         comparison = Comparison(
             user_id=user_id,
@@ -64,19 +78,13 @@ def create_comparison():
         db.session.add(comparison)
         db.session.flush()
         
-        # Add projects if provided
-        if data.get('project_ids'):
-            for project_id in data['project_ids']:
-                # Verify project exists
-                project = Project.query.get(project_id)
-                if not project:
-                    continue
-                
-                item = ComparisonItem(
-                    comparison_id=comparison.id,
-                    project_id=project_id
-                )
-                db.session.add(item)
+        # Add projects if provided, skipping ids that don't exist
+        if requested:
+            existing = set(db.session.scalars(select(Project.id).where(Project.id.in_(requested))))
+            db.session.add_all([
+                ComparisonItem(comparison_id=comparison.id, project_id=project_id)
+                for project_id in requested if project_id in existing
+            ])
         
         db.session.commit()
         
@@ -109,6 +117,76 @@ def get_comparison(comparison_id):
         return api_response(error=str(e), status_code=500)
 
 
+def _analysis_options():
+    """Weights and company for an analysis, from the JSON body or the query string"""
+    if request.method == 'POST':
+        data = request.get_json(silent=True) or {}
+        weights = data.get('weights') or {}
+        company_id = data.get('company_id')
+    else:
+        # ?weights=impact:2,cost:0.5
+        weights = {}
+        for part in filter(None, request.args.get('weights', '').split(',')):
+            name, _, value = part.partition(':')
+            weights[name.strip()] = value.strip()
+        company_id = request.args.get('company_id')
+    if not isinstance(weights, dict):
+        raise ValueError("weights must be an object of criterion -> weight")
+    try:
+        weights = {name: float(value) for name, value in weights.items()}
+    except (TypeError, ValueError):
+        raise ValueError("weights must be numbers")
+    if company_id is None:
+        # Alignment defaults to the caller's own company
+        company_id = db.session.scalar(select(Company.id).where(Company.user_id == request.user_id).limit(1))
+    return weights, int(company_id) if company_id is not None else None
+
+
+@comparisons_bp.route('/<int:comparison_id>/analysis', methods=['GET', 'POST'])
+@require_auth
+def analyze_comparison(comparison_id):
+    """Score, rank and Pareto-filter the projects of a comparison"""
+    try:
+        comparison = Comparison.query.filter_by(id=comparison_id, user_id=request.user_id).first()
+        if not comparison:
+            return api_response(error="Comparison not found", status_code=404)
+
+        weights, company_id = _analysis_options()
+        project_ids = db.session.scalars(
+            select(ComparisonItem.project_id)
+            .where(ComparisonItem.comparison_id == comparison_id)
+            .order_by(ComparisonItem.priority.desc(), ComparisonItem.id)
+        ).all()
+        analysis = load_criteria(project_ids, company_id).analyze(weights)
+        analysis['comparisonId'] = comparison_id
+        return api_response(data=analysis, message="Comparison analysis computed successfully")
+    except ValueError as e:
+        return api_response(error=str(e), status_code=400)
+    except Exception as e:
+        return api_response(error=str(e), status_code=500)
+
+
+@comparisons_bp.route('/analyze', methods=['POST'])
+@require_auth
+def analyze_projects():
+    """Ad-hoc analysis of a list of project ids without saving a comparison"""
+    try:
+        data = request.get_json(silent=True) or {}
+        project_ids = data.get('project_ids')
+        if not isinstance(project_ids, list) or len(project_ids) < 2:
+            return api_response(error="At least two project IDs are required", status_code=400)
+
+        weights, company_id = _analysis_options()
+        matrix = load_criteria(project_ids, company_id)
+        if len(matrix) != len({int(i) for i in project_ids}):
+            return api_response(error="One or more projects not found", status_code=404)
+        return api_response(data=matrix.analyze(weights), message="Comparison analysis computed successfully")
+    except ValueError as e:
+        return api_response(error=str(e), status_code=400)
+    except Exception as e:
+        return api_response(error=str(e), status_code=500)
+
+
 @comparisons_bp.route('/<int:comparison_id>', methods=['PUT'])
 @require_auth
 def update_comparison(comparison_id):
@@ -184,7 +262,7 @@ def add_project_to_comparison(comparison_id):
             return api_response(error="Project already in comparison", status_code=400)
         
         # Verify project exists
-        project = Project.query.get(project_id)
+        project = db.session.get(Project, project_id)
         if not project:
             return api_response(error="Project not found", status_code=404)
         
@@ -5,11 +5,14 @@ Enhanced AI Matching API Routes with IBM Watson Integration
 from flask import Blueprint, request, jsonify, current_app
 from flask_login import login_required, current_user
 import logging
+from datetime import datetime
 from typing import Dict, Any
 
 from ai_models.watson_enhanced_matching import watson_enhanced_matching
+from ai_models.comparison_engine import load_criteria
 from models.company_details import Company
 from models.projects import Project
+from routes.projects import get_current_user
 
 logger = logging.getLogger(__name__)
 
@@ -156,7 +159,7 @@ def optimize_portfolio():
             return jsonify({'error': 'One or more projects not found'}), 404
         
         # Get company profile
-        company = CompanyDetails.query.filter_by(user_id=current_user.id).first()
+        company = Company.query.filter_by(user_id=current_user.id).first()
         if not company:
             return jsonify({'error': 'Company profile not found'}), 404
         
@@ -204,10 +207,13 @@ def optimize_portfolio():
         return jsonify({'error': f'Portfolio optimization failed: {str(e)}'}), 500
 
 @enhanced_ai_bp.route('/comparison', methods=['POST'])
-@login_required
 def compare_projects():
-    """Compare multiple projects using Watson agents"""
+    """Compare multiple projects on the criteria matrix, scored in one pass"""
     try:
+        user = get_current_user()
+        if not user:
+            return jsonify({'error': 'Unauthorized'}), 401
+        
         data = request.get_json()
         
         if not data or 'project_ids' not in data:
@@ -218,59 +224,50 @@ def compare_projects():
         if not isinstance(project_ids, list) or len(project_ids) < 2:
             return jsonify({'error': 'At least two project IDs are required for comparison'}), 400
         
-        # Get projects data
-        projects = Project.query.filter(Project.id.in_(project_ids)).all()
-        if len(projects) != len(project_ids):
-            return jsonify({'error': 'One or more projects not found'}), 404
+        try:
+            project_ids = list(dict.fromkeys(int(i) for i in project_ids))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Project IDs must be integers'}), 400
         
         # Get company profile
-        company = CompanyDetails.query.filter_by(user_id=current_user.id).first()
+        company = Company.query.filter_by(user_id=user.id).first()
         if not company:
             return jsonify({'error': 'Company profile not found'}), 404
         
-        # Analyze each project
-        project_analyses = []
-        for project in projects:
-            project_data = {
-                'id': project.id,
-                'title': project.title,
-                'short_description': project.short_description,
-                'funding_required': float(project.funding_required) if project.funding_required else 0,
-                'duration_months': project.duration_months,
-                'location_country': project.location_country,
-                'sdg_goals': project.get_sdg_goals() if hasattr(project, 'get_sdg_goals') else [],
-                'target_beneficiaries': project.get_target_beneficiaries() if hasattr(project, 'get_target_beneficiaries') else 0
-            }
-            
-            company_data = {
-                'id': company.id,
-                'company_name': company.company_name,
-                'sdg_goals': company.sdg_goals or [],
-                'location_country': company.location_country or '',
-                'budget': company.budget or 0,
-                'focus_area': company.focus_area or []
+        # One query for the projects, one for the company's alignment scores
+        matrix = load_criteria(project_ids, company.id)
+        if len(matrix) != len(project_ids):
+            return jsonify({'error': 'One or more projects not found'}), 404
+        
+        try:
+            criteria_analysis = matrix.analyze(data.get('weights'))
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+        
+        project_analyses = [
+            {
+                'project_id': project['projectId'],
+                'project_name': project['title'],
+                'analysis': {
+                    'success': True,
+                    'overall_score': round(project['score'] / 100, 4),
+                    'rank': project['rank'],
+                    'pareto_optimal': project['paretoOptimal'],
+                    'criteria': project['criteria'],
+                }
             }
-            
-            # Get analysis for this project
-            analysis = watson_enhanced_matching._get_watson_comprehensive_analysis(
-                project_data, company_data
-            )
-            
-            if analysis:
-                project_analyses.append({
-                    'project_id': project.id,
-                    'project_name': project.title,
-                    'analysis': analysis
-                })
+            for project in criteria_analysis['projects']
+        ]
         
         # Generate comparison summary
         comparison_summary = _generate_comparison_summary(project_analyses)
         
         return jsonify({
-            'comparison_type': 'watson_enhanced_comparison',
-            'timestamp': watson_enhanced_matching._get_current_timestamp(),
+            'comparison_type': 'criteria_comparison',
+            'timestamp': datetime.utcnow().isoformat(),
             'project_analyses': project_analyses,
             'comparison_summary': comparison_summary,
+            'criteria_analysis': criteria_analysis,
             'success': True
         }), 200
         
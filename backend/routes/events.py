@@ -0,0 +1,67 @@
+"""
+Server-sent event stream of tracker and approval changes.
+
+Clients open GET /api/events/stream (optionally ?company_id=&types=) with an
+EventSource instead of polling the tracker and approvals endpoints. Streams end
+after EVENTS_STREAM_MAX_SECONDS so workers are recycled; EventSource reconnects
+on its own and sends Last-Event-ID, and events still in the broker's history are
+replayed.
+"""
+
+import time
+
+from flask import Blueprint, Response, current_app, jsonify, request
+
+from realtime import EVENT_TYPES, event_broker
+from utils import sse_event
+
+events_bp = Blueprint('events', __name__, url_prefix='/api/events')
+
+
+@events_bp.get('/stream')
+def stream_events():
+    """Push timeline, tracker and approval changes as they are committed"""
+    company_id = request.args.get('company_id', type=int)
+    types = [t for t in request.args.get('types', '').split(',') if t]
+    unknown = [t for t in types if t not in EVENT_TYPES]
+    if unknown:
+        return jsonify({'error': f"Unknown event types: {', '.join(unknown)}", 'available': list(EVENT_TYPES)}), 400
+
+    last_event_id = request.headers.get('Last-Event-ID', request.args.get('last_event_id'))
+    last_event_id = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    heartbeat = current_app.config.get('EVENTS_HEARTBEAT_SECONDS', 15)
+    max_seconds = current_app.config.get('EVENTS_STREAM_MAX_SECONDS', 300)
+
+    def generate():
+        deadline = time.monotonic() + max_seconds
+        with event_broker.subscribe(company_id, types or None, last_event_id) as subscription:
+            yield "retry: 3000\n\n"
+            yield sse_event('ready', {'companyId': company_id, 'types': types or list(EVENT_TYPES)})
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                if subscription.dropped:
+                    # Events were lost while the client lagged; it should refetch
+                    yield sse_event('resync', {'dropped': subscription.dropped})
+                    subscription.dropped = 0
+                event = subscription.get(timeout=min(heartbeat, remaining))
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield sse_event(event.type, event.data, event_id=event.id)
+
+    return Response(
+        generate(),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+
+@events_bp.get('/stats')
+def event_stats():
+    """Broker backend, subscriber count and delivery counters"""
+    return jsonify(event_broker.stats())
@@ -0,0 +1,73 @@
+"""
+Bulk export endpoints for BI extracts.
+
+GET /api/exports/<dataset>?format=csv|jsonl|parquet streams a whole table
+(projects, audit_events, impact_time_series) in id order instead of the capped
+list endpoints. Any other query parameter is a dataset filter. `after_id`
+resumes an interrupted export and `limit` caps the rows returned, so large
+extracts can also be pulled in pages. Admins only.
+"""
+
+from datetime import datetime
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+
+from exports import DATASETS, FORMATS, ExportError, export_rows, write_export
+from exports.writers import parquet_available
+from routes.projects import get_current_user
+
+exports_bp = Blueprint('exports', __name__, url_prefix='/api/exports')
+
+RESERVED_PARAMS = ('format', 'after_id', 'limit')
+
+
+@exports_bp.get('')
+def list_exports():
+    """Datasets, their filters and the formats this server can write"""
+    user = get_current_user()
+    if not user or user.role != 'admin':
+        return jsonify({'error': 'Admin access required'}), 403
+    formats = [f for f in FORMATS if f != 'parquet' or parquet_available()]
+    return jsonify([
+        {'dataset': name, 'columns': dataset.column_names, 'filters': sorted(dataset.filters), 'formats': formats}
+        for name, dataset in DATASETS.items()
+    ])
+
+
+@exports_bp.get('/<dataset_name>')
+def export_dataset(dataset_name):
+    """Stream every matching row of a dataset"""
+    user = get_current_user()
+    if not user or user.role != 'admin':
+        return jsonify({'error': 'Admin access required'}), 403
+
+    dataset = DATASETS.get(dataset_name)
+    if dataset is None:
+        return jsonify({'error': f"Unknown dataset '{dataset_name}'", 'available': list(DATASETS)}), 404
+    file_format = request.args.get('format', 'csv')
+    if file_format not in FORMATS:
+        return jsonify({'error': f"Unsupported format '{file_format}'", 'available': list(FORMATS)}), 400
+    if file_format == 'parquet' and not parquet_available():
+        return jsonify({'error': 'Parquet export requires the pyarrow package'}), 501
+
+    after_id = request.args.get('after_id', type=int)
+    limit = request.args.get('limit', type=int)
+    params = {k: v for k, v in request.args.items() if k not in RESERVED_PARAMS}
+    try:
+        # Builds the query up front so bad filters fail before the response starts
+        dataset.statement(params, after_id, limit)
+    except ExportError as e:
+        return jsonify({'error': str(e)}), 400
+
+    mimetype, extension = FORMATS[file_format]
+    filename = f"{dataset.name}-{datetime.utcnow():%Y%m%d}.{extension}"
+    chunks = write_export(file_format, dataset.columns, export_rows(dataset, params, after_id, limit))
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',
+        },
+    )
@@ -1,9 +1,15 @@
 from flask import Blueprint, jsonify, request, current_app
-from models import db, User, Project, ProjectMilestone, ProjectApplication, ProjectImpactReport, NGOProfile, AIMatch, Company, NGORiskAssessment, ApprovalRequest, ApprovalStep, ImpactMetricSnapshot, ImpactTimeSeries, ImpactRegionStat, ImpactGoal, ProjectTrackingInfo, ProjectTimelineEntry, ReportJob, ReportArtifact, DecisionRationale, RationaleNote, AuditEvent, NGOImpactEvent, NGODocument, NGOTransparencyReport, NGOCertificate, NGOTestimonial
+from models import db, User, Project, ProjectMilestone, ProjectApplication, ProjectImpactReport, NGOProfile, AIMatch, Company, NGORiskAssessment, ApprovalRequest, ApprovalStep, ImpactMetricSnapshot, ImpactTimeSeries, ImpactRegionStat, ImpactGoal, ProjectTrackingInfo, ProjectTimelineEntry, ReportJob, ReportArtifact, DecisionRationale, RationaleNote, AuditEvent, NGOImpactEvent, NGODocument, NGOTransparencyReport, NGOCertificate, NGOTestimonial, NGOSummary, ProjectImportJob
 from sqlalchemy import text
-from sqlalchemy.exc import OperationalError
-from utils import decode_token
+from sqlalchemy.orm import contains_eager, joinedload, selectinload
+from caching import response_cache
+from models.records import (ApprovalRecord, AuditEventRecord, ProjectRecord, RationaleRecord, RiskSummaryRecord,
+                            fetch_records, select_records)
+from models.types import as_text
+from utils import decode_token, encode_cursor, decode_cursor
 import json
+import os
+import shutil
 from datetime import datetime
 
 projects_bp = Blueprint('projects', __name__)
@@ -21,6 +27,18 @@ def ensure_column_exists(table_name: str, column_name: str, column_sql_type: str
 
 
 
+_schema_checked = set()
+
+
+def schema_checked(name: str) -> bool:
+    """True if the `name` schema check already ran against this database; marks it as run"""
+    key = (str(db.engine.url), name)
+    if key in _schema_checked:
+        return True
+    _schema_checked.add(key)
+    return False
+
+
 def get_current_user():
     """Get current user from JWT token"""
     auth_header = request.headers.get('Authorization')
@@ -47,29 +65,29 @@ def list_projects():
     min_budget = request.args.get('min_budget')
     max_budget = request.args.get('max_budget')
     
-    # Start with base query
-    query = Project.query
+    # Start with base query (rows are read into lightweight records, not ORM entities)
+    query = select_records(ProjectRecord)
     
     # Apply filters
     if status:
-        query = query.filter(Project.status == status)
+        query = query.where(Project.status == status)
     if sdg_goal:
-        query = query.filter(Project.sdg_goals.contains(str(sdg_goal)))
+        query = query.where(as_text(Project.sdg_goals).contains(str(sdg_goal)))
     if focus_area:
-        query = query.filter(Project.csr_focus_areas.contains(focus_area))
+        query = query.where(as_text(Project.csr_focus_areas).contains(focus_area))
     if location:
-        query = query.filter(
+        query = query.where(
             (Project.location_city.contains(location)) |
             (Project.location_region.contains(location)) |
             (Project.location_country.contains(location))
         )
     if min_budget:
-        query = query.filter(Project.funding_required >= float(min_budget))
+        query = query.where(Project.funding_required >= float(min_budget))
     if max_budget:
-        query = query.filter(Project.funding_required <= float(max_budget))
+        query = query.where(Project.funding_required <= float(max_budget))
     
-    # Get projects
-    projects = query.order_by(Project.created_at.desc()).all()
+    # Get projects (collections read by to_dict are loaded in one query each)
+    projects = fetch_records(ProjectRecord, query.order_by(Project.created_at.desc()))
     
     return jsonify({
         'projects': [project.to_dict() for project in projects],
@@ -78,21 +96,44 @@ def list_projects():
 
 
 @projects_bp.get('/ai-matches')
+@response_cache.cached(AIMatch, Project)
 def list_ai_matches():
     """Get AI matches combining company and project data (public)"""
     company_id = request.args.get('company_id', type=int)
     min_score = request.args.get('min_score', default=0, type=int)
+    source = request.args.get('source')
+    limit = max(1, min(request.args.get('limit', default=100, type=int), 100))
 
-    query = AIMatch.query
+    query = AIMatch.query.options(joinedload(AIMatch.project))
     if company_id:
         query = query.filter(AIMatch.company_id == company_id)
     if min_score:
         query = query.filter(AIMatch.alignment_score >= min_score)
+    if source:
+        query = query.filter(AIMatch.source == source)
 
-    matches = query.order_by(AIMatch.alignment_score.desc()).limit(100).all()
+    matches = query.order_by(AIMatch.alignment_score.desc()).limit(limit).all()
     return jsonify([m.to_dict() for m in matches])
 
 
+@projects_bp.post('/ai-matches/refresh')
+def refresh_ai_matches():
+    """Recompute rule-based top-K matches for one company or all companies"""
+    from ai_models.match_materializer import match_materializer
+
+    data = request.get_json(silent=True) or {}
+    company_id = data.get('company_id')
+    try:
+        if company_id:
+            result = match_materializer.refresh_companies([company_id])
+        else:
+            result = match_materializer.refresh_all()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+    return jsonify({'message': 'AI matches refreshed', **result})
+
+
 @projects_bp.post('/ai-matches')
 def create_ai_match():
     """Create a new AI match (public for dev)"""
@@ -126,20 +167,22 @@ def create_ai_match():
 
 
 @projects_bp.get('/ngo-risk')
+@response_cache.cached(NGORiskAssessment, NGOProfile)
 def list_ngo_risk():
     """Summaries for NGO risk scoring page (public)"""
     # Optional filters
     q = request.args.get('q', type=str)
     risk = request.args.get('risk', type=str)
 
-    query = NGORiskAssessment.query.join(NGOProfile, NGORiskAssessment.ngo_id == NGOProfile.id)
+    # The NGO's name and sectors come back in the same statement
+    query = select_records(RiskSummaryRecord)
     if q:
         like = f"%{q.lower()}%"
-        query = query.filter(db.func.lower(NGOProfile.name).like(like))
+        query = query.where(db.func.lower(NGOProfile.name).like(like))
     if risk and risk in ('Low', 'Medium', 'High'):
-        query = query.filter(NGORiskAssessment.risk_level == risk)
+        query = query.where(NGORiskAssessment.risk_level == risk)
 
-    items = query.order_by(NGORiskAssessment.updated_at.desc()).limit(200).all()
+    items = fetch_records(RiskSummaryRecord, query.order_by(NGORiskAssessment.updated_at.desc()).limit(200))
     ngos = [i.to_summary() for i in items]
 
     # Headline counts
@@ -199,10 +242,11 @@ def create_approval():
 @projects_bp.get('/approvals')
 def list_approvals():
     # Ensure new JSON columns exist for SQLite
-    ensure_column_exists('approval_requests', 'ai_recommendation', 'TEXT')
-    ensure_column_exists('approval_requests', 'compliance_notes', 'TEXT')
-    ensure_column_exists('approval_requests', 'compliance_metrics', 'TEXT')
-    q = ApprovalRequest.query.order_by(ApprovalRequest.created_at.desc()).limit(200).all()
+    if not schema_checked('approval_requests'):
+        ensure_column_exists('approval_requests', 'ai_recommendation', 'TEXT')
+        ensure_column_exists('approval_requests', 'compliance_notes', 'TEXT')
+        ensure_column_exists('approval_requests', 'compliance_metrics', 'TEXT')
+    q = fetch_records(ApprovalRecord, select_records(ApprovalRecord).order_by(ApprovalRequest.created_at.desc()).limit(200))
     return jsonify([r.to_dict() for r in q])
 
 
@@ -281,6 +325,7 @@ def update_approval_step(approval_id: int, step_id: int):
 
 # Impact dashboard endpoints (public)
 @projects_bp.get('/impact/overview')
+@response_cache.cached(ImpactMetricSnapshot)
 def impact_overview():
     # latest snapshot (optionally scope by company_id)
     company_id = request.args.get('company_id', type=int)
@@ -293,6 +338,7 @@ def impact_overview():
 
 
 @projects_bp.get('/impact/trends')
+@response_cache.cached(ImpactTimeSeries)
 def impact_trends():
     metric = request.args.get('metric', default='co2_reduced_tons', type=str)
     company_id = request.args.get('company_id', type=int)
@@ -304,6 +350,7 @@ def impact_trends():
 
 
 @projects_bp.get('/impact/regions')
+@response_cache.cached(ImpactRegionStat)
 def impact_regions():
     metric = request.args.get('metric', default='co2_reduced_tons', type=str)
     period = request.args.get('period', type=str)
@@ -318,6 +365,7 @@ def impact_regions():
 
 
 @projects_bp.get('/impact/goals')
+@response_cache.cached(ImpactGoal)
 def impact_goals():
     company_id = request.args.get('company_id', type=int)
     q = ImpactGoal.query
@@ -327,46 +375,22 @@ def impact_goals():
     return jsonify({ 'goals': goals })
 
 
-# Project tracker endpoints (public)
-@projects_bp.get('/tracker/projects')
-def tracker_projects():
-    status = request.args.get('status')  # all | on-track | delayed | completed
-    q = db.session.query(ProjectTrackingInfo).join(Project, ProjectTrackingInfo.project_id == Project.id)
-    if status and status != 'all':
-        q = q.filter(ProjectTrackingInfo.status == status)
-    items = q.order_by(ProjectTrackingInfo.updated_at.desc()).limit(200).all()
-    return jsonify([i.to_card() for i in items])
-
-
-@projects_bp.get('/tracker/timeline')
-def tracker_timeline():
-    items = ProjectTimelineEntry.query.order_by(ProjectTimelineEntry.created_at.asc()).limit(50).all()
-    return jsonify([i.to_item() for i in items])
-
-
-@projects_bp.get('/tracker/projects/<int:project_id>')
-def tracker_project_detail(project_id: int):
-    rec = ProjectTrackingInfo.query.filter_by(project_id=project_id).first()
-    if not rec:
-        return jsonify({'error': 'Not found'}), 404
-    return jsonify(rec.to_detail())
-
-
 # Rationale endpoints (public for dev)
 @projects_bp.get('/rationales')
+@response_cache.cached(DecisionRationale, RationaleNote, scope=('company_id', 'project_id'))
 def list_rationales():
     """Get all decision rationales with optional filtering"""
     project_id = request.args.get('project_id', type=int)
     company_id = request.args.get('company_id', type=int)
     
-    query = DecisionRationale.query
+    query = select_records(RationaleRecord)
     
     if project_id:
-        query = query.filter(DecisionRationale.project_id == project_id)
+        query = query.where(DecisionRationale.project_id == project_id)
     if company_id:
-        query = query.filter(DecisionRationale.company_id == company_id)
+        query = query.where(DecisionRationale.company_id == company_id)
     
-    rationales = query.order_by(DecisionRationale.created_at.desc()).limit(100).all()
+    rationales = fetch_records(RationaleRecord, query.order_by(DecisionRationale.created_at.desc()).limit(100))
     return jsonify([rationale.to_dict() for rationale in rationales])
 
 
@@ -475,67 +499,123 @@ def add_rationale_note(rationale_id: int):
 
 
 # NGO marketplace endpoints (public)
+def _like_token(value: str) -> str:
+    """LIKE pattern matching one |-delimited entry of a summary key column"""
+    escaped = value.strip().lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%|{escaped}|%"
+
+
 @projects_bp.get('/ngos')
 def list_ngos():
+    """Marketplace cards from the NGO summary projection, newest first.
+
+    Filters: sector, sdg, state, verification, min_rating, risk. Keyset paginated:
+    pass the X-Next-Cursor response header back as ?cursor= for the next page.
+    """
     try:
-        ensure_column_exists('ngo_profiles', 'about', 'TEXT')
-        # sanity check
-        _ = db.inspect(db.engine).get_columns('ngo_profiles')
-        rows = NGOProfile.query.order_by(NGOProfile.id.desc()).limit(200).all()
-        return jsonify([r.to_summary() for r in rows])
-    except OperationalError as oe:
-        # Fallback path if column still missing: query minimal fields via raw SQL
-        msg = str(oe)
-        if 'no such column: ngo_profiles.about' in msg:
+        limit = max(1, min(request.args.get('limit', 200, type=int), 200))
+        sector = request.args.get('sector')
+        sdg = request.args.get('sdg', type=int)
+        state = request.args.get('state')
+        verification = request.args.get('verification')
+        min_rating = request.args.get('min_rating', type=int)
+        risk = request.args.get('risk')
+        cursor = request.args.get('cursor')
+
+        query = db.session.query(NGOSummary.ngo_id, NGOSummary.payload)
+        if sector:
+            query = query.filter(NGOSummary.sectors_key.like(_like_token(sector), escape='\\'))
+        if sdg:
+            query = query.filter(NGOSummary.sdgs_key.like(f"%|{sdg}|%"))
+        if state:
+            query = query.filter(NGOSummary.state_key == state.strip().lower())
+        if verification:
+            query = query.filter(NGOSummary.verification_badge == verification)
+        if min_rating:
+            query = query.filter(NGOSummary.rating >= min_rating)
+        if risk:
+            query = query.filter(NGOSummary.risk_level == risk)
+        if cursor:
+            key = decode_cursor(cursor)
             try:
-                ensure_column_exists('ngo_profiles', 'about', 'TEXT')
-                # raw select limited fields
-                sql = text("""
-                    SELECT id, name, city, state, country, rating, verification_badge, primary_sectors, logo_url, profile_image_url, total_projects_completed, total_beneficiaries_reached
-                    FROM ngo_profiles
-                    ORDER BY id DESC LIMIT 200
-                """)
-                result = db.session.execute(sql).mappings().all()
-                def parse_list(v):
-                    try:
-                        import json as _json
-                        return _json.loads(v) if v else []
-                    except Exception:
-                        return []
-                payload = []
-                for r in result:
-                    payload.append({
-                        'id': r['id'],
-                        'name': r['name'],
-                        'location': { 'city': r['city'], 'state': r['state'], 'country': r['country'] },
-                        'rating': r['rating'],
-                        'verificationBadge': r['verification_badge'],
-                        'sectors': parse_list(r['primary_sectors']),
-                        'logoUrl': r['logo_url'],
-                        'profileImageUrl': r['profile_image_url'],
-                        'projectsCompleted': r['total_projects_completed'],
-                        'beneficiariesReached': r['total_beneficiaries_reached'],
-                    })
-                return jsonify(payload)
-            except Exception as e2:
-                current_app.logger.error(f"/api/ngos raw fallback failed: {e2}")
-                return jsonify({'error': 'failed', 'detail': str(e2)}), 500
-        current_app.logger.error(f"/api/ngos operational error: {oe}")
-        return jsonify({'error': 'failed', 'detail': msg}), 500
+                last_id = int(key[0])
+            except (TypeError, ValueError, IndexError):
+                return jsonify({'error': 'Invalid cursor'}), 400
+            query = query.filter(NGOSummary.ngo_id < last_id)
+
+        rows = query.order_by(NGOSummary.ngo_id.desc()).limit(limit + 1).all()
+        # Payloads are stored as JSON already; splice them instead of decoding/re-encoding
+        body = '[' + ','.join(payload for _, payload in rows[:limit]) + ']'
+        response = current_app.response_class(body, mimetype='application/json')
+        if len(rows) > limit:
+            response.headers['X-Next-Cursor'] = encode_cursor(rows[limit - 1].ngo_id)
+        return response
     except Exception as e:
         current_app.logger.error(f"/api/ngos failed: {e}")
         return jsonify({'error': 'failed', 'detail': str(e)}), 500
 
 
+def _sorted_desc(rows, attr, limit=None, nulls_last=False):
+    """Sort eagerly loaded children newest first, matching the per-resource endpoints"""
+    present = sorted((r for r in rows if getattr(r, attr) is not None), key=lambda r: getattr(r, attr), reverse=True)
+    missing = [r for r in rows if getattr(r, attr) is None]
+    ordered = present + missing if nulls_last else missing + present
+    return ordered[:limit] if limit else ordered
+
+
+# include name -> (response key, relationship, rows -> serialized list)
+NGO_INCLUDES = {
+    'timeline': ('impactTimeline', NGOProfile.impact_events, lambda rows: [
+        r.to_timeline_item() for r in sorted(rows, key=lambda r: (r.date is not None, r.date or datetime.min.date()))
+    ]),
+    'documents': ('documents', NGOProfile.documents_rel, lambda rows: [
+        r.to_row() for r in _sorted_desc(rows, 'uploaded_at')
+    ]),
+    'transparency': ('transparency', NGOProfile.transparency_reports, lambda rows: [
+        r.to_dict() for r in _sorted_desc(rows, 'created_at', limit=12)
+    ]),
+    'certificates': ('certificates', NGOProfile.certificates, lambda rows: [
+        r.to_card() for r in _sorted_desc(rows, 'valid_until', nulls_last=True)
+    ]),
+    'testimonials': ('testimonials', NGOProfile.testimonials, lambda rows: [
+        r.to_card() for r in _sorted_desc(rows, 'created_at', limit=50)
+    ]),
+}
+
+
 @projects_bp.get('/ngos/<int:ngo_id>')
 def get_ngo(ngo_id: int):
+    """NGO detail, optionally with sub-resources in the same response.
+
+    ?include=timeline,documents,transparency,certificates,testimonials (or all)
+    loads each requested collection with one SELECT ... IN query. The response
+    carries an ETag over the whole payload and answers If-None-Match with 304.
+    """
     try:
-        ensure_column_exists('ngo_profiles', 'about', 'TEXT')
-        _ = db.inspect(db.engine).get_columns('ngo_profiles')
-        ngo = NGOProfile.query.filter_by(id=ngo_id).first()
+        if not schema_checked('ngo_profiles'):
+            ensure_column_exists('ngo_profiles', 'about', 'TEXT')
+
+        include = [part.strip() for part in request.args.get('include', '').split(',') if part.strip()]
+        if 'all' in include:
+            include = list(NGO_INCLUDES)
+        unknown = [name for name in include if name not in NGO_INCLUDES]
+        if unknown:
+            return jsonify({'error': f"Unknown include: {', '.join(unknown)}", 'allowed': list(NGO_INCLUDES)}), 400
+
+        query = NGOProfile.query.options(*[selectinload(NGO_INCLUDES[name][1]) for name in include])
+        ngo = query.filter(NGOProfile.id == ngo_id).first()
         if not ngo:
             return jsonify({'error': 'NGO not found'}), 404
-        return jsonify(ngo.to_detail())
+
+        payload = ngo.to_detail()
+        for name in include:
+            key, relationship, serialize = NGO_INCLUDES[name]
+            payload[key] = serialize(getattr(ngo, relationship.key))
+
+        response = jsonify(payload)
+        response.cache_control.no_cache = True
+        response.add_etag()
+        return response.make_conditional(request)
     except Exception as e:
         current_app.logger.error(f"/api/ngos/{ngo_id} failed: {e}")
         if current_app.debug:
@@ -592,7 +672,7 @@ def create_report_job():
 @projects_bp.get('/reports')
 def list_report_jobs():
     company_id = request.args.get('company_id', type=int)
-    q = ReportJob.query.order_by(ReportJob.created_at.desc())
+    q = ReportJob.query.options(selectinload(ReportJob.artifacts)).order_by(ReportJob.created_at.desc())
     if company_id:
         q = q.filter(ReportJob.company_id == company_id)
     jobs = [j.to_dict() for j in q.limit(50).all()]
@@ -709,6 +789,69 @@ def create_project():
         return jsonify({'error': f'Failed to create project: {str(e)}'}), 500
 
 
+IMPORT_ROLES = ('ngo', 'admin')
+
+
+@projects_bp.post('/projects/import')
+def import_projects():
+    """Bulk import projects from a CSV or JSONL upload (NGOs and admins)"""
+    from ai_models.project_import import DEFAULT_IMPORT_DIR, detect_format, run_import_job, start_import_job
+
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'Unauthorized'}), 401
+    if user.role not in IMPORT_ROLES:
+        return jsonify({'error': 'Only NGO and admin accounts can import projects'}), 403
+
+    # Multipart upload in the `file` field, or the raw file as the request body
+    upload = request.files.get('file')
+    filename = upload.filename if upload else request.args.get('filename')
+    content_type = upload.mimetype if upload else request.mimetype
+    file_format = detect_format(filename, content_type, request.args.get('format'))
+    if not file_format:
+        return jsonify({'error': 'Upload a .csv or .jsonl file, or pass format=csv|jsonl'}), 400
+    stream = upload.stream if upload else request.stream
+
+    batch_size = request.args.get('batch_size', type=int) or current_app.config.get('PROJECT_IMPORT_BATCH_SIZE', 500)
+    background_bytes = current_app.config.get('PROJECT_IMPORT_BACKGROUND_BYTES', 1_000_000)
+    background = request.args.get('background') in ('1', 'true') or (request.content_length or 0) > background_bytes
+
+    job = ProjectImportJob(filename=filename, file_format=file_format, created_by=user.id, status='queued')
+    db.session.add(job)
+    db.session.commit()
+
+    if not background:
+        run_import_job(job, stream, batch_size=batch_size)
+        return jsonify(job.to_dict()), 200 if job.status == 'completed' else 400
+
+    # Spool the upload to disk so the request can return while the worker imports it
+    import_dir = current_app.config.get('PROJECT_IMPORT_DIR', DEFAULT_IMPORT_DIR)
+    os.makedirs(import_dir, exist_ok=True)
+    path = os.path.join(import_dir, f'job_{job.id}.{file_format}')
+    try:
+        with open(path, 'wb') as f:
+            shutil.copyfileobj(stream, f)
+    except OSError as e:
+        job.status = 'failed'
+        job.error = f'Could not store upload: {str(e)}'
+        db.session.commit()
+        return jsonify(job.to_dict()), 500
+    start_import_job(current_app._get_current_object(), job.id, path, batch_size=batch_size)
+    return jsonify(job.to_dict()), 202
+
+
+@projects_bp.get('/projects/import/<int:job_id>')
+def get_import_job(job_id):
+    """Progress and per-row error report of a bulk import"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'Unauthorized'}), 401
+    job = db.session.get(ProjectImportJob, job_id)
+    if not job or (job.created_by != user.id and user.role != 'admin'):
+        return jsonify({'error': 'Import job not found'}), 404
+    return jsonify(job.to_dict())
+
+
 @projects_bp.put('/projects/<int:project_id>')
 def update_project(project_id):
     """Update an existing project"""
@@ -976,21 +1119,21 @@ def list_audit_events():
         limit = request.args.get('limit', 100, type=int)
         
         # Build query
-        query = AuditEvent.query
+        query = select_records(AuditEventRecord)
         
         if entity_type:
-            query = query.filter(AuditEvent.entity_type == entity_type)
+            query = query.where(AuditEvent.entity_type == entity_type)
         if entity_id:
-            query = query.filter(AuditEvent.entity_id == entity_id)
+            query = query.where(AuditEvent.entity_id == entity_id)
         if action:
-            query = query.filter(AuditEvent.action == action)
+            query = query.where(AuditEvent.action == action)
         if actor_role:
-            query = query.filter(AuditEvent.actor_role == actor_role)
+            query = query.where(AuditEvent.actor_role == actor_role)
         if source:
-            query = query.filter(AuditEvent.source == source)
+            query = query.where(AuditEvent.source == source)
         
         # Order by most recent first
-        events = query.order_by(AuditEvent.created_at.desc()).limit(limit).all()
+        events = fetch_records(AuditEventRecord, query.order_by(AuditEvent.created_at.desc()).limit(limit))
         
         return jsonify([event.to_dict() for event in events])
         
@@ -1046,6 +1189,8 @@ def create_audit_event():
 
 
 @projects_bp.get('/audit/summary')
+# Short TTL: recent_events counts a sliding 24 hour window
+@response_cache.cached(AuditEvent, ttl=60)
 def get_audit_summary():
     """Get audit summary statistics"""
     try:
@@ -1090,33 +1235,84 @@ def get_audit_summary():
 
 
 # Tracker endpoints (public for dev)
+TRACKER_COLUMNS = [
+    ('details', 'JSON'),
+    ('team_user_ids', 'JSON'),
+    ('gradient_from', 'VARCHAR(16)'),
+    ('gradient_to', 'VARCHAR(16)'),
+    ('progress_from', 'VARCHAR(16)'),
+    ('progress_to', 'VARCHAR(16)'),
+    ('metric_color', 'VARCHAR(16)'),
+    ('tooltip', 'VARCHAR(255)'),
+    ('cta_label', 'VARCHAR(64)'),
+    ('cta_color', 'VARCHAR(16)'),
+]
+def ensure_tracker_schema():
+    """Bring older tracker tables up to date; runs once per database per process"""
+    if schema_checked('tracker'):
+        return
+    for column_name, column_sql_type in TRACKER_COLUMNS:
+        ensure_column_exists('project_tracking_info', column_name, column_sql_type)
+    for index in list(ProjectTrackingInfo.__table__.indexes) + list(ProjectTimelineEntry.__table__.indexes):
+        try:
+            index.create(db.engine, checkfirst=True)
+        except Exception as e:
+            current_app.logger.warning(f"Could not ensure index {index.name}: {e}")
+
+
+def tracker_query():
+    """Tracking rows with the project title loaded in the same query"""
+    return (
+        ProjectTrackingInfo.query
+        .join(ProjectTrackingInfo.project)
+        .options(contains_eager(ProjectTrackingInfo.project).load_only(Project.id, Project.title))
+    )
+
+
 @projects_bp.get('/tracker/projects')
 def list_tracker_projects():
-    """Get all project tracking info with optional filtering"""
+    """Tracker board cards, newest first.
+
+    Filters: status (on-track | delayed | completed | all), company_id (projects the
+    company has applied to). Keyset paginated: pass the X-Next-Cursor response
+    header back as ?cursor= to fetch the next page.
+    """
     try:
-        # Ensure tracker table columns exist
-        ensure_column_exists('project_tracking_info', 'details', 'JSON')
-        ensure_column_exists('project_tracking_info', 'team_user_ids', 'JSON')
-        ensure_column_exists('project_tracking_info', 'gradient_from', 'VARCHAR(16)')
-        ensure_column_exists('project_tracking_info', 'gradient_to', 'VARCHAR(16)')
-        ensure_column_exists('project_tracking_info', 'progress_from', 'VARCHAR(16)')
-        ensure_column_exists('project_tracking_info', 'progress_to', 'VARCHAR(16)')
-        ensure_column_exists('project_tracking_info', 'metric_color', 'VARCHAR(16)')
-        ensure_column_exists('project_tracking_info', 'tooltip', 'VARCHAR(255)')
-        ensure_column_exists('project_tracking_info', 'cta_label', 'VARCHAR(64)')
-        ensure_column_exists('project_tracking_info', 'cta_color', 'VARCHAR(16)')
-        
+        ensure_tracker_schema()
+
         status = request.args.get('status')
-        limit = request.args.get('limit', 50, type=int)
-        
-        query = ProjectTrackingInfo.query.join(Project)
-        
+        company_id = request.args.get('company_id', type=int)
+        limit = max(1, min(request.args.get('limit', 200, type=int), 200))
+        cursor = request.args.get('cursor')
+
+        query = tracker_query()
         if status and status != 'all':
             query = query.filter(ProjectTrackingInfo.status == status)
-        
-        tracking_info = query.order_by(ProjectTrackingInfo.updated_at.desc()).limit(limit).all()
-        return jsonify([info.to_card() for info in tracking_info])
-        
+        if company_id:
+            query = query.filter(
+                db.session.query(ProjectApplication.id)
+                .filter(ProjectApplication.project_id == ProjectTrackingInfo.project_id,
+                        ProjectApplication.company_id == company_id)
+                .exists()
+            )
+        if cursor:
+            key = decode_cursor(cursor)
+            try:
+                updated_at, last_id = datetime.fromisoformat(key[0]), int(key[1])
+            except (TypeError, ValueError, IndexError):
+                return jsonify({'error': 'Invalid cursor'}), 400
+            query = query.filter(db.or_(
+                ProjectTrackingInfo.updated_at < updated_at,
+                db.and_(ProjectTrackingInfo.updated_at == updated_at, ProjectTrackingInfo.id < last_id),
+            ))
+
+        rows = query.order_by(ProjectTrackingInfo.updated_at.desc(), ProjectTrackingInfo.id.desc()).limit(limit + 1).all()
+        response = jsonify([info.to_card() for info in rows[:limit]])
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            response.headers['X-Next-Cursor'] = encode_cursor(last.updated_at, last.id)
+        return response
+
     except Exception as e:
         return jsonify({'error': f'Failed to fetch tracker projects: {str(e)}'}), 500
 
@@ -1125,24 +1321,14 @@ def list_tracker_projects():
 def get_tracker_project(project_id: int):
     """Get detailed tracking info for a specific project"""
     try:
-        # Ensure tracker table columns exist
-        ensure_column_exists('project_tracking_info', 'details', 'JSON')
-        ensure_column_exists('project_tracking_info', 'team_user_ids', 'JSON')
-        ensure_column_exists('project_tracking_info', 'gradient_from', 'VARCHAR(16)')
-        ensure_column_exists('project_tracking_info', 'gradient_to', 'VARCHAR(16)')
-        ensure_column_exists('project_tracking_info', 'progress_from', 'VARCHAR(16)')
-        ensure_column_exists('project_tracking_info', 'progress_to', 'VARCHAR(16)')
-        ensure_column_exists('project_tracking_info', 'metric_color', 'VARCHAR(16)')
-        ensure_column_exists('project_tracking_info', 'tooltip', 'VARCHAR(255)')
-        ensure_column_exists('project_tracking_info', 'cta_label', 'VARCHAR(64)')
-        ensure_column_exists('project_tracking_info', 'cta_color', 'VARCHAR(16)')
-        
-        tracking_info = ProjectTrackingInfo.query.filter_by(project_id=project_id).first()
+        ensure_tracker_schema()
+
+        tracking_info = tracker_query().filter(ProjectTrackingInfo.project_id == project_id).first()
         if not tracking_info:
             return jsonify({'error': 'Project tracking info not found'}), 404
-        
+
         return jsonify(tracking_info.to_detail())
-        
+
     except Exception as e:
         return jsonify({'error': f'Failed to fetch tracker project: {str(e)}'}), 500
 
@@ -1251,21 +1437,51 @@ def update_tracker_project(project_id: int):
         return jsonify({'error': f'Failed to update tracker project: {str(e)}'}), 500
 
 
+@projects_bp.get('/tracker/projects/<int:project_id>/monitoring')
+def get_tracker_project_monitoring(project_id: int):
+    """Current status and alerts for one project, computed from its tracked data"""
+    try:
+        from ai_models.monitoring_engine import monitoring_engine
+
+        results = monitoring_engine.evaluate([project_id])
+        if not results:
+            return jsonify({'error': 'Project not found or not monitored'}), 404
+        return jsonify(results[0])
+
+    except Exception as e:
+        return jsonify({'error': f'Failed to monitor project: {str(e)}'}), 500
+
+
+@projects_bp.post('/tracker/monitoring/run')
+def run_tracker_monitoring():
+    """Monitor projects changed since the last run (or all of them with ?full=1)"""
+    try:
+        from ai_models.monitoring_engine import monitoring_engine
+
+        summary = monitoring_engine.run(full=request.args.get('full', type=int) == 1)
+        if summary.get('skipped'):
+            return jsonify({'error': summary['reason']}), 409
+        return jsonify(summary)
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Monitoring run failed: {str(e)}'}), 500
+
+
 @projects_bp.get('/tracker/timeline')
 def get_tracker_timeline():
-    """Get timeline entries for tracker overview"""
+    """The most recent timeline entries, returned oldest first for display"""
     try:
         company_id = request.args.get('company_id', type=int)
-        limit = request.args.get('limit', 20, type=int)
-        
+        limit = max(1, min(request.args.get('limit', 50, type=int), 200))
+
         query = ProjectTimelineEntry.query
-        
         if company_id:
             query = query.filter(ProjectTimelineEntry.company_id == company_id)
-        
-        entries = query.order_by(ProjectTimelineEntry.created_at.desc()).limit(limit).all()
-        return jsonify([entry.to_item() for entry in entries])
-        
+
+        entries = query.order_by(ProjectTimelineEntry.created_at.desc(), ProjectTimelineEntry.id.desc()).limit(limit).all()
+        return jsonify([entry.to_item() for entry in reversed(entries)])
+
     except Exception as e:
         return jsonify({'error': f'Failed to fetch timeline: {str(e)}'}), 500
 
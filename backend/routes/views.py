@@ -1,5 +1,12 @@
-from flask import Blueprint, render_template
+from datetime import date, datetime
+
+from flask import Blueprint, jsonify, render_template, request
+from sqlalchemy import JSON, LargeBinary, Text, select
+
 from models import User, db
+from models.types import JSONText
+from perf import table_stats
+from routes.projects import get_current_user
 
 views_bp = Blueprint('views', __name__)
 
@@ -42,33 +49,105 @@ def health_page():
 
 
 
+# Columns a table preview shows unless ?columns= asks for others
+PREVIEW_COLUMNS = 8
+PREVIEW_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+# Preview cells are cut to this many characters
+MAX_CELL_CHARS = 120
+# Columns whose name contains one of these are never shown, even on request
+CREDENTIAL_MARKERS = ('password', 'hash', 'token', 'secret', 'api_key')
+
+
+def _is_admin():
+	user = get_current_user()
+	return user is not None and user.role == 'admin'
+
+
+def _visible_columns(table):
+	"""Names of the columns the inspector may show: everything but credentials"""
+	return [c.name for c in table.c if not any(marker in c.name.lower() for marker in CREDENTIAL_MARKERS)]
+
+
+def _preview_columns(table):
+	"""Short columns in table order; long text, JSON and binary columns only on request"""
+	wide = (Text, JSON, JSONText, LargeBinary)
+	visible = _visible_columns(table)
+	return [c.name for c in table.c if c.name in visible and not isinstance(c.type, wide)][:PREVIEW_COLUMNS]
+
+
+def _cell(value):
+	if value is None or isinstance(value, (bool, int, float)):
+		return value
+	value = value.isoformat() if isinstance(value, (date, datetime)) else str(value)
+	return value if len(value) <= MAX_CELL_CHARS else value[:MAX_CELL_CHARS] + '…'
+
+
 @views_bp.get('/database')
 def database_view():
+	if not _is_admin():
+		return jsonify({'error': 'Admin access required'}), 403
+
+	# Only metadata and cached counts here; rows are fetched per table when it is opened
+	counts = table_stats.counts()
 	tables_info = []
-	# Iterate over all known tables in SQLAlchemy metadata
 	for table in db.metadata.sorted_tables:
-		try:
-			total_rows = db.session.scalar(
-				db.select(db.func.count()).select_from(table)
-			)
-		except Exception:
-			total_rows = None
-
-		column_names = [col.name for col in table.c]
-		preview_rows = []
-		try:
-			result = db.session.execute(db.select(table).limit(25))
-			for row in result:
-				mapping = row._mapping
-				preview_rows.append({name: mapping.get(name) for name in column_names})
-		except Exception:
-			preview_rows = []
-
+		stats = counts.get(table.name) or {}
 		tables_info.append({
 			'name': table.name,
-			'columns': column_names,
-			'count': total_rows,
-			'rows': preview_rows,
+			'columns': _visible_columns(table),
+			'preview_columns': _preview_columns(table),
+			'count': stats.get('rows'),
+			'approximate': stats.get('approximate', False),
 		})
 
-	return render_template('database.html', tables=tables_info)
\ No newline at end of file
+	return render_template('database.html', tables=tables_info)
+
+
+@views_bp.get('/database/<table_name>/rows')
+def database_rows(table_name):
+	"""One page of a table's rows, projected to the preview (or requested) columns"""
+	if not _is_admin():
+		return jsonify({'error': 'Admin access required'}), 403
+
+	table = db.metadata.tables.get(table_name)
+	if table is None:
+		return jsonify({'error': f'Unknown table: {table_name}'}), 404
+
+	requested = [name for name in (request.args.get('columns') or '').split(',') if name]
+	visible = _visible_columns(table)
+	unknown = [name for name in requested if name not in visible]
+	if unknown:
+		return jsonify({'error': f"Unknown columns: {', '.join(unknown)}"}), 400
+	columns = requested or _preview_columns(table)
+	limit = max(1, min(request.args.get('limit', PREVIEW_PAGE_SIZE, type=int), MAX_PAGE_SIZE))
+
+	primary_key = list(table.primary_key.columns)
+	query = select(*(table.c[name] for name in columns))
+	if len(primary_key) == 1:
+		# Keyset pagination on the primary key: each page is an index range, however deep
+		key = primary_key[0]
+		query = query.add_columns(key.label('_key')).order_by(key)
+		after = request.args.get('after')
+		if after:
+			try:
+				after = key.type.python_type(after)
+			except (NotImplementedError, TypeError, ValueError):
+				return jsonify({'error': f'Invalid cursor: {after}'}), 400
+			query = query.where(key > after)
+	else:
+		offset = max(0, request.args.get('offset', 0, type=int))
+		query = query.order_by(*primary_key).offset(offset)
+
+	rows = db.session.execute(query.limit(limit + 1)).all()
+	page = rows[:limit]
+	next_cursor = None
+	if len(rows) > limit:
+		next_cursor = {'after': page[-1]._key} if len(primary_key) == 1 else {'offset': offset + limit}
+
+	return jsonify({
+		'table': table.name,
+		'columns': columns,
+		'rows': [[_cell(row[index]) for index in range(len(columns))] for row in page],
+		'next': next_cursor,
+	})
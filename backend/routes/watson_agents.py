@@ -12,12 +12,19 @@ from ibm_watson.watson_service import watson_service
 from models.user import User
 from models.projects import Project
 from models.company_details import Company
+from perf.metrics import track_external
+from routes.projects import get_current_user
 
 logger = logging.getLogger(__name__)
 
 # Create Blueprint
 watson_bp = Blueprint('watson_agents', __name__, url_prefix='/api/watson')
 
+def _updated_at(record):
+    """Version stamp for the Watson result cache; edits invalidate cached analyses"""
+    updated_at = getattr(record, 'updated_at', None)
+    return updated_at.isoformat() if updated_at else None
+
 @watson_bp.route('/initialize', methods=['POST'])
 @login_required
 def initialize_watson():
@@ -76,7 +83,8 @@ def analyze_project_alignment():
             'sdg_focus': project.sdg_focus or [],
             'impact_metrics': project.impact_metrics or {},
             'complexity_level': project.complexity_level or 'medium',
-            'expected_beneficiaries': project.expected_beneficiaries or 0
+            'expected_beneficiaries': project.expected_beneficiaries or 0,
+            'updated_at': _updated_at(project)
         }
         
         company_profile = {
@@ -85,11 +93,13 @@ def analyze_project_alignment():
             'sdg_priorities': company.sdg_priorities or [],
             'geographic_focus': company.geographic_focus or [],
             'available_budget': company.available_budget or 0,
-            'csr_focus_areas': company.csr_focus_areas or []
+            'csr_focus_areas': company.csr_focus_areas or [],
+            'updated_at': _updated_at(company)
         }
         
         # Perform analysis
-        result = watson_service.analyze_project_alignment(project_data, company_profile)
+        with track_external('watson'):
+            result = watson_service.analyze_project_alignment(project_data, company_profile)
         
         return jsonify(result), 200 if result.get('success', False) else 500
         
@@ -142,7 +152,8 @@ def evaluate_project_feasibility():
         }
         
         # Perform evaluation
-        result = watson_service.evaluate_project_feasibility(project_data, company_profile)
+        with track_external('watson'):
+            result = watson_service.evaluate_project_feasibility(project_data, company_profile)
         
         return jsonify(result), 200 if result.get('success', False) else 500
         
@@ -175,11 +186,13 @@ def assess_project_impact():
             'baseline_data': project.baseline_data or {},
             'timeframe': data.get('timeframe', '12_months'),
             'expected_beneficiaries': project.expected_beneficiaries or 0,
+            'updated_at': _updated_at(project),
             'sustainability_score': project.sustainability_score or 0.5
         }
         
         # Perform assessment
-        result = watson_service.assess_project_impact(project_data)
+        with track_external('watson'):
+            result = watson_service.assess_project_impact(project_data)
         
         return jsonify(result), 200 if result.get('success', False) else 500
         
@@ -225,6 +238,7 @@ def optimize_budget_allocation():
                 'complexity_level': project.complexity_level or 'medium',
                 'risk_level': project.risk_level or 'medium',
                 'expected_return': project.expected_return or 0,
+                'updated_at': _updated_at(project),
                 'sustainability_score': project.sustainability_score or 0.5,
                 'sdg_alignment_score': project.sdg_alignment_score or 0.5
             }
@@ -243,9 +257,10 @@ def optimize_budget_allocation():
             })
         
         # Perform optimization
-        result = watson_service.optimize_budget_allocation(
-            available_budget, project_list, constraints
-        )
+        with track_external('watson'):
+            result = watson_service.optimize_budget_allocation(
+                available_budget, project_list, constraints
+            )
         
         return jsonify(result), 200 if result.get('success', False) else 500
         
@@ -289,6 +304,7 @@ def get_comprehensive_analysis():
             'complexity_level': project.complexity_level or 'medium',
             'risk_level': project.risk_level or 'medium',
             'expected_beneficiaries': project.expected_beneficiaries or 0,
+            'updated_at': _updated_at(project),
             'sustainability_score': project.sustainability_score or 0.5,
             'expected_return': project.expected_return or 0,
             'team_size': project.team_size or 5,
@@ -303,12 +319,14 @@ def get_comprehensive_analysis():
             'geographic_focus': company.geographic_focus or [],
             'available_budget': company.available_budget or 0,
             'csr_focus_areas': company.csr_focus_areas or [],
+            'updated_at': _updated_at(company),
             'capabilities': company.capabilities or [],
             'available_resources': company.available_resources or {}
         }
         
         # Perform comprehensive analysis
-        result = watson_service.get_comprehensive_analysis(project_data, company_profile)
+        with track_external('watson'):
+            result = watson_service.get_comprehensive_analysis(project_data, company_profile)
         
         return jsonify(result), 200 if result.get('success', False) else 500
         
@@ -329,13 +347,24 @@ def get_agents_status():
         return jsonify({
             'agents': agents,
             'service_initialized': watson_service.initialized,
-            'config_configured': watson_service.config.is_configured()
+            'config_configured': watson_service.config.is_configured(),
+            'cache': watson_service.cache.stats()
         }), 200
         
     except Exception as e:
         logger.error(f"Error getting agents status: {str(e)}")
         return jsonify({'error': f'Failed to get agents status: {str(e)}'}), 500
 
+@watson_bp.route('/cache/clear', methods=['POST'])
+def clear_cache():
+    """Drop every cached Watson analysis"""
+    user = get_current_user()
+    if not user or user.role != 'admin':
+        return jsonify({'error': 'Admin access required'}), 403
+    
+    watson_service.cache.clear()
+    return jsonify({'message': 'Watson result cache cleared', 'cache': watson_service.cache.stats()}), 200
+
 @watson_bp.route('/tools/execute', methods=['POST'])
 @login_required
 def execute_tool():
@@ -352,9 +381,8 @@ def execute_tool():
         if tool_name not in watson_service.tools:
             return jsonify({'error': f'Unknown tool: {tool_name}'}), 400
         
-        # Execute the tool
-        tool_function = watson_service.tools[tool_name]
-        result = tool_function(**parameters)
+        # Execute the tool (inline or on the runtime's pool, with its timeout)
+        result = watson_service.runtime.run(tool_name, **parameters)
         
         return jsonify({
             'tool_name': tool_name,
@@ -375,7 +403,8 @@ def health_check():
             'service_initialized': watson_service.initialized,
             'config_configured': watson_service.config.is_configured(),
             'available_tools': list(watson_service.tools.keys()),
-            'available_agents': list(watson_service.config.agent_configs.keys())
+            'available_agents': list(watson_service.config.agent_configs.keys()),
+            'cache': watson_service.cache.stats()
         }), 200
         
     except Exception as e:
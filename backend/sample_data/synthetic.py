@@ -0,0 +1,698 @@
+"""
+Synthetic Data Generator for SustainAlign
+Produces production-sized, deterministic datasets for load and benchmark testing.
+
+Row counts grow linearly with `scale` (scale=1 is roughly 100 companies and
+1,000 projects; scale=100 is several million rows). Rows are generated lazily and
+written with Core executemany inserts in chunks, so memory stays flat regardless of
+size. Every table draws from its own RNG derived from the seed, so the same seed and
+scale always produce the same data.
+"""
+
+import json
+import math
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterator, Optional
+
+from sqlalchemy import func, select
+
+from models.base import db
+from utils import hash_password
+
+# Base counts at scale=1
+BASE_COMPANIES = 100
+BASE_EXTRA_USERS = 50
+BASE_NGOS = 150
+BASE_PROJECTS = 1000
+
+EPOCH = datetime(2022, 1, 1)
+HISTORY_DAYS = 3 * 365
+
+COUNTRIES = {
+    'India': {
+        'Maharashtra': ['Mumbai', 'Pune', 'Nagpur'],
+        'Karnataka': ['Bengaluru', 'Mysuru'],
+        'Rajasthan': ['Jaipur', 'Udaipur', 'Jodhpur'],
+        'Tamil Nadu': ['Chennai', 'Coimbatore'],
+        'Delhi': ['New Delhi'],
+        'Gujarat': ['Ahmedabad', 'Surat'],
+        'Kerala': ['Kochi', 'Thiruvananthapuram'],
+        'Telangana': ['Hyderabad'],
+        'West Bengal': ['Kolkata'],
+        'Uttar Pradesh': ['Lucknow', 'Varanasi'],
+    },
+    'Kenya': {'Nairobi County': ['Nairobi'], 'Mombasa County': ['Mombasa']},
+    'Bangladesh': {'Dhaka Division': ['Dhaka'], 'Chittagong Division': ['Chittagong']},
+    'Brazil': {'Sao Paulo': ['Sao Paulo'], 'Amazonas': ['Manaus']},
+}
+# Most activity is concentrated in India, mirroring the hand-written samples
+COUNTRY_WEIGHTS = {'India': 0.85, 'Kenya': 0.05, 'Bangladesh': 0.05, 'Brazil': 0.05}
+
+INDUSTRIES = ['Technology', 'Manufacturing', 'Healthcare', 'Financial Services', 'Energy', 'Retail', 'Agriculture', 'Telecommunications']
+FOCUS_AREAS = ['Education', 'Healthcare', 'Environment', 'Women Empowerment', 'Rural Development', 'Clean Energy',
+               'Water & Sanitation', 'Skill Development', 'Digital Inclusion', 'Food Security', 'Climate Action']
+BENEFICIARIES = ['Rural Women', 'Children', 'Farmers', 'Youth', 'Elderly', 'Urban Poor', 'Persons with Disabilities', 'Tribal Communities']
+SDG_NAMES = ['No Poverty', 'Zero Hunger', 'Good Health and Well-being', 'Quality Education', 'Gender Equality',
+             'Clean Water and Sanitation', 'Affordable and Clean Energy', 'Decent Work and Economic Growth',
+             'Industry, Innovation and Infrastructure', 'Reduced Inequalities', 'Sustainable Cities and Communities',
+             'Responsible Consumption and Production', 'Climate Action', 'Life Below Water', 'Life on Land',
+             'Peace, Justice and Strong Institutions', 'Partnerships for the Goals']
+IMPACT_METRICS = ['beneficiaries', 'co2_reduced_tons', 'water_saved_liters', 'trees_planted']
+NAME_PREFIXES = ['Green', 'Bright', 'Sun', 'River', 'Hope', 'Future', 'Unity', 'Blue', 'Earth', 'Sky', 'Seed', 'Pioneer']
+NAME_SUFFIXES = ['Foundation', 'Trust', 'Society', 'Initiative', 'Collective', 'Alliance', 'Network', 'Mission']
+COMPANY_SUFFIXES = ['Technologies', 'Industries', 'Holdings', 'Enterprises', 'Solutions', 'Labs', 'Group', 'Systems']
+
+
+def _weighted(rng: random.Random, weights: Dict):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _skewed_count(rng: random.Random, mean: float) -> int:
+    """Long-tailed count (geometric) with the given mean"""
+    if mean <= 0:
+        return 0
+    p = 1.0 / (mean + 1)
+    return int(math.log(1 - rng.random()) / math.log(1 - p))
+
+
+def _timestamp(rng: random.Random, start: datetime = EPOCH, days: int = HISTORY_DAYS) -> datetime:
+    return start + timedelta(seconds=rng.randrange(days * 86400))
+
+
+def _location(rng: random.Random):
+    country = _weighted(rng, COUNTRY_WEIGHTS)
+    region = rng.choice(list(COUNTRIES[country]))
+    return country, region, rng.choice(COUNTRIES[country][region])
+
+
+def _month(d: date, offset: int) -> date:
+    month = d.month - 1 + offset
+    return date(d.year + month // 12, month % 12 + 1, 1)
+
+
+class SyntheticDataGenerator:
+    """Generate and bulk insert a deterministic dataset of a given scale"""
+
+    def __init__(self, scale: float = 1.0, seed: int = 42, chunk_size: int = 5000,
+                 progress: Optional[Callable[[str, int, float], None]] = None):
+        self.scale = scale
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.counts = {
+            'companies': max(1, int(BASE_COMPANIES * scale)),
+            'ngos': max(1, int(BASE_NGOS * scale)),
+            'projects': max(1, int(BASE_PROJECTS * scale)),
+        }
+        self.counts['users'] = self.counts['companies'] + max(1, int(BASE_EXTRA_USERS * scale))
+        self.offsets = {}
+        self._password_hash = None
+
+    def rng(self, table: str) -> random.Random:
+        """Per-table RNG so each table is reproducible on its own"""
+        return random.Random(f"{self.seed}:{table}")
+
+    # Driver -------------------------------------------------------------------------
+
+    def run(self, engine=None) -> Dict[str, int]:
+        """Generate every table; returns rows written per table"""
+        engine = engine or db.engine
+        tables = db.metadata.tables
+        written = {}
+        with engine.begin() as conn:
+            if engine.dialect.name == 'sqlite':
+                conn.exec_driver_sql('PRAGMA synchronous=OFF')
+            for name in tables:
+                if 'id' in tables[name].c:
+                    self.offsets[name] = conn.execute(select(func.coalesce(func.max(tables[name].c.id), 0))).scalar()
+
+        plan = [
+            ('users', self.users),
+            ('companies', self.companies),
+            ('company_branches', self.company_branches),
+            ('csr_contacts', self.csr_contacts),
+            ('budgets', self.budgets),
+            ('focus_areas', self.focus_areas),
+            ('ngo_preferences', self.ngo_preferences),
+            ('ai_configs', self.ai_configs),
+            ('ngo_profiles', self.ngo_profiles),
+            ('ngo_risk_assessments', self.ngo_risk_assessments),
+            ('ngo_impact_events', self.ngo_impact_events),
+            ('ngo_documents', self.ngo_documents),
+            ('ngo_certificates', self.ngo_certificates),
+            ('ngo_testimonials', self.ngo_testimonials),
+            ('ngo_transparency_reports', self.ngo_transparency_reports),
+            ('projects', self.projects),
+            ('project_milestones', self.project_milestones),
+            ('project_applications', self.project_applications),
+            ('project_tracking_info', self.project_tracking_info),
+            ('project_timeline_entries', self.project_timeline_entries),
+            ('impact_metric_snapshots', self.impact_metric_snapshots),
+            ('impact_time_series', self.impact_time_series),
+            ('impact_region_stats', self.impact_region_stats),
+            ('impact_goals', self.impact_goals),
+            ('audit_events', self.audit_events),
+            ('decision_rationales', self.decision_rationales),
+        ]
+        for name, generator in plan:
+            written[name] = self._insert(engine, tables[name], generator())
+
+        # Core inserts bypass the ORM hooks that maintain the NGO summary projection
+        from models.ngo_summary import ngo_summary_projection
+        with engine.begin() as conn:
+            written['ngo_summaries'] = ngo_summary_projection.rebuild(conn)
+        return written
+
+    def _insert(self, engine, table, rows: Iterator[Dict]) -> int:
+        started = time.monotonic()
+        total = 0
+        chunk = []
+        with engine.begin() as conn:
+            if engine.dialect.name == 'sqlite':
+                conn.exec_driver_sql('PRAGMA synchronous=OFF')
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) >= self.chunk_size:
+                    conn.execute(table.insert(), chunk)
+                    total += len(chunk)
+                    chunk = []
+            if chunk:
+                conn.execute(table.insert(), chunk)
+                total += len(chunk)
+        if self.progress:
+            self.progress(table.name, total, time.monotonic() - started)
+        return total
+
+    # Id helpers ---------------------------------------------------------------------
+
+    def _id(self, table: str, index: int) -> int:
+        return self.offsets[table] + index + 1
+
+    def user_id(self, index: int) -> int:
+        return self._id('users', index)
+
+    def company_id(self, index: int) -> int:
+        return self._id('companies', index)
+
+    def ngo_id(self, index: int) -> int:
+        return self._id('ngo_profiles', index)
+
+    def project_id(self, index: int) -> int:
+        return self._id('projects', index)
+
+    def ngo_name(self, index: int) -> str:
+        rng = random.Random(f"{self.seed}:ngo-name:{index}")
+        return f"{rng.choice(NAME_PREFIXES)} {rng.choice(FOCUS_AREAS)} {rng.choice(NAME_SUFFIXES)} {index + 1}"
+
+    def company_name(self, index: int) -> str:
+        rng = random.Random(f"{self.seed}:company-name:{index}")
+        return f"{rng.choice(NAME_PREFIXES)}{rng.choice(['tech', 'corp', 'works', 'line', 'field'])} {rng.choice(COMPANY_SUFFIXES)} {index + 1}"
+
+    # Users and companies ------------------------------------------------------------
+
+    def users(self) -> Iterator[Dict]:
+        rng = self.rng('users')
+        if self._password_hash is None:
+            self._password_hash = hash_password('password123')
+        for i in range(self.counts['users']):
+            role = 'corporate' if i < self.counts['companies'] else _weighted(rng, {'ngo': 0.7, 'admin': 0.1, 'regulator': 0.2})
+            yield {
+                'id': self.user_id(i),
+                'email': f"user{self.offsets['users'] + i + 1}.s{self.seed}@synthetic.sustainalign.test",
+                'password_hash': self._password_hash,
+                'role': role,
+                'created_at': _timestamp(rng),
+            }
+
+    def companies(self) -> Iterator[Dict]:
+        rng = self.rng('companies')
+        for i in range(self.counts['companies']):
+            country, region, city = _location(rng)
+            created = _timestamp(rng)
+            yield {
+                'id': self.company_id(i),
+                'user_id': self.user_id(i),
+                'company_name': self.company_name(i),
+                'registration_id': f"CIN-{rng.randrange(10**9):09d}",
+                'industry': rng.choice(INDUSTRIES),
+                'hq_country': country,
+                'hq_state': region,
+                'hq_city': city,
+                'website': f"https://company{self.company_id(i)}.example.com",
+                'created_at': created,
+                'updated_at': created + timedelta(days=rng.randrange(0, 365)),
+            }
+
+    def company_branches(self) -> Iterator[Dict]:
+        rng = self.rng('company_branches')
+        for i in range(self.counts['companies']):
+            for _ in range(_skewed_count(rng, 2)):
+                country, region, city = _location(rng)
+                yield {'company_id': self.company_id(i), 'country': country, 'state': region, 'city': city, 'created_at': _timestamp(rng)}
+
+    def csr_contacts(self) -> Iterator[Dict]:
+        rng = self.rng('csr_contacts')
+        for i in range(self.counts['companies']):
+            yield {
+                'company_id': self.company_id(i),
+                'contact_name': f"CSR Lead {self.company_id(i)}",
+                'contact_role': rng.choice(['CSR Manager', 'Head of Sustainability', 'ESG Director']),
+                'email': f"csr{self.company_id(i)}@company.example.com",
+                'phone': f"+91-{rng.randrange(10**9, 10**10)}",
+                'created_at': _timestamp(rng),
+            }
+
+    def budgets(self) -> Iterator[Dict]:
+        rng = self.rng('budgets')
+        for i in range(self.counts['companies']):
+            # CSR budgets are heavy tailed: median ~50 lakh, some in the hundreds of crores
+            amount = round(min(rng.lognormvariate(15.4, 1.3), 5e10), 2)
+            education = rng.randint(10, 40)
+            environment = rng.randint(10, 40)
+            created = _timestamp(rng)
+            yield {
+                'company_id': self.company_id(i),
+                'amount': amount,
+                'currency': 'INR',
+                'project_size': 'Large' if amount > 5e7 else 'Medium' if amount > 5e6 else 'Small',
+                'splits': json.dumps({'education': education, 'environment': environment, 'healthcare': 100 - education - environment}),
+                'created_at': created,
+                'updated_at': created,
+            }
+
+    def focus_areas(self) -> Iterator[Dict]:
+        rng = self.rng('focus_areas')
+        for i in range(self.counts['companies']):
+            created = _timestamp(rng)
+            yield {
+                'company_id': self.company_id(i),
+                'priority_sdgs': json.dumps(rng.sample(SDG_NAMES, rng.randint(1, 4))),
+                'esg_goals': rng.choice(['Achieve carbon neutrality by 2030', 'Expand access to education', 'Improve community health outcomes']),
+                'themes': ', '.join(rng.sample(FOCUS_AREAS, rng.randint(1, 3))),
+                'target_year': rng.choice(['2025', '2030', '2035']),
+                'reporting_standard': rng.choice(['GRI Standards', 'SASB Standards', 'BRSR']),
+                'created_at': created,
+                'updated_at': created,
+            }
+
+    def ngo_preferences(self) -> Iterator[Dict]:
+        rng = self.rng('ngo_preferences')
+        regions = [region for states in COUNTRIES.values() for region in states]
+        for i in range(self.counts['companies']):
+            created = _timestamp(rng)
+            yield {
+                'company_id': self.company_id(i),
+                'ngo_size': rng.choice(['Small', 'Mid-level', 'Large']),
+                'partnership_model': rng.choice(['Funding only', 'Funding + Execution', 'Co-creation']),
+                'regions': json.dumps(rng.sample(regions, rng.randint(1, 4))),
+                'created_at': created,
+                'updated_at': created,
+            }
+
+    def ai_configs(self) -> Iterator[Dict]:
+        rng = self.rng('ai_configs')
+        for i in range(self.counts['companies']):
+            created = _timestamp(rng)
+            yield {
+                'company_id': self.company_id(i),
+                'optimize_for': json.dumps(rng.sample(['Impact', 'Cost Efficiency', 'Risk', 'SDG Coverage'], 2)),
+                'risk_appetite': _weighted(rng, {'Low': 0.3, 'Medium': 0.5, 'High': 0.2}),
+                'alignment_mode': rng.choice(['Strict compliance', 'Balanced', 'Exploratory']),
+                'integrations': json.dumps([]),
+                'created_at': created,
+                'updated_at': created,
+            }
+
+    # NGOs ---------------------------------------------------------------------------
+
+    def ngo_profiles(self) -> Iterator[Dict]:
+        rng = self.rng('ngo_profiles')
+        for i in range(self.counts['ngos']):
+            country, region, city = _location(rng)
+            created = _timestamp(rng)
+            yield {
+                'id': self.ngo_id(i),
+                'name': self.ngo_name(i),
+                'registration_number': f"NGO-{self.ngo_id(i):07d}",
+                'legal_status': rng.choice(['Trust', 'Society', 'Section 8 Company']),
+                'year_established': rng.randint(1980, 2020),
+                'city': city,
+                'state': region,
+                'country': country,
+                'email': f"contact{self.ngo_id(i)}@ngo.example.org",
+                '_80g_status': _weighted(rng, {'Valid': 0.8, 'Expired': 0.1, 'Not Available': 0.1}),
+                'fcra_status': _weighted(rng, {'Valid': 0.6, 'Not Required': 0.3, 'Expired': 0.1}),
+                'rating': _weighted(rng, {5: 0.2, 4: 0.4, 3: 0.25, 2: 0.1, 1: 0.05}),
+                'verification_badge': _weighted(rng, {'Verified': 0.7, 'Pending': 0.2, 'Unverified': 0.1}),
+                'total_projects_completed': _skewed_count(rng, 20),
+                'total_beneficiaries_reached': _skewed_count(rng, 20000),
+                'primary_sectors': json.dumps(rng.sample(FOCUS_AREAS, rng.randint(1, 3))),
+                'sdg_focus': json.dumps(sorted(rng.sample(range(1, 18), rng.randint(1, 4)))),
+                'geographic_focus': json.dumps([region]),
+                'annual_budget': round(rng.lognormvariate(16, 1.2), 2),
+                'currency': 'INR',
+                'funding_sources': json.dumps(rng.sample(['CSR', 'Government', 'Individual Donors', 'International Grants'], 2)),
+                'documents': json.dumps([]),
+                'about': f"{self.ngo_name(i)} works on community programmes in {city}.",
+                'status': _weighted(rng, {'active': 0.9, 'inactive': 0.1}),
+                'created_at': created,
+                'updated_at': created + timedelta(days=rng.randrange(0, 365)),
+            }
+
+    def ngo_risk_assessments(self) -> Iterator[Dict]:
+        rng = self.rng('ngo_risk_assessments')
+        categories = ['Financial', 'Compliance', 'Execution', 'Transparency', 'Legal']
+        for i in range(self.counts['ngos']):
+            values = [min(100, max(20, int(rng.gauss(78, 12)))) for _ in categories]
+            average = sum(values) / len(values)
+            trend = [max(0, int(average) - 4 + k) for k in range(5)]
+            created = _timestamp(rng)
+            yield {
+                'ngo_id': self.ngo_id(i),
+                'risk_level': 'Low' if average >= 80 else 'Medium' if average >= 60 else 'High',
+                'highlight_metric_label': categories[values.index(max(values))],
+                'highlight_metric_value_pct': max(values),
+                'financial_stability_pct': values[0],
+                'compliance_score_pct': values[1],
+                'execution_track_pct': values[2],
+                'transparency_pct': values[3],
+                'legal_standing_pct': values[4],
+                'radar_categories': categories,
+                'radar_values': values,
+                'trend_categories': ['Jan', 'Feb', 'Mar', 'Apr', 'May'],
+                'trend_avg': trend,
+                'trend_bench': [v - 2 for v in trend],
+                'created_at': created,
+                'updated_at': created,
+            }
+
+    def ngo_impact_events(self) -> Iterator[Dict]:
+        rng = self.rng('ngo_impact_events')
+        for i in range(self.counts['ngos']):
+            for _ in range(_skewed_count(rng, 4)):
+                created = _timestamp(rng)
+                yield {
+                    'ngo_id': self.ngo_id(i),
+                    'date': created.date(),
+                    'title': rng.choice(['Programme launched', 'Milestone reached', 'Community outreach', 'Annual review']),
+                    'description': 'Synthetic impact event',
+                    'kpis': {'beneficiaries': rng.randint(50, 5000)},
+                    'color': rng.choice(['green', 'blue', 'purple', 'orange']),
+                    'created_at': created,
+                }
+
+    def ngo_documents(self) -> Iterator[Dict]:
+        rng = self.rng('ngo_documents')
+        for i in range(self.counts['ngos']):
+            for kind in rng.sample(['Registration', 'Audit Report', '80G Certificate', 'Annual Report'], rng.randint(1, 3)):
+                yield {
+                    'ngo_id': self.ngo_id(i),
+                    'name': f"{kind} {self.ngo_id(i)}",
+                    'kind': kind,
+                    'url': f"https://files.example.org/ngo/{self.ngo_id(i)}/{kind.lower().replace(' ', '-')}.pdf",
+                    'uploaded_at': _timestamp(rng),
+                }
+
+    def ngo_certificates(self) -> Iterator[Dict]:
+        rng = self.rng('ngo_certificates')
+        for i in range(self.counts['ngos']):
+            for _ in range(rng.randint(0, 2)):
+                valid_from = _timestamp(rng).date()
+                yield {
+                    'ngo_id': self.ngo_id(i),
+                    'title': rng.choice(['ISO 9001', 'GuideStar Platinum', 'Credibility Alliance']),
+                    'issuer': rng.choice(['ISO', 'GuideStar India', 'Credibility Alliance']),
+                    'valid_from': valid_from,
+                    'valid_until': valid_from + timedelta(days=3 * 365),
+                }
+
+    def ngo_testimonials(self) -> Iterator[Dict]:
+        rng = self.rng('ngo_testimonials')
+        for i in range(self.counts['ngos']):
+            for _ in range(_skewed_count(rng, 2)):
+                yield {
+                    'ngo_id': self.ngo_id(i),
+                    'author': f"Partner {rng.randrange(1000)}",
+                    'role': rng.choice(['CSR Head', 'Programme Officer', 'Beneficiary']),
+                    'content': 'Reliable partner with measurable outcomes.',
+                    'rating': rng.randint(3, 5),
+                    'created_at': _timestamp(rng),
+                }
+
+    def ngo_transparency_reports(self) -> Iterator[Dict]:
+        rng = self.rng('ngo_transparency_reports')
+        for i in range(self.counts['ngos']):
+            for year in range(2022, 2022 + rng.randint(0, 3)):
+                yield {
+                    'ngo_id': self.ngo_id(i),
+                    'period': f"FY{year}",
+                    'summary': 'Annual transparency disclosure',
+                    'metrics': {'program_spend_pct': rng.randint(60, 95)},
+                    'score': rng.randint(50, 100),
+                    'created_at': datetime(year + 1, 4, 30),
+                }
+
+    # Projects -----------------------------------------------------------------------
+
+    def projects(self) -> Iterator[Dict]:
+        rng = self.rng('projects')
+        for i in range(self.counts['projects']):
+            country, region, city = _location(rng)
+            ngo_index = rng.randrange(self.counts['ngos'])
+            start = _timestamp(rng).date()
+            months = rng.choice([6, 12, 12, 18, 24, 36])
+            total_cost = round(rng.lognormvariate(14.5, 1.1), 2)
+            created = datetime.combine(start, datetime.min.time()) - timedelta(days=rng.randint(10, 120))
+            yield {
+                'id': self.project_id(i),
+                'title': f"{rng.choice(FOCUS_AREAS)} Programme {self.project_id(i)}",
+                'short_description': f"Community {rng.choice(FOCUS_AREAS).lower()} initiative in {city}",
+                'ngo_name': self.ngo_name(ngo_index),
+                'location_city': city,
+                'location_region': region,
+                'location_country': country,
+                'sdg_goals': json.dumps(sorted(rng.sample(range(1, 18), rng.randint(1, 4)))),
+                'csr_focus_areas': json.dumps(rng.sample(FOCUS_AREAS, rng.randint(1, 3))),
+                'target_beneficiaries': json.dumps(rng.sample(BENEFICIARIES, rng.randint(1, 3))),
+                'total_project_cost': total_cost,
+                'funding_required': round(total_cost * rng.uniform(0.3, 1.0), 2),
+                'currency': 'INR',
+                'csr_eligibility': rng.random() < 0.9,
+                'preferred_contribution_type': rng.choice(['cash', 'in-kind', 'volunteer hours']),
+                'start_date': start,
+                'end_date': start + timedelta(days=30 * months),
+                'duration_months': months,
+                'expected_outcomes': json.dumps({'beneficiaries': rng.randint(100, 20000)}),
+                'kpis': json.dumps({'completion_rate': f"{rng.randint(60, 100)}%"}),
+                'ngo_registration_number': f"NGO-{self.ngo_id(ngo_index):07d}",
+                'ngo_80g_status': 'Valid',
+                'ngo_fcra_status': 'Valid',
+                'ngo_rating': _weighted(rng, {5: 0.2, 4: 0.4, 3: 0.25, 2: 0.1, 1: 0.05}),
+                'ngo_verification_badge': 'Verified',
+                'past_projects_completed': _skewed_count(rng, 10),
+                'status': _weighted(rng, {'published': 0.5, 'draft': 0.15, 'funded': 0.2, 'completed': 0.15}),
+                'visibility': 'public',
+                'created_by': self.user_id(self.counts['companies'] + rng.randrange(self.counts['users'] - self.counts['companies'])),
+                'created_at': created,
+                'updated_at': created + timedelta(days=rng.randint(0, 200)),
+            }
+
+    def project_milestones(self) -> Iterator[Dict]:
+        rng = self.rng('project_milestones')
+        for i in range(self.counts['projects']):
+            start = _timestamp(rng).date()
+            for m in range(rng.randint(2, 6)):
+                target = start + timedelta(days=60 * (m + 1))
+                status = _weighted(rng, {'completed': 0.4, 'in_progress': 0.3, 'pending': 0.3})
+                yield {
+                    'project_id': self.project_id(i),
+                    'title': f"Milestone {m + 1}",
+                    'target_date': target,
+                    'completion_date': target if status == 'completed' else None,
+                    'status': status,
+                    'progress_percentage': 100 if status == 'completed' else rng.randint(0, 90),
+                    'created_at': datetime.combine(start, datetime.min.time()),
+                    'updated_at': datetime.combine(target, datetime.min.time()),
+                }
+
+    def project_applications(self) -> Iterator[Dict]:
+        rng = self.rng('project_applications')
+        companies = self.counts['companies']
+        for i in range(self.counts['projects']):
+            # Popular projects attract most applications (long tail)
+            for company_index in rng.sample(range(companies), min(companies, _skewed_count(rng, 4))):
+                created = _timestamp(rng)
+                yield {
+                    'project_id': self.project_id(i),
+                    'company_id': self.company_id(company_index),
+                    'application_type': _weighted(rng, {'funding': 0.7, 'partnership': 0.2, 'volunteer': 0.1}),
+                    'amount_offered': round(rng.lognormvariate(13, 1), 2),
+                    'status': _weighted(rng, {'pending': 0.3, 'approved': 0.4, 'rejected': 0.2, 'withdrawn': 0.1}),
+                    'created_at': created,
+                    'updated_at': created,
+                }
+
+    def project_tracking_info(self) -> Iterator[Dict]:
+        rng = self.rng('project_tracking_info')
+        for i in range(self.counts['projects']):
+            if rng.random() > 0.6:
+                continue
+            status = _weighted(rng, {'on-track': 0.5, 'delayed': 0.2, 'completed': 0.2, 'at-risk': 0.1})
+            progress = 100 if status == 'completed' else rng.randint(5, 95)
+            created = _timestamp(rng)
+            yield {
+                'project_id': self.project_id(i),
+                'status': status,
+                'progress_pct': progress,
+                'due_date': (created + timedelta(days=rng.randint(60, 720))).date(),
+                'subtitle': f"Programme {self.project_id(i)}",
+                'metric_label': rng.choice(['Beneficiaries Reached', 'Trees Planted', 'Students Trained']),
+                'icon': rng.choice(['🌱', '📚', '💧', '⚡']),
+                'gradient_from': 'blue',
+                'gradient_to': 'indigo',
+                'progress_from': 'blue',
+                'progress_to': 'indigo',
+                'metric_color': 'blue',
+                'tooltip': f"{progress}% complete",
+                'team_user_ids': [self.user_id(rng.randrange(self.counts['users'])) for _ in range(rng.randint(1, 4))],
+                'cta_label': 'View Details',
+                'cta_color': 'blue',
+                'details': {'phase': rng.choice(['Planning', 'Execution', 'Closure']), 'utilizedPct': progress},
+                'created_at': created,
+                'updated_at': created + timedelta(days=rng.randint(0, 300)),
+            }
+
+    def project_timeline_entries(self) -> Iterator[Dict]:
+        rng = self.rng('project_timeline_entries')
+        for i in range(self.counts['companies']):
+            for _ in range(_skewed_count(rng, 10)):
+                created = _timestamp(rng)
+                yield {
+                    'color': rng.choice(['green', 'blue', 'yellow', 'red']),
+                    'text': rng.choice(['Milestone completed', 'Funding released', 'Report submitted', 'Site visit scheduled']),
+                    'quarter': f"Q{(created.month - 1) // 3 + 1} {created.year}",
+                    'company_id': self.company_id(i),
+                    'created_at': created,
+                }
+
+    # Impact -------------------------------------------------------------------------
+
+    def impact_metric_snapshots(self) -> Iterator[Dict]:
+        rng = self.rng('impact_metric_snapshots')
+        for i in range(self.counts['companies']):
+            beneficiaries = rng.randint(100, 5000)
+            for m in range(12):
+                beneficiaries += rng.randint(0, 800)
+                as_of = _month(date(2024, 1, 1), m)
+                yield {
+                    'company_id': self.company_id(i),
+                    'as_of_date': as_of,
+                    'beneficiaries': beneficiaries,
+                    'trees_planted': rng.randint(0, 5000) * (m + 1),
+                    'co2_reduced_tons': round(rng.uniform(1, 50) * (m + 1), 2),
+                    'water_saved_liters': round(rng.uniform(1e3, 1e5) * (m + 1), 2),
+                    'energy_generated_kwh': round(rng.uniform(1e2, 1e4) * (m + 1), 2),
+                    'waste_reduced_tons': round(rng.uniform(0.1, 10) * (m + 1), 2),
+                    'created_at': datetime.combine(as_of, datetime.min.time()),
+                }
+
+    def impact_time_series(self) -> Iterator[Dict]:
+        rng = self.rng('impact_time_series')
+        for i in range(self.counts['companies']):
+            for metric in IMPACT_METRICS:
+                value = rng.uniform(10, 1000)
+                for m in range(36):
+                    value *= rng.uniform(0.98, 1.08)
+                    yield {'metric_name': metric, 'ts_date': _month(EPOCH.date(), m), 'value': round(value, 2),
+                           'project_id': None, 'company_id': self.company_id(i)}
+        for i in range(self.counts['projects']):
+            for metric in rng.sample(IMPACT_METRICS, 2):
+                value = rng.uniform(1, 100)
+                for m in range(12):
+                    value *= rng.uniform(0.98, 1.1)
+                    yield {'metric_name': metric, 'ts_date': _month(date(2024, 1, 1), m), 'value': round(value, 2),
+                           'project_id': self.project_id(i), 'company_id': None}
+
+    def impact_region_stats(self) -> Iterator[Dict]:
+        rng = self.rng('impact_region_stats')
+        for i in range(self.counts['companies']):
+            for _ in range(rng.randint(1, 3)):
+                country, region, city = _location(rng)
+                for metric in rng.sample(IMPACT_METRICS, 3):
+                    for m in range(12):
+                        yield {
+                            'country': country, 'region': region, 'city': city, 'metric_name': metric,
+                            'period_month': _month(date(2024, 1, 1), m).strftime('%Y-%m'),
+                            'value': round(rng.uniform(10, 10000), 2), 'project_id': None,
+                            'company_id': self.company_id(i),
+                        }
+
+    def impact_goals(self) -> Iterator[Dict]:
+        rng = self.rng('impact_goals')
+        for i in range(self.counts['companies']):
+            for metric in IMPACT_METRICS:
+                for quarter in range(4):
+                    target = rng.uniform(1000, 100000)
+                    current = target * rng.uniform(0.3, 1.2)
+                    yield {
+                        'metric_name': metric,
+                        'period_month': f"2024-{quarter * 3 + 3:02d}",
+                        'target_value': round(target, 2),
+                        'current_value': round(current, 2),
+                        'status': 'achieved' if current >= target else 'on_track' if current >= 0.7 * target else 'at_risk',
+                        'company_id': self.company_id(i),
+                    }
+
+    # Activity -----------------------------------------------------------------------
+
+    def audit_events(self) -> Iterator[Dict]:
+        rng = self.rng('audit_events')
+        entity_types = {'project': 0.35, 'approval': 0.2, 'company': 0.1, 'ai_match': 0.1, 'report': 0.1, 'user': 0.1, 'ngo_profile': 0.05}
+        actions = {'created': 0.3, 'updated': 0.3, 'status_changed': 0.2, 'generated': 0.1, 'login': 0.1}
+        total = int(50 * self.counts['companies'])
+        for _ in range(total):
+            actor_index = rng.randrange(self.counts['users'])
+            yield {
+                'entity_type': _weighted(rng, entity_types),
+                'entity_id': rng.randint(1, max(self.counts['projects'], 1)),
+                'action': _weighted(rng, actions),
+                'actor_user_id': self.user_id(actor_index),
+                'actor_role': 'corporate' if actor_index < self.counts['companies'] else 'ngo',
+                'source': _weighted(rng, {'ui': 0.7, 'system': 0.2, 'scheduler': 0.1}),
+                'message': 'Synthetic audit event',
+                'metadata': {'ip': f"10.0.{rng.randrange(256)}.{rng.randrange(256)}"},
+                'created_at': _timestamp(rng),
+            }
+
+    def decision_rationales(self) -> Iterator[Dict]:
+        rng = self.rng('decision_rationales')
+        for i in range(self.counts['companies']):
+            for _ in range(_skewed_count(rng, 3)):
+                project_indexes = rng.sample(range(self.counts['projects']), min(3, self.counts['projects']))
+                options = [{'key': str(self.project_id(p)), 'label': f"Programme {self.project_id(p)}",
+                            'data': {'projectId': self.project_id(p), 'score': round(rng.uniform(0.5, 0.95), 2)}}
+                           for p in project_indexes]
+                created = _timestamp(rng)
+                yield {
+                    'company_id': self.company_id(i),
+                    'project_id': self.project_id(project_indexes[0]),
+                    'title': f"Project matching analysis for {self.company_name(i)}",
+                    'context': {'companyProfile': self.company_name(i)},
+                    'criteria': {k: round(rng.uniform(0.4, 1.0), 2) for k in ['impact', 'cost', 'risk', 'alignment', 'feasibility']},
+                    'options': options,
+                    'selected_option': options[0]['key'],
+                    'pros': ['Strong SDG alignment', 'Within budget'],
+                    'cons': ['Execution risk'],
+                    'reasoning_steps': ['Compared budgets', 'Checked SDG overlap', 'Reviewed NGO track record'],
+                    'score_breakdown': {o['key']: {'total': o['data']['score']} for o in options},
+                    'created_by': self.user_id(i),
+                    'created_at': created,
+                    'updated_at': created,
+                }
+
+
+def generate_synthetic_data(scale: float = 1.0, seed: int = 42, chunk_size: int = 5000, progress=None) -> Dict[str, int]:
+    """Generate a synthetic dataset into the current app's database"""
+    return SyntheticDataGenerator(scale=scale, seed=seed, chunk_size=chunk_size, progress=progress).run()
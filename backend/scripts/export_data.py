@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Data Export Script for SustainAlign
+Writes full extracts of projects, audit events and impact time series (nightly BI
+extracts) as CSV, JSONL or Parquet, streaming rows so memory use stays flat.
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from exports import DATASETS, FORMATS, export_rows, write_export
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export tables for BI extracts')
+    parser.add_argument('datasets', nargs='*', help=f"Datasets to export: {', '.join(DATASETS)} (default: all)")
+    parser.add_argument('--format', choices=list(FORMATS), default='csv', help='Output format (default: csv)')
+    parser.add_argument('--out', default='exports', help='Output directory (default: ./exports)')
+    parser.add_argument('--filter', action='append', default=[], metavar='NAME=VALUE', help='Dataset filter (repeatable)')
+    args = parser.parse_args()
+
+    unknown = [name for name in args.datasets if name not in DATASETS]
+    if unknown:
+        parser.error(f"Unknown datasets: {', '.join(unknown)}")
+    params = dict(f.split('=', 1) for f in args.filter)
+    os.makedirs(args.out, exist_ok=True)
+    stamp = datetime.utcnow().strftime('%Y%m%d')
+
+    summary = {}
+    app = create_app()
+    with app.app_context():
+        for name in args.datasets or list(DATASETS):
+            dataset = DATASETS[name]
+            path = os.path.join(args.out, f"{name}-{stamp}.{FORMATS[args.format][1]}")
+            rows = 0
+
+            def counted(partitions):
+                nonlocal rows
+                for partition in partitions:
+                    rows += len(partition)
+                    yield partition
+
+            # Write to a temporary name so a failed run never leaves a truncated extract behind
+            with open(f"{path}.tmp", 'wb') as f:
+                for chunk in write_export(args.format, dataset.columns, counted(export_rows(dataset, params))):
+                    f.write(chunk)
+            os.replace(f"{path}.tmp", path)
+            summary[name] = {'path': path, 'rows': rows}
+
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
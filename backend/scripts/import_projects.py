@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Project Import Script for SustainAlign
+Bulk imports projects from a CSV or JSONL file (partner onboarding). Valid rows are
+inserted in batches; rejected rows are listed with their line numbers.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from ai_models.match_materializer import match_materializer
+from ai_models.project_import import detect_format, run_import_job
+from models import db, ProjectImportJob, User
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk import projects from a CSV or JSONL file')
+    parser.add_argument('path', help='CSV or JSONL file to import')
+    parser.add_argument('--user', type=int, required=True, help='User id recorded as the creator of the projects')
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help='File format (default: from the extension)')
+    parser.add_argument('--batch-size', type=int, default=500, help='Rows per insert transaction (default: 500)')
+    args = parser.parse_args()
+
+    file_format = detect_format(args.path, requested=args.format)
+    if not file_format:
+        parser.error('Cannot tell the file format; pass --format csv|jsonl')
+
+    app = create_app()
+    with app.app_context():
+        if not db.session.get(User, args.user):
+            parser.error(f'User {args.user} does not exist')
+        job = ProjectImportJob(filename=os.path.basename(args.path), file_format=file_format, created_by=args.user)
+        db.session.add(job)
+        db.session.commit()
+        with open(args.path, 'rb') as stream:
+            run_import_job(job, stream, batch_size=args.batch_size)
+        summary = job.to_dict()
+        # Imported projects are matched on a background thread; let it finish before exiting
+        match_materializer.wait()
+
+    print(json.dumps(summary, indent=2))
+    return 0 if summary['status'] == 'completed' and summary['failedRows'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
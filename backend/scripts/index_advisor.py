@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Index Advisor Script for SustainAlign
+Exercises the hot read endpoints in-process, explains every statement they issue
+and proposes the indexes that would remove full scans and sorts, with snippets
+for the model and for scripts/migrate.py.
+
+Usage:
+    python scripts/index_advisor.py                       # against DATABASE_URL / sustainalign.db
+    python scripts/index_advisor.py --synthetic 1         # against a temporary synthetic dataset
+    python scripts/index_advisor.py --path '/api/projects/projects?status=published' --output advice.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# {company_id} and {project_id} are filled from the first rows in the database
+DEFAULT_PATHS = [
+    '/api/projects/projects',
+    '/api/projects/projects?status=published',
+    '/api/projects/projects?status=published&min_budget=100000&max_budget=5000000',
+    '/api/projects/projects/{project_id}/applications',
+    '/api/projects/ngos',
+    '/api/projects/ai-matches?company_id={company_id}',
+    '/api/projects/ngo-risk',
+    '/api/projects/impact/overview?company_id={company_id}',
+    '/api/projects/impact/trends?metric=co2_reduced_tons&company_id={company_id}',
+    '/api/projects/impact/regions?metric=beneficiaries',
+    '/api/projects/impact/goals?company_id={company_id}',
+    '/api/projects/rationales?company_id={company_id}',
+    '/api/projects/audit/events?entity_type=project&action=created',
+    '/api/projects/audit/summary',
+    '/api/projects/tracker/projects',
+    '/api/projects/tracker/timeline',
+    '/api/projects/corporate-risk-analysis',
+    '/api/comparisons/',
+]
+
+
+def build_app(synthetic_scale, tmp_dir):
+    if synthetic_scale:
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp_dir, 'index_advisor.db')}"
+    from app import create_app
+    from models import db
+
+    app = create_app()
+    # Every request must reach the database for its statements to be captured
+    app.config['RESPONSE_CACHE_ENABLED'] = False
+    app.config['AI_MATCH_AUTO_REFRESH'] = False
+    if synthetic_scale:
+        from sample_data.synthetic import generate_synthetic_data
+        with app.app_context():
+            print(f"Loading synthetic data (scale={synthetic_scale})...", file=sys.stderr)
+            generate_synthetic_data(scale=synthetic_scale)
+            db.session.remove()
+    return app
+
+
+def fill_paths(paths):
+    from models import Company, Project, db
+
+    values = {
+        'company_id': db.session.query(Company.id).order_by(Company.id).limit(1).scalar(),
+        'project_id': db.session.query(Project.id).order_by(Project.id).limit(1).scalar(),
+    }
+    # Paths needing an id the database doesn't have are skipped
+    return [path.format(**values) for path in paths
+            if all(values[name] is not None for name in values if f'{{{name}}}' in path)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Explain the statements hot endpoints issue and propose indexes')
+    parser.add_argument('--path', action='append', help='Endpoint path to exercise (repeatable; default: hot read endpoints)')
+    parser.add_argument('--synthetic', type=float, metavar='SCALE', help='Run against a temporary synthetic dataset of this scale')
+    parser.add_argument('--min-rows', type=int, default=0, help='Ignore scans of tables with fewer rows (default: 0)')
+    parser.add_argument('--no-verify', action='store_true', help='Skip re-explaining with each proposed index created')
+    parser.add_argument('--output', help='Write the full report as JSON to this file')
+    args = parser.parse_args()
+
+    from perf.index_advisor import IndexAdvisor, StatementCapture, format_report
+    from models import db
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = build_app(args.synthetic, tmp)
+        client = app.test_client()
+        with app.app_context():
+            paths = fill_paths(args.path or DEFAULT_PATHS)
+            with StatementCapture(db.engine) as capture:
+                for path in paths:
+                    status = client.get(path).status_code
+                    print(f"  GET {path} [{status}]", file=sys.stderr)
+            report = IndexAdvisor(db.engine, verify=not args.no_verify).analyze(capture, min_rows=args.min_rows)
+            db.session.remove()
+            db.engine.dispose()
+
+    print(format_report(report))
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(report, fh, indent=2, default=str)
+        print(f"📄 Report written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -19,6 +19,8 @@ from models import (
     Project, ProjectMilestone, ProjectApplication, ProjectImpactReport, NGOProfile, AIMatch, NGORiskAssessment, ApprovalRequest, ApprovalStep,
     ImpactMetricSnapshot, ImpactTimeSeries, ImpactRegionStat, ImpactGoal, ProjectTrackingInfo, ProjectTimelineEntry, ReportJob, ReportArtifact, DecisionRationale, RationaleNote, AuditEvent, NGOImpactEvent, NGODocument, NGOTransparencyReport, NGOCertificate, NGOTestimonial
 )
+from models.ngo_summary import ngo_summary_projection
+from models.types import migrate_json_columns
 
 def get_table_names():
     """Get list of existing table names from database"""
@@ -108,6 +110,20 @@ def add_new_tables():
 
         # After tables, ensure important new columns exist (non-destructive alters)
         ensure_column_exists('ngo_profiles', 'about', 'TEXT')
+        ensure_column_exists('ai_matches', 'source', 'VARCHAR(16)')
+
+        # Indexes added to existing tables (create_all skips tables that already exist)
+        for model in (AIMatch, ProjectTrackingInfo, ProjectTimelineEntry):
+            for index in model.__table__.indexes:
+                ensure_index_exists(index)
+
+        # JSON list/object columns: repair legacy non-JSON text, use native JSON where available
+        rewritten = migrate_json_columns(db.engine, (Project, NGOProfile))
+        if any(rewritten.values()):
+            print(f"🔧 Rewrote non-JSON values: {', '.join(f'{k}={v}' for k, v in rewritten.items() if v)}")
+
+        # Backfill the NGO marketplace summary projection
+        ngo_summary_projection.ensure_fresh()
 
 def drop_tables():
     """Drop all database tables (DANGEROUS - use with caution)"""
@@ -138,6 +154,13 @@ def ensure_column_exists(table_name: str, column_name: str, column_sql_type: str
     except Exception as e:
         print(f"⚠️  Could not ensure column {table_name}.{column_name}: {e}")
 
+def ensure_index_exists(index):
+    """Create an index on an existing table if it is missing"""
+    try:
+        index.create(db.engine, checkfirst=True)
+    except Exception as e:
+        print(f"⚠️  Could not ensure index {index.name}: {e}")
+
 def create_sample_data():
     """Create sample data for testing"""
     app = create_app()
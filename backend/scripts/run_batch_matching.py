@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Batch Matching Script for SustainAlign
+Generates AI rationales for every company (nightly refresh) with bounded concurrency.
+Interrupted runs resume from the checkpoint unless --fresh is given.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from ai_models.batch_matching import BatchMatchingRunner, DEFAULT_CHECKPOINT_PATH
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate project matching rationales for all companies')
+    parser.add_argument('--company', type=int, action='append', dest='company_ids', help='Limit to a company id (repeatable)')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent LLM requests (default: 4)')
+    parser.add_argument('--rpm', type=float, default=20, help='Provider requests per minute (default: 20)')
+    parser.add_argument('--retries', type=int, default=3, help='Retries for rate limited or 5xx responses (default: 3)')
+    parser.add_argument('--flush-every', type=int, default=10, help='Companies per bulk write and checkpoint (default: 10)')
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT_PATH, help='Checkpoint file path')
+    parser.add_argument('--fresh', action='store_true', help='Ignore any existing checkpoint')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        runner = BatchMatchingRunner(
+            max_workers=args.workers,
+            requests_per_minute=args.rpm,
+            checkpoint_path=args.checkpoint,
+            max_retries=args.retries,
+            flush_every=args.flush_every,
+        )
+        summary = runner.run(company_ids=args.company_ids, resume=not args.fresh)
+
+    print(json.dumps(summary, indent=2))
+    return 0 if summary['failed'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -12,6 +12,7 @@ from datetime import datetime
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from app import create_app, db
+from ai_models.match_materializer import match_materializer
 from models import (
     User, Project, ProjectMilestone, ProjectApplication, ProjectImpactReport,
     Company, CompanyBranch, CSRContact, Budget, FocusArea, ComplianceDocument,
@@ -586,6 +587,8 @@ def main():
             
             # Seed with new data
             stats = seed_database()
+            # Seeded projects are matched on a background thread; let it finish before exiting
+            match_materializer.wait()
             print()
             
             # Print summary
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Catalog Sync Script for SustainAlign
+Imports projects and NGOs from the external catalogs (nightly refresh). Only pages
+that changed since the last sync are downloaded and only changed records are written.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from ai_models.match_materializer import match_materializer
+from agents.discovery_agent import DiscoveryAgent
+from ai_models.catalog_ingestion import CatalogIngestor, CatalogSource
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sync external NGO/project catalogs into the database')
+    parser.add_argument('--sources', help='JSON file with a list of sources (default: the DiscoveryAgent endpoints)')
+    parser.add_argument('--only', action='append', dest='names', help='Limit to a source name (repeatable)')
+    parser.add_argument('--concurrency', type=int, default=4, help='Concurrent HTTP requests (default: 4)')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Per-request timeout in seconds (default: 30)')
+    parser.add_argument('--retries', type=int, default=2, help='Retries for 429/5xx and connection errors (default: 2)')
+    parser.add_argument('--user', type=int, help='User id that owns imported projects (default: CATALOG_IMPORT_USER_ID)')
+    args = parser.parse_args()
+
+    if args.sources:
+        with open(args.sources, encoding='utf-8') as f:
+            sources = [CatalogSource.from_dict(s) for s in json.load(f)]
+    else:
+        sources = DiscoveryAgent().catalog_sources()
+    if args.names:
+        sources = [s for s in sources if s.name in args.names]
+
+    app = create_app()
+    with app.app_context():
+        ingestor = CatalogIngestor(
+            sources,
+            max_concurrency=args.concurrency,
+            timeout=args.timeout,
+            max_retries=args.retries,
+            import_user_id=args.user,
+        )
+        summary = ingestor.sync()
+        # Catalog projects are matched on a background thread; let it finish before exiting
+        match_materializer.wait()
+
+    print(json.dumps(summary, indent=2))
+    return 0 if summary['failed'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
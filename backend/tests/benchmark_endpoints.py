@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Endpoint benchmark suite for SustainAlign
+
+Builds the app against a freshly generated synthetic dataset and exercises the hot
+read endpoints in-process through the Flask test client. For every endpoint it
+reports p50/p95 latency, SQL statements per request and peak Python memory, and
+writes the results as JSON so runs can be compared between versions.
+
+Usage:
+    python tests/benchmark_endpoints.py --scale 1 --iterations 30 --output bench.json
+    python tests/benchmark_endpoints.py --scale 1 --baseline bench.json --fail-on-regression
+    python tests/benchmark_endpoints.py --scale 1 --index-advice   # also explain every statement issued
+    python tests/benchmark_endpoints.py --scale 1 --hydration 10000   # ORM entities vs read records
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+os.environ.setdefault('OPENROUTER_API_KEY', 'benchmark-key')
+
+# Add the backend directory to the Python path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+# (name, path) - {company_id} is filled with a company that has data
+ENDPOINTS = [
+    ('projects_list', '/api/projects/projects'),
+    ('ngos_list', '/api/projects/ngos'),
+    ('impact_trends', '/api/projects/impact/trends?metric=co2_reduced_tons&company_id={company_id}'),
+    ('impact_regions', '/api/projects/impact/regions?metric=beneficiaries'),
+    ('corporate_risk_analysis', '/api/projects/corporate-risk-analysis'),
+    ('audit_summary', '/api/projects/audit/summary'),
+    ('tracker_projects', '/api/projects/tracker/projects'),
+    ('tracker_timeline', '/api/projects/tracker/timeline'),
+    ('rationales_list', '/api/projects/rationales'),
+]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class QueryCounter:
+    """Counts statements executed on an engine"""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+
+def build_app(database_path, scale, seed):
+    """Create the application on a new SQLite file and load synthetic data into it"""
+    os.environ['DATABASE_URL'] = f"sqlite:///{database_path}"
+    from app import create_app
+    from models import db, Company
+    from sample_data.synthetic import generate_synthetic_data
+
+    app = create_app()
+    app.config['AI_MATCH_AUTO_REFRESH'] = False
+    # Time the handlers themselves; cache hits would report 0 queries and hide regressions
+    app.config['RESPONSE_CACHE_ENABLED'] = False
+    with app.app_context():
+        started = time.monotonic()
+        counts = generate_synthetic_data(scale=scale, seed=seed)
+        load_seconds = time.monotonic() - started
+        company_id = db.session.query(Company.id).order_by(Company.id).first()[0]
+    return app, counts, load_seconds, company_id
+
+
+def benchmark_endpoint(app, client, counter, path, iterations, warmup):
+    for _ in range(warmup):
+        client.get(path)
+
+    timings = []
+    queries = []
+    status = None
+    size = 0
+    for _ in range(iterations):
+        before = counter.count
+        started = time.perf_counter()
+        response = client.get(path)
+        timings.append((time.perf_counter() - started) * 1000)
+        queries.append(counter.count - before)
+        status = response.status_code
+        size = len(response.get_data())
+
+    # Separate pass for memory so tracing overhead doesn't skew latency
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    client.get(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'path': path,
+        'status': status,
+        'iterations': iterations,
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'mean_ms': round(statistics.fmean(timings), 3),
+        'max_ms': round(max(timings), 3),
+        'queries': int(statistics.median(queries)),
+        'peak_memory_kb': round(peak / 1024, 1),
+        'response_bytes': size,
+    }
+
+
+def measure_load(load):
+    """Time one load, then measure the memory it allocates and what its result keeps alive"""
+    from models import db
+
+    db.session.expunge_all()
+    started = time.perf_counter()
+    result = load()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    count = len(result)
+    del result
+    db.session.expunge_all()
+    gc.collect()
+
+    tracemalloc.start()
+    result = load()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    db.session.expunge_all()
+    return count, elapsed_ms, retained, peak
+
+
+def benchmark_hydration(rows):
+    """Load `rows` audit events as ORM entities and as read records; memory is reported per 10k rows"""
+    from sqlalchemy import func, insert
+    from models import db, AuditEvent
+    from models.records import AuditEventRecord, fetch_records, select_records
+
+    missing = rows - db.session.query(func.count(AuditEvent.id)).scalar()
+    if missing > 0:
+        db.session.execute(insert(AuditEvent), [
+            {'entity_type': 'project', 'entity_id': i, 'action': 'updated', 'source': 'benchmark',
+             'message': f'Benchmark event {i}', 'meta': {'field': 'status', 'to': 'published'}}
+            for i in range(missing)
+        ])
+        db.session.commit()
+
+    loads = {
+        'orm_entities': lambda: AuditEvent.query.order_by(AuditEvent.id).limit(rows).all(),
+        'records': lambda: fetch_records(AuditEventRecord, select_records(AuditEventRecord).order_by(AuditEvent.id).limit(rows)),
+    }
+    results = {}
+    for name, load in loads.items():
+        count, elapsed_ms, retained, peak = measure_load(load)
+        per_10k = 10000 / max(count, 1)
+        results[name] = {
+            'rows': count,
+            'load_ms': round(elapsed_ms, 3),
+            'retained_kb_per_10k': round(retained / 1024 * per_10k, 1),
+            'peak_kb_per_10k': round(peak / 1024 * per_10k, 1),
+        }
+        print(f"  {name:<26} load {results[name]['load_ms']:>9.2f}ms  retained {results[name]['retained_kb_per_10k']:>9.1f}KB/10k  "
+              f"peak {results[name]['peak_kb_per_10k']:>9.1f}KB/10k  ({count} rows)")
+    return results
+
+
+def compare(results, baseline, latency_tolerance, query_tolerance):
+    """Return a list of regressions against a previous results file"""
+    regressions = []
+    for name, current in results['endpoints'].items():
+        previous = baseline.get('endpoints', {}).get(name)
+        if not previous:
+            continue
+        if previous['p95_ms'] and current['p95_ms'] > previous['p95_ms'] * (1 + latency_tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms")
+        if current['queries'] > previous['queries'] + query_tolerance:
+            regressions.append(f"{name}: queries {previous['queries']} -> {current['queries']}")
+        if current['status'] != previous['status']:
+            regressions.append(f"{name}: status {previous['status']} -> {current['status']}")
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=backend_dir, stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def run(args):
+    from models import db
+    from perf.index_advisor import IndexAdvisor, StatementCapture, format_report
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app, counts, load_seconds, company_id = build_app(os.path.join(tmp, 'benchmark.db'), args.scale, args.seed)
+        client = app.test_client()
+        selected = [e for e in ENDPOINTS if not args.only or e[0] in args.only]
+
+        with app.app_context():
+            counter = QueryCounter(db.engine)
+            capture = StatementCapture(db.engine) if args.index_advice else None
+            if capture:
+                capture.start()
+            endpoints = {}
+            for name, path in selected:
+                result = benchmark_endpoint(app, client, counter, path.format(company_id=company_id), args.iterations, args.warmup)
+                endpoints[name] = result
+                print(f"  {name:<26} p50 {result['p50_ms']:>9.2f}ms  p95 {result['p95_ms']:>9.2f}ms  "
+                      f"queries {result['queries']:>5}  peak {result['peak_memory_kb']:>9.1f}KB  [{result['status']}]")
+            index_advice = None
+            if capture:
+                capture.stop()
+                index_advice = IndexAdvisor(db.engine).analyze(capture)
+                print(format_report(index_advice))
+            hydration = benchmark_hydration(args.hydration) if args.hydration else None
+            db.session.remove()
+            db.engine.dispose()
+
+    return {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'scale': args.scale,
+            'seed': args.seed,
+            'iterations': args.iterations,
+            'rows_loaded': sum(counts.values()),
+            'load_seconds': round(load_seconds, 2),
+        },
+        'endpoints': endpoints,
+        **({'index_advice': index_advice} if index_advice else {}),
+        **({'hydration': hydration} if hydration else {}),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark hot API endpoints in-process')
+    parser.add_argument('--scale', type=float, default=1.0, help='Synthetic dataset scale factor')
+    parser.add_argument('--seed', type=int, default=42, help='Synthetic dataset seed')
+    parser.add_argument('--iterations', type=int, default=20, help='Timed requests per endpoint')
+    parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per endpoint')
+    parser.add_argument('--only', action='append', help='Benchmark only this endpoint name (repeatable)')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    parser.add_argument('--baseline', help='Compare against a previous JSON results file')
+    parser.add_argument('--latency-tolerance', type=float, default=0.25, help='Allowed p95 slowdown vs baseline (0.25 = 25%%)')
+    parser.add_argument('--query-tolerance', type=int, default=0, help='Allowed extra queries per request vs baseline')
+    parser.add_argument('--fail-on-regression', action='store_true', help='Exit non-zero when a regression is found')
+    parser.add_argument('--index-advice', action='store_true', help='Explain the statements issued and propose missing indexes')
+    parser.add_argument('--hydration', type=int, metavar='ROWS', help='Compare loading ROWS audit events as ORM entities and as read records')
+    args = parser.parse_args()
+
+    print(f"⏱️  Benchmarking endpoints (scale={args.scale}, seed={args.seed}, iterations={args.iterations})")
+    results = run(args)
+
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(results, fh, indent=2, default=str)
+        print(f"📄 Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        regressions = compare(results, baseline, args.latency_tolerance, args.query_tolerance)
+        if regressions:
+            print("❌ Regressions against baseline:")
+            for line in regressions:
+                print(f"   - {line}")
+            if args.fail_on_regression:
+                return 1
+        else:
+            print("✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
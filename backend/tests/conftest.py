@@ -0,0 +1,118 @@
+"""
+Shared pytest fixtures for the backend test suite.
+
+Tests run against a throwaway in-memory SQLite database. ai_models reads
+OPENROUTER_API_KEY at import time, so a placeholder is set before anything
+from the app is imported.
+"""
+
+import os
+import sys
+from datetime import date
+
+import pytest
+
+os.environ.setdefault('OPENROUTER_API_KEY', 'test-key')
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from flask import Flask, jsonify  # noqa: E402
+from models import db, User, Company, Project  # noqa: E402
+
+
+def build_app():
+    """Minimal app mirroring create_app() with an in-memory database"""
+    from routes.auth import auth_bp
+    from routes.projects import projects_bp
+    from routes.reports import reports_bp
+    from routes.profile import profile_bp
+    from routes.comparisons import comparisons_bp
+    from routes.approvals import approvals_bp
+    from routes.ai_matching import ai_matching_bp
+    from routes.events import events_bp
+    from routes.exports import exports_bp
+    import caching
+    import realtime
+    from perf import request_metrics, query_tracker
+    from models.ngo_summary import ngo_summary_projection
+
+    app = Flask(__name__)
+    app.config.update(
+        TESTING=True,
+        SECRET_KEY='test-secret',
+        SQLALCHEMY_DATABASE_URI='sqlite://',
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+    )
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    request_metrics.init_app(app)
+    query_tracker.init_app(app)
+    ngo_summary_projection.init_app(app)
+    realtime.init_app(app)
+    caching.init_app(app)
+
+    app.register_blueprint(auth_bp, url_prefix='/api/auth')
+    app.register_blueprint(profile_bp, url_prefix='/api/profile')
+    app.register_blueprint(projects_bp, url_prefix='/api/projects')
+    app.register_blueprint(reports_bp, url_prefix='/api/reports')
+    app.register_blueprint(comparisons_bp, url_prefix='/api/comparisons')
+    app.register_blueprint(approvals_bp, url_prefix='/api/approvals')
+    app.register_blueprint(ai_matching_bp)
+    app.register_blueprint(events_bp)
+    app.register_blueprint(exports_bp)
+
+    @app.route('/api/health')
+    def health():
+        return jsonify({'status': 'ok'}), 200
+
+    return app
+
+
+@pytest.fixture
+def app():
+    app = build_app()
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def make_user(email='owner@example.com'):
+    user = User(email=email, password_hash='x')
+    db.session.add(user)
+    db.session.flush()
+    return user
+
+
+def make_company(user, name='Acme Corp', industry='Technology'):
+    company = Company(user_id=user.id, company_name=name, industry=industry, hq_country='India')
+    db.session.add(company)
+    db.session.flush()
+    return company
+
+
+def make_project(user, title='Solar Schools', status='published', **kwargs):
+    fields = dict(
+        title=title,
+        short_description=f'{title} description',
+        ngo_name='Green Earth',
+        location_country='India',
+        total_project_cost=100000,
+        funding_required=50000,
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 12, 31),
+        status=status,
+        created_by=user.id,
+    )
+    fields.update(kwargs)
+    project = Project(**fields)
+    db.session.add(project)
+    db.session.flush()
+    return project
@@ -0,0 +1,166 @@
+"""
+Tests for the concurrent batch matching runner.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from conftest import make_company, make_project, make_user
+from ai_models.ai_model import ai_model
+from ai_models.batch_matching import BatchMatchingRunner, BatchCheckpoint, TokenBucket, background_run_status
+from models import db, AIMatch, DecisionRationale
+from utils import create_token
+
+
+class FakeCompletions(BaseHTTPRequestHandler):
+    """Non-streaming stand-in that rate limits the first request"""
+    calls = 0
+    rate_limit_first = True
+    fail_companies = set()
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        prompt = body['messages'][-1]['content']
+        with self.lock:
+            type(self).calls += 1
+            first = type(self).calls == 1
+        if first and self.rate_limit_first:
+            self.send_response(429)
+            self.send_header('Retry-After', '0')
+            self.end_headers()
+            self.wfile.write(b'{"error": "rate limited"}')
+            return
+        if any(name in prompt for name in self.fail_companies):
+            self.send_response(400)
+            self.end_headers()
+            self.wfile.write(b'{"error": "bad request"}')
+            return
+        project_ids = [int(line.split(':')[1]) for line in prompt.splitlines() if line.startswith('Project ID:')]
+        rationale = {
+            'selectedProjectId': project_ids[0],
+            'confidenceScore': 0.8,
+            'title': 'Batch analysis',
+            'options': [
+                {'key': str(pid), 'label': f'P{pid}', 'data': {'projectId': pid, 'score': 0.9 - i * 0.1, 'strengths': ['fit']}}
+                for i, pid in enumerate(project_ids)
+            ],
+            'reasoningSteps': ['step'],
+        }
+        payload = {'choices': [{'message': {'content': json.dumps(rationale)}}]}
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(json.dumps(payload).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_completions(monkeypatch):
+    FakeCompletions.calls = 0
+    FakeCompletions.rate_limit_first = True
+    FakeCompletions.fail_companies = set()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeCompletions)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(ai_model, 'base_url', f"http://127.0.0.1:{server.server_port}/v1/chat/completions")
+    yield FakeCompletions
+    server.shutdown()
+    server.server_close()
+
+
+def seed(count=5):
+    user = make_user()
+    companies = [make_company(user, name=f'Company {i}') for i in range(count)]
+    make_project(user, 'Solar Schools')
+    make_project(user, 'Clean Water')
+    db.session.commit()
+    return companies
+
+
+def test_batch_run_writes_rationales_and_matches(app, fake_completions, tmp_path):
+    companies = seed()
+    checkpoint_path = str(tmp_path / 'checkpoint.json')
+
+    summary = BatchMatchingRunner(max_workers=3, requests_per_minute=6000, checkpoint_path=checkpoint_path).run()
+
+    assert summary['succeeded'] == len(companies)
+    assert summary['failed'] == 0
+    assert DecisionRationale.query.count() == len(companies)
+    assert AIMatch.query.count() == len(companies) * 2
+    top = AIMatch.query.filter_by(company_id=companies[0].id).order_by(AIMatch.alignment_score.desc()).first()
+    assert top.alignment_score == 90
+    with open(checkpoint_path) as fh:
+        assert json.load(fh)['finished_at'] is not None
+
+    # A second run starts fresh and replaces matches instead of duplicating them
+    BatchMatchingRunner(max_workers=3, requests_per_minute=6000, checkpoint_path=checkpoint_path).run()
+    assert AIMatch.query.count() == len(companies) * 2
+
+
+def test_batch_run_resumes_failed_companies(app, fake_completions, tmp_path):
+    companies = seed(3)
+    checkpoint_path = str(tmp_path / 'checkpoint.json')
+    fake_completions.rate_limit_first = False
+    fake_completions.fail_companies = {'Company 1'}
+
+    first = BatchMatchingRunner(max_workers=2, requests_per_minute=6000, checkpoint_path=checkpoint_path).run()
+    assert first['succeeded'] == 2
+    assert first['failed'] == 1
+
+    fake_completions.fail_companies = set()
+    calls_before = fake_completions.calls
+    second = BatchMatchingRunner(max_workers=2, requests_per_minute=6000, checkpoint_path=checkpoint_path).run()
+    assert second['run_id'] == first['run_id']
+    assert second['skipped'] == 2
+    assert second['succeeded'] == 1
+    assert fake_completions.calls - calls_before == 1
+    assert {r.company_id for r in DecisionRationale.query.all()} == {c.id for c in companies}
+
+
+def test_checkpoint_round_trip(tmp_path):
+    checkpoint = BatchCheckpoint(str(tmp_path / 'cp.json'))
+    state = checkpoint.load()
+    checkpoint.record([3, 1], {2: 'boom'})
+    checkpoint.save()
+    reloaded = BatchCheckpoint(str(tmp_path / 'cp.json'))
+    assert reloaded.load()['run_id'] == state['run_id']
+    assert reloaded.completed == {1, 3}
+    assert reloaded.state['failed'] == {'2': 'boom'}
+
+    # A finished run is reported as saved; only a new run starts from scratch
+    reloaded.finish()
+    reloaded.save()
+    status = background_run_status(str(tmp_path / 'cp.json'))['checkpoint']
+    assert status['run_id'] == state['run_id'] and status['completed'] == [1, 3] and status['finished_at']
+    assert BatchCheckpoint(str(tmp_path / 'cp.json')).load()['run_id'] != state['run_id']
+    assert background_run_status(str(tmp_path / 'missing.json'))['checkpoint'] is None
+
+
+def test_token_bucket_pause_blocks_acquire():
+    import time
+    bucket = TokenBucket(rate_per_minute=6000, capacity=5)
+    bucket.pause(0.05)
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.04
+
+
+def test_start_endpoint_is_admin_only_and_validates_options(app, client):
+    admin, member = make_user('admin@example.com'), make_user('member@example.com')
+    admin.role, member.role = 'admin', 'corporate'
+    db.session.commit()
+
+    def start(user=None, **options):
+        headers = {'Authorization': f"Bearer {create_token({'user_id': user.id})}"} if user else {}
+        return client.post('/api/ai-matching/batch-runs', json=options, headers=headers)
+
+    assert start().status_code == 403
+    assert start(member).status_code == 403
+    for bad in ({'requests_per_minute': 0}, {'max_workers': 'many'}, {'max_retries': -1}, {'flush_every': 0}):
+        response = start(admin, **bad)
+        assert response.status_code == 400 and next(iter(bad)) in response.get_json()['error']
@@ -0,0 +1,178 @@
+"""
+Tests for incremental catalog ingestion against a local stand-in catalog server.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from agents.discovery_agent import DiscoveryAgent
+from ai_models.catalog_ingestion import NGO, CatalogIngestor, CatalogSource
+from models import CatalogRecord, CatalogSyncState, NGOProfile, NGOSummary, Project, db
+from perf import query_budget
+from tests.conftest import make_user
+
+
+def project(external_id, title, **extra):
+    return {'id': external_id, 'title': title, 'description': f'{title} description', 'ngo_name': 'Green Earth',
+            'total_cost': 100000, 'start_date': '2024-01-01', 'end_date': '2024-12-31',
+            'sdgs': ['SDG 6', '13'], 'focus_areas': ['Environment'], 'city': 'Pune', **extra}
+
+
+class CatalogServer:
+    """Paged JSON catalog with ETags that records the requests it serves"""
+
+    def __init__(self, delay=0.0):
+        self.catalogs = {}
+        self.requests = []
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server._lock:
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    time.sleep(server.delay)
+                    server.handle(self)
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.httpd.server_port}{path}"
+
+    def handle(self, request):
+        url = urlparse(request.path)
+        page_index = int(parse_qs(url.query).get('cursor', ['0'])[0])
+        pages = self.catalogs.get(url.path)
+        if pages is None or page_index >= len(pages):
+            request.send_response(404)
+            request.end_headers()
+            return
+        body = json.dumps({
+            'items': pages[page_index],
+            'next_cursor': str(page_index + 1) if page_index + 1 < len(pages) else None,
+        }).encode('utf-8')
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        self.requests.append((url.path, page_index, request.headers.get('If-None-Match') == etag))
+        if request.headers.get('If-None-Match') == etag:
+            request.send_response(304)
+            request.send_header('ETag', etag)
+            request.end_headers()
+            return
+        request.send_response(200)
+        request.send_header('Content-Type', 'application/json')
+        request.send_header('ETag', etag)
+        request.send_header('Content-Length', str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+
+@pytest.fixture
+def catalog_server():
+    server = CatalogServer()
+    server.thread.start()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
+
+
+def test_sync_is_incremental(app, catalog_server):
+    user = make_user()
+    catalog_server.catalogs['/projects'] = [
+        [project('p1', 'Clean Water'), project('p2', 'Solar Schools')],
+        [project('p3', 'Mangrove Restoration'), {'id': 'p4', 'title': 'Missing fields'}],
+    ]
+    ingestor = CatalogIngestor([CatalogSource('darpan.projects', catalog_server.url('/projects'), default_country='India')])
+
+    first = ingestor.sync()
+    assert (first['inserted'], first['updated'], first['failed']) == (3, 0, 0)
+    assert first['sources']['darpan.projects']['invalid'] == 1
+    water = Project.query.filter_by(title='Clean Water').one()
+    assert water.created_by == user.id and water.location_country == 'India'
+    assert water.get_sdg_goals() == [6, 13] and water.duration_months == 13
+
+    # Nothing changed: every page answers 304 and nothing is written
+    catalog_server.requests.clear()
+    with query_budget(4):
+        second = ingestor.sync()
+    assert (second['inserted'], second['updated'], second['unchanged']) == (0, 0, 0)
+    assert [r[2] for r in catalog_server.requests] == [True, True]
+
+    # One edited record on the second page: only that page is re-read and only that row updated
+    catalog_server.catalogs['/projects'][1][0] = project('p3', 'Mangrove Restoration', total_cost=250000)
+    third = ingestor.sync()
+    assert (third['inserted'], third['updated'], third['unchanged']) == (0, 1, 0)
+    assert third['sources']['darpan.projects']['not_modified'] == 1
+    assert float(Project.query.filter_by(title='Mangrove Restoration').one().total_project_cost) == 250000
+    assert Project.query.count() == 3 and CatalogRecord.query.count() == 3
+    assert set(db.session.get(CatalogSyncState, 'darpan.projects').pages) == {'', '1'}
+
+
+def test_ngos_are_linked_to_existing_profiles(app, catalog_server):
+    db.session.add(NGOProfile(name='Green Earth', country='India', registration_number='MH/123'))
+    db.session.commit()
+    catalog_server.catalogs['/ngos'] = [[
+        {'id': 'n1', 'name': 'Green Earth Trust', 'registration_number': 'MH/123', 'sectors': 'Environment, Water'},
+        {'id': 'n2', 'name': 'Teach India', 'country': 'India', 'rating': 9},
+    ]]
+    summary = CatalogIngestor([CatalogSource('darpan.ngos', catalog_server.url('/ngos'), kind=NGO,
+                                             default_country='India')]).sync()
+
+    assert (summary['inserted'], summary['updated']) == (1, 1)
+    profiles = {p.name: p for p in NGOProfile.query.all()}
+    assert set(profiles) == {'Green Earth Trust', 'Teach India'}
+    assert profiles['Green Earth Trust'].get_primary_sectors() == ['Environment', 'Water']
+    assert profiles['Teach India'].rating is None
+    assert {s.ngo_id for s in NGOSummary.query.all()} == {p.id for p in profiles.values()}
+
+
+def test_sources_are_fetched_concurrently_and_failures_isolated(app):
+    make_user()
+    server = CatalogServer(delay=0.1)
+    server.thread.start()
+    try:
+        sources = []
+        for index in range(4):
+            server.catalogs[f'/s{index}'] = [[project(f'{index}-1', f'Project {index}')]]
+            sources.append(CatalogSource(f'source{index}', server.url(f'/s{index}'), default_country='India'))
+        sources.append(CatalogSource('broken', server.url('/missing')))
+
+        summary = CatalogIngestor(sources, max_concurrency=2, max_retries=0).sync()
+    finally:
+        server.httpd.shutdown()
+        server.httpd.server_close()
+
+    assert summary['inserted'] == 4 and summary['failed'] == 1
+    assert '404' in summary['sources']['broken']['error']
+    assert server.max_in_flight == 2
+
+
+def test_discovery_agent_serves_imported_projects(app, catalog_server):
+    make_user()
+    agent = DiscoveryAgent()
+    assert [p['id'] for p in agent.search_projects('water')] == ['ngo_002']
+
+    catalog_server.catalogs['/projects'] = [[project('p1', 'River Cleanup', funding_required=750000),
+                                             project('p2', 'Solar Schools')]]
+    agent.sync_catalog([CatalogSource('darpan.projects', catalog_server.url('/projects'), default_country='India')])
+
+    results = agent.search_projects('river', {'budget_range': '500000-1000000'})
+    assert [(p['id'], p['sdgs'], p['geography']) for p in results] == [('p1', ['6', '13'], 'Pune, India')]
+    assert len(agent.fetch_ngo_projects({'sector': 'environment'})) == 2
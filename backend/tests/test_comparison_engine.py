@@ -0,0 +1,156 @@
+"""
+Tests for the multi-criteria comparison engine and the comparison analysis routes.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from ai_models.comparison_engine import CRITERIA_NAMES, CriteriaMatrix, load_criteria
+from conftest import make_company, make_project, make_user
+from models import db, AIMatch
+from models.comparison import Comparison, ComparisonItem
+from perf import query_budget
+from routes.enhanced_ai_matching import enhanced_ai_bp
+from utils import create_token
+
+
+def matrix(rows):
+    """Matrix from {criterion: value} dicts; unlisted criteria are unknown"""
+    values = [[row.get(name, np.nan) for name in CRITERIA_NAMES] for row in rows]
+    return CriteriaMatrix(list(range(1, len(rows) + 1)), [f'P{i}' for i in range(1, len(rows) + 1)], values)
+
+
+def test_normalization_respects_direction():
+    m = matrix([{'cost': 100, 'impact': 2}, {'cost': 300, 'impact': 6}, {'cost': 200}])
+    cost, impact = CRITERIA_NAMES.index('cost'), CRITERIA_NAMES.index('impact')
+    assert m.normalized[:, cost].tolist() == [1.0, 0.0, 0.5]
+    assert m.normalized[:, impact].tolist() == [0.0, 1.0, 0.5]  # unknown scores neutral
+    assert m.available.tolist() == [name in ('cost', 'impact') for name in CRITERIA_NAMES]
+
+
+def test_pareto_front_and_deltas():
+    m = matrix([
+        {'cost': 100, 'impact': 5},  # dominates the third
+        {'cost': 300, 'impact': 9},
+        {'cost': 300, 'impact': 4},
+    ])
+    analysis = m.analyze()
+    assert sorted(analysis['paretoFront']) == [1, 2]
+    by_id = {p['projectId']: p for p in analysis['projects']}
+    assert by_id[3]['dominatedBy'] == [1, 2]
+    assert not by_id[3]['paretoOptimal'] and by_id[1]['dominates'] == 1
+    assert by_id[2]['criteria']['cost']['deltaToBest'] == 200
+    assert by_id[1]['criteria']['impact']['deltaToBest'] == 4
+    assert set(by_id[1]['criteria']) == {'cost', 'impact'}
+
+
+def test_rerank_reuses_matrix():
+    m = matrix([{'cost': 100, 'impact': 1}, {'cost': 200, 'impact': 9}])
+    assert [r['projectId'] for r in m.rank({'cost': 1, 'impact': 0})] == [1, 2]
+    assert [r['projectId'] for r in m.rank({'cost': 0, 'impact': 1})] == [2, 1]
+    assert m.analyze({'cost': 1, 'impact': 0})['projects'][0]['score'] == 100
+    with pytest.raises(ValueError):
+        m.rank({'popularity': 1})
+
+
+def test_weighted_scores_match_scalar_computation():
+    rng = np.random.default_rng(7)
+    m = CriteriaMatrix(list(range(60)), [''] * 60, rng.uniform(1, 100, size=(60, len(CRITERIA_NAMES))))
+    weights = dict(zip(CRITERIA_NAMES, [3, 1, 2, 0, 1, 1]))
+    scores = m.scores(weights)
+    total = sum(weights.values())
+    for i in range(60):
+        expected = sum(m.normalized[i, c] * weights[name] / total for c, name in enumerate(CRITERIA_NAMES)) * 100
+        assert scores[i] == pytest.approx(expected)
+    front = m.analyze()['paretoFront']
+    for i in front:
+        row = m.normalized[i]
+        assert not any((m.normalized[j] >= row).all() and (m.normalized[j] > row).any() for j in range(60))
+
+
+@pytest.fixture
+def compared(app):
+    user = make_user()
+    company = make_company(user)
+    projects = [
+        make_project(user, title='Cheap', funding_required=20000, ngo_rating=4, ngo_verification_badge='Verified',
+                     sdg_goals=json.dumps([4, 13])),
+        make_project(user, title='Costly', funding_required=90000, ngo_rating=2),
+        make_project(user, title='Middle', funding_required=50000, ngo_rating=3),
+    ]
+    comparison = Comparison(user_id=user.id, name='Shortlist')
+    db.session.add(comparison)
+    db.session.flush()
+    for project in projects:
+        db.session.add(ComparisonItem(comparison_id=comparison.id, project_id=project.id))
+        db.session.add(AIMatch(project_id=project.id, company_id=company.id, alignment_score=50))
+    db.session.commit()
+    return comparison, projects, company
+
+
+def test_load_criteria_is_bulk(compared):
+    _, projects, company = compared
+    ids = [p.id for p in reversed(projects)] + [99999]
+    company_id = company.id
+    with query_budget(2):
+        m = load_criteria(ids, company_id)
+    assert m.project_ids == ids[:-1]
+    assert m.values[:, CRITERIA_NAMES.index('alignment')].tolist() == [50, 50, 50]
+
+
+def test_analysis_route(compared, client):
+    comparison, projects, _ = compared
+    url = f'/api/comparisons/{comparison.id}/analysis'
+    client.get(url)
+    # comparison, caller's company, items, projects, alignment scores
+    with query_budget(5):
+        response = client.get(url)
+    data = response.get_json()['data']
+    assert data['projects'][0]['title'] == 'Cheap'
+    assert data['paretoFront'] == [projects[0].id]
+    assert len(data['normalized']) == 3 and len(data['normalized'][0]) == len(data['criteria'])
+
+    reweighted = client.get(f'/api/comparisons/{comparison.id}/analysis?weights=cost:0,impact:0,risk:0,'
+                            'ngo_credibility:0,duration:0,alignment:1').get_json()['data']
+    assert {p['score'] for p in reweighted['projects']} == {100.0}
+
+    assert client.post(f'/api/comparisons/{comparison.id}/analysis',
+                       json={'weights': {'bogus': 1}}).status_code == 400
+    assert client.get('/api/comparisons/99999/analysis').status_code == 404
+
+
+def test_adhoc_analyze_and_create_skip_missing(compared, client):
+    _, projects, _ = compared
+    ids = [p.id for p in projects]
+    response = client.post('/api/comparisons/analyze', json={'project_ids': ids, 'weights': {'cost': 5}})
+    assert response.status_code == 200
+    assert client.post('/api/comparisons/analyze', json={'project_ids': ids + [99999]}).status_code == 404
+    assert client.post('/api/comparisons/analyze', json={'project_ids': ids[:1]}).status_code == 400
+
+    created = client.post('/api/comparisons/', json={'name': 'New', 'project_ids': ids + [99999, ids[0]]})
+    assert created.status_code == 201
+    assert [item['project_id'] for item in created.get_json()['data']['items']] == ids
+    assert client.post('/api/comparisons/', json={'name': 'Bad', 'project_ids': ['abc']}).status_code == 400
+
+
+def test_enhanced_comparison_scores_from_matrix(app, compared):
+    app.register_blueprint(enhanced_ai_bp)
+    client = app.test_client()
+    _, projects, company = compared
+    ids = [p.id for p in projects]
+    headers = {'Authorization': f"Bearer {create_token({'user_id': company.user_id})}"}
+
+    assert client.post('/api/enhanced-ai/comparison', json={'project_ids': ids}).status_code == 401
+    response = client.post('/api/enhanced-ai/comparison', json={'project_ids': ids}, headers=headers)
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [a['project_id'] for a in data['project_analyses']] == [p['projectId'] for p in data['criteria_analysis']['projects']]
+    assert data['project_analyses'][0]['project_name'] == 'Cheap'
+    assert data['comparison_summary']['best_performing_project']['project_id'] == projects[0].id
+
+    assert client.post('/api/enhanced-ai/comparison', json={'project_ids': ids + [99999]},
+                       headers=headers).status_code == 404
+    assert client.post('/api/enhanced-ai/comparison', json={'project_ids': ['x', ids[0]]},
+                       headers=headers).status_code == 400
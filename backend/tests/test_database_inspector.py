@@ -0,0 +1,84 @@
+"""
+Tests for the database inspector: cached row counts and paged, projected rows.
+"""
+
+import os
+
+import pytest
+from sqlalchemy import text
+
+from models import Project, db
+from perf import query_budget, table_stats
+from routes.views import views_bp
+from tests.conftest import backend_dir, make_project, make_user
+from utils import create_token
+
+
+@pytest.fixture
+def inspector(app):
+    app.template_folder = os.path.join(backend_dir, 'templates')
+    app.register_blueprint(views_bp)
+    admin = make_user('admin@example.com')
+    admin.role = 'admin'
+    db.session.commit()
+    client = app.test_client()
+    client.environ_base['HTTP_AUTHORIZATION'] = f"Bearer {create_token({'user_id': admin.id})}"
+    table_stats.invalidate()
+    yield client
+    table_stats.invalidate()
+
+
+def test_page_renders_cached_counts_without_scanning_tables(app, inspector):
+    user = make_user()
+    for i in range(3):
+        make_project(user, title=f'Project {i}')
+
+    counts = table_stats.refresh()
+    assert counts['projects']['rows'] == 3 and counts['projects']['approximate'] is True
+    assert counts['audit_events']['rows'] == 0
+    # Reading the counts leaves the planner statistics alone
+    assert db.session.execute(text("SELECT name FROM sqlite_master WHERE name = 'sqlite_stat1'")).first() is None
+
+    # Only the admin token check touches the database
+    with query_budget(1):
+        page = inspector.get('/database')
+    assert page.status_code == 200
+    html = page.get_data(as_text=True)
+    assert 'data-table="projects"' in html and '~3' in html
+
+
+def test_rows_are_paged_by_key_and_projected(app, inspector):
+    user = make_user()
+    for i in range(5):
+        make_project(user, title=f'Project {i}')
+    ids = [p.id for p in Project.query.order_by(Project.id)]
+
+    first = inspector.get('/database/projects/rows?columns=id,title&limit=2').get_json()
+    assert first['columns'] == ['id', 'title']
+    assert first['rows'] == [[ids[0], 'Project 0'], [ids[1], 'Project 1']]
+    assert first['next'] == {'after': ids[1]}
+
+    last = inspector.get(f'/database/projects/rows?columns=id&limit=3&after={ids[1]}').get_json()
+    assert last['rows'] == [[ids[2]], [ids[3]], [ids[4]]] and last['next'] is None
+
+    # The default preview leaves out long text and JSON columns
+    preview = inspector.get('/database/projects/rows').get_json()
+    assert 'id' in preview['columns'] and 'short_description' not in preview['columns']
+
+    assert inspector.get('/database/projects/rows?columns=nope').status_code == 400
+    assert inspector.get('/database/projects/rows?after=abc').status_code == 400
+    assert inspector.get('/database/missing/rows').status_code == 404
+
+
+def test_inspector_is_admin_only_and_hides_credentials(app, inspector, client):
+    member = make_user('member@example.com')
+    member.role = 'corporate'
+    db.session.commit()
+    member_headers = {'Authorization': f"Bearer {create_token({'user_id': member.id})}"}
+    for url in ('/database', '/database/users/rows'):
+        assert client.get(url).status_code == 403
+        assert client.get(url, headers=member_headers).status_code == 403
+
+    assert 'password_hash' not in inspector.get('/database').get_data(as_text=True)
+    assert 'password_hash' not in inspector.get('/database/users/rows').get_json()['columns']
+    assert inspector.get('/database/users/rows?columns=id,password_hash').status_code == 400
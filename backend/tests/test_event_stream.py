@@ -0,0 +1,131 @@
+"""
+Tests for the change event broker and the SSE stream.
+"""
+
+from sqlalchemy import insert
+
+from models import ApprovalRequest, ApprovalStep, ProjectApplication, ProjectTimelineEntry, ProjectTrackingInfo, db
+from realtime import EventBroker, event_broker
+from realtime.broker import Event
+from tests.conftest import make_company, make_project, make_user
+
+
+def drain(subscription):
+    events = []
+    while (event := subscription.get(timeout=0)) is not None:
+        events.append(event)
+    return events
+
+
+def test_broker_filters_drops_and_replays():
+    broker = EventBroker(max_queue=2)
+    first = broker.stats()['last_event_id'] + 1
+    acme = broker.subscribe(company_id=1)
+    approvals = broker.subscribe(types=['approval'])
+    broker.publish('timeline', {'text': 'a'}, [1])
+    broker.publish('timeline', {'text': 'b'}, [2])
+    broker.publish('approval', {'id': 5}, [2])
+    broker.publish('timeline', {'text': 'c'}, [1, 3])
+    broker.publish('timeline', {'text': 'd'}, [1])
+
+    assert [e.data for e in drain(approvals)] == [{'id': 5}]
+    assert [e.data['text'] for e in drain(acme)] == ['a', 'c'] and acme.dropped == 1
+
+    replay = broker.subscribe(company_id=2, last_event_id=first)
+    assert [e.id for e in drain(replay)] == [first + 1, first + 2]
+    assert broker.stats()['subscribers'] == 3
+    replay.close()
+    assert broker.stats()['subscribers'] == 2
+
+
+class SharedRedis:
+    """The two commands publish() sends, recorded instead of sent"""
+
+    def __init__(self, counter):
+        self.counter = counter
+        self.messages = []
+
+    def incr(self, key):
+        self.counter += 1
+        return self.counter
+
+    def publish(self, channel, message):
+        self.messages.append(message)
+
+
+def test_redis_events_are_numbered_once_for_every_worker():
+    publisher = EventBroker()
+    # connect_redis() seeds the shared counter from the clock the same way
+    redis = SharedRedis(publisher.stats()['last_event_id'])
+    first = redis.counter + 1
+    publisher._redis = redis
+    publisher.publish('approval', {'id': 5}, [2])
+    publisher.publish('approval', {'id': 6}, [2])
+
+    # Each worker's listener delivers what came back from the channel
+    first_worker, second_worker = EventBroker(), EventBroker()
+    for worker in (first_worker, second_worker):
+        for message in redis.messages:
+            worker._deliver(Event.from_message(message))
+    for worker in (first_worker, second_worker):
+        assert [e.data['id'] for e in drain(worker.subscribe(last_event_id=first))] == [6]
+        assert [e.id for e in drain(worker.subscribe(last_event_id=0))] == [first, first + 1]
+
+
+def test_committed_changes_are_published_per_company(app):
+    user = make_user()
+    acme = make_company(user)
+    other = make_company(user, name='Other Co')
+    project = make_project(user)
+    tracking = ProjectTrackingInfo(project_id=project.id, status='on-track')
+    approval = ApprovalRequest(title='Fund solar', company_id=acme.id, project_id=project.id)
+    approval.steps = [ApprovalStep(name='Finance', order_index=0)]
+    db.session.add_all([tracking, approval, ProjectApplication(project_id=project.id, company_id=acme.id,
+                                                                application_type='funding', status='approved')])
+    db.session.commit()
+
+    with event_broker.subscribe(company_id=acme.id) as subscription:
+        db.session.add(ProjectTimelineEntry(text='Site visit', company_id=acme.id))
+        db.session.execute(insert(ProjectTimelineEntry), [
+            {'text': 'Funds released', 'company_id': acme.id, 'color': 'green'},
+            {'text': 'Unrelated', 'company_id': other.id},
+        ])
+        assert tracking.status == 'on-track'
+        tracking.status = 'delayed'
+        approval.steps[0].status = 'approved'
+        approval.recompute_status()
+        db.session.commit()
+
+        tracking.progress_pct = tracking.progress_pct  # no-op changes publish nothing
+        db.session.add(ProjectTimelineEntry(text='Rolled back', company_id=acme.id))
+        db.session.flush()
+        db.session.rollback()
+
+        events = drain(subscription)
+
+    by_type = {}
+    for event in events:
+        by_type.setdefault(event.type, []).append(event.data)
+    assert [e['text'] for e in by_type['timeline']] == ['Site visit', 'Funds released']
+    assert by_type['tracker'] == [{'id': f'p{project.id}', 'projectId': project.id, 'status': 'delayed',
+                                   'progressPct': 0, 'previousStatus': 'on-track'}]
+    assert by_type['approval_step'][0]['status'] == 'approved'
+    assert by_type['approval_step'][0]['previousStatus'] == 'pending'
+    assert by_type['approval'][0]['status'] == 'approved'
+
+
+def test_stream_endpoint(app, client):
+    app.config.update(EVENTS_STREAM_MAX_SECONDS=0.2, EVENTS_HEARTBEAT_SECONDS=0.05)
+    start = event_broker.stats()['last_event_id']
+    event_broker.publish('timeline', {'text': 'Milestone completed'}, [7])
+    event_broker.publish('timeline', {'text': 'Other company'}, [8])
+
+    assert client.get('/api/events/stream?types=nope').status_code == 400
+
+    response = client.get(f'/api/events/stream?company_id=7&last_event_id={start}')
+    assert response.mimetype == 'text/event-stream'
+    body = response.get_data(as_text=True)
+    assert 'event: ready' in body and ': keep-alive' in body
+    assert f'id: {start + 1}\nevent: timeline\ndata: {{"text": "Milestone completed"}}' in body
+    assert 'Other company' not in body
+    assert client.get('/api/events/stats').get_json()['backend'] == 'memory'
@@ -0,0 +1,107 @@
+"""
+Parity and aggregate tests for the batch impact calculator.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from ibm_watson.tools.impact_calculator import (TIER_BOUNDS, calculate_impact_batch, impact_calculator_batch_function,
+                                                impact_calculator_function)
+
+
+def random_metrics(rng, i):
+    def maybe(value):
+        return value if rng.random() < 0.7 else 0
+
+    def nested(*keys):
+        if rng.random() < 0.3:
+            return {}
+        return {key: maybe(rng.randint(1, 50)) for key in keys}
+
+    metrics = {
+        'id': i,
+        'beneficiaries': maybe(rng.choice([rng.randint(1, 50000), 100, 1000, 10000])),
+        'carbon_reduction_tons': maybe(rng.uniform(0, 5000)),
+        'water_conservation_liters': maybe(rng.choice([rng.uniform(0, 5e6), 10000, 1e6])),
+        'waste_reduction_kg': maybe(rng.uniform(0, 20000)),
+        'jobs_created': maybe(rng.choice([rng.randint(0, 300), 5, 20, 100])),
+        'local_spending_usd': maybe(rng.uniform(0, 3e6)),
+        'education_metrics': nested('students_reached', 'schools_improved', 'teachers_trained'),
+        'health_metrics': nested('people_served', 'facilities_improved', 'workers_trained'),
+        'community_metrics': nested('groups_engaged', 'infrastructure_improved', 'social_cohesion_score'),
+        'biodiversity_metrics': nested('species_protected', 'habitat_area_hectares', 'ecosystem_services'),
+        'skill_development_metrics': {'people_trained': maybe(10), 'skills_taught': ['welding'] * maybe(1),
+                                      'certification_provided': rng.random() < 0.5},
+        'market_development_metrics': nested('businesses_supported', 'value_chain_development'),
+    }
+    # Some projects only report a handful of fields
+    if rng.random() < 0.2:
+        metrics = {k: v for k, v in metrics.items() if k in ('id', 'beneficiaries', 'jobs_created')}
+    return metrics
+
+
+def test_batch_matches_scalar_results():
+    rng = random.Random(42)
+    portfolio = [random_metrics(rng, i) for i in range(400)]
+    batch = impact_calculator_batch_function(portfolio)
+    assert batch['success'] and batch['project_count'] == 400
+    for metrics, result in zip(portfolio, batch['projects']):
+        expected = impact_calculator_function(metrics)
+        assert result.pop('id') == metrics['id']
+        result.pop('portfolio_percentile')
+        assert result == expected
+
+
+def test_tier_boundaries_match_scalar():
+    for field, bounds in TIER_BOUNDS.items():
+        values = sorted({b + d for b in bounds for d in (-0.5, 0, 0.5)} | {-1})
+        batch = calculate_impact_batch([{field: v} for v in values])['projects']
+        for value, result in zip(values, batch):
+            assert result == {**impact_calculator_function({field: value}),
+                              'portfolio_percentile': result['portfolio_percentile']}, (field, value)
+
+
+def test_columnar_input_and_aggregates():
+    columns = {
+        'beneficiaries': [50, 500, 5000, 50000],
+        'jobs_created': [0, 10, 50, 500],
+        'carbon_reduction_tons': [0, 0, 50, 5000],
+    }
+    summary = calculate_impact_batch(columns, include_details=False, percentiles=(50, 90))
+    scores = [p['overall_impact_score'] for p in summary['projects']]
+    assert scores == [impact_calculator_function({k: v[i] for k, v in columns.items()})['overall_impact_score']
+                      for i in range(4)]
+    assert set(summary['projects'][0]) == {'overall_impact_score', 'social_score', 'environmental_score',
+                                           'economic_score', 'portfolio_percentile'}
+    assert [p['portfolio_percentile'] for p in summary['projects']] == [25, 50, 75, 100]
+
+    portfolio = summary['portfolio']
+    assert portfolio['overall_impact']['percentiles']['p50'] == pytest.approx(np.percentile(scores, 50))
+    assert portfolio['overall_impact']['max'] == max(scores)
+    assert portfolio['totals']['beneficiaries'] == 55550
+    assert portfolio['low_impact_projects'] == sum(s < 0.5 for s in scores)
+
+
+def test_empty_and_invalid_input():
+    empty = calculate_impact_batch([])
+    assert empty['project_count'] == 0 and empty['portfolio']['overall_impact']['mean'] is None
+    failed = impact_calculator_batch_function({'beneficiaries': [1, 2], 'jobs_created': [1]})
+    assert not failed['success']
+
+
+def test_dataframe_nulls_count_as_zero():
+    pd = pytest.importorskip('pandas')
+    frame = pd.DataFrame([
+        {'id': 1, 'beneficiaries': None, 'jobs_created': 3, 'education_metrics': None},
+        {'id': 2, 'beneficiaries': 500, 'jobs_created': None, 'education_metrics': {'students_reached': 40}},
+    ])
+    batch = calculate_impact_batch(frame)
+    as_zero = calculate_impact_batch([{'id': 1, 'jobs_created': 3},
+                                      {'id': 2, 'beneficiaries': 500, 'education_metrics': {'students_reached': 40}}])
+    scores = [p['overall_impact_score'] for p in batch['projects']]
+    assert scores == [p['overall_impact_score'] for p in as_zero['projects']]
+    assert batch['projects'][0]['id'] == 1 and type(batch['projects'][0]['id']) is int
+    assert batch['projects'][0]['social_impact']['beneficiary_impact'] == {'count': None, 'score': 0.0}
+    assert batch['portfolio']['totals']['beneficiaries'] == 500 and batch['portfolio']['totals']['jobs_created'] == 3
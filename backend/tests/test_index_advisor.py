@@ -0,0 +1,52 @@
+"""
+Tests for the query plan analyzer and index advisor.
+"""
+
+from sqlalchemy import text
+
+from models import AuditEvent, db
+from perf.index_advisor import FULL_SCAN, IndexAdvisor, StatementCapture, predicate_columns, propose_columns
+from tests.conftest import make_project, make_user
+
+
+def test_predicates_are_read_per_table_alias():
+    statement = (
+        'SELECT ai_matches.id FROM ai_matches LEFT OUTER JOIN projects AS projects_1 '
+        'ON projects_1.id = ai_matches.project_id WHERE ai_matches.company_id = ? AND ai_matches.source IN (?, ?) '
+        'AND ai_matches.alignment_score >= ? AND projects_1.status = ? ORDER BY ai_matches.alignment_score DESC LIMIT ?'
+    )
+    assert predicate_columns(statement, 'ai_matches') == {
+        'equality': ['company_id', 'source', 'project_id'], 'range': ['alignment_score'], 'order': ['alignment_score'],
+    }
+    assert propose_columns(statement, 'projects_1') == ['id', 'status']
+    assert propose_columns('SELECT count(*) FROM audit_events', 'audit_events') == []
+
+
+def test_scans_on_hot_filters_get_verified_proposals(app, client):
+    user = make_user()
+    for i in range(20):
+        make_project(user, title=f'Project {i}', status='published' if i % 2 else 'draft')
+    db.session.add(AuditEvent(entity_type='project', action='created'))
+    db.session.commit()
+
+    with StatementCapture(db.engine) as capture:
+        client.get('/api/projects/projects?status=published')
+        client.get('/api/projects/projects?status=draft')
+        client.get('/api/projects/audit/events?entity_type=project&action=created')
+    report = IndexAdvisor(db.engine).analyze(capture)
+
+    projects = next(p for p in report['proposals'] if p['table'] == 'projects')
+    assert projects['columns'] == ['status', 'created_at'] and projects['verified'] is True
+    assert projects['endpoints'] == [{'endpoint': 'projects.list_projects', 'executions': 2}]
+    assert projects['migration'] == \
+        "ensure_index_exists(db.Index('ix_projects_status_created_at', Project.status, Project.created_at))"
+    assert any(f['table'] == 'projects' and f['kind'] == FULL_SCAN for f in report['findings'])
+    # Nothing was left behind by verification
+    assert 'ix_projects_status_created_at' not in {i['name'] for i in db.inspect(db.engine).get_indexes('projects')}
+
+    # An existing index that already covers the proposal is not proposed again
+    db.session.execute(text('CREATE INDEX ix_audit_lookup ON audit_events (entity_type, action, created_at)'))
+    db.session.commit()
+    report = IndexAdvisor(db.engine).analyze(capture)
+    assert [p['table'] for p in report['proposals']] == ['projects']
+    assert all(f['table'] != 'audit_events' for f in report['findings'])
@@ -0,0 +1,78 @@
+"""
+Tests for JSON text columns decoded once per loaded row.
+"""
+
+import json
+from unittest import mock
+
+from sqlalchemy import text
+
+from models import NGOProfile, Project, db
+from models import types
+from models.types import migrate_json_columns
+from tests.conftest import make_project, make_user
+from utils import create_token
+
+
+def test_values_are_stored_as_json_and_decoded_once_per_load(app):
+    user = make_user()
+    project = make_project(user, sdg_goals=json.dumps([4, 10]))
+    project.set_kpis({'schools': 3})
+    db.session.commit()
+
+    raw = db.session.execute(text('SELECT sdg_goals, kpis FROM projects WHERE id = :id'), {'id': project.id}).one()
+    assert json.loads(raw.sdg_goals) == [4, 10] and json.loads(raw.kpis) == {'schools': 3}
+
+    db.session.expire_all()
+    with mock.patch.object(types.json, 'loads', wraps=json.loads) as loads:
+        project = db.session.get(Project, project.id)
+        decoded = loads.call_count
+        for _ in range(5):
+            card = project.to_dict()
+    assert decoded > 0 and loads.call_count == decoded
+    assert card['sdg_goals'] == [4, 10] and card['impact_metrics']['kpis'] == {'schools': 3}
+
+    # Getters hand out copies, so callers cannot change the loaded value in place
+    project.get_sdg_goals().append(17)
+    assert project.get_sdg_goals() == [4, 10]
+    project.set_sdg_goals([6])
+    assert project.get_sdg_goals() == [6]
+    db.session.commit()
+    db.session.expire_all()
+    assert db.session.get(Project, project.id).get_sdg_goals() == [6]
+
+
+def test_migration_repairs_legacy_text(app):
+    ngo = NGOProfile(name='Legacy Trust', country='India')
+    db.session.add(ngo)
+    db.session.commit()
+    db.session.execute(
+        text("UPDATE ngo_profiles SET primary_sectors = 'Health, Water', sdg_focus = '', "
+             "geographic_focus = '[\"Pune\"]' WHERE id = :id"),
+        {'id': ngo.id},
+    )
+    db.session.commit()
+
+    assert migrate_json_columns(db.engine, (NGOProfile,)) == {
+        'ngo_profiles.primary_sectors': 1, 'ngo_profiles.sdg_focus': 1, 'ngo_profiles.geographic_focus': 0,
+        'ngo_profiles.funding_sources': 0, 'ngo_profiles.documents': 0,
+    }
+    db.session.expire_all()
+    ngo = db.session.get(NGOProfile, ngo.id)
+    assert ngo.primary_sectors == 'Health, Water' and ngo.sdg_focus is None
+    assert ngo.get_geographic_focus() == ['Pune'] and ngo.get_primary_sectors() == []
+
+
+def test_list_filters_match_stored_json(app, client):
+    user = make_user()
+    make_project(user, title='Library', status='published', sdg_goals=[4, 10], csr_focus_areas=['Education'])
+    make_project(user, title='Clinic', status='published', sdg_goals=[3], csr_focus_areas=['Health'])
+    db.session.commit()
+    headers = {'Authorization': f"Bearer {create_token({'user_id': user.id})}"}
+
+    def titles(**params):
+        response = client.get('/api/projects/projects', query_string=params, headers=headers)
+        return [p['title'] for p in response.get_json()['projects']]
+
+    assert titles(sdg_goal=10) == ['Library']
+    assert titles(focus_area='Health') == ['Clinic']
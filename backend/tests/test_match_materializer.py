@@ -0,0 +1,145 @@
+"""
+Tests for the rule-based AIMatch materializer and its incremental refresh.
+"""
+
+import json
+import random
+
+import pytest
+from flask import current_app
+
+from conftest import make_company, make_project, make_user
+from ai_models.match_materializer import MatchMaterializer, sdg_number, MATCH_SOURCE
+from models import db, AIMatch, FocusArea, Budget, Project
+
+
+@pytest.fixture
+def materializer(app):
+    materializer = MatchMaterializer(top_k=3)
+    app.config['AI_MATCH_TOP_K'] = 3
+    app.config['AI_MATCH_REFRESH_DELAY_SECONDS'] = 0
+    materializer.init_app(app)
+    yield materializer
+    materializer.wait(5)
+
+
+def seed_world(projects=6, companies=3, seed=1):
+    rng = random.Random(seed)
+    user = make_user()
+    company_list = []
+    for i in range(companies):
+        company = make_company(user, name=f'Company {i}')
+        db.session.add(FocusArea(company_id=company.id, priority_sdgs=json.dumps(['Quality Education', 'Climate Action']), themes='Education, Climate'))
+        db.session.add(Budget(company_id=company.id, amount=rng.choice([40000, 80000, 200000])))
+        company_list.append(company)
+    project_list = []
+    for i in range(projects):
+        project_list.append(make_project(
+            user, f'Project {i}',
+            sdg_goals=json.dumps(rng.sample(range(1, 18), 3)),
+            csr_focus_areas=json.dumps([rng.choice(['Education', 'Health', 'Climate'])]),
+            funding_required=rng.choice([30000, 60000, 150000]),
+            ngo_rating=rng.randint(1, 5),
+        ))
+    db.session.commit()
+    # Let the refresh queued by seeding finish before the test refreshes on its own
+    current_app.extensions['match_materializer'].wait(5)
+    return company_list, project_list
+
+
+def snapshot():
+    rows = AIMatch.query.filter_by(source=MATCH_SOURCE).all()
+    return sorted((r.company_id, r.project_id, r.alignment_score) for r in rows)
+
+
+def test_sdg_names_normalize_to_numbers():
+    assert sdg_number('Affordable and Clean Energy') == 7
+    assert sdg_number('Life Below Water') == 14
+    assert sdg_number('Clean Water') == 6
+    assert sdg_number('Life on Land') == 15
+    assert sdg_number('13') == 13
+    assert sdg_number('SDG 4') == 4
+
+
+def test_refresh_all_keeps_top_k_per_company(app, materializer):
+    companies, _ = seed_world()
+    result = materializer.refresh_all()
+    assert result['rows_written'] == 3 * len(companies)
+    for company in companies:
+        scores = [m.alignment_score for m in AIMatch.query.filter_by(company_id=company.id).order_by(AIMatch.alignment_score.desc())]
+        assert len(scores) == 3
+        assert scores == sorted(scores, reverse=True)
+
+
+def test_incremental_refresh_matches_full_recompute(app, materializer):
+    companies, projects = seed_world(projects=10)
+    materializer.refresh_all()
+    rng = random.Random(5)
+
+    for _ in range(8):
+        project = rng.choice(projects)
+        project.sdg_goals = json.dumps(rng.sample(range(1, 18), 3))
+        project.ngo_rating = rng.randint(1, 5)
+        project.status = rng.choice(['published', 'published', 'completed'])
+        db.session.commit()
+        assert materializer.wait(5)
+        incremental = snapshot()
+        materializer.refresh_all()
+        assert incremental == snapshot()
+
+
+def test_company_profile_change_refreshes_only_that_company(app, materializer):
+    companies, _ = seed_world()
+    materializer.refresh_all()
+    other_rows = {m.id for m in AIMatch.query.filter_by(company_id=companies[1].id)}
+
+    focus = FocusArea.query.filter_by(company_id=companies[0].id).first()
+    focus.priority_sdgs = json.dumps(['Zero Hunger'])
+    db.session.commit()
+    assert materializer.wait(5)
+    incremental = snapshot()
+
+    assert {m.id for m in AIMatch.query.filter_by(company_id=companies[1].id)} == other_rows
+    materializer.refresh_all()
+    assert incremental == snapshot()
+
+
+def test_new_project_enters_top_k(app, materializer):
+    companies, _ = seed_world()
+    materializer.refresh_all()
+    owner = Project.query.first().creator
+    star = make_project(
+        owner, 'Perfect Fit',
+        sdg_goals=json.dumps([4, 13]), csr_focus_areas=json.dumps(['Education']),
+        funding_required=10000, ngo_rating=5,
+    )
+    db.session.commit()
+    assert materializer.wait(5)
+    top = AIMatch.query.filter_by(company_id=companies[0].id).order_by(AIMatch.alignment_score.desc()).first()
+    assert top.project_id == star.id
+
+
+def test_commits_only_queue_refreshes_and_coalesce(app, materializer, monkeypatch):
+    _, projects = seed_world()
+    materializer.refresh_all()
+    calls = []
+    monkeypatch.setattr(materializer, 'refresh_projects', lambda ids, session=None: calls.append(set(ids)))
+    app.config['AI_MATCH_REFRESH_DELAY_SECONDS'] = 0.2
+
+    for project in projects[:3]:
+        project.ngo_rating = 5
+        db.session.commit()
+    assert calls == []
+    assert materializer.wait(5)
+    assert calls == [{p.id for p in projects[:3]}]
+
+
+def test_ai_matches_endpoint_serves_materialized_rows(client, materializer):
+    companies, _ = seed_world()
+    materializer.refresh_all()
+    response = client.get(f'/api/projects/ai-matches?company_id={companies[0].id}&source=rules')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert len(body) == 3
+    assert [m['alignmentScore'] for m in body] == sorted((m['alignmentScore'] for m in body), reverse=True)
+    assert body[0]['title'].startswith('Project')
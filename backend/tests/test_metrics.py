@@ -0,0 +1,87 @@
+"""
+Tests for per-request metrics: Server-Timing header, SQL counting,
+outbound call timing and the Prometheus /metrics endpoint.
+"""
+
+import pytest
+
+from conftest import make_project, make_user
+from models import db
+from perf import request_metrics, track_external
+from perf.metrics import Histogram, MetricsRegistry
+
+
+@pytest.fixture(autouse=True)
+def reset_registry():
+    request_metrics.registry.reset()
+    yield
+    request_metrics.registry.reset()
+
+
+def _timing_entries(response):
+    header = response.headers['Server-Timing']
+    return {part.split(';')[0].strip(): part for part in header.split(',')}
+
+
+def test_server_timing_header_counts_queries(app, client):
+    user = make_user()
+    for i in range(3):
+        make_project(user, title=f'Project {i}')
+    db.session.commit()
+
+    response = client.get('/api/projects/projects')
+    assert response.status_code == 200
+    entries = _timing_entries(response)
+    assert 'app' in entries and 'db' in entries
+    assert 'serialize' in entries
+    queries = int(entries['db'].split('desc="')[1].split(' ')[0])
+    assert queries >= 1
+
+
+def test_metrics_endpoint_exposes_aggregates(app, client):
+    client.get('/api/health')
+    client.get('/api/health')
+    client.get('/api/does-not-exist')
+
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'sustainalign_http_requests_total{method="GET",endpoint="health",status="200"} 2' in body
+    assert 'endpoint="<unmatched>",status="404"' in body
+    assert 'sustainalign_http_request_duration_seconds_bucket{method="GET",endpoint="health",le="+Inf"} 2' in body
+    assert 'sustainalign_http_request_duration_seconds_count{method="GET",endpoint="health"} 2' in body
+
+
+def test_track_external_charges_current_request(app):
+    @app.route('/api/test-external')
+    def call_external():
+        with track_external('openrouter'):
+            pass
+        return {'ok': True}
+
+    response = app.test_client().get('/api/test-external')
+    assert 'openrouter' in _timing_entries(response)
+
+    with pytest.raises(RuntimeError):
+        with track_external('watson'):
+            raise RuntimeError('boom')
+
+    body = request_metrics.registry.render()
+    assert 'sustainalign_external_request_duration_seconds_count{service="openrouter"} 1' in body
+    assert 'sustainalign_external_request_errors_total{service="watson"} 1' in body
+
+
+def test_statements_outside_requests_are_background(app):
+    db.session.execute(db.text('SELECT 1'))
+    assert request_metrics.registry.db_statements.get('background', 0) >= 1
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value)
+    assert list(histogram.cumulative()) == [('0.1', 1), ('1.0', 3), ('+Inf', 4)]
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.observe_external('svc"x', 0.01)
+    assert 'service="svc\\"x"' in registry.render()
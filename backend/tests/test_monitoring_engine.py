@@ -0,0 +1,104 @@
+"""
+Tests for the incremental project monitoring engine.
+"""
+
+import json
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from agents.monitoring_agent import MonitoringAgent
+from ai_models.monitoring_engine import MonitoringEngine
+from models import ProjectApplication, ProjectImpactReport, ProjectMilestone, ProjectTimelineEntry, ProjectTrackingInfo, db
+from perf import query_budget
+from tests.conftest import make_company, make_project, make_user
+
+TODAY = date(2024, 7, 1)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    return MonitoringEngine(state_path=str(tmp_path / 'monitoring_state.json'))
+
+
+@pytest.fixture
+def portfolio(app):
+    user = make_user()
+    company = make_company(user)
+    healthy = make_project(user, title='Healthy')
+    late = make_project(user, title='Late')
+    draft = make_project(user, title='Draft', status='draft')
+    db.session.add_all([
+        ProjectTrackingInfo(project_id=healthy.id, progress_pct=60),
+        ProjectMilestone(project_id=healthy.id, title='Kickoff', target_date=date(2024, 3, 1),
+                         status='completed', progress_percentage=100),
+        ProjectMilestone(project_id=late.id, title='Survey', target_date=date(2024, 3, 1), progress_percentage=40),
+        ProjectMilestone(project_id=late.id, title='Build', target_date=date(2024, 5, 1)),
+        ProjectMilestone(project_id=late.id, title='Handover', target_date=date(2024, 9, 1)),
+        ProjectApplication(project_id=late.id, company_id=company.id, application_type='funding',
+                           amount_offered=20000, status='approved'),
+        ProjectImpactReport(project_id=late.id, report_period='quarterly', report_date=date(2024, 6, 30),
+                            impact_metrics=json.dumps({'amount_spent': 19000}), created_by=user.id),
+    ])
+    db.session.commit()
+    return {'company': company.id, 'healthy': healthy.id, 'late': late.id, 'draft': draft.id}
+
+
+def test_status_is_computed_from_tracked_data(engine, portfolio):
+    results = {r['project_id']: r for r in engine.evaluate(portfolio.values(), today=TODAY)}
+    assert portfolio['draft'] not in results
+
+    healthy = results[portfolio['healthy']]
+    assert healthy['status'] == 'On Track' and healthy['progress'] == 0.6 and not healthy['alerts']
+
+    late = results[portfolio['late']]
+    assert late['status'] == 'At Risk'
+    assert late['milestones'] == {'total': 3, 'completed': 0, 'overdue': 2, 'next_due': '2024-09-01'}
+    assert late['budget_spent'] == 0.95
+    assert {a['type'] for a in late['alerts']} == {'overdue_milestones', 'schedule_delay', 'budget_burn'}
+    assert late['company_ids'] == [portfolio['company']]
+
+
+def test_runs_are_incremental_and_alerts_are_not_repeated(engine, portfolio):
+    first = engine.run(today=TODAY)
+    assert first['projects_checked'] == 2 and first['alerts_written'] == 3
+    entries = ProjectTimelineEntry.query.filter_by(company_id=portfolio['company']).all()
+    assert len(entries) == 3 and all(e.text.startswith('Late: ') and e.quarter == 'Q3 2024' for e in entries)
+
+    with query_budget(8):
+        second = engine.run(today=TODAY)
+    assert second['projects_checked'] == 0 and second['alerts_written'] == 0
+
+    # Touching one project only re-checks that project
+    tracking = ProjectTrackingInfo.query.filter_by(project_id=portfolio['healthy']).one()
+    tracking.progress_pct = 10
+    tracking.updated_at = datetime.utcnow() + timedelta(seconds=1)
+    db.session.commit()
+    third = engine.run(today=TODAY)
+    assert third['projects_checked'] == 1 and third['alerts_written'] == 1
+
+    # The watermark survives a restart
+    restarted = MonitoringEngine(state_path=engine.state.path)
+    assert restarted.run(today=TODAY)['projects_checked'] == 0
+    full = restarted.run(today=TODAY, full=True)
+    assert full['projects_checked'] == 2 and full['alerts_written'] == 0
+
+
+def test_milestones_falling_due_are_rechecked(engine, portfolio):
+    engine.run(today=date(2024, 8, 30))
+    later = engine.run(today=date(2024, 9, 2))
+    assert later['projects_checked'] == 1
+
+
+def test_agent_accepts_plain_project_data():
+    result = MonitoringAgent().monitor_project(7, {
+        'name': 'Water Wells',
+        'start_date': date.today() - timedelta(days=100),
+        'end_date': date.today() + timedelta(days=100),
+        'progress_pct': 50,
+        'budget': 1000,
+        'spent': 1200,
+        'milestones': [{'target_date': date.today() + timedelta(days=10), 'progress_percentage': 50}],
+    })
+    assert result['status'] == 'At Risk'
+    assert [a['type'] for a in result['alerts']] == ['budget_overrun']
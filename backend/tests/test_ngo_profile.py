@@ -0,0 +1,78 @@
+"""
+Tests for the aggregate NGO profile endpoint (/ngos/<id>?include=...).
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+from models import (db, NGOCertificate, NGODocument, NGOImpactEvent, NGOProfile, NGOTestimonial,
+                    NGOTransparencyReport)
+from perf import query_budget
+
+SUB_RESOURCES = {
+    'timeline': ('impactTimeline', 'impact-timeline'),
+    'documents': ('documents', 'documents'),
+    'transparency': ('transparency', 'transparency'),
+    'certificates': ('certificates', 'certificates'),
+    'testimonials': ('testimonials', 'testimonials'),
+}
+
+
+@pytest.fixture
+def ngo(app):
+    ngo = NGOProfile(name='Learn India', country='India', state='Maharashtra', rating=4)
+    db.session.add(ngo)
+    db.session.flush()
+    for i in range(3):
+        db.session.add(NGOImpactEvent(ngo_id=ngo.id, title=f'Event {i}', date=date(2024, 3 - i, 1)))
+        db.session.add(NGODocument(ngo_id=ngo.id, name=f'Doc {i}', uploaded_at=datetime(2024, 1, i + 1)))
+        db.session.add(NGOTransparencyReport(ngo_id=ngo.id, period=f'Q{i + 1}', created_at=datetime(2024, i + 1, 1)))
+        db.session.add(NGOTestimonial(ngo_id=ngo.id, content=f'Quote {i}', created_at=datetime(2024, 1, i + 1)))
+    db.session.add(NGOImpactEvent(ngo_id=ngo.id, title='Undated'))
+    db.session.add(NGOCertificate(ngo_id=ngo.id, title='Open ended'))
+    db.session.add(NGOCertificate(ngo_id=ngo.id, title='FCRA', valid_until=date(2026, 1, 1)))
+    db.session.add(NGOCertificate(ngo_id=ngo.id, title='80G', valid_until=date(2025, 1, 1)))
+    db.session.commit()
+    return ngo
+
+
+def test_without_include_returns_detail_only(ngo, client):
+    body = client.get(f'/api/projects/ngos/{ngo.id}').get_json()
+    assert body == ngo.to_detail()
+
+
+def test_includes_match_sub_resource_endpoints(ngo, client):
+    body = client.get(f'/api/projects/ngos/{ngo.id}?include=all').get_json()
+    for key, path in SUB_RESOURCES.values():
+        assert body[key] == client.get(f'/api/projects/ngos/{ngo.id}/{path}').get_json(), key
+    assert body['name'] == 'Learn India'
+
+
+def test_one_query_per_included_collection(ngo, client):
+    client.get(f'/api/projects/ngos/{ngo.id}')
+    with query_budget(1 + len(SUB_RESOURCES), max_repeats=1):
+        client.get(f'/api/projects/ngos/{ngo.id}?include=all')
+    with query_budget(2):
+        body = client.get(f'/api/projects/ngos/{ngo.id}?include=documents').get_json()
+    assert 'documents' in body and 'testimonials' not in body
+
+
+def test_etag_and_conditional_get(ngo, client):
+    url = f'/api/projects/ngos/{ngo.id}?include=certificates,testimonials'
+    first = client.get(url)
+    etag = first.headers['ETag']
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+    db.session.add(NGOTestimonial(ngo_id=ngo.id, content='New quote'))
+    db.session.commit()
+    changed = client.get(url, headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    # Different includes are different representations
+    assert client.get(f'/api/projects/ngos/{ngo.id}?include=documents').headers['ETag'] != etag
+
+
+def test_unknown_include_and_missing_ngo(ngo, client):
+    assert client.get(f'/api/projects/ngos/{ngo.id}?include=bogus').status_code == 400
+    assert client.get('/api/projects/ngos/99999?include=all').status_code == 404
@@ -0,0 +1,112 @@
+"""
+Tests for the NGO summary projection and the marketplace listing it serves.
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from models import db, NGOCertificate, NGOProfile, NGORiskAssessment, NGOSummary
+from models.ngo_summary import ngo_summary_projection
+from perf import query_budget
+
+
+def make_ngo(name, state='Maharashtra', sectors=('Education',), sdgs=(4,), rating=4, badge='Verified'):
+    ngo = NGOProfile(name=name, country='India', state=state, rating=rating, verification_badge=badge,
+                     primary_sectors=json.dumps(list(sectors)), sdg_focus=json.dumps(list(sdgs)))
+    db.session.add(ngo)
+    db.session.flush()
+    return ngo
+
+
+@pytest.fixture
+def ngos(app):
+    rows = [
+        make_ngo('Learn India', sectors=['Education'], sdgs=[4]),
+        make_ngo('Clean Water Trust', state='Rajasthan', sectors=['Water', 'Health'], sdgs=[6, 3], rating=3),
+        make_ngo('Green Rajasthan', state='Rajasthan', sectors=['Environment'], sdgs=[13, 15], badge='Pending'),
+        make_ngo('Health First', state='Karnataka', sectors=['Health'], sdgs=[3], rating=5),
+        make_ngo('Skill Up', sectors=['Education', 'Livelihood'], sdgs=['SDG 8'], rating=2),
+    ]
+    db.session.commit()
+    return rows
+
+
+def ids(response):
+    return [card['id'] for card in response.get_json()]
+
+
+def test_listing_matches_to_summary(ngos, client):
+    response = client.get('/api/projects/ngos')
+    cards = response.get_json()
+    assert [c['id'] for c in cards] == sorted((n.id for n in ngos), reverse=True)
+    by_id = {c['id']: c for c in cards}
+    for ngo in ngos:
+        card = dict(by_id[ngo.id])
+        assert card.pop('riskLevel') is None
+        assert card.pop('certificateCount') == 0
+        assert card == ngo.to_summary()
+
+
+def test_listing_is_a_single_query(ngos, client):
+    with query_budget(1):
+        client.get('/api/projects/ngos?state=rajasthan&min_rating=3')
+
+
+def test_filters(ngos, client):
+    learn, water, green, health, skill = ngos
+    assert ids(client.get('/api/projects/ngos?sector=health')) == [health.id, water.id]
+    assert ids(client.get('/api/projects/ngos?sdg=3')) == [health.id, water.id]
+    assert ids(client.get('/api/projects/ngos?sdg=8')) == [skill.id]
+    assert ids(client.get('/api/projects/ngos?state=Rajasthan')) == [green.id, water.id]
+    assert ids(client.get('/api/projects/ngos?verification=Pending')) == [green.id]
+    assert ids(client.get('/api/projects/ngos?min_rating=4')) == [health.id, green.id, learn.id]
+    # A sector filter only matches whole entries
+    assert ids(client.get('/api/projects/ngos?sector=educ')) == []
+
+
+def test_keyset_pagination(ngos, client):
+    first = client.get('/api/projects/ngos?limit=2')
+    second = client.get(f"/api/projects/ngos?limit=2&cursor={first.headers['X-Next-Cursor']}")
+    third = client.get(f"/api/projects/ngos?limit=2&cursor={second.headers['X-Next-Cursor']}")
+    assert ids(first) + ids(second) + ids(third) == sorted((n.id for n in ngos), reverse=True)
+    assert 'X-Next-Cursor' not in third.headers
+    assert client.get('/api/projects/ngos?cursor=bogus').status_code == 400
+
+
+def test_projection_follows_ngo_risk_and_certificate_changes(ngos, client):
+    learn = ngos[0]
+    learn.rating = 1
+    learn.state = 'Delhi'
+    db.session.add(NGORiskAssessment(ngo_id=learn.id, risk_level='High', updated_at=datetime(2024, 1, 1)))
+    db.session.add(NGORiskAssessment(ngo_id=learn.id, risk_level='Low', updated_at=datetime(2024, 6, 1)))
+    db.session.add(NGOCertificate(ngo_id=learn.id, title='FCRA'))
+    db.session.commit()
+
+    card = next(c for c in client.get('/api/projects/ngos?state=delhi').get_json())
+    assert card['rating'] == 1
+    assert card['riskLevel'] == 'Low'
+    assert card['certificateCount'] == 1
+    assert ids(client.get('/api/projects/ngos?risk=Low')) == [learn.id]
+
+    NGORiskAssessment.query.filter_by(ngo_id=learn.id).delete()
+    db.session.delete(learn)
+    db.session.commit()
+    assert db.session.get(NGOSummary, learn.id) is None
+    assert learn.id not in ids(client.get('/api/projects/ngos'))
+
+
+def test_rollback_discards_projection_changes(ngos):
+    ngos[0].rating = 1
+    db.session.flush()
+    db.session.rollback()
+    payload = json.loads(db.session.get(NGOSummary, ngos[0].id).payload)
+    assert payload['rating'] == 4
+
+
+def test_ensure_fresh_backfills_bulk_loaded_rows(ngos):
+    db.session.execute(NGOSummary.__table__.delete())
+    db.session.commit()
+    ngo_summary_projection.ensure_fresh()
+    assert db.session.query(NGOSummary).count() == len(ngos)
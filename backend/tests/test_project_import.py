@@ -0,0 +1,116 @@
+"""
+Tests for the bulk CSV/JSONL project import.
+"""
+
+import io
+import json
+
+from ai_models import project_import
+from ai_models.project_import import validate_record
+from models import Project, ProjectImportJob, db
+from perf import query_budget
+from tests.conftest import make_user
+from utils import create_token
+
+CSV_HEADER = 'title,short_description,ngo_name,location_country,total_project_cost,funding_required,start_date,end_date,sdg_goals,csr_focus_areas\n'
+
+
+def csv_row(title, sdgs='4;SDG 10', start='2024-01-01', end='2024-12-31', cost='100000', funding='50000'):
+    return f'{title},{title} description,Green Earth,India,{cost},{funding},{start},{end},{sdgs},Education;Gender\n'
+
+
+def auth(user):
+    return {'Authorization': f"Bearer {create_token({'user_id': user.id})}"}
+
+
+def test_rows_are_validated_with_every_problem_reported():
+    fields, errors = validate_record({
+        'title': 'Wells', 'short_description': 'Wells', 'ngo_name': 'Water Org', 'location_country': 'India',
+        'total_project_cost': '1,000', 'funding_required': 2000, 'start_date': '2024-05-01',
+        'end_date': '2024-01-01', 'sdg_goals': '6;18', 'status': 'funded', 'ngo_rating': 'x',
+    })
+    assert fields is None
+    assert errors == [
+        'funding_required cannot exceed total_project_cost',
+        'end_date is before start_date',
+        'Invalid SDG goals: 18',
+        'status must be one of: draft, published',
+        'ngo_rating must be a whole number',
+    ]
+
+    fields, errors = validate_record({
+        'title': ' Wells ', 'short_description': 'Wells', 'ngo_name': 'Water Org', 'location_country': 'India',
+        'total_project_cost': 1000, 'funding_required': 500, 'start_date': '2024-01-01', 'end_date': '2024-12-31',
+        'sdg_goals': [6, 'SDG 3'], 'kpis': {'wells': 10}, 'csr_eligibility': 'no',
+    })
+    assert errors == []
+    assert fields['title'] == 'Wells' and fields['sdg_goals'] == '[6, 3]' and fields['duration_months'] == 13
+    assert fields['kpis'] == '{"wells": 10}' and fields['csr_eligibility'] is False
+
+
+def test_csv_upload_imports_valid_rows_in_batches(app, client):
+    ngo = make_user('ngo@example.com')
+    ngo.role = 'ngo'
+    corporate = make_user('corp@example.com')
+    db.session.commit()
+    body = CSV_HEADER + ''.join([
+        csv_row('Library'),
+        csv_row('Bad Goals', sdgs='4;19'),
+        csv_row('Clinic'),
+        'Too,many,values,India,1,1,2024-01-01,2024-02-01,4,Health,extra\n',
+        csv_row('Schools'),
+        csv_row('Backwards', start='2024-06-01', end='2024-01-01'),
+    ])
+
+    def upload(user, data=body, **params):
+        return client.post('/api/projects/projects/import', query_string=params, headers=auth(user),
+                           data={'file': (io.BytesIO(data.encode()), 'partner.csv')},
+                           content_type='multipart/form-data')
+
+    assert client.post('/api/projects/projects/import').status_code == 401
+    assert upload(corporate).status_code == 403
+
+    with query_budget(20):
+        response = upload(ngo, batch_size=2)
+    assert response.status_code == 200
+    job = response.get_json()
+    assert (job['status'], job['totalRows'], job['importedRows'], job['failedRows']) == ('completed', 6, 3, 3)
+    assert [(e['row'], e['errors']) for e in job['errors']] == [
+        (3, ['Invalid SDG goals: 19']),
+        (5, ['Row has more values than the header has columns']),
+        (7, ['end_date is before start_date']),
+    ]
+    library = Project.query.filter_by(title='Library').one()
+    assert library.created_by == ngo.id and library.get_sdg_goals() == [4, 10] and library.status == 'draft'
+    assert library.duration_months == 13
+
+    assert client.get(f"/api/projects/projects/import/{job['id']}", headers=auth(ngo)).get_json()['importedRows'] == 3
+    assert client.get(f"/api/projects/projects/import/{job['id']}", headers=auth(corporate)).status_code == 404
+
+    missing = upload(ngo, data='title,ngo_name\nA,B\n')
+    assert missing.status_code == 400 and 'missing columns' in missing.get_json()['error']
+
+
+def test_large_jsonl_upload_runs_in_the_background(app, client, tmp_path):
+    admin = make_user('admin@example.com')
+    admin.role = 'admin'
+    db.session.commit()
+    app.config.update(PROJECT_IMPORT_DIR=str(tmp_path), PROJECT_IMPORT_BACKGROUND_BYTES=100)
+    lines = [json.dumps({
+        'title': f'Project {i}', 'short_description': 'Solar lamps', 'ngo_name': 'Light Trust',
+        'location_country': 'India', 'total_project_cost': 5000, 'funding_required': 5000,
+        'start_date': '2024-01-01', 'end_date': '2024-06-30', 'sdg_goals': [7], 'status': 'published',
+    }) for i in range(25)] + ['{not json']
+
+    response = client.post('/api/projects/projects/import?format=jsonl', headers=auth(admin),
+                           data='\n'.join(lines), content_type='application/x-ndjson')
+    assert response.status_code == 202 and response.get_json()['status'] == 'queued'
+    # The single import worker runs jobs in order, so a no-op queued after it waits for the import
+    project_import._executor.submit(lambda: None).result(timeout=10)
+
+    db.session.expire_all()
+    job = db.session.get(ProjectImportJob, response.get_json()['id'])
+    assert (job.status, job.imported_rows, job.failed_rows) == ('completed', 25, 1)
+    assert job.errors[0]['row'] == 26 and job.errors[0]['errors'][0].startswith('Invalid JSON')
+    assert Project.query.filter_by(status='published').count() == 25
+    assert list(tmp_path.iterdir()) == []
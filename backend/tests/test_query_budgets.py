@@ -0,0 +1,104 @@
+"""
+Per-endpoint SQL query budgets and tests for the N+1 detector.
+
+Budgets are seeded with several rows per table so a serializer that lazy-loads a
+relationship per row blows through them. When an endpoint legitimately needs
+more statements, raise its budget here in the same change.
+"""
+
+import pytest
+
+from conftest import make_company, make_project, make_user
+from models import db, NGOProfile, NGORiskAssessment, ProjectTrackingInfo, ReportArtifact, ReportJob
+from models.comparison import Comparison, ComparisonItem
+from perf import query_budget
+from perf.query_tracker import QueryCollector, statement_shape
+
+ROWS = 6
+
+# path -> max statements per request, independent of the number of rows returned
+ENDPOINT_BUDGETS = {
+    '/api/projects/projects': 4,
+    '/api/projects/ngos': 1,
+    '/api/projects/ngo-risk': 1,
+    '/api/projects/tracker/projects': 1,
+    '/api/projects/reports': 2,
+    '/api/projects/ai-matches': 1,
+    '/api/projects/audit/events': 1,
+    '/api/projects/rationales': 2,
+    '/api/comparisons/': 5,
+}
+
+
+@pytest.fixture
+def seeded(app):
+    user = make_user()
+    company = make_company(user)
+    for i in range(ROWS):
+        project = make_project(user, title=f'Project {i}')
+        db.session.add(ProjectTrackingInfo(project_id=project.id))
+        ngo = NGOProfile(name=f'NGO {i}', country='India')
+        db.session.add(ngo)
+        db.session.flush()
+        db.session.add(NGORiskAssessment(ngo_id=ngo.id))
+        job = ReportJob(company_id=company.id, period='2024', report_type='ESG Progress')
+        db.session.add(job)
+        db.session.flush()
+        db.session.add(ReportArtifact(job_id=job.id, kind='pdf'))
+        comparison = Comparison(user_id=user.id, name=f'Comparison {i}')
+        db.session.add(comparison)
+        db.session.flush()
+        db.session.add(ComparisonItem(comparison_id=comparison.id, project_id=project.id))
+    db.session.commit()
+    return user
+
+
+@pytest.mark.parametrize('path,budget', sorted(ENDPOINT_BUDGETS.items()))
+def test_endpoint_query_budget(seeded, app, client, path, budget):
+    # Budgets measure the handler, not a response cache hit
+    app.config['RESPONSE_CACHE_ENABLED'] = False
+    # Budgets are for steady state; the first request may run one-off schema checks
+    client.get(path)
+    with query_budget(budget, max_repeats=2) as collector:
+        response = client.get(path)
+    assert response.status_code == 200
+    assert 'X-Cache' not in response.headers and collector.report().count > 0
+    assert 'X-Query-Repeats' not in response.headers
+
+
+def test_detector_flags_lazy_loads_with_serializer(seeded, app, caplog):
+    @app.route('/api/test-n-plus-one')
+    def n_plus_one():
+        infos = ProjectTrackingInfo.query.all()
+        return {'cards': [info.to_card() for info in infos]}
+
+    response = app.test_client().get('/api/test-n-plus-one')
+    assert response.headers['X-Query-Count'] == str(ROWS + 1)
+    assert response.headers['X-Query-Repeats'] == '1'
+    assert 'ProjectTrackingInfo.to_card' in caplog.text
+
+
+def test_query_budget_reports_repeated_shapes(seeded):
+    with pytest.raises(AssertionError) as excinfo:
+        with query_budget(3):
+            for info in ProjectTrackingInfo.query.all():
+                info.to_card()
+    message = str(excinfo.value)
+    assert f'{ROWS + 1} > 3' in message
+    assert f'{ROWS}x' in message
+    assert 'models/tracker.py' in message
+
+
+def test_collectors_nest(app):
+    with QueryCollector() as outer:
+        db.session.execute(db.text('SELECT 1'))
+        with QueryCollector() as inner:
+            db.session.execute(db.text('SELECT 2'))
+    assert outer.report().count == 2
+    assert inner.report().count == 1
+
+
+def test_statement_shape_ignores_parameters():
+    assert statement_shape('SELECT * FROM t WHERE id IN (?, ?, ?)') == statement_shape('SELECT *\n FROM t WHERE id IN (?, ?)')
+    assert statement_shape("SELECT * FROM t WHERE name = 'a' LIMIT 10") == 'SELECT * FROM t WHERE name = ? LIMIT ?'
+    assert statement_shape('SELECT anon_1.id FROM t1 AS anon_1') == 'SELECT anon_1.id FROM t1 AS anon_1'
@@ -0,0 +1,157 @@
+"""
+Tests for streamed rationale generation against a local stand-in for the
+OpenRouter chat completions endpoint.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from conftest import make_company, make_project, make_user
+from ai_models.ai_model import ai_model
+from ai_models.stream_parser import IncrementalRationaleParser
+from models import db, DecisionRationale
+
+RATIONALE = {
+    "reasoningSteps": ["Compared budgets", "Checked SDG overlap", "Weighed \"NGO\" track record"],
+    "pros": ["Strong alignment", "Within budget"],
+    "options": [
+        {"key": "1", "label": "Solar Schools", "data": {"projectId": 1, "score": 0.9, "strengths": ["a"], "concerns": []}},
+        {"key": "2", "label": "Clean Water", "data": {"projectId": 2, "score": 0.7, "strengths": [], "concerns": ["b"]}},
+    ],
+    "selectedProjectId": 1,
+    "confidenceScore": 0.82,
+    "title": "Streamed analysis",
+    "context": {"companyProfile": "Acme"},
+    "criteria": {"impact": 0.9, "cost": 0.8},
+    "selectedOption": "1",
+    "cons": ["Tight timeline"],
+    "scoreBreakdown": {"1": {"impact": 0.9, "total": 0.85}},
+}
+
+
+class FakeOpenRouter(BaseHTTPRequestHandler):
+    """Replays a completion as SSE chunks of a few characters each"""
+    content = '```json\n' + json.dumps(RATIONALE, indent=2) + '\n```'
+    status = 200
+    delay = 0.0
+    requests_seen = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        type(self).requests_seen.append(body)
+        if self.status != 200:
+            self.send_response(self.status)
+            self.end_headers()
+            self.wfile.write(b'{"error": {"message": "slow down"}}')
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        self.wfile.write(b': OPENROUTER PROCESSING\n\n')
+        for i in range(0, len(self.content), 7):
+            delta = {"choices": [{"delta": {"content": self.content[i:i + 7]}}]}
+            self.wfile.write(f"data: {json.dumps(delta)}\n\n".encode())
+            self.wfile.flush()
+            if self.delay:
+                time.sleep(self.delay)
+        self.wfile.write(b'data: [DONE]\n\n')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_openrouter(monkeypatch):
+    FakeOpenRouter.status = 200
+    FakeOpenRouter.delay = 0.0
+    FakeOpenRouter.requests_seen = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeOpenRouter)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(ai_model, 'base_url', f"http://127.0.0.1:{server.server_port}/api/v1/chat/completions")
+    yield FakeOpenRouter
+    server.shutdown()
+    server.server_close()
+
+
+def test_parser_emits_items_regardless_of_chunking():
+    text = 'Sure! ```json\n' + json.dumps(RATIONALE) + '\n```'
+    rng = random.Random(7)
+    for _ in range(20):
+        parser = IncrementalRationaleParser()
+        events = []
+        i = 0
+        while i < len(text):
+            step = rng.randint(1, 9)
+            events.extend(parser.feed(text[i:i + step]))
+            i += step
+        assert [item for key, item in events if key == 'reasoningSteps'] == RATIONALE['reasoningSteps']
+        assert [item for key, item in events if key == 'pros'] == RATIONALE['pros']
+        assert [item for key, item in events if key == 'options'] == RATIONALE['options']
+        assert parser.complete
+        assert json.loads(parser.document()) == RATIONALE
+
+
+def test_parser_ignores_unwatched_and_nested_arrays():
+    parser = IncrementalRationaleParser(watched_keys=('pros',))
+    events = parser.feed('{"cons": ["x"], "meta": {"pros": ["nested"]}, "pros": [1, true, null, "y"]}')
+    assert events == [('pros', 1), ('pros', True), ('pros', None), ('pros', 'y')]
+
+
+def test_stream_yields_items_before_completion(fake_openrouter):
+    fake_openrouter.delay = 0.002
+    company = {'company_name': 'Acme', 'industry': 'Technology'}
+    projects = [{'id': 1, 'title': 'Solar Schools'}, {'id': 2, 'title': 'Clean Water'}]
+
+    events = list(ai_model.stream_project_matching_rationale(company, projects))
+
+    assert fake_openrouter.requests_seen[0]['stream'] is True
+    names = [name for name, _ in events]
+    assert names[0] == 'reasoningSteps'
+    assert names[-1] == 'complete'
+    assert names.count('options') == 2
+    rationale = events[-1][1]
+    assert rationale['selectedProjectId'] == 1
+    assert 'error' not in rationale
+
+
+def test_stream_falls_back_to_mock_on_http_error(fake_openrouter):
+    fake_openrouter.status = 429
+    events = list(ai_model.stream_project_matching_rationale({'company_name': 'Acme'}, [{'id': 3, 'title': 'P'}]))
+    assert events[0] == ('error', {'reason': 'Rate Limit Exceeded', 'details': 'Too many requests. Please wait before trying again.'})
+    assert events[-1][0] == 'complete'
+    assert events[-1][1]['selectedProjectId'] == 3
+    assert any(name == 'pros' for name, _ in events)
+
+
+def test_stream_endpoint_relays_sse_and_saves_rationale(client, fake_openrouter):
+    user = make_user()
+    company = make_company(user)
+    make_project(user, 'Solar Schools')
+    db.session.commit()
+
+    response = client.post('/api/ai-matching/generate-rationale/stream', json={'company_id': company.id})
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+
+    frames = [frame for frame in response.get_data(as_text=True).split('\n\n') if frame]
+    parsed = []
+    for frame in frames:
+        event_line, data_line = frame.split('\n')
+        parsed.append((event_line[len('event: '):], json.loads(data_line[len('data: '):])))
+
+    assert parsed[0][0] == 'start'
+    assert [data for name, data in parsed if name == 'pros'] == RATIONALE['pros']
+    assert parsed[-1][0] == 'complete'
+    rationale_id = parsed[-1][1]['rationale_id']
+    assert DecisionRationale.query.get(rationale_id).title == 'Streamed analysis'
+
+
+def test_stream_endpoint_requires_company(client):
+    response = client.post('/api/ai-matching/generate-rationale/stream', json={})
+    assert response.status_code == 400
@@ -0,0 +1,83 @@
+"""
+Tests for the lightweight read records used by list endpoints.
+"""
+
+from datetime import date
+
+from models import (db, ApprovalRequest, ApprovalStep, AuditEvent, DecisionRationale, NGOProfile, NGORiskAssessment,
+                    Project, ProjectApplication, ProjectMilestone, RationaleNote)
+from models.records import (ApprovalRecord, AuditEventRecord, ProjectRecord, RationaleRecord, RiskSummaryRecord,
+                            fetch_records, select_records)
+from perf import query_budget
+from tests.conftest import make_company, make_project, make_user
+
+
+def seed():
+    user = make_user()
+    company = make_company(user)
+    projects = [make_project(user, title=f'Project {i}', sdg_goals=[i + 1], kpis={'trees': i}) for i in range(3)]
+    for project in projects[:2]:
+        db.session.add(ProjectMilestone(project_id=project.id, title='Kickoff', target_date=date(2024, 3, 1)))
+        db.session.add(ProjectApplication(project_id=project.id, company_id=company.id, application_type='funding'))
+    rationale = DecisionRationale(project_id=projects[0].id, company_id=company.id, title='Pick solar',
+                                  criteria={'impact': 0.6}, pros=['cheap'])
+    db.session.add(rationale)
+    db.session.flush()
+    db.session.add_all([RationaleNote(rationale_id=rationale.id, author='a', content=f'note {i}') for i in range(2)])
+    approval = ApprovalRequest(project_id=projects[1].id, company_id=company.id, title='Fund project 1',
+                               compliance_notes=['EPA'])
+    db.session.add(approval)
+    db.session.add(ApprovalRequest(title='Unlinked'))
+    db.session.flush()
+    db.session.add_all([ApprovalStep(request_id=approval.id, name=f'Step {i}', order_index=2 - i) for i in range(2)])
+    ngo = NGOProfile(name='Green Earth', country='India', primary_sectors=['Education', 'Health'])
+    db.session.add(ngo)
+    db.session.flush()
+    db.session.add(NGORiskAssessment(ngo_id=ngo.id, risk_level='Medium', compliance_score_pct=70))
+    db.session.add(AuditEvent(entity_type='project', entity_id=projects[0].id, action='created', meta={'by': 'x'}))
+    db.session.commit()
+    db.session.expunge_all()
+
+
+def test_records_serialize_like_entities(app):
+    seed()
+    cases = [
+        (ProjectRecord, Project.query.order_by(Project.id), 'to_dict'),
+        (RationaleRecord, DecisionRationale.query.order_by(DecisionRationale.id), 'to_dict'),
+        (ApprovalRecord, ApprovalRequest.query.order_by(ApprovalRequest.id), 'to_dict'),
+        (AuditEventRecord, AuditEvent.query.order_by(AuditEvent.id), 'to_dict'),
+        (RiskSummaryRecord, NGORiskAssessment.query.order_by(NGORiskAssessment.id), 'to_summary'),
+    ]
+    for record_cls, query, serializer in cases:
+        expected = [getattr(entity, serializer)() for entity in query]
+        db.session.expunge_all()
+        records = fetch_records(record_cls, select_records(record_cls).order_by(record_cls.__model__.id))
+        assert [getattr(record, serializer)() for record in records] == expected, record_cls.__name__
+        # Nothing is added to the session and records carry no per-instance dict
+        assert len(db.session.identity_map) == 0
+        assert not hasattr(records[0], '__dict__')
+
+
+def test_list_endpoints_load_related_records_per_page(app, client):
+    seed()
+    client.get('/api/projects/approvals')  # first request runs the approval schema checks
+    with query_budget(4):
+        approvals = client.get('/api/projects/approvals').get_json()
+    linked = next(a for a in approvals if a['title'] == 'Fund project 1')
+    assert [s['name'] for s in linked['steps']] == ['Step 1', 'Step 0']
+    assert linked['project']['title'] == 'Project 1' and linked['company']['name'] == 'Acme Corp'
+    assert next(a for a in approvals if a['title'] == 'Unlinked')['project'] is None
+
+    with query_budget(1):
+        ngos = client.get('/api/projects/ngo-risk?q=green').get_json()['ngos']
+    assert ngos == [{'id': ngos[0]['id'], 'name': 'Green Earth', 'sector': 'Education, Health', 'risk': 'Medium',
+                     'highlightMetric': {'label': 'Compliance Score', 'valuePct': 70}}]
+
+    with query_budget(2):
+        rationales = client.get('/api/projects/rationales').get_json()
+    assert [n['content'] for n in rationales[0]['notes']] == ['note 0', 'note 1']
+
+    projects = client.get('/api/projects/projects?sdg_goal=2').get_json()['projects']
+    assert [(p['title'], p['applications_count'], len(p['milestones'])) for p in projects] == [('Project 1', 1, 1)]
+    events = client.get('/api/projects/audit/events?entity_type=project').get_json()
+    assert events[0]['metadata'] == {'by': 'x'}
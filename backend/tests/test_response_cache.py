@@ -0,0 +1,168 @@
+"""
+Tests for the tag-invalidated response cache, in-process and against a local Redis stand-in.
+"""
+
+import socketserver
+import threading
+import time
+
+import pytest
+from sqlalchemy import insert
+
+from caching import RedisBackend, response_cache
+from models import ImpactGoal, db
+from perf import query_budget
+
+
+def goal(company_id, metric='co2_reduced_tons', target=100.0):
+    return ImpactGoal(metric_name=metric, period_month='2024-01', target_value=target, company_id=company_id)
+
+
+def cache_status(client, path):
+    response = client.get(path)
+    assert response.status_code == 200
+    return response.headers['X-Cache']
+
+
+def test_entries_are_scoped_by_tenant_and_invalidated_on_commit(app, client):
+    db.session.add_all([goal(1), goal(2)])
+    db.session.commit()
+
+    assert cache_status(client, '/api/projects/impact/goals?company_id=1') == 'MISS'
+    with query_budget(0):
+        hit = client.get('/api/projects/impact/goals?company_id=1&unused=')
+    assert hit.headers['X-Cache'] == 'HIT' and [g['target'] for g in hit.get_json()['goals']] == [100.0]
+    assert cache_status(client, '/api/projects/impact/goals') == 'MISS'
+    assert cache_status(client, '/api/projects/impact/trends?metric=a&company_id=1') == 'MISS'
+    assert cache_status(client, '/api/projects/impact/trends?company_id=1&metric=a') == 'HIT'
+
+    # Another tenant's rows leave company 1 cached but not the unscoped view
+    db.session.add(goal(2, target=50.0))
+    db.session.commit()
+    assert cache_status(client, '/api/projects/impact/goals?company_id=1') == 'HIT'
+    assert cache_status(client, '/api/projects/impact/goals') == 'MISS'
+
+    # Moving a row between tenants invalidates both
+    assert cache_status(client, '/api/projects/impact/goals?company_id=2') == 'MISS'
+    row = ImpactGoal.query.filter_by(company_id=1).one()
+    row.company_id = 2
+    db.session.commit()
+    assert cache_status(client, '/api/projects/impact/goals?company_id=1') == 'MISS'
+    assert len(client.get('/api/projects/impact/goals?company_id=2').get_json()['goals']) == 3
+
+    # Rolled back changes invalidate nothing; bulk statements drop the whole table
+    assert cache_status(client, '/api/projects/impact/goals?company_id=2') == 'HIT'
+    db.session.add(goal(2))
+    db.session.flush()
+    db.session.rollback()
+    assert cache_status(client, '/api/projects/impact/goals?company_id=2') == 'HIT'
+    db.session.execute(insert(ImpactGoal), [{'metric_name': 'water', 'period_month': '2024-02', 'target_value': 1}])
+    db.session.commit()
+    assert cache_status(client, '/api/projects/impact/goals?company_id=2') == 'MISS'
+
+    assert client.get('/api/projects/impact/goals?company_id=2',
+                      headers={'Cache-Control': 'no-cache'}).headers['X-Cache'] == 'MISS'
+    stats = response_cache.stats()
+    assert stats['backend'] == 'memory' and stats['hits'] >= 5
+    assert 'sustainalign_response_cache_lookups_total{endpoint="projects.impact_goals",result="hit"}' in \
+        client.get('/metrics').get_data(as_text=True)
+
+
+class RedisStandIn:
+    """Speaks enough RESP for the commands the Redis backend sends"""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+        self.commands = []
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                while True:
+                    header = self.rfile.readline()
+                    if not header:
+                        return
+                    args = []
+                    for _ in range(int(header[1:])):
+                        length = int(self.rfile.readline()[1:])
+                        args.append(self.rfile.read(length + 2)[:-2])
+                    self.wfile.write(server.execute([args[0].decode().upper()] + args[1:]))
+
+        self.tcp = socketserver.ThreadingTCPServer(('127.0.0.1', 0), Handler)
+        self.tcp.daemon_threads = True
+        self.thread = threading.Thread(target=self.tcp.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"redis://127.0.0.1:{self.tcp.server_address[1]}/0"
+
+    @staticmethod
+    def bulk(value):
+        return b'$-1\r\n' if value is None else b'$%d\r\n%s\r\n' % (len(value), value)
+
+    def _get(self, key):
+        if key in self.expiry and self.expiry[key] <= time.monotonic():
+            self.data.pop(key, None)
+            self.expiry.pop(key, None)
+        return self.data.get(key)
+
+    def execute(self, args):
+        command, args = args[0], args[1:]
+        with self._lock:
+            self.commands.append(command)
+            if command == 'GET':
+                return self.bulk(self._get(args[0]))
+            if command == 'MGET':
+                return b'*%d\r\n' % len(args) + b''.join(self.bulk(self._get(key)) for key in args)
+            if command == 'SET':
+                self.data[args[0]] = args[1]
+                self.expiry.pop(args[0], None)
+                if len(args) == 4 and args[2].upper() == b'EX':
+                    self.expiry[args[0]] = time.monotonic() + int(args[3])
+                return b'+OK\r\n'
+            if command in ('INCR', 'INCRBY'):
+                value = int(self._get(args[0]) or 0) + (int(args[1]) if args[1:] else 1)
+                self.data[args[0]] = str(value).encode()
+                return b':%d\r\n' % value
+            if command in ('PING', 'CLIENT', 'SELECT'):
+                return b'+PONG\r\n' if command == 'PING' else b'+OK\r\n'
+            return b'-ERR unknown command\r\n'
+
+
+@pytest.fixture
+def redis_stand_in():
+    server = RedisStandIn()
+    server.thread.start()
+    yield server
+    server.tcp.shutdown()
+    server.tcp.server_close()
+
+
+def test_redis_backend_shares_entries_and_versions(app, client, redis_stand_in):
+    app.config['RESPONSE_CACHE_REDIS_URL'] = redis_stand_in.url
+    response_cache.init_app(app)
+    assert response_cache.backend.name == 'redis'
+    db.session.add(goal(1))
+    db.session.commit()
+
+    assert cache_status(client, '/api/projects/impact/goals?company_id=1') == 'MISS'
+    assert cache_status(client, '/api/projects/impact/goals?company_id=1') == 'HIT'
+    # A hit is one round trip reading the entry and its tag versions together
+    redis_stand_in.commands.clear()
+    assert cache_status(client, '/api/projects/impact/goals?company_id=1') == 'HIT'
+    assert redis_stand_in.commands == ['MGET']
+
+    # Another worker sharing the Redis sees the invalidation
+    other_worker = RedisBackend.connect(redis_stand_in.url)
+    entry_key = next(k for k in redis_stand_in.data if b':entry:' in k).decode().rsplit(':', 1)[1]
+    tags = ['impact_goals:company_id=1', 'impact_goals:*']
+    entry, versions = other_worker.lookup(entry_key, tags)
+    assert entry['versions'] == versions
+
+    db.session.add(goal(1, target=5.0))
+    db.session.commit()
+    entry, versions = other_worker.lookup(entry_key, tags)
+    assert entry['versions'] != versions
+    assert cache_status(client, '/api/projects/impact/goals?company_id=1') == 'MISS'
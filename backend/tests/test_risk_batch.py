@@ -0,0 +1,83 @@
+"""
+Parity and caching tests for the batch risk engine.
+"""
+
+import random
+
+from ibm_watson.tools.risk_assessor import (MIN_PROJECTS_PER_WORKER, RiskEngine, assess_risks_batch,
+                                            risk_assessor_batch_function, risk_assessor_function)
+
+
+def random_project(rng, i):
+    project = {
+        'id': i,
+        'budget': rng.choice([0, 5000, 120000, 2500000]),
+        'timeline_months': rng.choice([6, 12, 36]),
+        'funding_source': rng.choice(['government', 'Corporate', 'crowdfunding', 'other']),
+        'currency_volatility': rng.choice([0.05, 0.1, 0.6]),
+        'complexity_level': rng.choice(['low', 'medium', 'very_high']),
+        'team_size': rng.choice([1, 4, 8, 30]),
+        'technology_requirements': ['iot'] * rng.randint(0, 3),
+        'location': rng.choice(['', 'Rural Bihar', 'Post-conflict region', 'Emerging market', 'Mumbai',
+                                'Warsaw', 'Remote island']),
+        'climate_vulnerability': rng.choice(['low', 'high']),
+        'community_engagement': rng.choice([{}, {'level': 'high'}, {'level': 'medium'}]),
+        'stakeholder_conflicts': ['land'] * rng.randint(0, 4),
+        'compliance_status': rng.choice(['compliant', 'unknown', 'non_compliant']),
+        'permits_required': ['water'] * rng.randint(0, 5),
+        'social_impact': {'displacement': True} if rng.random() < 0.3 else {},
+    }
+    # Sparse projects rely on the helpers' defaults
+    if rng.random() < 0.2:
+        project = {k: v for k, v in project.items() if k in ('id', 'budget', 'location')}
+    return project
+
+
+def normalized(result):
+    result = dict(result)
+    if 'mitigation_recommendations' in result:
+        # The scalar tool de-duplicates through a set, so order is arbitrary
+        result['mitigation_recommendations'] = sorted(result['mitigation_recommendations'])
+    return result
+
+
+def test_batch_matches_scalar_results():
+    rng = random.Random(3)
+    portfolio = [random_project(rng, i) for i in range(300)]
+    portfolio.append({'id': 'bad', 'funding_source': None})
+    batch = risk_assessor_batch_function(portfolio)
+    assert batch['success'] and batch['summary']['failed'] == 1
+    for project, result in zip(portfolio, batch['projects']):
+        assert result.pop('id') == project['id']
+        assert normalized(result) == normalized(risk_assessor_function(project))
+
+
+def test_categories_are_memoized():
+    engine = RiskEngine()
+    project = {'budget': 50000, 'location': 'Rural Bihar', 'permits_required': ['water']}
+    first = engine.assess(project)
+    assert engine.misses == 5 and engine.hits == 0
+    assert normalized(engine.assess(dict(project))) == normalized(first)
+    assert engine.hits == 5
+
+    # Only the category that reads the changed field is recomputed
+    engine.assess({**project, 'location': 'Mumbai'})
+    assert engine.misses == 6
+    engine.clear_cache()
+    engine.assess(project)
+    assert engine.misses == 5
+
+
+def test_unhashable_fields_fall_back_to_uncached():
+    engine = RiskEngine()
+    project = {'environmental_impact': {'emissions': bytearray(b'x')}}
+    assert normalized(engine.assess(project)) == normalized(risk_assessor_function(project))
+
+
+def test_process_pool_matches_serial():
+    rng = random.Random(5)
+    portfolio = [random_project(rng, i) for i in range(MIN_PROJECTS_PER_WORKER * 2)]
+    parallel = assess_risks_batch(portfolio, workers=2)
+    serial = assess_risks_batch(portfolio)
+    assert [normalized(r) for r in parallel['projects']] == [normalized(r) for r in serial['projects']]
+    assert parallel['summary'] == serial['summary']
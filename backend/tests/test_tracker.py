@@ -0,0 +1,97 @@
+"""
+Tests for the tracker read endpoints: eager loading, filters, keyset
+pagination and timeline ordering.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import make_company, make_project, make_user
+from models import db, ProjectApplication, ProjectTimelineEntry, ProjectTrackingInfo
+from perf import query_budget
+
+
+@pytest.fixture
+def tracker_rows(app):
+    user = make_user()
+    company = make_company(user)
+    base = datetime(2024, 6, 1)
+    rows = []
+    for i in range(7):
+        project = make_project(user, title=f'Project {i}')
+        info = ProjectTrackingInfo(project_id=project.id, status='delayed' if i % 3 == 0 else 'on-track')
+        # Two rows share a timestamp so pagination has to fall back to the id
+        info.updated_at = base + timedelta(days=min(i, 5))
+        db.session.add(info)
+        if i % 2 == 0:
+            db.session.add(ProjectApplication(project_id=project.id, company_id=company.id, application_type='funding'))
+        rows.append(info)
+    db.session.commit()
+    return company, rows
+
+
+def test_cards_include_project_title_in_one_query(tracker_rows, client):
+    client.get('/api/projects/tracker/projects')
+    with query_budget(1):
+        response = client.get('/api/projects/tracker/projects')
+    cards = response.get_json()
+    assert len(cards) == 7
+    assert cards[0]['title'] in {'Project 5', 'Project 6'}
+    assert all(card['title'].startswith('Project') for card in cards)
+    assert 'X-Next-Cursor' not in response.headers
+
+
+def test_keyset_pagination_walks_every_row_once(tracker_rows, client):
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        url = '/api/projects/tracker/projects?limit=2' + (f'&cursor={cursor}' if cursor else '')
+        response = client.get(url)
+        assert response.status_code == 200
+        seen.extend(card['id'] for card in response.get_json())
+        pages += 1
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            break
+    _, rows = tracker_rows
+    assert pages == 4
+    assert sorted(seen) == sorted(f'p{row.project_id}' for row in rows)
+    assert len(seen) == len(set(seen))
+
+
+def test_status_and_company_filters(tracker_rows, client):
+    company, rows = tracker_rows
+    delayed = client.get('/api/projects/tracker/projects?status=delayed').get_json()
+    assert {c['id'] for c in delayed} == {f'p{r.project_id}' for r in rows if r.status == 'delayed'}
+
+    funded = client.get(f'/api/projects/tracker/projects?company_id={company.id}').get_json()
+    assert {c['id'] for c in funded} == {f'p{r.project_id}' for i, r in enumerate(rows) if i % 2 == 0}
+
+
+def test_invalid_cursor_is_rejected(tracker_rows, client):
+    response = client.get('/api/projects/tracker/projects?cursor=not-a-cursor')
+    assert response.status_code == 400
+
+
+def test_detail_includes_title(tracker_rows, client):
+    _, rows = tracker_rows
+    response = client.get(f'/api/projects/tracker/projects/{rows[0].project_id}')
+    assert response.status_code == 200
+    assert response.get_json()['title'] == 'Project 0'
+    assert client.get('/api/projects/tracker/projects/99999').status_code == 404
+
+
+def test_timeline_returns_latest_entries_oldest_first(app, client):
+    user = make_user()
+    company = make_company(user)
+    base = datetime(2024, 1, 1)
+    for i in range(5):
+        db.session.add(ProjectTimelineEntry(text=f'Entry {i}', company_id=company.id, created_at=base + timedelta(days=i)))
+    db.session.add(ProjectTimelineEntry(text='Other company', created_at=base + timedelta(days=10)))
+    db.session.commit()
+
+    items = client.get(f'/api/projects/tracker/timeline?company_id={company.id}&limit=3').get_json()
+    assert [i['text'] for i in items] == ['Entry 2', 'Entry 3', 'Entry 4']
+    assert client.get('/api/projects/tracker/timeline').get_json()[-1]['text'] == 'Other company'
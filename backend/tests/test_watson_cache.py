@@ -0,0 +1,96 @@
+"""
+Tests for the Watson result cache.
+"""
+
+import time
+
+import pytest
+
+from conftest import make_user
+from ibm_watson.config import WatsonConfig
+from ibm_watson.result_cache import ResultCache, fingerprint
+from ibm_watson.watson_service import WatsonService
+from models import db
+from routes.watson_agents import watson_bp
+from utils import create_token
+
+PROJECT = {'id': 1, 'name': 'Solar Schools', 'budget': 50000, 'timeline_months': 12, 'location': 'Rural India',
+           'sdg_focus': [4, 7], 'expected_beneficiaries': 2000, 'updated_at': '2026-01-01T00:00:00'}
+COMPANY = {'id': 9, 'sdg_priorities': [4, 7], 'geographic_focus': ['India'], 'available_budget': 100000,
+           'updated_at': '2026-01-01T00:00:00'}
+
+
+@pytest.fixture
+def service():
+    service = WatsonService(WatsonConfig())
+    service.config.cache_enabled = True
+    service.initialize()
+    yield service
+    service.runtime.shutdown()
+
+
+def test_fingerprint_canonicalizes_inputs():
+    assert fingerprint({'a': 1, 'b': [1.0, 2]}) == fingerprint({'b': [1, 2], 'a': 1.0})
+    assert fingerprint({'a': 1, 'updated_at': 'x'}) == fingerprint({'a': 1, 'updated_at': 'y'})
+    assert fingerprint({'a': 1}) != fingerprint({'a': 2})
+
+
+def test_second_analysis_is_served_from_cache(service, monkeypatch):
+    first = service.get_comprehensive_analysis(PROJECT, COMPANY)
+    monkeypatch.setattr(service.runtime, 'run_many', lambda calls: pytest.fail('tools re-run'))
+    second = service.get_comprehensive_analysis(dict(PROJECT), dict(COMPANY))
+    assert second['cached'] and 'cached' not in first
+    assert second['overall_score'] == first['overall_score']
+    assert service.cache.hits == 1 and service.cache.misses == 1
+
+
+def test_updated_at_invalidates(service):
+    service.analyze_project_alignment(PROJECT, COMPANY)
+    edited = service.analyze_project_alignment({**PROJECT, 'updated_at': '2026-02-01T00:00:00'}, COMPANY)
+    assert 'cached' not in edited
+    assert service.cache.stats()['entries'] == 1
+    assert service.analyze_project_alignment({**PROJECT, 'updated_at': '2026-02-01T00:00:00'}, COMPANY)['cached']
+
+
+def test_failures_are_not_cached(service):
+    service.runtime.run = lambda name, **kwargs: {'error': 'boom', 'success': False}
+    assert not service.optimize_budget_allocation(1000, [PROJECT])['success']
+    assert service.cache.stats()['entries'] == 0
+
+
+def test_ttl_and_lru_eviction():
+    cache = ResultCache(max_entries=2, ttl=60)
+    for key in 'abc':
+        cache.set(key, {'value': key})
+    assert cache.get('a') is None and cache.evictions == 1
+    assert cache.get('b') == {'value': 'b'}
+
+    cache.ttl = 0.01
+    cache.set('d', {'value': 'd'})
+    time.sleep(0.02)
+    assert cache.get('d') is None
+
+
+def test_persists_to_disk(tmp_path):
+    path = str(tmp_path / 'watson_cache.sqlite')
+    ResultCache(path=path).set('key', {'score': 0.5}, version='1@x')
+    reopened = ResultCache(path=path)
+    assert reopened.get('key', version='1@x') == {'score': 0.5}
+    assert reopened.get('key', version='1@y') is None
+    assert reopened.get('key', version='1@x') is None
+
+
+def test_clear_endpoint_is_admin_only(app, client):
+    app.register_blueprint(watson_bp)
+    admin, member = make_user('admin@example.com'), make_user('member@example.com')
+    admin.role, member.role = 'admin', 'corporate'
+    db.session.commit()
+
+    def clear(user=None):
+        headers = {'Authorization': f"Bearer {create_token({'user_id': user.id})}"} if user else {}
+        return client.post('/api/watson/cache/clear', headers=headers)
+
+    assert clear().status_code == 403
+    assert clear(member).status_code == 403
+    response = clear(admin)
+    assert response.status_code == 200 and 'cache' in response.get_json()
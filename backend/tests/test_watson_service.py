@@ -0,0 +1,67 @@
+"""
+Tests for the local Watson tool runtime.
+"""
+
+import pytest
+
+from ibm_watson.config import WatsonConfig
+from ibm_watson.tools import impact_calculator_function, project_analyzer_function, risk_assessor_function
+from ibm_watson.watson_service import WatsonService
+
+PROJECT = {
+    'name': 'Rural Education Initiative',
+    'budget': 50000,
+    'timeline_months': 18,
+    'location': 'Rural India',
+    'sdg_focus': [4, 10],
+    'expected_beneficiaries': 5000,
+    'impact_metrics': {'jobs_created': 15, 'carbon_reduction_tons': 50},
+}
+COMPANY = {'sdg_priorities': [4, 10, 17], 'geographic_focus': ['India'], 'available_budget': 200000}
+
+
+@pytest.fixture
+def service():
+    service = WatsonService(WatsonConfig())
+    assert service.initialize()
+    yield service
+    service.runtime.shutdown()
+
+
+def test_discovers_tools_and_agents(service):
+    assert {'project_analyzer_tool', 'impact_calculator_tool', 'risk_assessor_tool',
+            'budget_optimizer_tool'} <= set(service.tools)
+    agents = service.agent_manager.list_agents()
+    assert agents and all(agent['status'] == 'local' for agent in agents)
+
+
+def test_comprehensive_analysis_composes_tools(service):
+    analysis = service.get_comprehensive_analysis(PROJECT, COMPANY)
+    assert analysis['success']
+    assert analysis['alignment'] == project_analyzer_function(PROJECT, COMPANY, 'alignment')
+    assert analysis['impact'] == impact_calculator_function({**PROJECT['impact_metrics'], 'beneficiaries': 5000}, {})
+    assert analysis['risk']['overall_risk_score'] == risk_assessor_function(PROJECT)['overall_risk_score']
+    assert analysis['comprehensive_recommendations']
+    assert 0 <= analysis['overall_score'] <= 1
+
+
+def test_operations_and_errors(service):
+    assert service.evaluate_project_feasibility(PROJECT, COMPANY)['success']
+    assert service.assess_project_impact(PROJECT)['success']
+    assert service.optimize_budget_allocation(100000, [PROJECT])['success']
+    assert service.runtime.run('missing_tool') == {'error': 'Unknown tool: missing_tool', 'success': False}
+    failed = service.runtime.run('project_analyzer_tool', project_data=PROJECT)
+    assert not failed['success'] and 'company_profile' in failed['error']
+
+
+def test_process_pool_matches_inline_and_times_out(service):
+    service.config.cache_enabled = False
+    inline = service.get_comprehensive_analysis(PROJECT, COMPANY)
+    service.config.tool_execution = 'process'
+    pooled = service.get_comprehensive_analysis(PROJECT, COMPANY)
+    assert pooled['overall_score'] == inline['overall_score']
+    assert pooled['alignment'] == inline['alignment']
+
+    service.config.tool_timeout = 0
+    slow = service.runtime.run('budget_optimizer_tool', available_budget=1000, project_list=[PROJECT] * 2000)
+    assert not slow['success'] and 'timed out' in slow['error']
@@ -1,9 +1,11 @@
 import os
+import base64
 import hashlib
 import hmac
 from datetime import datetime, timedelta
 import jwt
 from flask import jsonify
+import json
 
 
 def hash_password(password: str) -> str:
@@ -47,6 +49,28 @@ def api_response(data=None, message="", status_code=200, error=None):
     return jsonify(response), status_code
 
 
+def sse_event(event, data, event_id=None):
+    """Format a single server-sent event frame"""
+    frame = f"id: {event_id}\n" if event_id is not None else ''
+    return f"{frame}event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def encode_cursor(*values) -> str:
+    """Opaque keyset pagination cursor built from the sort key of the last row returned"""
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> list | None:
+    """Inverse of encode_cursor; returns None for a malformed cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        return None
+    return values if isinstance(values, list) else None
+
+
 def validate_required_fields(data, required_fields):
     """Validate that required fields are present in request data"""
     missing_fields = []
@@ -135,3 +159,16 @@ def validate_sdg_list(sdg_list):
     return True, None
 
 
+def validate_sdg_goals(sdg_goals):
+    """Validate a list of SDG numbers (1-17)"""
+    if not isinstance(sdg_goals, list):
+        return False, "SDG goals must be an array"
+    
+    invalid_goals = [str(goal) for goal in sdg_goals
+                     if isinstance(goal, bool) or not isinstance(goal, int) or not 1 <= goal <= 17]
+    if invalid_goals:
+        return False, f"Invalid SDG goals: {', '.join(invalid_goals)}"
+    
+    return True, None
+
+
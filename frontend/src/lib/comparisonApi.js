@@ -313,3 +313,55 @@ export async function getOrCreateDefaultComparison() {
     throw error
   }
 }
+
+/**
+ * Get scores, rankings and the Pareto front for a comparison
+ * weights is an optional { criterion: weight } object, e.g. { impact: 2, cost: 0.5 }
+ */
+export async function getComparisonAnalysis(comparisonId, weights = {}) {
+  try {
+    const token = localStorage.getItem('token')
+    const headers = {
+      'Content-Type': 'application/json'
+    }
+    
+    // Only add Authorization header if token exists
+    if (token) {
+      headers['Authorization'] = `Bearer ${token}`
+    }
+    
+    const response = await fetch(`${API_BASE}/${comparisonId}/analysis`, {
+      method: 'POST',
+      headers,
+      body: JSON.stringify({ weights })
+    })
+    
+    if (!response.ok) {
+      const errorData = await response.json()
+      throw new Error(errorData.error || `HTTP error! status: ${response.status}`)
+    }
+    
+    const data = await response.json()
+    return data.data
+  } catch (error) {
+    console.error('Error fetching comparison analysis:', error)
+    throw error
+  }
+}
+
+/**
+ * Re-rank an analysis with new weights without another request
+ * Uses the normalized criteria matrix returned by getComparisonAnalysis
+ */
+export function rerankAnalysis(analysis, weights = {}) {
+  const criteria = analysis.criteria.map(c => c.name)
+  const raw = criteria.map((name, i) => Math.max(0, weights[name] ?? analysis.criteria[i].weight))
+  const total = raw.reduce((sum, w) => sum + w, 0) || 1
+  const scores = analysis.normalized.map(row =>
+    row.reduce((sum, value, i) => sum + value * raw[i] / total, 0) * 100
+  )
+  return analysis.projectOrder
+    .map((projectId, i) => ({ projectId, score: Math.round(scores[i] * 100) / 100, index: i }))
+    .sort((a, b) => b.score - a.score || a.index - b.index)
+    .map(({ projectId, score }, i) => ({ rank: i + 1, projectId, score }))
+}
@@ -268,11 +268,13 @@ export const getNGOs = async (filters = {}, token) => {
  * Get a specific NGO by ID
  * @param {number} ngoId - NGO ID
  * @param {string} token - JWT authentication token
+ * @param {string[]} include - Sub-resources to embed (timeline, documents, transparency, certificates, testimonials or all)
  * @returns {Promise<Object>} NGO data
  */
-export const getNGO = async (ngoId, token) => {
+export const getNGO = async (ngoId, token, include = []) => {
   try {
-    const response = await fetch(`${API_BASE_URL}/ngos/${ngoId}`, {
+    const query = include.length ? `?include=${include.join(',')}` : ''
+    const response = await fetch(`${API_BASE_URL}/ngos/${ngoId}${query}`, {
       method: 'GET',
       headers: {
         'Authorization': `Bearer ${token}`
@@ -845,6 +847,25 @@ export const createTimelineEntry = async (entryData) => {
   }
 }
 
+/**
+ * Subscribe to tracker timeline, tracker status and approval changes pushed by the server
+ * @param {Object} handlers - Map of event type (timeline, tracker, approval, approval_step, resync) to callback
+ * @param {Object} options - Optional companyId and types filter
+ * @returns {Function} Unsubscribe function
+ */
+export const subscribeToTrackerEvents = (handlers, { companyId, types } = {}) => {
+  const params = new URLSearchParams()
+  if (companyId) params.append('company_id', companyId)
+  if (types?.length) params.append('types', types.join(','))
+
+  // EventSource reconnects on its own and resumes from the last event id
+  const source = new EventSource(`/api/events/stream?${params.toString()}`)
+  Object.entries(handlers).forEach(([type, handler]) => {
+    source.addEventListener(type, (event) => handler(JSON.parse(event.data)))
+  })
+  return () => source.close()
+}
+
 /**
  * Create a new report generation job
  * @param {Object} reportData - Report job data
@@ -1,5 +1,5 @@
 import { useMemo, useState, useCallback, useEffect } from 'react'
-import { getTrackerProjects, getTrackerTimeline, getProjects } from '../../../../lib/projectApi'
+import { getTrackerProjects, getTrackerTimeline, getProjects, subscribeToTrackerEvents } from '../../../../lib/projectApi'
 
 const SDG = {
   green: '#4CAF50',
@@ -144,6 +144,17 @@ export default function useTracker() {
     fetchData()
   }, [fetchData])
 
+  // Apply pushed changes instead of polling the tracker endpoints
+  useEffect(() => {
+    return subscribeToTrackerEvents({
+      timeline: (entry) => setTimeline((items) => [...(items || []), entry]),
+      tracker: (change) => setProjects((items) => items.map((p) => (
+        p.id === change.id ? { ...p, status: change.status, progressPct: change.progressPct } : p
+      ))),
+      resync: () => fetchData(),
+    }, { types: ['timeline', 'tracker'] })
+  }, [fetchData])
+
   const filtered = useMemo(() => {
     if (filter === 'all') return projects
     if (filter === 'approved') return projects.filter((p) => p.status === 'funded' || p.status === 'published')